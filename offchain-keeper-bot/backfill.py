@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Stratum Fi Keeper Bot - Backfill Entry Point
+Loads historical harvest events into the local state store
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from backfill import main
+
+if __name__ == "__main__":
+    main()
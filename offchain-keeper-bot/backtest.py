@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Stratum Fi Keeper Bot - Backtest Entry Point
+Replays recorded or synthetic data through a grid of harvest policies
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from backtest import main
+
+if __name__ == "__main__":
+    main()
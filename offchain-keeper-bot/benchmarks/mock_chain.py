@@ -0,0 +1,689 @@
+"""
+In-process JSON-RPC stand-in for keeper benchmarks
+Serves the Stratum Fi contracts the keeper reads and harvests over HTTP,
+with configurable latency, jitter and error injection
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import rlp
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
+
+CHAIN_ID = 31611
+MULTICALL_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Test-only key (never funded anywhere)
+KEEPER_PRIVATE_KEY = "0x" + "4b" * 32
+KEEPER_ADDRESS = Account.from_key(KEEPER_PRIVATE_KEY).address
+
+BLOCK_TIME_SECONDS = 2
+HARVEST_GAS = 420_000
+PRIORITY_FEE_WEI = 1_000_000  # 0.001 gwei
+
+# MUSD/BTC pool reserves (60,000 MUSD per BTC) and Pyth BTC/USD price
+POOL_RESERVES = (60_000_000 * 10**18, 1_000 * 10**18)
+PYTH_PRICE, PYTH_EXPO = 60_000 * 10**8, -8
+SWAP_FEE = 0.003
+
+# Per-tick accrual of the first vault (MUSD, BTC); later vaults accrue faster
+YIELD_PER_TICK = (1.5 * 10**18, 0.00005 * 10**18)
+
+REVERT_SELECTOR = function_signature_to_4byte_selector("Error(string)")
+
+# Function signature -> output types, per mocked contract
+FUNCTIONS = {
+    "multicall": {
+        "aggregate3((address,bool,bytes)[])": ["(bool,bytes)[]"],
+        "getBlockNumber()": ["uint256"],
+        "getCurrentBlockTimestamp()": ["uint256"],
+        "getEthBalance(address)": ["uint256"],
+    },
+    "harvester": {
+        "getClaimableYield()": ["uint256", "uint256"],
+        "keeper()": ["address"],
+        "harvest()": [],
+    },
+    "debt_manager": {
+        "totalDebt()": ["uint256"],
+        "pythOracle()": ["address"],
+        "btcPriceFeedId()": ["bytes32"],
+    },
+    "strategy": {
+        "totalBTCDeposited()": ["uint256"],
+        "btc()": ["address"],
+        "musd()": ["address"],
+        "musdBtcPool()": ["address"],
+    },
+    "pool": {
+        "token0()": ["address"],
+        "token1()": ["address"],
+        "getReserves()": ["uint112", "uint112", "uint32"],
+        "getAmountOut(uint256,address)": ["uint256"],
+    },
+    "pyth": {
+        "getPriceUnsafe(bytes32)": ["(int64,uint64,int32,uint256)"],
+    },
+}
+
+
+def _split_types(signature: str) -> List[str]:
+    """Argument types of a function signature (top-level commas only)"""
+    inner = signature[signature.index("(") + 1 : -1]
+    types, depth, current = [], 0, ""
+    for char in inner:
+        if char == "," and depth == 0:
+            types.append(current)
+            current = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current += char
+    if current:
+        types.append(current)
+    return types
+
+
+# 4-byte selector -> (function name, input types, output types), per contract
+SELECTORS = {
+    kind: {
+        function_signature_to_4byte_selector(sig): (
+            sig[: sig.index("(")],
+            _split_types(sig),
+            outputs,
+        )
+        for sig, outputs in functions.items()
+    }
+    for kind, functions in FUNCTIONS.items()
+}
+
+
+def _address(tag: int, index: int = 0) -> str:
+    return to_checksum_address(f"0x{tag:02x}{index:038x}")
+
+
+def _hex(value: int) -> str:
+    return hex(int(value))
+
+
+def _int(field: bytes) -> int:
+    """Decode an RLP integer field"""
+    return int.from_bytes(field, "big")
+
+
+class Revert(Exception):
+    """A mocked contract call reverted"""
+
+
+class RPCError(Exception):
+    """A JSON-RPC error response"""
+
+    def __init__(self, code: int, message: str, data: Optional[str] = None):
+        super().__init__(message)
+        self.error = {"code": code, "message": message}
+        if data is not None:
+            self.error["data"] = data
+
+
+@dataclass
+class MockVault:
+    """Contracts and claimable yield of one mocked vault"""
+
+    index: int
+    harvester: str
+    debt_manager: str
+    strategy: str
+    claimable_musd: int = 0
+    claimable_btc: int = 0
+    harvests: int = 0
+
+    @property
+    def accrual(self) -> Tuple[int, int]:
+        # Vaults accrue at 1x-2x the base rate so they cross thresholds apart
+        scale = 1 + (self.index % 5) / 4
+        return int(YIELD_PER_TICK[0] * scale), int(YIELD_PER_TICK[1] * scale)
+
+    def as_definition(self) -> Dict[str, str]:
+        """Entry for a VAULTS_FILE"""
+        return {
+            "name": f"vault-{self.index}",
+            "harvester_address": self.harvester,
+            "debt_manager_address": self.debt_manager,
+            "strategy_btc_address": self.strategy,
+        }
+
+
+@dataclass
+class Faults:
+    """
+    Fault injection per HTTP request
+
+    Attributes:
+        latency_ms: Added delay before every response
+        jitter_ms: Uniform random delay added on top of latency_ms
+        error_rate: Fraction of requests answered with HTTP 503
+        rate_limit_rate: Fraction answered with JSON-RPC -32005 errors
+        stall_rate: Fraction held for stall_seconds (past client timeouts)
+        stall_seconds: Delay of stalled requests
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_seconds: float = 2.0
+
+
+class MockChain:
+    """
+    State and JSON-RPC dispatch of a minimal chain
+
+    Blocks are produced by tick() (which also accrues vault yield) and by
+    every accepted transaction, which is mined immediately in its own block.
+    With hold_transactions set, accepted transactions wait in the pool
+    (where a same-nonce replacement paying 10% more takes their place)
+    until include_pending() mines them.
+    Contract calls are dispatched on the 4-byte selector of the target
+    contract's mocked functions.
+    """
+
+    def __init__(self, vaults: int = 1, base_fee_wei: int = 10_000_000):
+        """
+        Initialize mock chain
+
+        Args:
+            vaults: Number of vaults (all share the pool, tokens and Pyth)
+            base_fee_wei: Initial base fee per gas
+        """
+        self.chain_id = CHAIN_ID
+        self.keeper = KEEPER_ADDRESS
+        self.block_number = 1_000_000
+        self.timestamp = int(time.time())
+        self.base_fee_wei = base_fee_wei
+        self.base_fees = deque([base_fee_wei] * 64, maxlen=1024)
+
+        self.musd = _address(0x11)
+        self.btc = _address(0x12)
+        self.pool = _address(0x13)
+        self.pyth = _address(0x14)
+        self.feed_id = keccak(b"BTC/USD")
+
+        self.vaults = [
+            MockVault(i, _address(0xA1, i), _address(0xA2, i), _address(0xA3, i))
+            for i in range(vaults)
+        ]
+        self.contracts: Dict[str, Tuple[str, Optional[MockVault]]] = {
+            MULTICALL_ADDRESS.lower(): ("multicall", None),
+            self.pool.lower(): ("pool", None),
+            self.pyth.lower(): ("pyth", None),
+        }
+        for vault in self.vaults:
+            self.contracts[vault.harvester.lower()] = ("harvester", vault)
+            self.contracts[vault.debt_manager.lower()] = ("debt_manager", vault)
+            self.contracts[vault.strategy.lower()] = ("strategy", vault)
+
+        self.balances: Dict[str, int] = {self.keeper.lower(): 10**18}
+        self.nonces: Dict[str, int] = {}
+        self.queued: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+        self.hold_transactions = False
+        self._lock = threading.RLock()
+
+    @property
+    def harvests(self) -> int:
+        return sum(vault.harvests for vault in self.vaults)
+
+    def tick(self, blocks: int = 1):
+        """Advance the chain and accrue yield to every vault"""
+        with self._lock:
+            for _ in range(blocks):
+                for vault in self.vaults:
+                    musd, btc = vault.accrual
+                    vault.claimable_musd += musd
+                    vault.claimable_btc += btc
+                self._mine()
+
+    def set_base_fee(self, base_fee_wei: int):
+        with self._lock:
+            self.base_fee_wei = base_fee_wei
+
+    def _mine(self):
+        self.block_number += 1
+        self.timestamp += BLOCK_TIME_SECONDS
+        self.base_fees.append(self.base_fee_wei)
+
+    def _block_hash(self, number: int) -> str:
+        return "0x" + keccak(number.to_bytes(32, "big")).hex()
+
+    # JSON-RPC
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one JSON-RPC request"""
+        method = request.get("method", "")
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        with self._lock:
+            handler = getattr(self, "rpc_" + method, None)
+            try:
+                if handler is None:
+                    raise RPCError(
+                        -32601, f"the method {method} does not exist/is not available"
+                    )
+                response["result"] = handler(*request.get("params", []))
+            except RPCError as e:
+                response["error"] = e.error
+        return response
+
+    def rpc_eth_chainId(self):
+        return _hex(self.chain_id)
+
+    def rpc_net_version(self):
+        return str(self.chain_id)
+
+    def rpc_eth_blockNumber(self):
+        return _hex(self.block_number)
+
+    def rpc_eth_gasPrice(self):
+        return _hex(self.base_fee_wei + PRIORITY_FEE_WEI)
+
+    def rpc_eth_maxPriorityFeePerGas(self):
+        return _hex(PRIORITY_FEE_WEI)
+
+    def rpc_eth_feeHistory(self, block_count, newest_block, percentiles=None):
+        if isinstance(block_count, str):
+            block_count = int(block_count, 16)
+        count = min(block_count, len(self.base_fees) - 1)
+        fees = list(self.base_fees)[-count:] + [self.base_fee_wei]
+        return {
+            "oldestBlock": _hex(self.block_number - count + 1),
+            "baseFeePerGas": [_hex(fee) for fee in fees],
+            "gasUsedRatio": [0.5] * count,
+            "reward": [[_hex(PRIORITY_FEE_WEI)] * len(percentiles or [])] * count,
+        }
+
+    def rpc_eth_getBlockByNumber(self, block, full_transactions=False):
+        number = self._block_number(block)
+        if number > self.block_number:
+            return None
+        timestamp = self.timestamp - (self.block_number - number) * BLOCK_TIME_SECONDS
+        empty = "0x" + "00" * 32
+        return {
+            "number": _hex(number),
+            "hash": self._block_hash(number),
+            "parentHash": self._block_hash(number - 1),
+            "timestamp": _hex(timestamp),
+            "baseFeePerGas": _hex(self.base_fee_wei),
+            "gasLimit": _hex(30_000_000),
+            "gasUsed": _hex(0),
+            "miner": "0x" + "00" * 20,
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "extraData": "0x",
+            "logsBloom": "0x" + "00" * 256,
+            "nonce": "0x0000000000000000",
+            "mixHash": empty,
+            "sha3Uncles": empty,
+            "stateRoot": empty,
+            "transactionsRoot": empty,
+            "receiptsRoot": empty,
+            "size": "0x0",
+            "transactions": [],
+            "uncles": [],
+        }
+
+    def rpc_eth_getBalance(self, address, block="latest"):
+        return _hex(self.balances.get(address.lower(), 0))
+
+    def rpc_eth_getTransactionCount(self, address, block="latest"):
+        nonce = self.nonces.get(address.lower(), 0)
+        if block == "pending":
+            while nonce in self.queued.get(address.lower(), {}):
+                nonce += 1
+        return _hex(nonce)
+
+    def rpc_eth_getCode(self, address, block="latest"):
+        return "0x60806040" if address.lower() in self.contracts else "0x"
+
+    def rpc_eth_call(self, tx, block="latest", *overrides):
+        return "0x" + self._call(tx.get("to", ""), self._data(tx)).hex()
+
+    def rpc_eth_estimateGas(self, tx, block="latest"):
+        if tx.get("to", "").lower() not in self.contracts:
+            return _hex(21_000)
+        self._call(tx["to"], self._data(tx))
+        return _hex(HARVEST_GAS)
+
+    def rpc_eth_sendRawTransaction(self, raw_tx):
+        raw = bytes.fromhex(raw_tx[2:])
+        tx = self._decode_transaction(raw)
+        queued = self.queued.setdefault(tx["from"], {})
+        held = queued.get(tx["nonce"])
+        if tx["hash"] in self.receipts or (held and held["hash"] == tx["hash"]):
+            raise RPCError(-32000, "already known")
+        if tx["nonce"] < self.nonces.get(tx["from"], 0):
+            raise RPCError(-32000, "nonce too low")
+        if held is not None and tx["gas_price"] < held["gas_price"] * 1.1:
+            raise RPCError(-32000, "replacement transaction underpriced")
+
+        # Like a txpool: a nonce gap holds later transactions until filled
+        queued[tx["nonce"]] = tx
+        if not self.hold_transactions:
+            self._include_queued(tx["from"])
+        return tx["hash"]
+
+    def include_pending(self):
+        """Mine every transaction waiting in the pool"""
+        with self._lock:
+            for sender in self.queued:
+                self._include_queued(sender)
+
+    def _include_queued(self, sender: str):
+        """Mine a sender's queued transactions up to the first nonce gap"""
+        queued = self.queued[sender]
+        while self.nonces.get(sender, 0) in queued:
+            self._include(queued.pop(self.nonces.get(sender, 0)))
+
+    def _decode_transaction(self, raw: bytes) -> Dict[str, Any]:
+        """Sender, nonce, target, calldata and gas price of a signed transaction"""
+        if raw[0] == 2:
+            fields = rlp.decode(raw[1:])
+            nonce, tip, max_fee, _, to, _, data = fields[1:8]
+            gas_price = min(self.base_fee_wei + _int(tip), _int(max_fee))
+        else:
+            nonce, gas_price, _, to, _, data = rlp.decode(raw)[:6]
+            gas_price = _int(gas_price)
+        return {
+            "hash": "0x" + keccak(raw).hex(),
+            # Signature recovery would dominate mock CPU time; the keeper is
+            # the only sender
+            "from": self.keeper.lower(),
+            "nonce": _int(nonce),
+            "to": "0x" + to.hex(),
+            "data": data,
+            "gas_price": gas_price,
+            "type": raw[0] if raw[0] < 0x7F else 0,
+        }
+
+    def _include(self, tx: Dict[str, Any]):
+        """Execute a transaction and mine it in its own block"""
+        sender = tx["from"]
+        self.nonces[sender] = tx["nonce"] + 1
+        status = 1
+        try:
+            self._call(tx["to"], tx["data"], execute=True)
+        except Revert:
+            status = 0
+        fee = HARVEST_GAS * tx["gas_price"]
+        self.balances[sender] = self.balances.get(sender, 0) - fee
+
+        self._mine()
+        self.receipts[tx["hash"]] = {
+            "transactionHash": tx["hash"],
+            "transactionIndex": "0x0",
+            "blockHash": self._block_hash(self.block_number),
+            "blockNumber": _hex(self.block_number),
+            "from": to_checksum_address(sender),
+            "to": to_checksum_address(tx["to"]),
+            "cumulativeGasUsed": _hex(HARVEST_GAS),
+            "gasUsed": _hex(HARVEST_GAS),
+            "effectiveGasPrice": _hex(tx["gas_price"]),
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": _hex(status),
+            "type": _hex(tx["type"]),
+        }
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash):
+        return self.receipts.get(tx_hash)
+
+    # Contracts
+
+    def _block_number(self, block) -> int:
+        if isinstance(block, int):
+            return block
+        if block in ("latest", "pending", "safe", "finalized"):
+            return self.block_number
+        if block == "earliest":
+            return 0
+        return int(block, 16)
+
+    @staticmethod
+    def _data(tx: Dict[str, Any]) -> bytes:
+        data = tx.get("data") or tx.get("input") or "0x"
+        return bytes.fromhex(data[2:])
+
+    def _call(self, to: str, data: bytes, execute: bool = False) -> bytes:
+        """Run a contract call; raises RPCError (code 3) on revert"""
+        try:
+            return self._dispatch(to, data, execute)
+        except Revert as e:
+            if execute:
+                raise
+            reason = encode(["string"], [str(e)])
+            raise RPCError(
+                3,
+                f"execution reverted: {e}",
+                "0x" + (REVERT_SELECTOR + reason).hex(),
+            )
+
+    def _dispatch(self, to: str, data: bytes, execute: bool) -> bytes:
+        kind, vault = self.contracts.get(to.lower(), (None, None))
+        if kind is None:
+            return b""
+        function = SELECTORS[kind].get(data[:4])
+        if function is None:
+            raise Revert("unknown function")
+        name, input_types, output_types = function
+        args = decode(input_types, data[4:]) if input_types else ()
+        result = self._execute(kind, vault, name, args, execute)
+        return encode(output_types, result) if output_types else b""
+
+    def _execute(
+        self, kind: str, vault: Optional[MockVault], name: str, args, execute: bool
+    ) -> Tuple:
+        if kind == "multicall":
+            if name == "aggregate3":
+                return (self._aggregate3(args[0]),)
+            if name == "getBlockNumber":
+                return (self.block_number,)
+            if name == "getCurrentBlockTimestamp":
+                return (self.timestamp,)
+            return (self.balances.get(args[0].lower(), 0),)
+
+        if kind == "harvester":
+            if name == "getClaimableYield":
+                return vault.claimable_musd, vault.claimable_btc
+            if name == "keeper":
+                return (self.keeper,)
+            if vault.claimable_musd == 0 and vault.claimable_btc == 0:
+                raise Revert("No yield to harvest")
+            if execute:
+                vault.claimable_musd = vault.claimable_btc = 0
+                vault.harvests += 1
+            return ()
+
+        if kind == "debt_manager":
+            if name == "totalDebt":
+                return (500_000 * 10**18,)
+            if name == "pythOracle":
+                return (self.pyth,)
+            return (self.feed_id,)
+
+        if kind == "strategy":
+            return {
+                "totalBTCDeposited": (25 * 10**18,),
+                "btc": (self.btc,),
+                "musd": (self.musd,),
+                "musdBtcPool": (self.pool,),
+            }[name]
+
+        if kind == "pool":
+            if name == "token0":
+                return (self.musd,)
+            if name == "token1":
+                return (self.btc,)
+            if name == "getReserves":
+                return POOL_RESERVES + (self.timestamp % 2**32,)
+            amount_in, token_in = args
+            reserve_in, reserve_out = POOL_RESERVES
+            if token_in.lower() == self.btc.lower():
+                reserve_in, reserve_out = reserve_out, reserve_in
+            return (int(amount_in * reserve_out / reserve_in * (1 - SWAP_FEE)),)
+
+        # Pyth
+        return ((PYTH_PRICE, PYTH_PRICE // 1000, PYTH_EXPO, self.timestamp),)
+
+    def _aggregate3(self, calls) -> List[Tuple[bool, bytes]]:
+        results = []
+        for target, allow_failure, call_data in calls:
+            try:
+                results.append((True, self._dispatch(target, call_data, False)))
+            except Revert:
+                if not allow_failure:
+                    raise Revert("Multicall3: call failed")
+                results.append((False, b""))
+        return results
+
+
+class MockRPCServer:
+    """
+    HTTP JSON-RPC server for a MockChain
+
+    Threaded HTTP/1.1 with keep-alive and batch requests. Faults are drawn
+    from a seeded random source per HTTP request.
+    """
+
+    def __init__(
+        self,
+        chain: MockChain,
+        faults: Optional[Faults] = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize mock RPC server
+
+        Args:
+            chain: Chain to serve
+            faults: Fault injection (default: none)
+            seed: Seed of the fault random source
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self.chain = chain
+        self.faults = faults or Faults()
+        self.calls: Counter = Counter()  # JSON-RPC requests by method
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.server.block_on_close = False
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread and return the RPC URL"""
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="mock-rpc", daemon=True
+        )
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockRPCServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _draw_fault(self) -> Tuple[float, Optional[str]]:
+        """Delay and fault (None, "error", "rate_limit" or "stall") of a request"""
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency_ms + self._rng.uniform(0, faults.jitter_ms)
+            roll = self._rng.random()
+        delay /= 1000
+        if roll < faults.stall_rate:
+            return delay + faults.stall_seconds, "stall"
+        roll -= faults.stall_rate
+        if roll < faults.error_rate:
+            return delay, "error"
+        roll -= faults.error_rate
+        if roll < faults.rate_limit_rate:
+            return delay, "rate_limit"
+        return delay, None
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _respond(self, payload: Any, fault: Optional[str]) -> Any:
+        requests = payload if isinstance(payload, list) else [payload]
+        with self._lock:
+            self.calls.update(request.get("method", "") for request in requests)
+
+        if fault == "rate_limit":
+            responses = [
+                {
+                    "jsonrpc": "2.0",
+                    "id": request.get("id"),
+                    "error": {"code": -32005, "message": "rate limit exceeded"},
+                }
+                for request in requests
+            ]
+        else:
+            responses = [self.chain.handle(request) for request in requests]
+        return responses if isinstance(payload, list) else responses[0]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body in one segment: no Nagle/delayed-ACK stalls
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                delay, fault = server._draw_fault()
+                if delay > 0:
+                    time.sleep(delay)
+
+                result = server._respond(payload, fault)
+                status, body = 200, json.dumps(result).encode()
+                if fault == "error":
+                    status, body = 503, b"Service Unavailable"
+
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out on a stalled request
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
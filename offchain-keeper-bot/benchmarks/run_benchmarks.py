@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Stratum Fi Keeper Bot - Benchmarks
+Runs the keeper engines against an in-process mock chain and compares
+cycles/sec, cycle latency and RPC calls per cycle with a stored baseline
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_chain import (  # noqa: E402
+    KEEPER_PRIVATE_KEY,
+    MULTICALL_ADDRESS,
+    Faults,
+    MockChain,
+    MockRPCServer,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Allowed relative change before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.3
+
+# (metric, direction): +1 if higher is worse, -1 if lower is worse
+COMPARED_METRICS = (
+    ("cycles_per_second", -1),
+    ("p50_ms", 1),
+    ("p99_ms", 1),
+    ("rpc_calls_per_cycle", 1),
+)
+
+# p99 of a few dozen cycles is noisy: it gets this multiple of the tolerance
+P99_TOLERANCE_FACTOR = 2.0
+
+HIGH_BASE_FEE_WEI = 80 * 10**9  # Above the default 50 gwei gas cap
+
+
+@dataclass
+class Scenario:
+    """
+    One benchmark scenario
+
+    Attributes:
+        name: Scenario name (key in the baseline)
+        description: One-line summary
+        engine: "sync" (KeeperBot) or "async" (AsyncKeeperBot)
+        vaults: Vaults on the mock chain
+        cycles: Measured keeper cycles
+        faults: RPC fault injection
+        gas_spike: (first, last) cycles run with a base fee above the gas cap
+        env: Extra keeper settings
+    """
+
+    name: str
+    description: str
+    engine: str = "sync"
+    vaults: int = 1
+    cycles: int = 60
+    faults: Faults = field(default_factory=lambda: Faults(latency_ms=2, jitter_ms=1))
+    gas_spike: Optional[Tuple[int, int]] = None
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+SCENARIOS = [
+    Scenario("single_vault", "One vault on the sync engine, 2-3ms RPC latency"),
+    Scenario(
+        "vaults_100",
+        "100 vaults on the async engine, 2-3ms RPC latency",
+        engine="async",
+        vaults=100,
+        cycles=15,
+    ),
+    Scenario(
+        "rpc_brownout",
+        "One vault, 20-30ms latency, 10% HTTP 503, 5% rate limits, 2% stalls",
+        cycles=40,
+        faults=Faults(
+            latency_ms=20,
+            jitter_ms=10,
+            error_rate=0.10,
+            rate_limit_rate=0.05,
+            stall_rate=0.02,
+            stall_seconds=1.0,
+        ),
+        env={"RPC_TIMEOUT_SECONDS": "0.5", "RPC_COOLDOWN_SECONDS": "0.2"},
+    ),
+    Scenario(
+        "gas_spike",
+        "One vault, base fee above the gas cap for cycles 20-39",
+        gas_spike=(20, 39),
+    ),
+]
+
+
+@dataclass
+class Result:
+    """Measurements of one scenario run"""
+
+    scenario: str
+    cycles: int
+    seconds: float
+    cycles_per_second: float
+    p50_ms: float
+    p99_ms: float
+    rpc_calls_per_cycle: float
+    harvests: int
+    failed_cycles: int
+    rpc_calls: Dict[str, int]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+@contextmanager
+def keeper_environment(chain: MockChain, url: str, scenario: Scenario):
+    """Point the keeper config at the mock chain, restoring the environment"""
+    env = {
+        "RPC_URL": url,
+        "RPC_FALLBACK_URLS": "",
+        "CHAIN_ID": str(chain.chain_id),
+        "KEEPER_PRIVATE_KEY": KEEPER_PRIVATE_KEY,
+        "HARVESTER_ADDRESS": chain.vaults[0].harvester,
+        "DEBT_MANAGER_ADDRESS": chain.vaults[0].debt_manager,
+        "STRATEGY_BTC_ADDRESS": chain.vaults[0].strategy,
+        "MULTICALL_ADDRESS": MULTICALL_ADDRESS,
+        "DRY_RUN": "false",
+        "MIN_YIELD_THRESHOLD_USD": "10.0",
+        "MAX_GAS_PRICE_GWEI": "50.0",
+        # Short mock block times would push the optimal harvest point far out
+        "YIELD_OPPORTUNITY_APR": "0",
+        "ENABLE_PROMETHEUS": "false",
+        "ENABLE_SLACK_ALERTS": "false",
+        "ALERT_WEBHOOK_URL": "",
+        "ALERT_FILE": "",
+        "HEALTH_PORT": "0",
+        "STATE_DB_PATH": "",
+        "LOG_FILE": "",
+        "LOG_LEVEL": "CRITICAL",
+        "TRIGGER_MODE": "interval",
+        "VAULTS_FILE": "",
+        **scenario.env,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if scenario.engine == "async" and len(chain.vaults) > 1:
+            vaults_file = Path(tmp) / "vaults.json"
+            vaults_file.write_text(
+                json.dumps({"vaults": [v.as_definition() for v in chain.vaults]})
+            )
+            env["VAULTS_FILE"] = str(vaults_file)
+
+        saved = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        try:
+            from config import reload_config
+
+            reload_config()
+            yield
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def _before_cycle(chain: MockChain, scenario: Scenario, cycle: int):
+    chain.tick()
+    if scenario.gas_spike:
+        first, last = scenario.gas_spike
+        spiking = first <= cycle <= last
+        chain.set_base_fee(HIGH_BASE_FEE_WEI if spiking else 10_000_000)
+
+
+def _run_sync(chain: MockChain, scenario: Scenario) -> Tuple[List[float], int]:
+    """Run sync keeper cycles; returns cycle durations and failed cycles"""
+    from keeper import KeeperBot
+
+    bot = KeeperBot()
+    durations, failed = [], 0
+    try:
+        for cycle in range(scenario.cycles):
+            _before_cycle(chain, scenario, cycle)
+            start = time.perf_counter()
+            bot.check_and_harvest()
+            durations.append(time.perf_counter() - start)
+            failed += bot.last_cycle_error is not None
+    finally:
+        # Not bot._shutdown(): it exits the process
+        bot.health_server.stop()
+        bot.contracts.close()
+        bot.alerts.close()
+        bot.http.close()
+    return durations, failed
+
+
+async def _run_async(chain: MockChain, scenario: Scenario) -> Tuple[List[float], int]:
+    """Run async keeper cycles; returns cycle durations and failed cycles"""
+    from async_keeper import AsyncKeeperBot
+
+    bot = AsyncKeeperBot()
+    bot._stop_event = asyncio.Event()
+    await bot.start()
+    durations, failed = [], 0
+    try:
+        for cycle in range(scenario.cycles):
+            _before_cycle(chain, scenario, cycle)
+            bot.cycle_count += 1
+            start = time.perf_counter()
+            await bot.run_cycle()
+            durations.append(time.perf_counter() - start)
+            failed += bot.last_cycle_error is not None
+    finally:
+        await bot._shutdown()
+    return durations, failed
+
+
+def run_scenario(scenario: Scenario, seed: int = 0) -> Result:
+    """
+    Run one scenario against a fresh mock chain
+
+    Args:
+        scenario: Scenario to run
+        seed: Seed of the injected faults
+
+    Returns:
+        Result of the measured cycles
+    """
+    chain = MockChain(vaults=scenario.vaults)
+    with MockRPCServer(chain, faults=scenario.faults, seed=seed) as server:
+        with keeper_environment(chain, server.url, scenario):
+            # Startup reads (chain ID, ABIs, templates) are not measured
+            calls_before = server.total_calls
+            start = time.perf_counter()
+            if scenario.engine == "async":
+                durations, failed = asyncio.run(_run_async(chain, scenario))
+            else:
+                durations, failed = _run_sync(chain, scenario)
+            seconds = time.perf_counter() - start
+            calls = server.total_calls - calls_before
+
+    return Result(
+        scenario=scenario.name,
+        cycles=len(durations),
+        seconds=round(seconds, 3),
+        cycles_per_second=round(len(durations) / sum(durations), 2),
+        p50_ms=round(percentile(durations, 50) * 1000, 2),
+        p99_ms=round(percentile(durations, 99) * 1000, 2),
+        rpc_calls_per_cycle=round(calls / len(durations), 2),
+        harvests=chain.harvests,
+        failed_cycles=failed,
+        rpc_calls=dict(server.calls.most_common()),
+    )
+
+
+def compare(
+    result: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """
+    Compare a result against its baseline
+
+    Args:
+        result: Result of a scenario (as a dict)
+        baseline: Baseline entry of the same scenario
+        tolerance: Allowed relative change in the worse direction
+
+    Returns:
+        Descriptions of the regressed metrics (empty if none)
+    """
+    regressions = []
+    for metric, direction in COMPARED_METRICS:
+        if metric not in baseline:
+            continue
+        allowed = tolerance * (P99_TOLERANCE_FACTOR if metric == "p99_ms" else 1)
+        old, new = baseline[metric], result[metric]
+        change = (new - old) / old if old else 0.0
+        if change * direction > allowed:
+            regressions.append(
+                f"{metric} {old} -> {new} ({change:+.0%}, allowed {allowed:.0%})"
+            )
+    return regressions
+
+
+def _print_result(result: Result, regressions: Optional[List[str]]):
+    status = "" if regressions is None else ("REGRESSED" if regressions else "ok")
+    print(
+        f"{result.scenario:<14} {result.cycles_per_second:>9.2f} "
+        f"{result.p50_ms:>9.2f} {result.p99_ms:>9.2f} "
+        f"{result.rpc_calls_per_cycle:>10.2f} {result.harvests:>8} "
+        f"{result.failed_cycles:>7}  {status}"
+    )
+    for regression in regressions or []:
+        print(f"{'':<14} {regression}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[s.name for s in SCENARIOS],
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative regression (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Fault injection seed")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()).get("scenarios", {})
+
+    print(
+        f"{'scenario':<14} {'cycles/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'rpc/cycle':>10} {'harvests':>8} {'failed':>7}"
+    )
+    results, regressed = [], False
+    for scenario in scenarios:
+        result = run_scenario(scenario, seed=args.seed)
+        regressions = None
+        if scenario.name in baseline:
+            regressions = compare(
+                asdict(result), baseline[scenario.name], args.tolerance
+            )
+            regressed |= bool(regressions)
+        _print_result(result, regressions)
+        results.append(result)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps([asdict(r) for r in results], indent=2) + "\n"
+        )
+
+    if args.update_baseline:
+        stored = {}
+        if args.baseline.exists():
+            stored = json.loads(args.baseline.read_text()).get("scenarios", {})
+        for result in results:
+            entry = asdict(result)
+            entry.pop("scenario")
+            entry.pop("rpc_calls")
+            stored[result.scenario] = entry
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "scenarios": stored,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baseline written to {args.baseline}")
+
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
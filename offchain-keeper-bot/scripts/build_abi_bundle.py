@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Stratum Fi Keeper Bot - ABI Bundle Generator
+Writes src/abi_bundle.py with only the ABI entries the keeper uses, taken
+from the frontend's Hardhat artifacts
+
+Usage:
+    python scripts/build_abi_bundle.py [--abi-dir ../stratum-frontend/abi]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ABI_DIR = ROOT.parent / "stratum-frontend" / "abi"
+BUNDLE_PATH = ROOT / "src" / "abi_bundle.py"
+
+# Functions and events the keeper calls, encodes or decodes, per contract
+KEEPER_ABI_ENTRIES = {
+    "Harvester": ["harvest", "getClaimableYield", "keeper", "Harvested"],
+    "DebtManager": ["totalDebt", "pythOracle", "btcPriceFeedId", "YieldProcessed"],
+    "StrategyBTC": [
+        "totalBTCDeposited",
+        "btc",
+        "musd",
+        "musdBtcPool",
+        "YieldClaimed",
+    ],
+}
+
+HEADER = '''"""
+ABI entries used by the keeper, bundled so startup needs no ABI files
+Generated by scripts/build_abi_bundle.py from {source} - do not edit
+"""
+
+'''
+
+
+def _literal(value) -> str:
+    """Python literal of a JSON value on one line, double-quoted strings"""
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, dict):
+        items = ", ".join(f"{_literal(k)}: {_literal(v)}" for k, v in value.items())
+        return "{" + items + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_literal(v) for v in value) + "]"
+    return repr(value)
+
+
+def format_literal(value, indent: int = 0, prefix: str = "", suffix: str = "") -> str:
+    """Black-style layout: one line if it fits in 88 columns, else exploded"""
+    pad = " " * indent
+    line = f"{pad}{prefix}{_literal(value)}{suffix}"
+    if len(line) <= 88 or not isinstance(value, (dict, list)) or not value:
+        return line
+    if isinstance(value, dict):
+        opening, closing = "{", "}"
+        items = [
+            format_literal(v, indent + 4, f"{_literal(k)}: ", ",")
+            for k, v in value.items()
+        ]
+    else:
+        opening, closing = "[", "]"
+        items = [format_literal(v, indent + 4, "", ",") for v in value]
+    return "\n".join([f"{pad}{prefix}{opening}", *items, f"{pad}{closing}{suffix}"])
+
+
+def select_entries(abi: list, names: list) -> list:
+    """ABI entries with the given names, in the artifact's order"""
+    entries = [e for e in abi if e.get("name") in names]
+    missing = set(names) - {e["name"] for e in entries}
+    if missing:
+        raise ValueError(f"Not in ABI: {', '.join(sorted(missing))}")
+    return entries
+
+
+def build_bundle(abi_dir: Path) -> str:
+    """Source of the abi_bundle module"""
+    abis = {}
+    for contract, names in KEEPER_ABI_ENTRIES.items():
+        artifact = json.loads((abi_dir / f"{contract}.json").read_text())
+        abi = artifact["abi"] if isinstance(artifact, dict) else artifact
+        abis[contract] = select_entries(abi, names)
+
+    try:
+        source = abi_dir.resolve().relative_to(ROOT.parent)
+    except ValueError:
+        source = abi_dir
+    return HEADER.format(source=source) + format_literal(abis, prefix="ABIS = ") + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--abi-dir", type=Path, default=DEFAULT_ABI_DIR)
+    parser.add_argument("--output", type=Path, default=BUNDLE_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        bundle = build_bundle(args.abi_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Failed to build ABI bundle: {e}")
+        sys.exit(1)
+    args.output.write_text(bundle)
+    print(f"✅ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,11 +37,16 @@ setup(
         "prometheus-client>=0.19.0",
         "schedule>=1.2.1",
         "colorlog>=6.8.2",
-        "tenacity>=8.2.3",
     ],
+    extras_require={
+        # Offline harvest policy backtesting (backtest.py)
+        "backtest": ["numpy>=1.24"],
+    },
     entry_points={
         "console_scripts": [
             "stratum-keeper=keeper:main",
+            "stratum-keeper-backfill=backfill:main",
+            "stratum-keeper-backtest=backtest:main",
         ],
     },
 )
@@ -0,0 +1,157 @@
+"""
+ABI entries used by the keeper, bundled so startup needs no ABI files
+Generated by scripts/build_abi_bundle.py from stratum-frontend/abi - do not edit
+"""
+
+ABIS = {
+    "Harvester": [
+        {
+            "anonymous": False,
+            "inputs": [
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "musdAmount",
+                    "type": "uint256",
+                },
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "btcAmount",
+                    "type": "uint256",
+                },
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "totalValue",
+                    "type": "uint256",
+                },
+            ],
+            "name": "Harvested",
+            "type": "event",
+        },
+        {
+            "inputs": [],
+            "name": "getClaimableYield",
+            "outputs": [
+                {"internalType": "uint256", "name": "claimable0", "type": "uint256"},
+                {"internalType": "uint256", "name": "claimable1", "type": "uint256"},
+            ],
+            "stateMutability": "view",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "harvest",
+            "outputs": [],
+            "stateMutability": "nonpayable",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "keeper",
+            "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+            "stateMutability": "view",
+            "type": "function",
+        },
+    ],
+    "DebtManager": [
+        {
+            "anonymous": False,
+            "inputs": [
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "amount",
+                    "type": "uint256",
+                },
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "totalDebtReduction",
+                    "type": "uint256",
+                },
+            ],
+            "name": "YieldProcessed",
+            "type": "event",
+        },
+        {
+            "inputs": [],
+            "name": "btcPriceFeedId",
+            "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
+            "stateMutability": "view",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "pythOracle",
+            "outputs": [
+                {"internalType": "contract IPyth", "name": "", "type": "address"},
+            ],
+            "stateMutability": "view",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "totalDebt",
+            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+            "stateMutability": "view",
+            "type": "function",
+        },
+    ],
+    "StrategyBTC": [
+        {
+            "anonymous": False,
+            "inputs": [
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "token0Amount",
+                    "type": "uint256",
+                },
+                {
+                    "indexed": False,
+                    "internalType": "uint256",
+                    "name": "token1Amount",
+                    "type": "uint256",
+                },
+            ],
+            "name": "YieldClaimed",
+            "type": "event",
+        },
+        {
+            "inputs": [],
+            "name": "btc",
+            "outputs": [
+                {"internalType": "contract IERC20", "name": "", "type": "address"},
+            ],
+            "stateMutability": "view",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "musd",
+            "outputs": [
+                {"internalType": "contract IERC20", "name": "", "type": "address"},
+            ],
+            "stateMutability": "view",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "musdBtcPool",
+            "outputs": [
+                {"internalType": "contract ITigrisPool", "name": "", "type": "address"},
+            ],
+            "stateMutability": "view",
+            "type": "function",
+        },
+        {
+            "inputs": [],
+            "name": "totalBTCDeposited",
+            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+            "stateMutability": "view",
+            "type": "function",
+        },
+    ],
+}
@@ -0,0 +1,313 @@
+"""
+Background alert dispatcher for Stratum Fi Keeper Bot
+Delivers alerts off the harvest path to Slack, webhook and file sinks with
+deduplication, rate limiting and retries
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from alerts import build_error_message, build_success_message
+from http_transport import HttpTransport
+from metrics import metrics
+
+logger = logging.getLogger("keeper.alert_dispatcher")
+
+# Queue sentinel telling the worker to flush and exit
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Alert:
+    """A keeper event worth telling a human about"""
+
+    kind: str  # harvest_success or error
+    message: str
+    vault: Optional[str] = None
+    yield_usd: Optional[float] = None
+    tx_hash: Optional[str] = None
+    repeats: int = 0  # Duplicates folded into this alert
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> str:
+        """Deduplication key: each harvest is unique, errors repeat"""
+        if self.kind == "harvest_success":
+            return f"{self.kind}:{self.tx_hash}"
+        return f"{self.kind}:{self.vault or ''}:{self.message[:200]}"
+
+
+def success_alert(yield_usd: float, tx_hash: str, vault: Optional[str] = None) -> Alert:
+    """Alert for a confirmed harvest"""
+    return Alert(
+        kind="harvest_success",
+        message=f"Harvested ${yield_usd:.2f} USD",
+        vault=vault,
+        yield_usd=yield_usd,
+        tx_hash=tx_hash,
+    )
+
+
+def error_alert(error_msg: str, vault: Optional[str] = None) -> Alert:
+    """Alert for a keeper error"""
+    return Alert(kind="error", message=error_msg, vault=vault)
+
+
+class AlertSink:
+    """Destination for alerts; send() raises on failure so it is retried"""
+
+    name = "sink"
+
+    def send(self, alert: Alert):
+        raise NotImplementedError
+
+
+class SlackSink(AlertSink):
+    """Slack incoming webhook"""
+
+    name = "slack"
+
+    def __init__(self, webhook_url: str, transport: HttpTransport, explorer_url: str):
+        self.webhook_url = webhook_url
+        self.transport = transport
+        self.explorer_url = explorer_url
+
+    def send(self, alert: Alert):
+        if alert.kind == "harvest_success":
+            payload = build_success_message(
+                alert.yield_usd, alert.tx_hash, self.explorer_url, vault=alert.vault
+            )
+        else:
+            payload = build_error_message(
+                alert.message, vault=alert.vault, repeats=alert.repeats
+            )
+        self.transport.post_json(self.webhook_url, payload, timeout=5)
+
+
+class WebhookSink(AlertSink):
+    """Generic webhook receiving the alert fields as JSON"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, transport: HttpTransport):
+        self.url = url
+        self.transport = transport
+
+    def send(self, alert: Alert):
+        self.transport.post_json(self.url, asdict(alert), timeout=5)
+
+
+class FileSink(AlertSink):
+    """Append-only JSON lines file"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def send(self, alert: Alert):
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(alert)) + "\n")
+
+
+def build_alert_sinks(
+    transport: HttpTransport,
+    explorer_url: str,
+    slack_webhook_url: Optional[str] = None,
+    webhook_url: Optional[str] = None,
+    file_path: Optional[str] = None,
+) -> List[AlertSink]:
+    """Sinks for every configured destination"""
+    sinks: List[AlertSink] = []
+    if slack_webhook_url:
+        sinks.append(SlackSink(slack_webhook_url, transport, explorer_url))
+    if webhook_url:
+        sinks.append(WebhookSink(webhook_url, transport))
+    if file_path:
+        sinks.append(FileSink(file_path))
+    return sinks
+
+
+@dataclass
+class _Window:
+    """Deduplication window of one alert key"""
+
+    until: float
+    alert: Alert
+    suppressed: int = 0
+
+
+class AlertDispatcher:
+    """
+    Queues alerts and delivers them from one background thread
+
+    submit() never blocks: a full queue drops the alert. The first alert
+    for a key is delivered at once; repeats within dedup_window_seconds
+    are counted and delivered as one summary when the window closes, so
+    a flapping error produces at most one message per window. Deliveries
+    are paced by a token bucket (rate_limit_per_minute) and retried with
+    jittered exponential backoff per sink.
+    """
+
+    def __init__(
+        self,
+        sinks: List[AlertSink],
+        max_queue: int = 1000,
+        dedup_window_seconds: float = 300.0,
+        rate_limit_per_minute: int = 20,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.5,
+    ):
+        """
+        Initialize dispatcher (call start() to begin delivering)
+
+        Args:
+            sinks: Alert destinations (none makes submit() a no-op)
+            max_queue: Alerts waiting for delivery before new ones are dropped
+            dedup_window_seconds: Window in which repeated alerts are folded
+            rate_limit_per_minute: Maximum deliveries per minute (burst size)
+            max_retries: Delivery attempts per sink
+            retry_backoff_seconds: First retry delay (doubles per attempt)
+        """
+        self.sinks = sinks
+        self.dedup_window_seconds = dedup_window_seconds
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._windows: Dict[str, _Window] = {}
+        self._tokens = float(rate_limit_per_minute)
+        self._refilled_at = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def start(self):
+        """Start the delivery thread"""
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="alert-dispatcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Alert dispatcher started ({', '.join(s.name for s in self.sinks)})"
+        )
+
+    def submit(self, alert: Alert) -> bool:
+        """
+        Queue an alert without blocking
+
+        Returns:
+            False if alerting is disabled or the queue is full
+        """
+        if self._thread is None:
+            return False
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            metrics.record_alert_discarded("dropped")
+            logger.warning(f"Alert queue full, dropped alert: {alert.message}")
+            return False
+
+    def close(self, timeout: float = 10.0):
+        """Deliver queued alerts and pending summaries, then stop"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Alert queue full at shutdown, queued alerts lost")
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            next_close = min((w.until for w in self._windows.values()), default=None)
+            wait = 1.0 if next_close is None else max(0.0, min(1.0, next_close - now))
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            try:
+                if item is _STOP:
+                    self._close_windows(force=True)
+                    return
+                if item is not None:
+                    self._accept(item)
+                self._close_windows()
+            except Exception as e:
+                # Alerting must never take the keeper down
+                logger.error(f"Alert dispatcher error: {e}")
+
+    def _accept(self, alert: Alert):
+        now = time.monotonic()
+        window = self._windows.get(alert.key)
+        if window is not None and now < window.until:
+            window.suppressed += 1
+            metrics.record_alert_discarded("suppressed")
+            return
+        self._windows[alert.key] = _Window(now + self.dedup_window_seconds, alert)
+        self._deliver(alert)
+
+    def _close_windows(self, force: bool = False):
+        """Deliver one summary per closed window that folded repeats"""
+        now = time.monotonic()
+        for key, window in list(self._windows.items()):
+            if not force and now < window.until:
+                continue
+            if window.suppressed:
+                summary = replace(
+                    window.alert, repeats=window.suppressed, timestamp=time.time()
+                )
+                # Keep folding a still-flapping alert into the next window
+                self._windows[key] = _Window(now + self.dedup_window_seconds, summary)
+                self._deliver(summary)
+            else:
+                del self._windows[key]
+
+    def _take_token(self):
+        """Block the worker until the rate limit allows another delivery"""
+        rate = self.rate_limit_per_minute / 60.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.rate_limit_per_minute),
+                self._tokens + (now - self._refilled_at) * rate,
+            )
+            self._refilled_at = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            time.sleep((1.0 - self._tokens) / rate)
+
+    def _deliver(self, alert: Alert):
+        self._take_token()
+        for sink in self.sinks:
+            for attempt in range(self.max_retries):
+                try:
+                    sink.send(alert)
+                    metrics.record_alert_delivery(sink.name, "sent")
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries - 1:
+                        metrics.record_alert_delivery(sink.name, "failed")
+                        logger.warning(f"Failed to send {sink.name} alert: {e}")
+                        break
+                    delay = self.retry_backoff_seconds * 2**attempt
+                    time.sleep(delay + random.uniform(0, delay))
@@ -0,0 +1,88 @@
+"""
+Slack alert payloads for Stratum Fi Keeper Bot
+Shared by the sync and async keeper engines
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def _vault_line(vault: Optional[str]) -> str:
+    """Slack bullet naming the vault, if any"""
+    return f"• Vault: `{vault}`\n" if vault else ""
+
+
+def _repeats_line(repeats: int) -> str:
+    """Slack bullet counting folded duplicate alerts, if any"""
+    if not repeats:
+        return ""
+    return f"• Repeated: {repeats} more time(s) since the last alert\n"
+
+
+def build_success_message(
+    yield_usd: float, tx_hash: str, explorer_url: str, vault: Optional[str] = None
+) -> Dict:
+    """
+    Build Slack message for a successful harvest
+
+    Args:
+        yield_usd: Yield collected in USD
+        tx_hash: Harvest transaction hash
+        explorer_url: Block explorer base URL
+        vault: Vault name (multi-vault mode)
+
+    Returns:
+        Slack webhook payload
+    """
+    return {
+        "text": "🌾 Harvest Successful!",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": (
+                        f"*Stratum Fi Keeper Bot - Harvest Complete*\n\n"
+                        f"{_vault_line(vault)}"
+                        f"• Yield Collected: `${yield_usd:.2f} USD`\n"
+                        f"• Transaction: <{explorer_url}/tx/{tx_hash}|{tx_hash[:10]}...>\n"
+                        f"• Timestamp: {datetime.now().isoformat()}"
+                    ),
+                },
+            }
+        ],
+    }
+
+
+def build_error_message(
+    error_msg: str, vault: Optional[str] = None, repeats: int = 0
+) -> Dict:
+    """
+    Build Slack message for a keeper error
+
+    Args:
+        error_msg: Error description
+        vault: Vault name (multi-vault mode)
+        repeats: Further occurrences folded into this message
+
+    Returns:
+        Slack webhook payload
+    """
+    return {
+        "text": f"⚠️ Keeper Bot Error: {error_msg}",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": (
+                        f"*Stratum Fi Keeper Bot - Error*\n\n"
+                        f"{_vault_line(vault)}"
+                        f"• Error: `{error_msg}`\n"
+                        f"{_repeats_line(repeats)}"
+                        f"• Timestamp: {datetime.now().isoformat()}"
+                    ),
+                },
+            }
+        ],
+    }
@@ -0,0 +1,925 @@
+"""
+Async smart contract interaction layer for Stratum Fi Keeper Bot
+AsyncWeb3-backed counterpart of ContractManager for the asyncio engine
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from web3 import AsyncWeb3
+from web3.exceptions import ContractLogicError, TransactionNotFound
+from web3.middleware import async_simple_cache_middleware
+from eth_account import Account
+
+from contracts import (
+    DEFAULT_MULTICALL_ADDRESS,
+    GAS_ESTIMATE_TTL_SECONDS,
+    HARVEST_GAS_FALLBACK,
+    MULTICALL3_ABI,
+    TIGRIS_POOL_ABI,
+    CycleSnapshot,
+    build_batch_calls,
+    build_snapshot_calls,
+    decode_snapshot,
+    load_abi,
+    split_batch_results,
+)
+from nonce_manager import NonceManager
+from gas_oracle import GasOracle, REWARD_PERCENTILES, is_unsupported_error
+from pricing import PriceMarket, PriceOracle
+from http_transport import HttpTransport
+from metrics import DEFAULT_VAULT, phase_timer
+from rpc_pool import AsyncRPCPoolProvider, EndpointPool
+from simulation import (
+    TRACE_CONFIG,
+    HarvestSimulation,
+    simulation_from_quote,
+    simulation_from_trace,
+)
+from tx_lifecycle import (
+    CANCEL,
+    CONFIRMED,
+    LOST,
+    REBROADCAST,
+    REORGED,
+    REPLACE,
+    HarvestTxMixin,
+    TrackedTx,
+    TxAction,
+    TxLifecycle,
+)
+from tx_template import TxTemplate
+
+logger = logging.getLogger("keeper.async_contracts")
+
+
+def create_async_web3(
+    rpc_urls: List[str],
+    hedge: bool = False,
+    hedge_min_delay: float = 0.25,
+    timeout: float = 10.0,
+    transport: Optional[HttpTransport] = None,
+    pool: Optional[EndpointPool] = None,
+) -> AsyncWeb3:
+    """
+    Create an AsyncWeb3 instance for the keeper
+
+    A single instance can be shared by many AsyncContractManagers so all
+    vaults reuse one HTTP connection pool. Requests go through an
+    AsyncRPCPoolProvider (see create_web3).
+    """
+    transport = transport or HttpTransport()
+    provider = AsyncRPCPoolProvider(
+        rpc_urls,
+        hedge=hedge,
+        hedge_min_delay=hedge_min_delay,
+        timeout=timeout,
+        pool=pool,
+        transport=transport,
+    )
+    w3 = AsyncWeb3(provider)
+    w3.middleware_onion.add(async_simple_cache_middleware)
+    return w3
+
+
+class AsyncContractManager(HarvestTxMixin):
+    """Manages AsyncWeb3 connection and smart contract interactions"""
+
+    def __init__(
+        self,
+        rpc_url: str,
+        chain_id: int,
+        private_key: str,
+        harvester_address: str,
+        debt_manager_address: str,
+        strategy_btc_address: str,
+        multicall_address: Optional[str] = DEFAULT_MULTICALL_ADDRESS,
+        w3: Optional[AsyncWeb3] = None,
+        tx_lock: Optional[asyncio.Lock] = None,
+        nonce_manager: Optional[NonceManager] = None,
+        gas_oracle: Optional[GasOracle] = None,
+        priority_tier: str = "standard",
+        vault: str = DEFAULT_VAULT,
+        abi_search_path: Sequence[str] = (),
+        lifecycle: Optional[TxLifecycle] = None,
+    ):
+        """
+        Initialize async contract manager (no network I/O until connect())
+
+        Args:
+            rpc_url: RPC endpoint URL
+            chain_id: Network chain ID
+            private_key: Keeper wallet private key
+            harvester_address: Harvester contract address
+            debt_manager_address: DebtManager contract address
+            strategy_btc_address: StrategyBTC contract address
+            multicall_address: Multicall3 address for batched reads
+                (None disables batching)
+            w3: Shared AsyncWeb3 instance (created from rpc_url if omitted)
+            tx_lock: Lock shared by all managers using the same keeper
+                wallet, held while resyncing the nonce from chain
+            nonce_manager: NonceManager shared by all managers using the
+                same keeper wallet
+            gas_oracle: Fee history oracle shared by all managers on the
+                chain (None uses legacy eth_gasPrice)
+            priority_tier: Priority fee tier for type-2 transactions
+            vault: Vault label for phase timing metrics
+            abi_search_path: Directories searched for ABI files before the
+                bundled ABIs
+            lifecycle: Tracker of stuck harvests shared by all managers using
+                the same keeper wallet
+        """
+        self.rpc_url = rpc_url
+        self.chain_id = chain_id
+        self.private_key = private_key
+        self.gas_oracle = gas_oracle
+        self.priority_tier = priority_tier
+        self.vault = vault
+
+        # Attached by the keeper once the vault's price market is resolved
+        self.price_oracle: Optional[PriceOracle] = None
+        self.price_market: Optional[PriceMarket] = None
+
+        # Cleared when the node turns out not to implement debug_traceCall
+        self.trace_simulation = True
+
+        self.w3 = w3 if w3 is not None else create_async_web3([rpc_url])
+        self.tx_lock = tx_lock if tx_lock is not None else asyncio.Lock()
+
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.nonce_manager = (
+            nonce_manager if nonce_manager is not None else NonceManager(self.address)
+        )
+        self.lifecycle = lifecycle if lifecycle is not None else TxLifecycle()
+        self.pending_nonces: Dict[str, int] = {}
+        # Wall-clock broadcast time per pending tx, for inclusion latency
+        self.submitted_at: Dict[str, float] = {}
+        # Receipt of the last harvest waited for (gas paid, block)
+        self.last_receipt: Optional[Dict] = None
+        # How the last wait ended: CONFIRMED, CANCEL, LOST, or WAIT if the
+        # harvest was still pending at the timeout
+        self.last_tx_outcome: Optional[str] = None
+
+        search_path = tuple(abi_search_path)
+        self.harvester = self.w3.eth.contract(
+            address=AsyncWeb3.to_checksum_address(harvester_address),
+            abi=load_abi("Harvester", search_path),
+        )
+        self.debt_manager = self.w3.eth.contract(
+            address=AsyncWeb3.to_checksum_address(debt_manager_address),
+            abi=load_abi("DebtManager", search_path),
+        )
+        self.strategy_btc = self.w3.eth.contract(
+            address=AsyncWeb3.to_checksum_address(strategy_btc_address),
+            abi=load_abi("StrategyBTC", search_path),
+        )
+
+        self.multicall = None
+        if multicall_address:
+            self.multicall = self.w3.eth.contract(
+                address=AsyncWeb3.to_checksum_address(multicall_address),
+                abi=MULTICALL3_ABI,
+            )
+
+        # Prebuilt harvest transaction: only nonce and fees are filled at send
+        self.harvest_template = TxTemplate(
+            to=self.harvester.address,
+            data=self.harvester.encodeABI(fn_name="harvest"),
+            chain_id=self.chain_id,
+            fallback_gas=HARVEST_GAS_FALLBACK,
+            validity_seconds=GAS_ESTIMATE_TTL_SECONDS,
+        )
+
+    async def connect(self):
+        """Verify RPC connectivity and chain ID, and log chain info"""
+        logger.info(f"Keeper wallet: {self.address}")
+        # Resolved once; every harvest is signed for this chain ID. Doubles as
+        # the connectivity check, saving a round trip at startup
+        try:
+            node_chain_id = await self.w3.eth.chain_id
+        except Exception as e:
+            raise ConnectionError(f"Failed to connect to RPC: {self.rpc_url}") from e
+        if node_chain_id != self.chain_id:
+            raise ConnectionError(
+                f"RPC chain ID {node_chain_id} does not match "
+                f"configured {self.chain_id}"
+            )
+        logger.info(f"Connected to chain ID: {node_chain_id}")
+        logger.info("Contract instances initialized")
+
+    async def is_connected(self) -> bool:
+        """Check if the RPC endpoint is reachable"""
+        try:
+            await self.w3.eth.block_number
+            return True
+        except Exception:
+            return False
+
+    async def get_keeper_balance(self) -> Optional[float]:
+        """
+        Get keeper wallet BTC balance
+
+        Returns:
+            Balance in BTC (as float), or None if the read failed
+        """
+        try:
+            balance_wei = await self.w3.eth.get_balance(self.address)
+            return float(self.w3.from_wei(balance_wei, "ether"))
+        except Exception as e:
+            logger.error(f"Failed to get keeper balance: {e}")
+            return None
+
+    async def get_gas_price(self) -> float:
+        """
+        Get current gas price in gwei
+
+        Returns:
+            Gas price in gwei
+        """
+        try:
+            gas_price_wei = await self.w3.eth.gas_price
+            return float(self.w3.from_wei(gas_price_wei, "gwei"))
+        except Exception as e:
+            logger.error(f"Failed to get gas price: {e}")
+            return 0.0
+
+    async def sample_gas_price_wei(self) -> int:
+        """
+        Gas price used for this cycle's harvest decision
+
+        Refreshes the fee history oracle and returns its smoothed price,
+        falling back to an eth_gasPrice spot sample without one.
+
+        Returns:
+            Gas price in wei
+        """
+        if self.gas_oracle is not None and self.gas_oracle.enabled:
+            try:
+                self.gas_oracle.ingest(
+                    await self.w3.eth.fee_history(
+                        self.gas_oracle.history_blocks, "latest", REWARD_PERCENTILES
+                    )
+                )
+                smoothed = self.gas_oracle.smoothed_gas_price_wei()
+                if smoothed is not None:
+                    return smoothed
+            except Exception as e:
+                if is_unsupported_error(e):
+                    logger.warning(
+                        f"eth_feeHistory not supported, using legacy gas pricing: {e}"
+                    )
+                    self.gas_oracle.enabled = False
+                else:
+                    logger.warning(f"Failed to refresh fee history: {e}")
+
+        return await self.w3.eth.gas_price
+
+    async def refresh_harvest_template(self):
+        """Re-estimate harvest() gas for the prebuilt harvest transaction"""
+        template = self.harvest_template
+        try:
+            estimate = await self.w3.eth.estimate_gas(
+                {"from": self.address, "to": template.to, "data": template.data}
+            )
+        except Exception as e:
+            # harvest() reverts when there is nothing to claim; keep the
+            # previous estimate (or the fallback) for another window rather
+            # than retrying each cycle
+            logger.debug("Harvest gas estimation failed: %s", e)
+            estimate = None
+        template.update_gas(estimate)
+
+    async def estimate_harvest_gas(self) -> int:
+        """
+        Expected gas used by harvest(), valid for GAS_ESTIMATE_TTL_SECONDS
+
+        Returns:
+            Gas estimate (HARVEST_GAS_FALLBACK if estimation fails)
+        """
+        if not self.harvest_template.is_valid():
+            await self.refresh_harvest_template()
+        return self.harvest_template.expected_gas
+
+    async def _fee_params(self) -> Dict[str, int]:
+        """Type-2 fee fields from the gas oracle, or a legacy gasPrice"""
+        if self.gas_oracle is not None and self.gas_oracle.has_data:
+            return self.gas_oracle.build_fee_params(self.priority_tier)
+        return {"gasPrice": await self.w3.eth.gas_price}
+
+    async def get_claimable_yield(self) -> Tuple[float, float]:
+        """
+        Query claimable yield from Harvester contract
+
+        Returns:
+            Tuple of (claimable0, claimable1) in ETH units
+        """
+        try:
+            result = await self.harvester.functions.getClaimableYield().call()
+            claimable0 = float(self.w3.from_wei(result[0], "ether"))
+            claimable1 = float(self.w3.from_wei(result[1], "ether"))
+            return claimable0, claimable1
+        except ContractLogicError as e:
+            logger.warning(f"Contract logic error querying yield: {e}")
+            return 0.0, 0.0
+        except Exception as e:
+            logger.error(f"Failed to get claimable yield: {e}")
+            return 0.0, 0.0
+
+    def estimate_yield_usd(
+        self, claimable0: float, claimable1: float
+    ) -> Optional[float]:
+        """
+        Estimate total yield in USD
+
+        Values pool token0/token1 with the price oracle when one is
+        attached; otherwise assumes both tokens are USD-pegged.
+
+        Returns:
+            Total yield in USD, or None if a token has no fresh price
+        """
+        if self.price_oracle is None or self.price_market is None:
+            return claimable0 + claimable1
+        return self.price_oracle.value_usd(
+            {self.price_market.token0: claimable0, self.price_market.token1: claimable1}
+        )
+
+    async def get_price_market(self) -> PriceMarket:
+        """
+        Resolve the pool, tokens and Pyth feed used to price this vault's yield
+
+        Returns:
+            PriceMarket (cached after the first call)
+        """
+        if self.price_market is not None:
+            return self.price_market
+
+        strategy = self.strategy_btc.functions
+        pool_address, btc, musd = await asyncio.gather(
+            strategy.musdBtcPool().call(),
+            strategy.btc().call(),
+            strategy.musd().call(),
+        )
+        pool = self.w3.eth.contract(address=pool_address, abi=TIGRIS_POOL_ABI)
+        token0, token1, pyth, feed_id = await asyncio.gather(
+            pool.functions.token0().call(),
+            pool.functions.token1().call(),
+            self.debt_manager.functions.pythOracle().call(),
+            self.debt_manager.functions.btcPriceFeedId().call(),
+            return_exceptions=True,
+        )
+        for result in (token0, token1):
+            if isinstance(result, Exception):
+                raise result
+        if isinstance(pyth, Exception) or isinstance(feed_id, Exception):
+            logger.warning(f"Pyth BTC feed unavailable: {pyth}, {feed_id}")
+            pyth, feed_id = None, None
+
+        self.price_market = PriceMarket(
+            pool=pool_address,
+            token0=token0,
+            token1=token1,
+            btc=btc,
+            musd=musd,
+            pyth=pyth,
+            btc_feed_id=feed_id,
+        )
+        return self.price_market
+
+    async def execute_batch(
+        self, calls: List[Tuple[str, bool, bytes]]
+    ) -> Tuple[int, int, List[Tuple[bool, bytes]]]:
+        """
+        Execute aggregate3-style calls pinned to one block
+
+        Uses one Multicall3 eth_call when available, otherwise concurrent
+        eth_calls at the latest block.
+
+        Returns:
+            (block_number, block_timestamp, per-call (success, data))
+        """
+        if self.multicall is not None:
+            results = await self.multicall.functions.aggregate3(
+                build_batch_calls(self.multicall, calls)
+            ).call()
+            return split_batch_results(self.w3.codec, results)
+
+        block = await self.w3.eth.get_block("latest")
+        raw = await asyncio.gather(
+            *(
+                self.w3.eth.call({"to": target, "data": data}, block["number"])
+                for target, _, data in calls
+            ),
+            return_exceptions=True,
+        )
+        results = [
+            (False, b"") if isinstance(r, Exception) else (True, bytes(r)) for r in raw
+        ]
+        return block["number"], block["timestamp"], results
+
+    async def refresh_prices(
+        self, tokens: List[str], block_number: Optional[int] = None
+    ):
+        """
+        Fetch expired token prices in one batched request
+
+        Args:
+            tokens: Tokens about to be valued (across all vaults)
+            block_number: Current block, if known (skips same-block refetches)
+        """
+        oracle = self.price_oracle
+        if oracle is None:
+            return
+        stale = oracle.tokens_to_refresh(tokens, block_number)
+        if not stale:
+            return
+
+        plan, calls = oracle.build_calls(stale)
+        block_timestamp, results = time.time(), []
+        if calls:
+            try:
+                block_number, block_timestamp, results = await self.execute_batch(
+                    calls
+                )
+            except Exception as e:
+                logger.warning(f"Price refresh failed: {e}")
+                return
+        oracle.ingest(plan, results, block_number, block_timestamp)
+
+    async def get_cycle_snapshot(
+        self, gas_price_wei: Optional[int] = None
+    ) -> Optional[CycleSnapshot]:
+        """
+        Read all per-cycle chain state, pinned to a single block
+
+        The Multicall3 eth_call and the gas price request are issued
+        concurrently. Falls back to concurrent individual reads if the
+        multicall fails.
+
+        Args:
+            gas_price_wei: Gas price already sampled this cycle (shared
+                across vaults); fetched if omitted
+
+        Returns:
+            CycleSnapshot, or None if the RPC is unreachable
+        """
+        if self.multicall is not None:
+            try:
+                calls = build_snapshot_calls(
+                    self.multicall,
+                    self.harvester,
+                    self.debt_manager,
+                    self.strategy_btc,
+                    self.address,
+                )
+                if gas_price_wei is None:
+                    results, gas_price_wei = await asyncio.gather(
+                        self.multicall.functions.aggregate3(calls).call(),
+                        self.sample_gas_price_wei(),
+                    )
+                else:
+                    results = await self.multicall.functions.aggregate3(calls).call()
+                return decode_snapshot(self.w3.codec, results, gas_price_wei)
+            except Exception as e:
+                logger.warning(
+                    f"Multicall snapshot failed, using sequential reads: {e}"
+                )
+                await self._disable_multicall_if_missing()
+
+        return await self._read_snapshot_concurrent(gas_price_wei)
+
+    async def _disable_multicall_if_missing(self):
+        """Stop using Multicall3 if it is not deployed on this chain"""
+        try:
+            if not await self.w3.eth.get_code(self.multicall.address):
+                logger.warning(
+                    f"No Multicall3 contract at {self.multicall.address}, "
+                    "batched snapshots disabled"
+                )
+                self.multicall = None
+        except Exception:
+            # RPC failure - keep multicall enabled and retry next cycle
+            pass
+
+    async def _read_snapshot_concurrent(
+        self, gas_price_wei: Optional[int] = None
+    ) -> Optional[CycleSnapshot]:
+        """Read the cycle snapshot with concurrent calls pinned to one block"""
+        try:
+            block = await self.w3.eth.get_block("latest")
+        except Exception as e:
+            logger.error(f"Failed to fetch latest block: {e}")
+            return None
+
+        block_number = block["number"]
+        results = await asyncio.gather(
+            self.harvester.functions.getClaimableYield().call(
+                block_identifier=block_number
+            ),
+            self.debt_manager.functions.totalDebt().call(
+                block_identifier=block_number
+            ),
+            self.strategy_btc.functions.totalBTCDeposited().call(
+                block_identifier=block_number
+            ),
+            self.w3.eth.get_balance(self.address, block_number),
+            self._gas_price_or(gas_price_wei),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Snapshot read failed: {result}")
+
+        def value(index, default):
+            result = results[index]
+            return default if isinstance(result, Exception) else result
+
+        claimable0_wei, claimable1_wei = value(0, (0, 0))
+        return CycleSnapshot(
+            block_number=block_number,
+            block_timestamp=block["timestamp"],
+            gas_price_gwei=float(self.w3.from_wei(value(4, 0), "gwei")),
+            claimable0=float(self.w3.from_wei(claimable0_wei, "ether")),
+            claimable1=float(self.w3.from_wei(claimable1_wei, "ether")),
+            keeper_balance_btc=float(self.w3.from_wei(value(3, 0), "ether")),
+            total_debt=float(self.w3.from_wei(value(1, 0), "ether")),
+            total_btc_deposited=float(self.w3.from_wei(value(2, 0), "ether")),
+        )
+
+    async def _gas_price_or(self, gas_price_wei: Optional[int]) -> int:
+        """Return the supplied gas price, or fetch it"""
+        if gas_price_wei is not None:
+            return gas_price_wei
+        return await self.sample_gas_price_wei()
+
+    async def _reserve_nonce(self) -> int:
+        """Reserve the next local nonce, syncing from chain when required"""
+        # The lock only guards resync, so concurrent vaults never sync
+        # from a pending count that misses a just-reserved nonce
+        async with self.tx_lock:
+            if self.nonce_manager.needs_sync:
+                self.nonce_manager.sync(
+                    await self.w3.eth.get_transaction_count(self.address, "pending")
+                )
+            return self.nonce_manager.reserve()
+
+    async def submit_harvest(
+        self, dry_run: bool = False, fee_ceiling_wei: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Sign and broadcast a harvest transaction without waiting for it
+
+        Uses the prebuilt harvest template (gas is kept warm by
+        refresh_harvest_template), so only the nonce and fees are filled in
+        here. The nonce comes from the shared local NonceManager, so
+        harvests for many vaults can be broadcast back to back. A harvest
+        still pending from an earlier wait is returned instead of
+        broadcasting another one behind it.
+
+        Args:
+            dry_run: If True, build the transaction but do not send it
+            fee_ceiling_wei: Highest effective gas price at which the harvest
+                is still worth landing; past it a stuck harvest is cancelled
+
+        Returns:
+            Transaction hash if broadcast, None otherwise
+        """
+        pending = self.pending_harvest(fee_ceiling_wei)
+        if pending is not None:
+            return pending
+
+        nonce = None
+        try:
+            template = self.harvest_template
+            with phase_timer("gas_estimation", self.vault):
+                if not template.is_valid():
+                    await self.refresh_harvest_template()
+                fee_params = await self._fee_params()
+
+            if dry_run:
+                logger.info(
+                    f"[DRY RUN] Would send harvest transaction with gas: "
+                    f"{template.gas_limit}"
+                )
+                return None
+
+            nonce = await self._reserve_nonce()
+            with phase_timer("signing", self.vault):
+                signed_tx = self.account.sign_transaction(
+                    template.build(nonce, fee_params)
+                )
+            with phase_timer("broadcast", self.vault):
+                tx_hash = await self.w3.eth.send_raw_transaction(
+                    signed_tx.rawTransaction
+                )
+            tx_hash_hex = tx_hash.hex()
+            self._track_harvest(
+                tx_hash_hex,
+                nonce,
+                signed_tx.rawTransaction,
+                fee_params,
+                fee_ceiling_wei=fee_ceiling_wei,
+            )
+            return tx_hash_hex
+
+        except ContractLogicError as e:
+            logger.error(f"Contract logic error during harvest: {e}")
+            if nonce is not None:
+                self.nonce_manager.release(nonce, e)
+            return None
+        except Exception as e:
+            logger.error(f"Failed to submit harvest: {e}")
+            if nonce is not None:
+                self.nonce_manager.release(nonce, e)
+            return None
+
+    async def simulate_harvest(
+        self, claimable0: float, claimable1: float
+    ) -> Optional[HarvestSimulation]:
+        """
+        Simulate harvest() from the keeper wallet at the pending block
+
+        Traces the call with debug_traceCall to read the Harvested log and
+        gas used. Nodes without tracing get an eth_estimateGas revert check
+        (which also measures gas) and, concurrently, a pool quote for the
+        BTC -> MUSD swap. The measured gas raises the harvest template's gas
+        limit if the template's estimate was taken on a cheaper harvest()
+        branch.
+
+        Args:
+            claimable0: Claimable pool token0
+            claimable1: Claimable pool token1
+
+        Returns:
+            HarvestSimulation, or None if the simulation itself failed
+        """
+        template = self.harvest_template
+        tx = {"from": self.address, "to": template.to, "data": template.data}
+
+        if self.trace_simulation:
+            try:
+                frame = await self.w3.manager.coro_request(
+                    "debug_traceCall", [tx, "pending", TRACE_CONFIG]
+                )
+                simulation = simulation_from_trace(frame, template.to)
+                template.record_simulated_gas(simulation.gas_used)
+                return simulation
+            except Exception as e:
+                if is_unsupported_error(e):
+                    logger.info(
+                        "debug_traceCall not supported, simulating with "
+                        f"eth_estimateGas: {e}"
+                    )
+                    self.trace_simulation = False
+                else:
+                    logger.debug("Harvest trace failed, using eth_estimateGas: %s", e)
+
+        gas_used, quote = await asyncio.gather(
+            self.w3.eth.estimate_gas(tx, "pending"),
+            self._quote_harvest(claimable0, claimable1),
+            return_exceptions=True,
+        )
+        if isinstance(gas_used, ContractLogicError):
+            return HarvestSimulation(reverted=True, revert_reason=str(gas_used))
+        if isinstance(gas_used, Exception):
+            logger.warning(f"Harvest simulation failed: {gas_used}")
+            return None
+        template.record_simulated_gas(gas_used)
+        return replace(quote, gas_used=gas_used)
+
+    async def _quote_harvest(
+        self, claimable0: float, claimable1: float
+    ) -> HarvestSimulation:
+        """Predict the harvested MUSD from a pool quote for the BTC swap"""
+        market = self.price_market
+        if market is None:
+            return HarvestSimulation(reverted=False)
+
+        if market.token0 == market.btc:
+            claimable_btc, claimable_musd = claimable0, claimable1
+        else:
+            claimable_btc, claimable_musd = claimable1, claimable0
+
+        swap_out = 0.0
+        if claimable_btc > 0:
+            pool = self.w3.eth.contract(address=market.pool, abi=TIGRIS_POOL_ABI)
+            try:
+                amount_out = await pool.functions.getAmountOut(
+                    int(claimable_btc * 1e18), market.btc
+                ).call()
+                swap_out = amount_out / 1e18
+            except Exception as e:
+                logger.debug("Pool swap quote failed: %s", e)
+                return HarvestSimulation(reverted=False)
+
+        return simulation_from_quote(claimable_musd, claimable_btc, swap_out)
+
+    async def wait_for_harvest_receipt(
+        self, tx_hash: str, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Follow a submitted harvest block by block until its outcome is final
+
+        Each new block is checked for a receipt of any attempt for the
+        nonce. A harvest left unmined is re-sent with the same nonce and
+        higher fees, or replaced by a cancel once the fees exceed its
+        ceiling; one that drops from the mempool or whose block is reorged
+        out is rebroadcast. On timeout the harvest stays tracked, and the
+        next cycle resumes it (see pending_harvest). last_tx_outcome
+        records how the wait ended.
+
+        Args:
+            tx_hash: Transaction hash returned by submit_harvest
+            timeout: Seconds to wait (defaults to the tracker's timeout)
+
+        Returns:
+            True if the harvest succeeded, False otherwise
+        """
+        tracked = self._start_wait(tx_hash)
+        if tracked is None:
+            return False
+
+        if timeout is None:
+            timeout = self.lifecycle.timeout_seconds
+        deadline = time.monotonic() + timeout
+        last_head = None
+        while True:
+            try:
+                head = await self.w3.eth.block_number
+                if head != last_head:
+                    last_head = head
+                    action = await self._next_tx_action(tracked, head)
+                    if action.kind in (CONFIRMED, LOST):
+                        return await self._finish_harvest(tx_hash, tracked, action)
+                    await self._apply_tx_action(tracked, action, head)
+            except Exception as e:
+                logger.warning(f"Error tracking harvest {tx_hash}: {e}")
+
+            if time.monotonic() >= deadline:
+                self._wait_timed_out(tx_hash, tracked, timeout)
+                return False
+            await asyncio.sleep(self.lifecycle.poll_interval_seconds)
+
+    async def _find_receipt(self, tracked: TrackedTx) -> Optional[Dict]:
+        """Receipt of any attempt for a tracked nonce, newest attempt first"""
+        for tx_hash in tracked.hashes:
+            try:
+                return await self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+        return None
+
+    async def _next_tx_action(self, tracked: TrackedTx, head: int) -> TxAction:
+        """Read the chain state the lifecycle tracker needs at a new block"""
+        receipt = await self._find_receipt(tracked)
+        chain_nonce = None
+        if receipt is None:
+            chain_nonce = await self.w3.eth.get_transaction_count(
+                self.address, "latest"
+            )
+            if chain_nonce > tracked.nonce:
+                # Mined between the two reads, or taken by another transaction
+                receipt = await self._find_receipt(tracked)
+
+        if receipt is not None:
+            try:
+                block = await self.w3.eth.get_block(receipt["blockNumber"])
+                canonical_hash = block["hash"]
+            except Exception as e:
+                logger.debug("Failed to fetch receipt block: %s", e)
+                canonical_hash = None
+            return self.lifecycle.next_action(tracked, head, receipt, canonical_hash)
+        if chain_nonce > tracked.nonce:
+            return self.lifecycle.next_action(tracked, head, chain_nonce=chain_nonce)
+
+        pending_nonce = await self.w3.eth.get_transaction_count(
+            self.address, "pending"
+        )
+        market_fee_params, base_fee_wei = None, None
+        if self.lifecycle.replacement_due(tracked, head):
+            market_fee_params, base_fee_wei = await self._market_fees()
+        return self.lifecycle.next_action(
+            tracked,
+            head,
+            chain_nonce=chain_nonce,
+            known=pending_nonce > tracked.nonce,
+            market_fee_params=market_fee_params,
+            base_fee_wei=base_fee_wei,
+        )
+
+    async def _market_fees(self) -> Tuple[Dict[str, int], Optional[int]]:
+        """Fee fields for a new transaction now, and the next base fee"""
+        await self.sample_gas_price_wei()
+        base_fee_wei = None
+        if self.gas_oracle is not None and self.gas_oracle.has_data:
+            base_fee_wei = self.gas_oracle.next_base_fee_wei
+        return await self._fee_params(), base_fee_wei
+
+    async def _apply_tx_action(
+        self, tracked: TrackedTx, action: TxAction, head: int
+    ):
+        """Re-send, replace or cancel a tracked harvest as the tracker decided"""
+        if action.kind in (REBROADCAST, REORGED):
+            self._rebroadcasting(tracked, action)
+            try:
+                await self.w3.eth.send_raw_transaction(tracked.latest.raw_tx)
+            except Exception as e:
+                logger.debug("Rebroadcast rejected: %s", e)
+            return
+        if action.kind not in (REPLACE, CANCEL):
+            return
+
+        signed_tx = self.account.sign_transaction(self._replacement_tx(tracked, action))
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except Exception as e:
+            self._replacement_rejected(tracked, e)
+            return
+        self._replacement_sent(
+            tracked, action, tx_hash.hex(), signed_tx.rawTransaction, head
+        )
+
+    async def _finish_harvest(
+        self, tx_hash: str, tracked: TrackedTx, action: TxAction
+    ) -> bool:
+        """Settle a tracked harvest's nonce and report whether it succeeded"""
+        success, submitted_at = self._settle_harvest(tx_hash, tracked, action)
+        if submitted_at is not None:
+            observed = time.time()
+            try:
+                block = await self.w3.eth.get_block(action.receipt["blockNumber"])
+                block_timestamp = block["timestamp"]
+            except Exception as e:
+                logger.debug("Failed to fetch inclusion block: %s", e)
+                block_timestamp = None
+            self._record_inclusion(submitted_at, observed, block_timestamp)
+        return success
+
+    async def execute_harvest(self, dry_run: bool = False) -> Optional[str]:
+        """
+        Execute harvest transaction and wait for its receipt
+
+        Args:
+            dry_run: If True, simulate without sending transaction
+
+        Returns:
+            Transaction hash if successful, None otherwise
+        """
+        tx_hash = await self.submit_harvest(dry_run=dry_run)
+        if tx_hash is None:
+            return None
+        return tx_hash if await self.wait_for_harvest_receipt(tx_hash) else None
+
+    async def check_keeper_authorization(self) -> Optional[bool]:
+        """
+        Verify that the keeper address is authorized in Harvester contract
+
+        Returns:
+            True if authorized, False if not, None if the check failed
+        """
+        try:
+            authorized_keeper = await self.harvester.functions.keeper().call()
+            is_authorized = authorized_keeper.lower() == self.address.lower()
+            if not is_authorized:
+                logger.warning(
+                    f"Keeper not authorized! Contract expects: {authorized_keeper}, "
+                    f"but wallet is: {self.address}"
+                )
+            return is_authorized
+        except Exception as e:
+            logger.error(f"Failed to check keeper authorization: {e}")
+            return None
+
+    async def get_watch_addresses(self) -> List[str]:
+        """
+        Contracts whose events can change this vault's claimable yield
+
+        Returns:
+            Harvester and StrategyBTC addresses, plus the MUSD/BTC pool
+            when it can be resolved
+        """
+        addresses = [self.harvester.address, self.strategy_btc.address]
+        try:
+            addresses.append(await self.strategy_btc.functions.musdBtcPool().call())
+        except Exception as e:
+            logger.warning(f"Failed to resolve MUSD/BTC pool address: {e}")
+        return addresses
+
+    def get_contract_info(self) -> Dict[str, str]:
+        """
+        Get summary of contract addresses and configuration
+
+        Returns:
+            Dictionary of contract info
+        """
+        return {
+            "harvester": self.harvester.address,
+            "debt_manager": self.debt_manager.address,
+            "strategy_btc": self.strategy_btc.address,
+            "keeper_wallet": self.address,
+            "rpc_url": self.rpc_url,
+            "chain_id": str(self.chain_id),
+        }
@@ -0,0 +1,1005 @@
+"""
+Stratum Fi Keeper Bot - asyncio engine
+Runs the harvest loop, balance polling, alerting and health endpoints
+as coroutines on a single event loop, for one or many vaults
+"""
+
+import asyncio
+import signal
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from eth_account import Account
+
+from config import get_config
+from logger import setup_logger, get_contextual_logger
+from async_contracts import AsyncContractManager, create_async_web3
+from contracts import CycleSnapshot
+from metrics import metrics, phase_timer, ALL_VAULTS, DEFAULT_VAULT
+from profiling import Profiler, cycle_breakdown
+from health_check import AsyncHealthCheckServer, HealthState
+from http_transport import HttpTransport
+from rpc_pool import EndpointPool
+from resilience import Backoff, CONNECTION, RECOVERABLE_ERRORS, classify_error
+from policy import (
+    HarvestDecision,
+    evaluate_harvest,
+    evaluate_simulation,
+    harvest_fee_ceiling_wei,
+)
+from profitability import HarvestEconomics, evaluate_economics
+from alert_dispatcher import (
+    AlertDispatcher,
+    build_alert_sinks,
+    error_alert,
+    success_alert,
+)
+from vaults import VaultDefinition, load_vaults
+from nonce_manager import NonceManager
+from triggers import AsyncBlockTrigger
+from forecast import YieldForecaster
+from gas_oracle import GasOracle
+from pricing import PriceOracle, build_price_oracle
+from state_store import StateStore
+from tx_lifecycle import WAIT, TxLifecycle
+
+
+async def _timed(phase: str, awaitable, vault: str = ALL_VAULTS):
+    """Await a per-cycle read, recording its duration as a harvest phase"""
+    with phase_timer(phase, vault):
+        return await awaitable
+
+
+class VaultState:
+    """Runtime state for one vault managed by the async engine"""
+
+    def __init__(self, definition: VaultDefinition, contracts: AsyncContractManager):
+        self.name = definition.name
+        self.definition = definition
+        self.contracts = contracts
+        self.harvest_count = 0
+        self.last_harvest_time: Optional[datetime] = None
+        self.last_snapshot: Optional[CycleSnapshot] = None
+        self.pending_tx_hash: Optional[str] = None
+        self.forecaster = YieldForecaster(value_usd=contracts.estimate_yield_usd)
+        self.last_economics: Optional[HarvestEconomics] = None
+        self.template_refresh: Optional[asyncio.Task] = None
+
+
+class AsyncKeeperBot:
+    """
+    Asyncio keeper bot for Stratum Fi yield harvesting
+    """
+
+    def __init__(self):
+        """Initialize keeper bot with configuration (no network I/O)"""
+        self.config = get_config()
+        self.logger = setup_logger(
+            name="keeper",
+            level=self.config.log_level,
+            log_file=self.config.log_file,
+            log_format=self.config.log_format,
+            max_bytes=self.config.log_max_bytes,
+            backup_count=self.config.log_backup_count,
+        )
+        self.running = False
+        self.cycle_count = 0
+        self.start_time = datetime.now()
+
+        # A cycle that failed on RPC errors is re-run after a short jittered
+        # backoff instead of the full check interval
+        self.last_cycle_error: Optional[str] = None
+        self.error_backoff = Backoff(
+            self.config.error_backoff_base_seconds,
+            self.config.error_backoff_max_seconds,
+        )
+
+        if self.config.vaults_file:
+            self.vault_definitions = load_vaults(self.config.vaults_file)
+        else:
+            self.vault_definitions = [
+                VaultDefinition(
+                    name=DEFAULT_VAULT,
+                    harvester_address=self.config.harvester_address,
+                    debt_manager_address=self.config.debt_manager_address,
+                    strategy_btc_address=self.config.strategy_btc_address,
+                )
+            ]
+
+        # Vault contract managers are created in start() so that shared
+        # asyncio primitives bind to the running event loop
+        self.vaults: List[VaultState] = []
+        self.health = HealthState(self.config.health_max_age_seconds)
+        self.profiler = Profiler() if self.config.enable_profiling else None
+        self.health_server = AsyncHealthCheckServer(self, port=self.config.health_port)
+
+        # Block-driven trigger and the vaults each watched contract belongs to
+        self.trigger: Optional[AsyncBlockTrigger] = None
+        self._vaults_by_address: Dict[str, List[VaultState]] = {}
+
+        # One price oracle (and one batched price fetch) shared by all vaults
+        self.price_oracle: Optional[PriceOracle] = None
+        self.price_tokens: List[str] = []
+
+        # One pooled keep-alive session for RPC requests and Slack alerts
+        self.http = HttpTransport(
+            pool_size=self.config.http_pool_size,
+            connect_timeout=self.config.http_connect_timeout_seconds,
+            read_timeout=self.config.rpc_timeout_seconds,
+            keepalive_seconds=self.config.http_keepalive_seconds,
+        )
+
+        # Alerts are delivered by a background thread, never on the event loop
+        self.alerts = AlertDispatcher(
+            build_alert_sinks(
+                self.http,
+                self.config.explorer_url,
+                slack_webhook_url=(
+                    self.config.slack_webhook_url
+                    if self.config.enable_slack_alerts
+                    else None
+                ),
+                webhook_url=self.config.alert_webhook_url,
+                file_path=self.config.alert_file,
+            ),
+            max_queue=self.config.alert_queue_size,
+            dedup_window_seconds=self.config.alert_dedup_window_seconds,
+            rate_limit_per_minute=self.config.alert_rate_limit_per_minute,
+        )
+
+        # Local history shared by all vaults (opened in start())
+        self.state_store: Optional[StateStore] = None
+
+        self._stop_event: Optional[asyncio.Event] = None
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def contracts(self) -> AsyncContractManager:
+        """Primary contract manager (shared RPC connection and keeper wallet)"""
+        return self.vaults[0].contracts
+
+    @property
+    def harvest_count(self) -> int:
+        """Total harvests executed across all vaults"""
+        return sum(vault.harvest_count for vault in self.vaults)
+
+    @property
+    def last_harvest_time(self) -> Optional[datetime]:
+        """Most recent harvest across all vaults"""
+        times = [v.last_harvest_time for v in self.vaults if v.last_harvest_time]
+        return max(times) if times else None
+
+    def _create_vaults(self):
+        """Create contract managers sharing one connection pool and signer"""
+        w3 = create_async_web3(
+            self.config.rpc_url_list,
+            hedge=self.config.enable_rpc_hedging,
+            hedge_min_delay=self.config.rpc_hedge_delay_seconds,
+            timeout=self.config.rpc_timeout_seconds,
+            transport=self.http,
+            pool=EndpointPool(
+                self.config.rpc_url_list,
+                failure_threshold=self.config.rpc_failure_threshold,
+                cooldown_seconds=self.config.rpc_cooldown_seconds,
+                max_cooldown_seconds=self.config.rpc_max_cooldown_seconds,
+                read_attempts=self.config.rpc_read_attempts,
+                broadcast_attempts=self.config.rpc_broadcast_attempts,
+                retry_budget_ratio=self.config.rpc_retry_budget_ratio,
+            ),
+        )
+        tx_lock = asyncio.Lock()
+        nonce_manager = NonceManager(
+            Account.from_key(self.config.keeper_private_key).address
+        )
+        gas_oracle = (
+            GasOracle(self.config.gas_history_blocks)
+            if self.config.enable_gas_oracle
+            else None
+        )
+        lifecycle = TxLifecycle(
+            replace_after_blocks=self.config.tx_replace_after_blocks,
+            fee_bump=1 + self.config.tx_fee_bump_percent / 100,
+            max_replacements=self.config.tx_max_replacements,
+            confirmations=self.config.tx_confirmations,
+            timeout_seconds=self.config.tx_timeout_seconds,
+            poll_interval_seconds=self.config.tx_poll_interval_seconds,
+        )
+
+        self.vaults = [
+            VaultState(
+                definition,
+                AsyncContractManager(
+                    rpc_url=self.config.rpc_url,
+                    chain_id=self.config.chain_id,
+                    private_key=self.config.keeper_private_key,
+                    harvester_address=definition.harvester_address,
+                    debt_manager_address=definition.debt_manager_address,
+                    strategy_btc_address=definition.strategy_btc_address,
+                    multicall_address=self.config.multicall_address or None,
+                    w3=w3,
+                    tx_lock=tx_lock,
+                    nonce_manager=nonce_manager,
+                    lifecycle=lifecycle,
+                    gas_oracle=gas_oracle,
+                    priority_tier=self.config.gas_priority_tier,
+                    vault=definition.name,
+                    abi_search_path=self.config.abi_search_path_list,
+                ),
+            )
+            for definition in self.vault_definitions
+        ]
+
+    async def _create_trigger(self):
+        """Watch every vault's contracts for yield-changing events"""
+        watch_lists = await asyncio.gather(
+            *(vault.contracts.get_watch_addresses() for vault in self.vaults)
+        )
+        for vault, addresses in zip(self.vaults, watch_lists):
+            for address in addresses:
+                self._vaults_by_address.setdefault(address, []).append(vault)
+
+        self.trigger = AsyncBlockTrigger(
+            self.contracts.w3,
+            self._vaults_by_address.keys(),
+            poll_interval=self.config.block_poll_interval_seconds,
+            ws_url=self.config.ws_url,
+        )
+
+    async def _create_price_oracle(self):
+        """Build one price oracle covering every vault's yield tokens"""
+        try:
+            markets = await asyncio.gather(
+                *(vault.contracts.get_price_market() for vault in self.vaults)
+            )
+            self.price_oracle = build_price_oracle(
+                list(markets),
+                self.config.price_source_list,
+                musd_price_usd=self.config.musd_price_usd,
+                btc_price_usd=self.config.btc_price_usd,
+                ttl_seconds=self.config.price_ttl_seconds,
+                max_age_seconds=self.config.max_price_age_seconds,
+            )
+        except Exception as e:
+            self.logger.warning(f"Price oracle unavailable, assuming 1:1 USD: {e}")
+            return
+
+        for vault in self.vaults:
+            vault.contracts.price_oracle = self.price_oracle
+        self.price_tokens = list(
+            dict.fromkeys(
+                token
+                for market in markets
+                for token in (market.token0, market.token1, market.btc)
+            )
+        )
+
+    async def start(self):
+        """Connect to the RPC and start auxiliary servers"""
+        if self.config.enable_prometheus:
+            metrics.start_server(self.config.prometheus_port)
+        self.alerts.start()
+
+        try:
+            self._create_vaults()
+            if self.config.state_db_path:
+                self.state_store = StateStore(self.config.state_db_path)
+                self.state_store.start()
+                self._restore_state()
+            await self.contracts.connect()
+            metrics.update_rpc_status(True)
+        except Exception as e:
+            self.logger.error(f"Failed to initialize contract manager: {e}")
+            metrics.update_rpc_status(False)
+            metrics.record_error("initialization_failed")
+            raise
+
+        await self._create_price_oracle()
+        if self.config.trigger_mode == "block":
+            await self._create_trigger()
+
+        await self.health_server.start()
+
+        self.logger.info("Keeper bot initialized successfully (async mode)")
+        self._log_startup_info()
+        self._spawn(self._startup_checks())
+
+    def _log_startup_info(self):
+        """Log startup configuration and contract info"""
+        self.logger.info("=" * 60)
+        self.logger.info("Stratum Fi Keeper Bot - Starting Up (async)")
+        self.logger.info("=" * 60)
+
+        self.logger.info(f"Harvest Interval: {self.config.harvest_interval_seconds}s")
+        self.logger.info(
+            f"Min Yield Threshold: ${self.config.min_yield_threshold_usd} USD"
+        )
+        self.logger.info(f"Max Gas Price: {self.config.max_gas_price_gwei} gwei")
+        self.logger.info(
+            f"Gas Oracle: {self.config.enable_gas_oracle} "
+            f"({self.config.gas_priority_tier} tier)"
+        )
+        self.logger.info(f"Dry Run Mode: {self.config.dry_run}")
+        self.logger.info(f"Trigger Mode: {self.config.trigger_mode}")
+        self.logger.info(f"Yield Forecast: {self.config.enable_yield_forecast}")
+        self.logger.info(f"Profitability Check: {self.config.enable_profitability}")
+        self.logger.info(f"Price Sources: {self.config.price_sources}")
+        self.logger.info(
+            f"Harvest Simulation: {self.config.enable_harvest_simulation}"
+        )
+        self.logger.info(f"Prometheus Enabled: {self.config.enable_prometheus}")
+
+        self.logger.info(f"Vaults: {len(self.vaults)}")
+        for vault in self.vaults:
+            contract_info = vault.contracts.get_contract_info()
+            self.logger.info(
+                f"[{vault.name}] Harvester: {contract_info['harvester']}, "
+                f"DebtManager: {contract_info['debt_manager']}, "
+                f"StrategyBTC: {contract_info['strategy_btc']}"
+            )
+        self.logger.info(f"Keeper Wallet: {self.contracts.address}")
+        self.logger.info("=" * 60)
+
+    async def _startup_checks(self):
+        """
+        Warm harvest templates and check authorization and balance
+
+        Runs alongside the first cycle rather than before it; readiness
+        stays false until the authorization check has been recorded.
+        """
+        # Independent startup reads run concurrently
+        try:
+            is_authorized, balance, *_ = await asyncio.gather(
+                self.check_keeper_authorization(),
+                self.contracts.get_keeper_balance(),
+                *(vault.contracts.refresh_harvest_template() for vault in self.vaults),
+            )
+        except Exception as e:
+            # The balance loop retries both checks
+            self.logger.warning(f"Startup checks failed: {e}")
+            return
+
+        # Failed reads are recorded as RPC failures and retried by the
+        # balance loop
+        self.health.record_authorization(is_authorized)
+        self.health.record_rpc_read(balance)
+        if is_authorized:
+            self.logger.info("✅ Keeper wallet is authorized")
+        elif is_authorized is not None:
+            self.logger.warning(
+                "⚠️  Keeper wallet is NOT authorized in every Harvester contract!"
+            )
+            self.logger.warning(
+                "Please run: harvester.setKeeper(keeperAddress) as contract owner"
+            )
+
+        if balance is None:
+            return
+        self.logger.info(f"Keeper Balance: {balance:.6f} BTC")
+        metrics.update_keeper_balance(balance)
+
+        if balance < 0.001:
+            self.logger.warning(
+                "⚠️  Low keeper balance! Ensure wallet has sufficient BTC for gas"
+            )
+
+    async def check_keeper_authorization(self) -> Optional[bool]:
+        """
+        Check the keeper wallet is authorized on every vault's Harvester
+
+        Returns:
+            True if authorized everywhere, False if not, None if any check
+            failed
+        """
+        results = await asyncio.gather(
+            *(vault.contracts.check_keeper_authorization() for vault in self.vaults)
+        )
+        if None in results:
+            return None
+        return all(results)
+
+    async def run_cycle(self, vaults: Optional[List[VaultState]] = None):
+        """
+        Check vaults concurrently
+
+        Gas price (smoothed from fee history when the gas oracle is
+        enabled) and token prices are fetched once per cycle and shared by
+        every vault, and at most max_concurrent_vaults checks are in flight
+        at a time.
+
+        Args:
+            vaults: Vaults to check (default: all)
+        """
+        vaults = self.vaults if vaults is None else vaults
+        self.last_cycle_error = None
+        try:
+            gas_price_wei, _ = await asyncio.gather(
+                _timed("gas_fetch", self.contracts.sample_gas_price_wei()),
+                _timed(
+                    "price_refresh", self.contracts.refresh_prices(self.price_tokens)
+                ),
+            )
+        except Exception as e:
+            self.last_cycle_error = classify_error(e)
+            self.logger.error(f"RPC connection lost ({self.last_cycle_error}): {e}")
+            metrics.update_rpc_status(False)
+            metrics.record_error("rpc_disconnected")
+            self.health.record_rpc_failure()
+            return
+
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_vaults)
+
+        async def check(vault: VaultState) -> bool:
+            async with semaphore:
+                return await self.check_and_harvest(vault, gas_price_wei)
+
+        results = await asyncio.gather(*(check(vault) for vault in vaults))
+        if len(self.vaults) > 1:
+            self.logger.info(
+                f"Cycle #{self.cycle_count} complete: harvests submitted for "
+                f"{sum(results)} of {len(vaults)} vaults"
+            )
+        self._refresh_harvest_templates()
+
+    def _refresh_harvest_templates(self):
+        """Re-estimate harvest gas in the background before templates expire"""
+        for vault in self.vaults:
+            if not vault.contracts.harvest_template.needs_refresh():
+                continue
+            if vault.template_refresh is None or vault.template_refresh.done():
+                vault.template_refresh = self._spawn(
+                    vault.contracts.refresh_harvest_template()
+                )
+
+    async def check_and_harvest(
+        self, vault: VaultState, gas_price_wei: Optional[int] = None
+    ) -> bool:
+        """
+        Check claimable yield for one vault and harvest if thresholds are met
+
+        Args:
+            vault: Vault to check
+            gas_price_wei: Gas price sampled for this cycle
+
+        Returns:
+            True if harvest was executed, False otherwise
+        """
+        cycle_logger = get_contextual_logger(
+            self.logger, cycle=self.cycle_count, vault=vault.name
+        )
+        contracts = vault.contracts
+
+        if vault.pending_tx_hash:
+            cycle_logger.info(
+                f"Harvest {vault.pending_tx_hash[:10]}... still pending. Skipping."
+            )
+            return False
+
+        try:
+            with phase_timer("snapshot", vault.name):
+                snapshot = await contracts.get_cycle_snapshot(gas_price_wei)
+            if snapshot is None:
+                cycle_logger.error("RPC connection lost")
+                self.last_cycle_error = CONNECTION
+                metrics.update_rpc_status(False)
+                metrics.record_error("rpc_disconnected")
+                self.health.record_rpc_failure()
+                return False
+
+            vault.last_snapshot = snapshot
+            metrics.update_rpc_status(True)
+            metrics.update_keeper_balance(snapshot.keeper_balance_btc)
+            self.health.record_rpc_read(
+                snapshot.keeper_balance_btc, snapshot.block_number
+            )
+
+            gas_price = snapshot.gas_price_gwei
+            metrics.update_gas_price(gas_price)
+
+            claimable0, claimable1 = snapshot.claimable0, snapshot.claimable1
+            total_yield_usd = contracts.estimate_yield_usd(claimable0, claimable1)
+            if total_yield_usd is None:
+                cycle_logger.warning("No fresh token prices. Skipping harvest.")
+                metrics.record_harvest_attempt("skipped_stale_price", vault=vault.name)
+                return False
+            metrics.update_claimable_yield(total_yield_usd, vault=vault.name)
+            if self.state_store is not None:
+                self.state_store.record_cycle(vault.name, snapshot, total_yield_usd)
+            vault.forecaster.add_sample(
+                snapshot.block_number,
+                snapshot.block_timestamp,
+                claimable0,
+                claimable1,
+                total_yield_usd,
+            )
+
+            cycle_logger.info(
+                f"Claimable yield: {claimable0:.6f} token0, {claimable1:.6f} token1 "
+                f"(≈${total_yield_usd:.2f} USD) at block {snapshot.block_number}",
+                extra={"block": snapshot.block_number},
+            )
+
+            with phase_timer("decision", vault.name):
+                economics = None
+                if self.config.enable_profitability:
+                    economics = evaluate_economics(
+                        yield_usd=total_yield_usd,
+                        gas_units=await contracts.estimate_harvest_gas(),
+                        gas_price_gwei=gas_price,
+                        btc_price_usd=self._btc_price_usd(vault),
+                        accrual_rate_usd_per_second=(
+                            vault.forecaster.rate_per_second()
+                        ),
+                        opportunity_apr=self.config.yield_opportunity_apr,
+                    )
+                    vault.last_economics = economics
+                    metrics.update_harvest_economics(
+                        economics.gas_cost_usd,
+                        economics.net_profit_usd,
+                        vault=vault.name,
+                    )
+
+                definition = vault.definition
+                max_gas_price_gwei = (
+                    definition.max_gas_price_gwei
+                    if definition.max_gas_price_gwei is not None
+                    else self.config.max_gas_price_gwei
+                )
+                decision = evaluate_harvest(
+                    gas_price_gwei=gas_price,
+                    yield_usd=total_yield_usd,
+                    max_gas_price_gwei=max_gas_price_gwei,
+                    min_yield_threshold_usd=self._min_yield_threshold(vault),
+                    economics=economics,
+                    min_profit_usd=self.config.min_profit_usd,
+                )
+                fee_ceiling_wei = harvest_fee_ceiling_wei(
+                    max_gas_price_gwei, economics, self.config.min_profit_usd
+                )
+
+            # A harvest left pending by an earlier cycle is followed up
+            # whatever the decision, so a gas spike that holds back new
+            # harvests cannot strand it unreplaced
+            pending_tx = contracts.pending_harvest(fee_ceiling_wei)
+            if pending_tx is not None:
+                vault.pending_tx_hash = pending_tx
+                self._spawn(
+                    self._confirm_harvest(
+                        vault, pending_tx, total_yield_usd, time.time()
+                    )
+                )
+                return False
+
+            if not decision.should_harvest:
+                cycle_logger.info(f"{decision.reason}. Skipping harvest.")
+                metrics.record_harvest_attempt(decision.status, vault=vault.name)
+                return False
+
+            # Pre-flight: skip reverts and poor swap output before paying gas
+            if self.config.enable_harvest_simulation:
+                with phase_timer("simulation", vault.name):
+                    simulated = await self._check_simulation(
+                        vault, claimable0, claimable1, total_yield_usd, economics
+                    )
+                if not simulated.should_harvest:
+                    cycle_logger.info(f"{simulated.reason}. Skipping harvest.")
+                    metrics.record_harvest_attempt(simulated.status, vault=vault.name)
+                    return False
+                cycle_logger.info(simulated.reason)
+
+            cycle_logger.info(f"💰 {decision.reason}! Executing harvest")
+
+            start_time = time.time()
+            tx_hash = await contracts.submit_harvest(
+                dry_run=self.config.dry_run, fee_ceiling_wei=fee_ceiling_wei
+            )
+
+            if tx_hash:
+                # Receipt is confirmed in the background so the remaining
+                # vaults (and the next cycle) are not blocked on inclusion
+                vault.pending_tx_hash = tx_hash
+                if self.state_store is not None:
+                    self.state_store.record_submission(
+                        vault.name,
+                        tx_hash,
+                        contracts.pending_nonces.get(tx_hash),
+                        total_yield_usd,
+                    )
+                self._spawn(
+                    self._confirm_harvest(vault, tx_hash, total_yield_usd, start_time)
+                )
+                return True
+            else:
+                cycle_logger.error("Harvest transaction failed")
+                metrics.record_harvest_attempt("failed", vault=vault.name)
+                metrics.record_error("harvest_tx_failed")
+                self._send_error_alert("Harvest transaction failed", vault)
+                return False
+
+        except Exception as e:
+            kind = classify_error(e)
+            if kind in RECOVERABLE_ERRORS:
+                self.last_cycle_error = kind
+            cycle_logger.error(
+                f"Error during harvest cycle ({kind}): {e}", exc_info=True
+            )
+            metrics.record_harvest_attempt("error", vault=vault.name)
+            metrics.record_error("harvest_exception")
+            self._send_error_alert(f"Harvest exception: {str(e)}", vault)
+            return False
+
+    def _restore_state(self):
+        """Restore per-vault harvest counters and forecast samples"""
+        for vault in self.vaults:
+            count, last_harvest = self.state_store.harvest_stats(vault.name)
+            vault.harvest_count = count
+            if last_harvest is not None:
+                vault.last_harvest_time = datetime.fromtimestamp(last_harvest)
+                metrics.update_last_harvest_timestamp(last_harvest, vault=vault.name)
+
+            # Samples since the last harvest describe the current accrual curve
+            for row in self.state_store.cycles(
+                vault.name, since=last_harvest, limit=vault.forecaster.samples.maxlen
+            ):
+                vault.forecaster.add_sample(
+                    row["block_number"],
+                    row["block_timestamp"],
+                    row["claimable0"],
+                    row["claimable1"],
+                    row["yield_usd"],
+                )
+        self.logger.info(
+            f"Restored {self.harvest_count} harvests across {len(self.vaults)} "
+            f"vaults from {self.config.state_db_path}"
+        )
+
+    def _min_yield_threshold(self, vault: VaultState) -> float:
+        """Vault's harvest threshold, falling back to the global setting"""
+        threshold = vault.definition.min_yield_threshold_usd
+        if threshold is None:
+            return self.config.min_yield_threshold_usd
+        return threshold
+
+    async def _check_simulation(
+        self,
+        vault: VaultState,
+        claimable0: float,
+        claimable1: float,
+        yield_usd: float,
+        economics: Optional[HarvestEconomics],
+    ) -> HarvestDecision:
+        """Simulate harvest() and re-check the decision against its outcome"""
+        simulation = await vault.contracts.simulate_harvest(claimable0, claimable1)
+        if simulation is None:
+            return HarvestDecision(
+                should_harvest=True,
+                status="execute",
+                reason="Harvest simulation unavailable",
+            )
+        return evaluate_simulation(
+            simulation,
+            yield_usd,
+            musd_price_usd=self.config.musd_price_usd,
+            max_slippage=self.config.max_harvest_slippage,
+            economics=economics,
+            min_profit_usd=self.config.min_profit_usd,
+        )
+
+    def _btc_price_usd(self, vault: VaultState) -> float:
+        """BTC/USD from the price oracle, or the static fallback"""
+        if self.price_oracle is not None:
+            price = self.price_oracle.get(vault.contracts.price_market.btc)
+            if price is not None:
+                return price.usd
+        return self.config.btc_price_usd
+
+    def _harvest_target_usd(self, vault: VaultState) -> float:
+        """Yield at which the vault's next harvest is expected to execute"""
+        threshold = self._min_yield_threshold(vault)
+        if vault.last_economics is None:
+            return threshold
+        return vault.last_economics.target_yield_usd(
+            threshold, self.config.min_profit_usd
+        )
+
+    async def _confirm_harvest(
+        self, vault: VaultState, tx_hash: str, yield_usd: float, start_time: float
+    ):
+        """Wait for a broadcast harvest to be mined and record the outcome"""
+        cycle_logger = get_contextual_logger(self.logger, vault=vault.name)
+        contracts = vault.contracts
+        contracts.last_receipt = None
+        try:
+            success = await contracts.wait_for_harvest_receipt(tx_hash)
+        finally:
+            vault.pending_tx_hash = None
+        duration = time.time() - start_time
+        receipt = contracts.last_receipt
+        if self.state_store is not None and receipt is not None:
+            self.state_store.record_receipt(
+                vault.name, tx_hash, success, yield_usd, receipt
+            )
+
+        if success:
+            # A sped-up harvest is mined under its replacement's hash
+            tx_hash = receipt["transactionHash"].hex()
+            vault.harvest_count += 1
+            vault.last_harvest_time = datetime.now()
+            vault.forecaster.reset()
+
+            metrics.record_harvest_attempt("success", vault=vault.name)
+            metrics.record_yield_collected(yield_usd, vault=vault.name)
+            metrics.record_harvest_duration(duration, vault=vault.name)
+            metrics.update_last_harvest_timestamp(time.time(), vault=vault.name)
+
+            cycle_logger.info(
+                f"✅ Harvest successful! TX: {tx_hash[:10]}... "
+                f"(took {duration:.2f}s)",
+                extra={"tx": tx_hash},
+            )
+            cycle_logger.info(
+                f"View transaction: {self.config.explorer_url}/tx/{tx_hash}"
+            )
+
+            self._send_success_alert(vault, yield_usd, tx_hash)
+            await self._log_protocol_stats(vault)
+        elif contracts.last_tx_outcome == WAIT:
+            # Still tracked: the vault's next cycle resumes it
+            cycle_logger.warning(
+                f"Harvest {tx_hash[:10]}... still pending, resuming next cycle",
+                extra={"tx": tx_hash},
+            )
+            metrics.record_harvest_attempt("pending", vault=vault.name)
+        else:
+            cycle_logger.error(f"Harvest transaction failed: {tx_hash}")
+            metrics.record_harvest_attempt("failed", vault=vault.name)
+            metrics.record_error("harvest_tx_failed")
+            self._send_error_alert("Harvest transaction failed", vault)
+
+    async def _log_protocol_stats(self, vault: VaultState):
+        """Log current protocol statistics after successful harvest"""
+        try:
+            snapshot = await vault.contracts.get_cycle_snapshot()
+            if snapshot is None:
+                self.logger.warning("Failed to fetch protocol stats: RPC unavailable")
+                return
+
+            vault.last_snapshot = snapshot
+            self.logger.info(
+                f"📊 [{vault.name}] Protocol Stats - "
+                f"Total BTC: {snapshot.total_btc_deposited:.4f}, "
+                f"Total Debt: {snapshot.total_debt:.2f} bMUSD "
+                f"(block {snapshot.block_number})"
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch protocol stats: {e}")
+
+    def _send_success_alert(self, vault: VaultState, yield_usd: float, tx_hash: str):
+        """Queue alert on successful harvest without blocking the loop"""
+        self.alerts.submit(
+            success_alert(yield_usd, tx_hash, vault=self._alert_vault(vault))
+        )
+
+    def _send_error_alert(self, error_msg: str, vault: Optional[VaultState] = None):
+        """Queue alert on error without blocking the loop"""
+        self.alerts.submit(error_alert(error_msg, vault=self._alert_vault(vault)))
+
+    def _alert_vault(self, vault: Optional[VaultState]) -> Optional[str]:
+        """Vault name for alerts, only shown when running multiple vaults"""
+        if vault is None or len(self.vaults) <= 1:
+            return None
+        return vault.name
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a fire-and-forget coroutine, keeping a reference until done"""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _sleep(self, seconds: float):
+        """Sleep until timeout or shutdown, whichever comes first"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _next_check_interval(self) -> float:
+        """
+        Seconds until the next check
+
+        With forecasting enabled this is the earliest predicted threshold
+        crossing across all vaults. After a cycle failed on RPC errors it
+        is a short jittered backoff.
+        """
+        interval = self.config.harvest_interval_seconds
+        if self.last_cycle_error in RECOVERABLE_ERRORS:
+            delay = min(interval, self.error_backoff.next_delay())
+            self.logger.info(
+                f"🔁 Cycle failed ({self.last_cycle_error}), retrying in {delay:.1f}s"
+            )
+            return delay
+        self.error_backoff.reset()
+
+        if not self.config.enable_yield_forecast:
+            return interval
+
+        return min(
+            vault.forecaster.next_check_delay(
+                self._harvest_target_usd(vault),
+                min_interval=self.config.min_check_interval_seconds,
+                max_interval=interval,
+            )
+            for vault in self.vaults
+        )
+
+    async def _wait_for_next_cycle(self) -> Optional[List[VaultState]]:
+        """
+        Sleep until the next check, or until relevant on-chain activity
+
+        Returns:
+            Vaults whose contracts emitted trigger events, or None to check
+            all vaults (interval mode, or block mode timeout)
+        """
+        interval = self._next_check_interval()
+        if self.trigger is None:
+            self.logger.info(f"⏳ Sleeping for {interval:.0f}s until next check...")
+            await self._sleep(interval)
+            return None
+
+        self.logger.info(
+            f"⏳ Waiting for relevant on-chain activity (max {interval:.0f}s)..."
+        )
+        changed = await self.trigger.wait(interval, self._stop_event)
+        if not changed:
+            return None
+
+        triggered = {}
+        for address in changed:
+            for vault in self._vaults_by_address.get(address, []):
+                triggered[vault.name] = vault
+        self.logger.info(
+            f"⚡ Trigger events at block {self.trigger.last_block} for "
+            f"{len(triggered)} vault(s)"
+        )
+        return list(triggered.values())
+
+    async def _harvest_loop(self):
+        """Check harvest conditions every interval or on trigger events"""
+        vaults: Optional[List[VaultState]] = None
+        while self.running:
+            try:
+                self.cycle_count += 1
+                count = len(self.vaults) if vaults is None else len(vaults)
+                self.logger.info(
+                    f"🔍 Checking harvest conditions for {count} "
+                    f"vault(s)... (Cycle #{self.cycle_count})"
+                )
+                with cycle_breakdown(self.logger, self.cycle_count):
+                    await self.run_cycle(vaults)
+
+                vaults = await self._wait_for_next_cycle()
+
+            except Exception as e:
+                self.logger.error(
+                    f"Unexpected error in harvest loop: {e}", exc_info=True
+                )
+                metrics.record_error("main_loop_exception")
+                vaults = None
+                delay = self.error_backoff.next_delay()
+                self.logger.info(f"🔁 Retrying in {delay:.1f}s")
+                await self._sleep(delay)
+
+    async def _balance_loop(self):
+        """Periodically poll keeper balance and alert when critically low"""
+        while self.running:
+            try:
+                balance = await self.contracts.get_keeper_balance()
+                self.health.record_rpc_read(balance)
+                if balance is not None:
+                    metrics.update_keeper_balance(balance)
+                await self._reconcile_nonce()
+
+                # Authorization rarely changes; re-check it for readiness
+                if self.health.authorization_due():
+                    self.health.record_authorization(
+                        await self.check_keeper_authorization()
+                    )
+
+                if balance is not None and balance < 0.0001:
+                    self.logger.critical(
+                        f"⚠️  CRITICAL: Keeper balance very low ({balance:.6f} BTC). "
+                        "Please fund the wallet!"
+                    )
+                    self._send_error_alert(
+                        f"Critical: Keeper balance low ({balance:.6f} BTC)"
+                    )
+            except Exception as e:
+                self.logger.error(f"Unexpected error in balance loop: {e}")
+                metrics.record_error("balance_loop_exception")
+
+            await self._sleep(self.config.balance_poll_interval_seconds)
+
+    async def _reconcile_nonce(self):
+        """Resync the local nonce if it drifted from chain while idle"""
+        nonce_manager = self.contracts.nonce_manager
+        if nonce_manager.needs_sync or nonce_manager.in_flight:
+            return
+
+        pending_nonce = await self.contracts.w3.eth.get_transaction_count(
+            self.contracts.address, "pending"
+        )
+        nonce_manager.reconcile(pending_nonce)
+
+    def stop(self):
+        """Request graceful shutdown of all loops"""
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self):
+        """
+        Main keeper entry point - run all loops until interrupted
+        """
+        self._stop_event = asyncio.Event()
+        await self.start()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._signal_handler, sig)
+
+        self.running = True
+        self.logger.info("🚀 Keeper bot started (async mode). Press Ctrl+C to stop.")
+
+        try:
+            await asyncio.gather(self._harvest_loop(), self._balance_loop())
+        finally:
+            await self._shutdown()
+
+    def _signal_handler(self, signum):
+        """Handle shutdown signals gracefully"""
+        self.logger.info(f"Received signal {signum}. Shutting down gracefully...")
+        self.stop()
+
+    async def _shutdown(self):
+        """Cleanup and shutdown"""
+        self.logger.info("=" * 60)
+        self.logger.info("Keeper Bot Shutdown Summary")
+        self.logger.info("=" * 60)
+        self.logger.info(f"Total Harvests Executed: {self.harvest_count}")
+        if self.last_harvest_time:
+            self.logger.info(f"Last Harvest: {self.last_harvest_time.isoformat()}")
+        else:
+            self.logger.info("Last Harvest: Never")
+        self.logger.info("=" * 60)
+
+        pending = [v.pending_tx_hash for v in self.vaults if v.pending_tx_hash]
+        if pending:
+            self.logger.warning(
+                f"{len(pending)} harvest transaction(s) still awaiting receipt: "
+                f"{', '.join(pending)}"
+            )
+
+        # Let in-flight confirmations finish
+        if self._background_tasks:
+            await asyncio.wait(self._background_tasks, timeout=5)
+
+        if self.trigger is not None:
+            await self.trigger.close()
+
+        # Flush queued history rows
+        if self.state_store is not None:
+            await asyncio.to_thread(self.state_store.close)
+
+        # Deliver queued alerts before closing their connections
+        await asyncio.to_thread(self.alerts.close)
+        await self.http.aclose()
+
+        await self.health_server.stop()
+        self.logger.info("Keeper bot stopped. Goodbye! 👋")
+
+
+def run_async():
+    """Run the asyncio keeper engine until shutdown"""
+    bot = AsyncKeeperBot()
+    asyncio.run(bot.run())
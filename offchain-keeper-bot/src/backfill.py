@@ -0,0 +1,409 @@
+"""
+Historical event backfill for Stratum Fi Keeper Bot
+Pulls Harvested, YieldProcessed and YieldClaimed logs over a block range
+with parallel, adaptively sized eth_getLogs windows into the state store
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi import decode
+from web3 import Web3
+
+from state_store import StateStore
+
+logger = logging.getLogger("keeper.backfill")
+
+CHECKPOINT_NAME = "backfill"
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    """A backfilled event and the vault contract that emits it"""
+
+    name: str
+    contract: str  # harvester, debt_manager or strategy_btc
+    data_types: Tuple[str, ...]
+
+
+EVENT_SPECS = [
+    EventSpec("Harvested", "harvester", ("uint256", "uint256", "uint256")),
+    EventSpec("YieldProcessed", "debt_manager", ("uint256", "uint256")),
+    EventSpec("YieldClaimed", "strategy_btc", ("uint256", "uint256")),
+]
+
+EVENT_TOPICS = {
+    Web3.keccak(
+        text=f"{spec.name}({','.join(spec.data_types)})"
+    ).hex(): spec
+    for spec in EVENT_SPECS
+}
+
+# Substrings of provider errors meaning the getLogs window was too large
+RANGE_LIMIT_MARKERS = (
+    "-32005",
+    "block range",
+    "range too large",
+    "range is too large",
+    "more than",
+    "too many",
+    "limit exceeded",
+    "response size",
+    "exceed",
+    "timeout",
+    "timed out",
+)
+
+
+def is_range_limit_error(error: Exception) -> bool:
+    """Return True if a getLogs error means the block window should shrink"""
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_LIMIT_MARKERS)
+
+
+class AdaptiveWindow:
+    """
+    getLogs window size that grows on success and halves on provider limits
+
+    Growth is gentle (x1.25) and shrinking aggressive (x0.5), so the size
+    settles just under whatever limit the provider enforces.
+    """
+
+    def __init__(self, initial: int = 2000, min_size: int = 1, max_size: int = 100_000):
+        self.size = initial
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def grow(self):
+        self.size = min(self.max_size, int(self.size * 1.25) + 1)
+
+    def shrink(self):
+        self.size = max(self.min_size, self.size // 2)
+
+
+def decode_event(
+    log: Dict, vaults_by_address: Dict[str, str], timestamps: Dict[int, int]
+) -> Optional[Dict]:
+    """
+    Decode a backfilled log into a state store events row
+
+    Args:
+        log: eth_getLogs entry
+        vaults_by_address: Checksummed contract address -> vault name
+        timestamps: Block number -> block timestamp
+
+    Returns:
+        Events row, or None for unknown logs
+    """
+    topics = log.get("topics") or []
+    if not topics:
+        return None
+    topic = topics[0]
+    topic = topic.hex() if isinstance(topic, (bytes, bytearray)) else topic
+    if not topic.startswith("0x"):
+        topic = "0x" + topic
+    spec = EVENT_TOPICS.get(topic)
+    vault = vaults_by_address.get(Web3.to_checksum_address(log["address"]))
+    if spec is None or vault is None:
+        return None
+
+    data = log["data"]
+    data = bytes.fromhex(data[2:]) if isinstance(data, str) else bytes(data)
+    amounts = [a / 1e18 for a in decode(list(spec.data_types), data)]
+    amounts += [None] * (3 - len(amounts))
+
+    tx_hash = log["transactionHash"]
+    tx_hash = tx_hash.hex() if isinstance(tx_hash, (bytes, bytearray)) else tx_hash
+    block_number = log["blockNumber"]
+    return {
+        "tx_hash": tx_hash,
+        "log_index": log["logIndex"],
+        "vault": vault,
+        "event": spec.name,
+        "block_number": block_number,
+        "block_timestamp": timestamps.get(block_number),
+        "amount0": amounts[0],
+        "amount1": amounts[1],
+        "amount2": amounts[2],
+    }
+
+
+class Backfiller:
+    """
+    Fetches event logs for a block range with parallel getLogs workers
+
+    Workers take the next window from a shared cursor. A window rejected
+    for its size is split in half and retried, shrinking the window for
+    later requests; successes grow it again. Completed windows advance a
+    contiguous checkpoint, so an interrupted backfill resumes where the
+    fully stored range ends.
+    """
+
+    def __init__(
+        self,
+        w3,
+        vaults_by_address: Dict[str, str],
+        store: StateStore,
+        window: Optional[AdaptiveWindow] = None,
+        concurrency: int = 8,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize backfiller
+
+        Args:
+            w3: AsyncWeb3 instance
+            vaults_by_address: Watched contract address -> vault name
+            store: State store receiving events and checkpoints
+            window: Window sizing (default AdaptiveWindow())
+            concurrency: getLogs requests in flight
+            max_retries: Attempts per window on errors other than size limits
+        """
+        self.w3 = w3
+        self.vaults_by_address = {
+            Web3.to_checksum_address(a): v for a, v in vaults_by_address.items()
+        }
+        self.store = store
+        self.window = window or AdaptiveWindow()
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+
+    async def run(self, from_block: int, to_block: int) -> Dict:
+        """
+        Backfill [from_block, to_block] and checkpoint progress
+
+        Returns:
+            Summary with events, requests, splits and seconds
+        """
+        self._cursor = from_block
+        self._to_block = to_block
+        self._retry: List[Tuple[int, int]] = []
+        self._in_flight = 0
+        self._done: Dict[int, int] = {}
+        self._frontier = from_block - 1
+        self.events = self.requests = self.splits = 0
+        started = time.monotonic()
+
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+
+        return {
+            "events": self.events,
+            "requests": self.requests,
+            "splits": self.splits,
+            "seconds": time.monotonic() - started,
+        }
+
+    def _next_window(self) -> Optional[Tuple[int, int]]:
+        if self._retry:
+            return self._retry.pop()
+        if self._cursor > self._to_block:
+            return None
+        start = self._cursor
+        end = min(start + self.window.size - 1, self._to_block)
+        self._cursor = end + 1
+        return start, end
+
+    async def _worker(self):
+        while True:
+            window = self._next_window()
+            if window is None:
+                if self._in_flight == 0:
+                    return
+                # Another worker may still split its window into retries
+                await asyncio.sleep(0.01)
+                continue
+
+            self._in_flight += 1
+            try:
+                await self._fetch(*window)
+            finally:
+                self._in_flight -= 1
+
+    async def _fetch(self, start: int, end: int):
+        """Fetch, decode and store one window (or split it)"""
+        params = {
+            "fromBlock": start,
+            "toBlock": end,
+            "address": sorted(self.vaults_by_address),
+            "topics": [list(EVENT_TOPICS)],
+        }
+        for attempt in range(self.max_retries):
+            try:
+                self.requests += 1
+                logs = await self.w3.eth.get_logs(params)
+                break
+            except Exception as e:
+                if is_range_limit_error(e) and end > start:
+                    self.window.shrink()
+                    self.splits += 1
+                    mid = (start + end) // 2
+                    self._retry.extend([(mid + 1, end), (start, mid)])
+                    logger.debug(
+                        "Window %s-%s too large, split (window now %s): %s",
+                        start,
+                        end,
+                        self.window.size,
+                        e,
+                    )
+                    return
+                if attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(0.5 * 2**attempt)
+
+        self.window.grow()
+
+        # Timestamps only for blocks that actually emitted events
+        blocks = sorted({log["blockNumber"] for log in logs})
+        headers = await asyncio.gather(
+            *(self.w3.eth.get_block(number) for number in blocks)
+        )
+        timestamps = {h["number"]: h["timestamp"] for h in headers}
+
+        rows = [
+            row
+            for row in (
+                decode_event(log, self.vaults_by_address, timestamps) for log in logs
+            )
+            if row is not None
+        ]
+        self.store.record_events(rows)
+        self.events += len(rows)
+        self._complete(start, end)
+
+    def _complete(self, start: int, end: int):
+        """Advance the contiguous checkpoint past completed windows"""
+        self._done[start] = end
+        advanced = False
+        while self._frontier + 1 in self._done:
+            self._frontier = self._done.pop(self._frontier + 1)
+            advanced = True
+        if advanced:
+            self.store.record_checkpoint(CHECKPOINT_NAME, self._frontier)
+
+
+def resume_block(store: StateStore, from_block: Optional[int]) -> Optional[int]:
+    """
+    First block to fetch, skipping whatever the stored checkpoint covers
+
+    Args:
+        store: State store holding the backfill checkpoint
+        from_block: Requested first block (None to rely on the checkpoint)
+
+    Returns:
+        The block after the checkpoint when it reaches from_block, else
+        from_block
+    """
+    checkpoint = store.checkpoint(CHECKPOINT_NAME)
+    if checkpoint is not None and (from_block is None or checkpoint >= from_block):
+        logger.info(f"Resuming from checkpoint at block {checkpoint}")
+        return checkpoint + 1
+    return from_block
+
+
+def _vault_addresses(config) -> Dict[str, str]:
+    """Watched contract address -> vault name from the keeper configuration"""
+    from vaults import VaultDefinition, load_vaults
+    from metrics import DEFAULT_VAULT
+
+    if config.vaults_file:
+        definitions = load_vaults(config.vaults_file)
+    else:
+        definitions = [
+            VaultDefinition(
+                name=DEFAULT_VAULT,
+                harvester_address=config.harvester_address,
+                debt_manager_address=config.debt_manager_address,
+                strategy_btc_address=config.strategy_btc_address,
+            )
+        ]
+
+    addresses = {}
+    for definition in definitions:
+        for spec in EVENT_SPECS:
+            address = getattr(definition, f"{spec.contract}_address")
+            addresses[Web3.to_checksum_address(address)] = definition.name
+    return addresses
+
+
+async def _run(args) -> Dict:
+    from async_contracts import create_async_web3
+    from config import get_config
+    from http_transport import HttpTransport
+
+    config = get_config()
+    store = StateStore(args.db or config.state_db_path)
+    store.start()
+    http = HttpTransport(
+        pool_size=max(config.http_pool_size, args.concurrency),
+        connect_timeout=config.http_connect_timeout_seconds,
+        read_timeout=config.rpc_timeout_seconds,
+        keepalive_seconds=config.http_keepalive_seconds,
+    )
+    try:
+        w3 = create_async_web3(config.rpc_url_list, transport=http)
+        to_block = args.to_block
+        if to_block is None:
+            to_block = await w3.eth.block_number
+
+        from_block = args.from_block
+        if not args.no_resume:
+            from_block = resume_block(store, from_block)
+        if from_block is None:
+            raise SystemExit("--from-block is required without a checkpoint")
+        if from_block > to_block:
+            logger.info(f"Already backfilled through block {to_block}")
+            return {"events": 0, "requests": 0, "splits": 0, "seconds": 0.0}
+
+        backfiller = Backfiller(
+            w3,
+            _vault_addresses(config),
+            store,
+            window=AdaptiveWindow(initial=args.window),
+            concurrency=args.concurrency,
+        )
+        logger.info(
+            f"Backfilling blocks {from_block}-{to_block} "
+            f"({args.concurrency} parallel requests)"
+        )
+        return await backfiller.run(from_block, to_block)
+    finally:
+        await http.aclose()
+        store.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Backfill Harvested, YieldProcessed and YieldClaimed events"
+    )
+    parser.add_argument("--from-block", type=int, help="First block (inclusive)")
+    parser.add_argument("--to-block", type=int, help="Last block (default: latest)")
+    parser.add_argument(
+        "--window", type=int, default=2000, help="Initial getLogs window in blocks"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Parallel getLogs requests"
+    )
+    parser.add_argument("--db", help="State store path (default: STATE_DB_PATH)")
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Ignore the saved checkpoint"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s | %(levelname)-8s | %(message)s"
+    )
+    summary = asyncio.run(_run(args))
+    logger.info(
+        f"Backfilled {summary['events']} events with {summary['requests']} "
+        f"getLogs requests ({summary['splits']} window splits) in "
+        f"{summary['seconds']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
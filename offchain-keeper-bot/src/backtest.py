@@ -0,0 +1,485 @@
+"""
+Harvest policy backtesting for Stratum Fi Keeper Bot
+Replays yield accrual and gas price series through the keeper's harvest
+decision for a grid of policies, vectorized over the policies with NumPy
+"""
+
+import argparse
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from profitability import SECONDS_PER_YEAR, gas_cost_usd
+
+logger = logging.getLogger("keeper.backtest")
+
+# Harvest gas assumed when no estimate is given (the keeper's fallback)
+DEFAULT_GAS_UNITS = 500_000
+
+
+@dataclass
+class MarketSeries:
+    """
+    Chain conditions sampled over time
+
+    Attributes:
+        timestamps: Sample times in seconds, non-decreasing
+        accrual_usd: Yield accrued to the Harvester during each sample step
+        gas_price_gwei: Gas price at each sample
+        btc_price_usd: BTC/USD price at each sample (gas is paid in BTC)
+    """
+
+    timestamps: np.ndarray
+    accrual_usd: np.ndarray
+    gas_price_gwei: np.ndarray
+    btc_price_usd: np.ndarray
+
+    def __post_init__(self):
+        self.timestamps = np.asarray(self.timestamps, dtype=float)
+        n = len(self.timestamps)
+        self.accrual_usd = np.asarray(self.accrual_usd, dtype=float)
+        self.gas_price_gwei = np.asarray(self.gas_price_gwei, dtype=float)
+        self.btc_price_usd = np.broadcast_to(
+            np.asarray(self.btc_price_usd, dtype=float), (n,)
+        )
+        if n < 2:
+            raise ValueError("A market series needs at least two samples")
+        if len(self.accrual_usd) != n or len(self.gas_price_gwei) != n:
+            raise ValueError("Market series arrays must have the same length")
+        if np.any(np.diff(self.timestamps) < 0):
+            raise ValueError("Market series timestamps must not decrease")
+
+    @property
+    def duration_days(self) -> float:
+        return (self.timestamps[-1] - self.timestamps[0]) / 86400
+
+
+@dataclass(frozen=True)
+class HarvestPolicy:
+    """Keeper settings that decide when to harvest"""
+
+    harvest_interval_seconds: int = 3600
+    min_yield_threshold_usd: float = 10.0
+    max_gas_price_gwei: float = 50.0
+    enable_profitability: bool = True
+    min_profit_usd: float = 0.0
+    yield_opportunity_apr: float = 0.0
+
+    @classmethod
+    def from_config(cls, config) -> "HarvestPolicy":
+        """Policy of a KeeperConfig"""
+        return cls(**{f.name: getattr(config, f.name) for f in fields(cls)})
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Outcome of one policy over a market series"""
+
+    policy: HarvestPolicy
+    harvests: int
+    yield_harvested_usd: float
+    gas_spent_usd: float
+    net_yield_usd: float
+    unharvested_usd: float
+    # Accrual-weighted time harvested yield waited in the Harvester
+    mean_lag_hours: float
+    # Debt repaid by harvested yield, per day of the series
+    debt_repaid_usd_per_day: float
+    # Days until harvested yield repaid initial_debt_usd (None: not repaid)
+    days_to_repay: Optional[float] = None
+
+
+def policy_grid(**values: Sequence) -> List[HarvestPolicy]:
+    """
+    Every combination of the given policy settings
+
+    Args:
+        **values: HarvestPolicy field name -> values to try (fields not
+            given keep their defaults)
+
+    Returns:
+        Policies in itertools.product order
+    """
+    names = list(values)
+    return [
+        HarvestPolicy(**dict(zip(names, combination)))
+        for combination in itertools.product(*(values[n] for n in names))
+    ]
+
+
+def optimal_yield(
+    gas_cost: np.ndarray, accrual_rate: np.ndarray, opportunity_apr: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized profitability.optimal_harvest_yield (NaN where undefined)
+    """
+    gas_cost, accrual_rate, opportunity_apr = np.broadcast_arrays(
+        gas_cost, accrual_rate, opportunity_apr
+    )
+    defined = (accrual_rate > 0) & (opportunity_apr > 0) & (gas_cost > 0)
+    rho = np.where(defined, opportunity_apr, 1.0) / SECONDS_PER_YEAR
+    with np.errstate(invalid="ignore"):
+        optimal = np.sqrt(2 * gas_cost * accrual_rate / rho)
+    return np.where(defined, optimal, np.nan)
+
+
+def harvest_mask(
+    gas_price_gwei: np.ndarray,
+    yield_usd: np.ndarray,
+    max_gas_price_gwei: np.ndarray,
+    min_yield_threshold_usd: np.ndarray,
+    gas_cost: np.ndarray,
+    enable_profitability: np.ndarray,
+    min_profit_usd: np.ndarray,
+    optimal_yield_usd: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized policy.evaluate_harvest: True where a harvest would execute
+
+    optimal_yield_usd is NaN where no optimal point is known.
+    """
+    profitable = (yield_usd - gas_cost >= min_profit_usd) & ~(
+        yield_usd < optimal_yield_usd
+    )
+    return (
+        (gas_price_gwei <= max_gas_price_gwei)
+        & (yield_usd >= min_yield_threshold_usd)
+        & (~enable_profitability | profitable)
+    )
+
+
+def run_backtest(
+    series: MarketSeries,
+    policies: Sequence[HarvestPolicy],
+    gas_units: int = DEFAULT_GAS_UNITS,
+    initial_debt_usd: Optional[float] = None,
+) -> List[BacktestResult]:
+    """
+    Replay a market series through each policy's harvest decisions
+
+    Each policy checks at the start of the series and then every
+    harvest_interval_seconds, seeing the latest sample at or before the
+    check. The accrual rate behind the optimal harvest point is the mean
+    rate since the policy's last harvest (the keeper fits it to recent
+    samples). A harvest claims everything accrued and pays gas at the
+    sampled price. Policies sharing an interval are simulated together,
+    one vectorized step per check.
+
+    Args:
+        series: Yield accrual, gas and BTC price samples
+        policies: Policies to evaluate
+        gas_units: Gas used per harvest
+        initial_debt_usd: Debt to repay, for days_to_repay
+
+    Returns:
+        One result per policy, in order
+    """
+    results: List[Optional[BacktestResult]] = [None] * len(policies)
+    by_interval: Dict[int, List[int]] = {}
+    for index, policy in enumerate(policies):
+        if policy.harvest_interval_seconds <= 0:
+            raise ValueError("harvest_interval_seconds must be positive")
+        by_interval.setdefault(policy.harvest_interval_seconds, []).append(index)
+
+    for interval, indices in by_interval.items():
+        group = [policies[i] for i in indices]
+        for index, result in zip(
+            indices,
+            _run_interval(series, group, interval, gas_units, initial_debt_usd),
+        ):
+            results[index] = result
+    return results
+
+
+def _run_interval(
+    series: MarketSeries,
+    policies: List[HarvestPolicy],
+    interval: int,
+    gas_units: int,
+    initial_debt_usd: Optional[float],
+) -> List[BacktestResult]:
+    """Backtest policies that share a check interval"""
+    t = series.timestamps
+    accrued = np.cumsum(series.accrual_usd)
+    check_times = np.arange(t[0], t[-1] + 1e-9, interval)
+    steps = np.searchsorted(t, check_times, side="right") - 1
+    gas = series.gas_price_gwei[steps]
+    cost = gas_cost_usd(gas_units, gas, series.btc_price_usd[steps])
+
+    def column(name: str, dtype=float) -> np.ndarray:
+        return np.array([getattr(p, name) for p in policies], dtype=dtype)
+
+    max_gas = column("max_gas_price_gwei")
+    min_yield = column("min_yield_threshold_usd")
+    profitability = column("enable_profitability", bool)
+    min_profit = column("min_profit_usd")
+    apr = column("yield_opportunity_apr")
+
+    # Accrued total and time at each policy's last harvest
+    claimed = np.zeros(len(policies))
+    last_harvest = np.full(len(policies), t[0])
+    harvested = np.zeros((len(steps), len(policies)), dtype=bool)
+    for k, step in enumerate(steps):
+        claimable = accrued[step] - claimed
+        elapsed = t[step] - last_harvest
+        rate = np.divide(
+            claimable, elapsed, out=np.zeros_like(claimable), where=elapsed > 0
+        )
+        mask = harvest_mask(
+            gas[k],
+            claimable,
+            max_gas,
+            min_yield,
+            cost[k],
+            profitability,
+            min_profit,
+            optimal_yield(cost[k], rate, apr),
+        )
+        claimed = np.where(mask, accrued[step], claimed)
+        last_harvest = np.where(mask, t[step], last_harvest)
+        harvested[k] = mask
+
+    days = max(series.duration_days, 1e-9)
+    gas_spent = cost @ harvested
+    results = []
+    for j, policy in enumerate(policies):
+        harvest_steps = steps[harvested[:, j]]
+        results.append(
+            BacktestResult(
+                policy=policy,
+                harvests=len(harvest_steps),
+                yield_harvested_usd=float(claimed[j]),
+                gas_spent_usd=float(gas_spent[j]),
+                net_yield_usd=float(claimed[j] - gas_spent[j]),
+                unharvested_usd=float(accrued[-1] - claimed[j]),
+                mean_lag_hours=_mean_lag_hours(series, harvest_steps),
+                debt_repaid_usd_per_day=float(claimed[j] / days),
+                days_to_repay=_days_to_repay(
+                    series, accrued, harvest_steps, initial_debt_usd
+                ),
+            )
+        )
+    return results
+
+
+def _mean_lag_hours(series: MarketSeries, harvest_steps: np.ndarray) -> float:
+    """Accrual-weighted wait between accruing and being harvested"""
+    if len(harvest_steps) == 0:
+        return math.nan
+    t = series.timestamps
+    # Accrual of step s is claimed by the first harvest at or after s
+    steps = np.arange(harvest_steps[-1] + 1)
+    claimed_by = harvest_steps[np.searchsorted(harvest_steps, steps)]
+    weights = series.accrual_usd[steps]
+    if weights.sum() <= 0:
+        return 0.0
+    return float(np.average(t[claimed_by] - t[steps], weights=weights) / 3600)
+
+
+def _days_to_repay(
+    series: MarketSeries,
+    accrued: np.ndarray,
+    harvest_steps: np.ndarray,
+    initial_debt_usd: Optional[float],
+) -> Optional[float]:
+    if initial_debt_usd is None or len(harvest_steps) == 0:
+        return None
+    repaid = np.nonzero(accrued[harvest_steps] >= initial_debt_usd)[0]
+    if len(repaid) == 0:
+        return None
+    step = harvest_steps[repaid[0]]
+    return float((series.timestamps[step] - series.timestamps[0]) / 86400)
+
+
+def synthetic_series(
+    days: float = 365.0,
+    step_seconds: int = 60,
+    yield_usd_per_day: float = 50.0,
+    gas_price_gwei: float = 0.01,
+    gas_volatility: float = 0.3,
+    spikes_per_day: float = 0.5,
+    spike_multiplier: float = 50.0,
+    spike_minutes: int = 30,
+    btc_price_usd: float = 60000.0,
+    seed: int = 0,
+) -> MarketSeries:
+    """
+    Generate a market series with noisy accrual and spiking gas
+
+    Gas follows a daily cycle with hour-scale lognormal noise, multiplied
+    by spike_multiplier during randomly started spikes.
+
+    Args:
+        days: Series length
+        step_seconds: Sample spacing
+        yield_usd_per_day: Mean yield accrual
+        gas_price_gwei: Median gas price outside spikes
+        gas_volatility: Standard deviation of log gas price noise
+        spikes_per_day: Mean number of gas spikes started per day
+        spike_multiplier: Gas price factor during a spike
+        spike_minutes: Spike duration
+        btc_price_usd: BTC/USD price (constant)
+        seed: Random seed
+
+    Returns:
+        MarketSeries starting at t=0
+    """
+    rng = np.random.default_rng(seed)
+    n = max(2, int(days * 86400 // step_seconds))
+    t = np.arange(n, dtype=float) * step_seconds
+
+    accrual = yield_usd_per_day * step_seconds / 86400 * rng.lognormal(0, 0.1, n)
+
+    # Hour-scale noise: smoothed white noise rescaled to gas_volatility
+    width = max(1, 3600 // step_seconds)
+    noise = np.convolve(rng.normal(0, 1, n), np.ones(width) / width, mode="same")
+    noise *= gas_volatility / max(noise.std(), 1e-12)
+    daily = 0.3 * np.sin(2 * np.pi * t / 86400)
+    gas = gas_price_gwei * np.exp(daily + noise)
+
+    starts = rng.random(n) < spikes_per_day * step_seconds / 86400
+    duration = max(1, spike_minutes * 60 // step_seconds)
+    spiking = np.convolve(starts, np.ones(duration), mode="full")[:n] > 0
+    gas[spiking] *= spike_multiplier
+
+    return MarketSeries(t, accrual, gas, btc_price_usd)
+
+
+def series_from_cycles(
+    cycles: List[Dict], btc_price_usd: float = 60000.0
+) -> MarketSeries:
+    """
+    Build a market series from recorded cycle snapshots
+
+    Accrual between cycles is the rise in claimable yield; where it fell
+    (a harvest), the new claimable yield accrued since.
+
+    Args:
+        cycles: Rows of StateStore.cycles(), oldest first
+        btc_price_usd: BTC/USD price (cycles do not record it)
+    """
+    t = np.array([row["block_timestamp"] for row in cycles], dtype=float)
+    claimable = np.array([row["yield_usd"] for row in cycles], dtype=float)
+    gas = np.array([row["gas_price_gwei"] for row in cycles], dtype=float)
+
+    accrual = np.zeros(len(cycles))
+    rise = np.diff(claimable)
+    accrual[1:] = np.where(rise >= 0, rise, claimable[1:])
+    return MarketSeries(t, accrual, gas, btc_price_usd)
+
+
+# Sort keys of format_results: best policy first
+SORT_KEYS = {
+    "net": lambda r: -r.net_yield_usd,
+    "lag": lambda r: (math.isnan(r.mean_lag_hours), r.mean_lag_hours),
+    "gas": lambda r: r.gas_spent_usd,
+}
+
+
+def format_results(
+    results: List[BacktestResult], limit: Optional[int] = None, sort: str = "net"
+) -> str:
+    """Results as a table, best first by net yield, harvest lag or gas spent"""
+    ranked = sorted(results, key=SORT_KEYS[sort])[:limit]
+    lines = [
+        f"{'interval':>8} {'min $':>7} {'max gwei':>8} {'profit':>6} {'apr':>5} "
+        f"{'harvests':>8} {'yield $':>11} {'gas $':>9} {'net $':>11} "
+        f"{'lag h':>7} {'repaid $/d':>10} {'repay d':>8}"
+    ]
+    for r in ranked:
+        p = r.policy
+        profitability = "on" if p.enable_profitability else "off"
+        repay = "-" if r.days_to_repay is None else f"{r.days_to_repay:.1f}"
+        lines.append(
+            f"{p.harvest_interval_seconds:>8} {p.min_yield_threshold_usd:>7g} "
+            f"{p.max_gas_price_gwei:>8g} {profitability:>6} "
+            f"{p.yield_opportunity_apr:>5g} "
+            f"{r.harvests:>8} {r.yield_harvested_usd:>11.2f} "
+            f"{r.gas_spent_usd:>9.2f} {r.net_yield_usd:>11.2f} "
+            f"{r.mean_lag_hours:>7.1f} {r.debt_repaid_usd_per_day:>10.2f} "
+            f"{repay:>8}"
+        )
+    return "\n".join(lines)
+
+
+def _numbers(text: str, kind=float) -> List:
+    return [kind(value) for value in text.split(",") if value.strip()]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Backtest harvest policies on recorded or synthetic data"
+    )
+    parser.add_argument("--db", help="Replay cycles recorded in this state store")
+    parser.add_argument("--vault", default="default", help="Vault of --db cycles")
+    parser.add_argument("--days", type=float, default=365.0, help="Synthetic days")
+    parser.add_argument(
+        "--yield-per-day", type=float, default=50.0, help="Synthetic USD/day"
+    )
+    parser.add_argument(
+        "--gas-gwei", type=float, default=0.01, help="Synthetic median gas price"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--btc-price", type=float, default=60000.0)
+    parser.add_argument("--gas-units", type=int, default=DEFAULT_GAS_UNITS)
+    parser.add_argument("--debt", type=float, help="Initial debt in USD")
+    parser.add_argument("--intervals", default="900,3600,14400,86400")
+    parser.add_argument("--thresholds", default="1,5,10,25,50,100")
+    parser.add_argument("--max-gas", default="0.05,0.2,50")
+    parser.add_argument("--min-profit", default="0")
+    parser.add_argument("--apr", default="0,0.05")
+    parser.add_argument(
+        "--profitability", default="on", choices=["on", "off", "both"]
+    )
+    parser.add_argument("--sort", default="net", choices=sorted(SORT_KEYS))
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s | %(levelname)-8s | %(message)s"
+    )
+
+    if args.db:
+        from state_store import StateStore
+
+        cycles = StateStore(args.db).cycles(args.vault)
+        if len(cycles) < 2:
+            parser.error(f"Fewer than two cycles recorded for vault {args.vault}")
+        series = series_from_cycles(cycles, args.btc_price)
+    else:
+        series = synthetic_series(
+            days=args.days,
+            yield_usd_per_day=args.yield_per_day,
+            gas_price_gwei=args.gas_gwei,
+            btc_price_usd=args.btc_price,
+            seed=args.seed,
+        )
+
+    profitability = {"on": [True], "off": [False], "both": [True, False]}
+    policies = policy_grid(
+        harvest_interval_seconds=_numbers(args.intervals, int),
+        min_yield_threshold_usd=_numbers(args.thresholds),
+        max_gas_price_gwei=_numbers(args.max_gas),
+        enable_profitability=profitability[args.profitability],
+        min_profit_usd=_numbers(args.min_profit),
+        yield_opportunity_apr=_numbers(args.apr),
+    )
+
+    start = time.perf_counter()
+    results = run_backtest(series, policies, args.gas_units, args.debt)
+    logger.info(
+        f"Backtested {len(policies)} policies over {len(series.timestamps)} "
+        f"samples ({series.duration_days:.1f} days) in "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+    print(format_results(results, args.top, args.sort))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ Configuration management for Stratum Fi Keeper Bot
 Uses pydantic-settings for type-safe environment variable loading
 """
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +23,75 @@ class KeeperConfig(BaseSettings):
         default="https://rpc.test.mezo.org",
         description="Mezo RPC endpoint URL",
     )
+    rpc_fallback_urls: str = Field(
+        default="",
+        description="Comma-separated extra RPC endpoints; with any set, reads go "
+        "to the fastest healthy endpoint and transactions to all of them",
+    )
+    rpc_timeout_seconds: float = Field(
+        default=10.0, description="HTTP timeout per RPC request (seconds)", gt=0
+    )
+    enable_rpc_hedging: bool = Field(
+        default=False,
+        description="Also send reads to a second endpoint when the first is slow",
+    )
+    http_pool_size: int = Field(
+        default=32,
+        description="Keep-alive HTTP connections pooled per host (RPC and alerts)",
+        ge=1,
+    )
+    http_connect_timeout_seconds: float = Field(
+        default=5.0, description="TCP/TLS connect timeout (seconds)", gt=0
+    )
+    http_keepalive_seconds: float = Field(
+        default=30.0,
+        description="Idle time before a pooled connection is closed (async engine)",
+        gt=0,
+    )
+    rpc_hedge_delay_seconds: float = Field(
+        default=0.25,
+        description="Shortest wait before hedging a read (the endpoint's p95 "
+        "latency is used when longer)",
+        ge=0,
+    )
+    rpc_failure_threshold: int = Field(
+        default=3,
+        description="Consecutive failures that open an endpoint's circuit breaker",
+        ge=1,
+    )
+    rpc_cooldown_seconds: float = Field(
+        default=2.0,
+        description="Time an open circuit rejects requests before a probe "
+        "(doubles while probes fail)",
+        gt=0,
+    )
+    rpc_max_cooldown_seconds: float = Field(
+        default=30.0, description="Longest time a circuit stays open", gt=0
+    )
+    rpc_read_attempts: int = Field(
+        default=3,
+        description="Attempts per RPC read on timeouts, rate limits and "
+        "connection errors",
+        ge=1,
+    )
+    rpc_broadcast_attempts: int = Field(
+        default=3, description="Attempts per transaction broadcast", ge=1
+    )
+    rpc_retry_budget_ratio: float = Field(
+        default=0.2,
+        description="Retries allowed per request over 10s, so an outage adds "
+        "bounded load",
+        ge=0,
+    )
+    error_backoff_base_seconds: float = Field(
+        default=2.0,
+        description="First wait before re-running a cycle that failed on RPC "
+        "errors (doubles per failure, jittered)",
+        gt=0,
+    )
+    error_backoff_max_seconds: float = Field(
+        default=60.0, description="Longest wait after repeated cycle failures", gt=0
+    )
     chain_id: int = Field(default=31611, description="Mezo Testnet Chain ID")
     explorer_url: str = Field(
         default="https://explorer.test.mezo.org",
@@ -47,6 +116,15 @@ class KeeperConfig(BaseSettings):
         default="0x3fffA39983C77933aB74E708B4475995E9540E4F",
         description="StrategyBTC contract address",
     )
+    multicall_address: Optional[str] = Field(
+        default="0xcA11bde05977b3631167028862bE2a173976CA11",
+        description="Multicall3 address for batched cycle reads (empty to disable)",
+    )
+    abi_search_path: str = Field(
+        default="",
+        description="Comma-separated directories searched for <Contract>.json "
+        "ABIs before the bundled ABIs",
+    )
 
     # Harvest Configuration
     harvest_interval_seconds: int = Field(
@@ -61,6 +139,139 @@ class KeeperConfig(BaseSettings):
     dry_run: bool = Field(
         default=False, description="If true, simulate transactions without sending"
     )
+    enable_yield_forecast: bool = Field(
+        default=False,
+        description="Sleep until yield is forecast to cross the threshold "
+        "(bounded by min_check_interval_seconds and harvest_interval_seconds)",
+    )
+    min_check_interval_seconds: int = Field(
+        default=60, description="Shortest forecast-scheduled sleep (seconds)", ge=10
+    )
+
+    # Pricing
+    price_sources: str = Field(
+        default="pyth,pool,static",
+        description="Comma-separated price sources in priority order "
+        "(pyth, pool, static)",
+    )
+    price_ttl_seconds: float = Field(
+        default=30.0, description="How long a fetched token price is reused", gt=0
+    )
+    max_price_age_seconds: int = Field(
+        default=3600, description="Never value yield with older prices", ge=1
+    )
+    musd_price_usd: float = Field(
+        default=1.0, description="MUSD/USD peg (static price and pool quote)", gt=0
+    )
+    btc_price_usd: float = Field(
+        default=60000.0, description="Static BTC/USD fallback price", gt=0
+    )
+
+    # Profitability
+    enable_profitability: bool = Field(
+        default=True,
+        description="Harvest only when yield net of expected gas cost is profitable",
+    )
+    min_profit_usd: float = Field(
+        default=0.0, description="Minimum net profit after gas to harvest", ge=0
+    )
+    yield_opportunity_apr: float = Field(
+        default=0.0,
+        description="Annual return forgone on unharvested yield, used to size "
+        "the optimal harvest point (0 disables: harvest at the threshold once "
+        "net profit clears MIN_PROFIT_USD)",
+        ge=0,
+    )
+
+    # Pre-flight Simulation
+    enable_harvest_simulation: bool = Field(
+        default=True,
+        description="Simulate harvest() at the pending block and skip reverts "
+        "or low output before sending",
+    )
+    max_harvest_slippage: float = Field(
+        default=0.02,
+        description="Largest tolerated shortfall of simulated MUSD output "
+        "against claimable yield (fraction)",
+        ge=0,
+        le=1,
+    )
+
+    # Gas Pricing
+    enable_gas_oracle: bool = Field(
+        default=True,
+        description="Price from eth_feeHistory and send EIP-1559 transactions "
+        "(falls back to legacy eth_gasPrice if unsupported)",
+    )
+    gas_history_blocks: int = Field(
+        default=20,
+        description="Blocks of fee history kept by the gas oracle",
+        ge=1,
+        le=1024,
+    )
+    gas_priority_tier: str = Field(
+        default="standard", description="Priority fee tier (slow, standard, fast)"
+    )
+
+    # Transaction Lifecycle
+    tx_replace_after_blocks: int = Field(
+        default=3,
+        description="Blocks a harvest may stay unmined before it is re-sent with "
+        "the same nonce and higher fees (0 disables speed-ups and cancels)",
+        ge=0,
+    )
+    tx_fee_bump_percent: float = Field(
+        default=12.5,
+        description="Fee increase per replacement (nodes require at least 10%)",
+        ge=10,
+    )
+    tx_max_replacements: int = Field(
+        default=5, description="Replacements sent per harvest nonce", ge=0
+    )
+    tx_confirmations: int = Field(
+        default=1,
+        description="Blocks (including its own) before a harvest receipt is "
+        "final; a receipt whose block is reorged out is rebroadcast",
+        ge=1,
+    )
+    tx_timeout_seconds: float = Field(
+        default=300.0,
+        description="How long a cycle tracks a pending harvest before giving up "
+        "(tracking resumes on the next cycle)",
+        gt=0,
+    )
+    tx_poll_interval_seconds: float = Field(
+        default=1.0,
+        description="New block polling interval while a harvest is pending",
+        gt=0,
+    )
+
+    # Engine
+    async_mode: bool = Field(
+        default=False,
+        description="Run the asyncio engine (AsyncWeb3, single event loop)",
+    )
+    balance_poll_interval_seconds: int = Field(
+        default=300, description="Keeper balance polling interval (async mode)", ge=10
+    )
+    vaults_file: Optional[str] = Field(
+        default=None,
+        description="JSON file of vault definitions (enables multi-vault async mode)",
+    )
+    max_concurrent_vaults: int = Field(
+        default=32, description="Maximum vaults checked concurrently", ge=1
+    )
+    trigger_mode: str = Field(
+        default="interval",
+        description="Harvest trigger: 'interval' (fixed timer) or 'block' (new logs)",
+    )
+    block_poll_interval_seconds: float = Field(
+        default=2.0, description="New head polling interval in block mode", gt=0
+    )
+    ws_url: Optional[str] = Field(
+        default=None,
+        description="Websocket RPC for newHeads subscriptions (async block mode)",
+    )
 
     # Monitoring
     enable_prometheus: bool = Field(
@@ -69,12 +280,51 @@ class KeeperConfig(BaseSettings):
     prometheus_port: int = Field(
         default=8000, description="Prometheus metrics server port", ge=1024, le=65535
     )
+    health_port: int = Field(
+        default=8080,
+        description="Health check server port (0 picks a free port)",
+        ge=0,
+        le=65535,
+    )
+    health_max_snapshot_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Readiness fails when the keeper's last successful RPC read "
+        "is older than this (default: 2x harvest interval + 60s)",
+        gt=0,
+    )
+    enable_profiling: bool = Field(
+        default=False,
+        description="Serve /debug/profile and /debug/memory on the health server",
+    )
     enable_slack_alerts: bool = Field(
         default=False, description="Enable Slack webhook alerts"
     )
     slack_webhook_url: Optional[str] = Field(
         default=None, description="Slack webhook URL for alerts"
     )
+    alert_webhook_url: Optional[str] = Field(
+        default=None, description="Generic webhook receiving alerts as JSON"
+    )
+    alert_file: Optional[str] = Field(
+        default=None, description="JSON lines file alerts are appended to"
+    )
+    alert_dedup_window_seconds: float = Field(
+        default=300.0,
+        description="Repeats of an alert within this window are sent as one summary",
+        ge=0,
+    )
+    alert_rate_limit_per_minute: int = Field(
+        default=20, description="Maximum alert deliveries per minute", ge=1
+    )
+    alert_queue_size: int = Field(
+        default=1000, description="Alerts queued for delivery before dropping", ge=1
+    )
+
+    # State Store
+    state_db_path: Optional[str] = Field(
+        default="data/keeper_state.db",
+        description="SQLite file for cycle and harvest history (empty disables)",
+    )
 
     # Logging
     log_level: str = Field(
@@ -84,6 +334,17 @@ class KeeperConfig(BaseSettings):
     log_file: str = Field(
         default="logs/keeper.log", description="Log file path"
     )
+    log_format: str = Field(
+        default="text", description="Log format: text (colorized) or json (lines)"
+    )
+    log_max_bytes: int = Field(
+        default=10 * 1024 * 1024,
+        description="Log file size that triggers rotation (0 never rotates)",
+        ge=0,
+    )
+    log_backup_count: int = Field(
+        default=5, description="Rotated log files kept", ge=0
+    )
 
     @field_validator("keeper_private_key")
     @classmethod
@@ -105,6 +366,68 @@ class KeeperConfig(BaseSettings):
             raise ValueError(f"Log level must be one of: {', '.join(valid_levels)}")
         return v_upper
 
+    @field_validator("log_format")
+    @classmethod
+    def validate_log_format(cls, v: str) -> str:
+        """Ensure log format is known"""
+        v_lower = v.strip().lower()
+        if v_lower not in ("text", "json"):
+            raise ValueError("Log format must be one of: text, json")
+        return v_lower
+
+    @field_validator("price_sources")
+    @classmethod
+    def validate_price_sources(cls, v: str) -> str:
+        """Ensure every price source is known"""
+        valid_sources = ["pyth", "pool", "static"]
+        sources = [s.strip().lower() for s in v.split(",") if s.strip()]
+        if not sources or any(s not in valid_sources for s in sources):
+            raise ValueError(
+                f"Price sources must be from: {', '.join(valid_sources)}"
+            )
+        return ",".join(sources)
+
+    @property
+    def price_source_list(self) -> List[str]:
+        """Price sources in priority order"""
+        return self.price_sources.split(",")
+
+    @property
+    def health_max_age_seconds(self) -> float:
+        """Staleness limit of the health snapshot served to probes"""
+        if self.health_max_snapshot_age_seconds is not None:
+            return self.health_max_snapshot_age_seconds
+        return 2 * self.harvest_interval_seconds + 60
+
+    @property
+    def rpc_url_list(self) -> List[str]:
+        """Primary RPC endpoint followed by the fallbacks"""
+        fallbacks = [u.strip() for u in self.rpc_fallback_urls.split(",")]
+        return [self.rpc_url] + [u for u in fallbacks if u and u != self.rpc_url]
+
+    @property
+    def abi_search_path_list(self) -> List[str]:
+        """ABI directories, in search order"""
+        return [d.strip() for d in self.abi_search_path.split(",") if d.strip()]
+
+    @field_validator("gas_priority_tier")
+    @classmethod
+    def validate_priority_tier(cls, v: str) -> str:
+        """Ensure priority fee tier is valid"""
+        v_lower = v.lower()
+        if v_lower not in ("slow", "standard", "fast"):
+            raise ValueError("Priority tier must be one of: slow, standard, fast")
+        return v_lower
+
+    @field_validator("trigger_mode")
+    @classmethod
+    def validate_trigger_mode(cls, v: str) -> str:
+        """Ensure trigger mode is valid"""
+        v_lower = v.lower()
+        if v_lower not in ("interval", "block"):
+            raise ValueError("Trigger mode must be one of: interval, block")
+        return v_lower
+
     @field_validator("slack_webhook_url")
     @classmethod
     def validate_slack_url(cls, v: Optional[str], info) -> Optional[str]:
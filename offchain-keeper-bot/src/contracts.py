@@ -4,18 +4,341 @@ Handles Web3 connection and contract method calls
 """
 
 import json
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from web3 import Web3
 from web3.contract import Contract
-from web3.exceptions import ContractLogicError
+from web3.exceptions import ContractLogicError, TransactionNotFound
+from web3.middleware import simple_cache_middleware
 from eth_account import Account
 import logging
 
+from nonce_manager import NonceManager
+from gas_oracle import GasOracle, REWARD_PERCENTILES, is_unsupported_error
+from pricing import PriceMarket, PriceOracle
+from simulation import (
+    TRACE_CONFIG,
+    HarvestSimulation,
+    simulation_from_quote,
+    simulation_from_trace,
+)
+from http_transport import HttpTransport
+from metrics import DEFAULT_VAULT, phase_timer
+from rpc_pool import EndpointPool, RPCPoolProvider
+from tx_lifecycle import (
+    CANCEL,
+    CONFIRMED,
+    LOST,
+    REBROADCAST,
+    REORGED,
+    REPLACE,
+    HarvestTxMixin,
+    TrackedTx,
+    TxAction,
+    TxLifecycle,
+)
+from tx_template import TxTemplate
+
 logger = logging.getLogger("keeper.contracts")
 
+# Canonical Multicall3 deployment address (same on most EVM chains)
+DEFAULT_MULTICALL_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Harvest gas used when estimation fails, and how long an estimate is reused
+HARVEST_GAS_FALLBACK = 500_000
+GAS_ESTIMATE_TTL_SECONDS = 600
+
+# Minimal Tigris (Aerodrome-style) pool ABI - token lookup and swap quotes
+TIGRIS_POOL_ABI = [
+    {
+        "inputs": [],
+        "name": "token0",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "token1",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
+            {"internalType": "address", "name": "tokenIn", "type": "address"},
+        ],
+        "name": "getAmountOut",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+# Minimal Multicall3 ABI - only the methods used for cycle snapshots
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getBlockNumber",
+        "outputs": [{"internalType": "uint256", "name": "blockNumber", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getCurrentBlockTimestamp",
+        "outputs": [{"internalType": "uint256", "name": "timestamp", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"internalType": "uint256", "name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+@dataclass(frozen=True)
+class CycleSnapshot:
+    """Chain state read for one harvest cycle, pinned to a single block"""
+
+    block_number: int
+    block_timestamp: int
+    gas_price_gwei: float
+    claimable0: float
+    claimable1: float
+    keeper_balance_btc: float
+    total_debt: float
+    total_btc_deposited: float
+
+
+@lru_cache(maxsize=None)
+def load_abi(contract_name: str, search_path: Tuple[str, ...] = ()) -> list:
+    """
+    Load a contract ABI
+
+    Directories on the search path are checked for <contract_name>.json
+    (a Hardhat artifact or a bare ABI list) first, so freshly deployed
+    ABIs can be mounted over the bundled ones. Otherwise the entries the
+    keeper uses are taken from abi_bundle (see scripts/build_abi_bundle.py).
+
+    Args:
+        contract_name: Name of contract (e.g., 'Harvester')
+        search_path: Directories to search before the bundled ABIs
+
+    Returns:
+        Contract ABI as list
+    """
+    for directory in search_path:
+        abi_path = Path(directory) / f"{contract_name}.json"
+        if abi_path.exists():
+            with open(abi_path, "r") as f:
+                abi_data = json.load(f)
+            return abi_data["abi"] if isinstance(abi_data, dict) else abi_data
+
+    from abi_bundle import ABIS
+
+    if contract_name not in ABIS:
+        searched = ", ".join(search_path) or "no directories"
+        raise FileNotFoundError(
+            f"ABI not found: {contract_name} (searched {searched} and the bundle)"
+        )
+    return ABIS[contract_name]
+
+
+def build_snapshot_calls(
+    multicall: Contract,
+    harvester: Contract,
+    debt_manager: Contract,
+    strategy_btc: Contract,
+    keeper_address: str,
+) -> List[Tuple[str, bool, str]]:
+    """
+    Build the Multicall3 aggregate3 call list for a cycle snapshot
+
+    Works with both sync and async contract instances, since only
+    ABI encoding is performed.
+
+    Returns:
+        List of (target, allowFailure, callData) tuples
+    """
+    return [
+        (
+            multicall.address,
+            False,
+            multicall.encodeABI(fn_name="getBlockNumber"),
+        ),
+        (
+            multicall.address,
+            False,
+            multicall.encodeABI(fn_name="getCurrentBlockTimestamp"),
+        ),
+        (
+            multicall.address,
+            False,
+            multicall.encodeABI(fn_name="getEthBalance", args=[keeper_address]),
+        ),
+        (
+            harvester.address,
+            True,
+            harvester.encodeABI(fn_name="getClaimableYield"),
+        ),
+        (
+            debt_manager.address,
+            True,
+            debt_manager.encodeABI(fn_name="totalDebt"),
+        ),
+        (
+            strategy_btc.address,
+            True,
+            strategy_btc.encodeABI(fn_name="totalBTCDeposited"),
+        ),
+    ]
+
+
+def build_batch_calls(
+    multicall: Contract, calls: List[Tuple[str, bool, bytes]]
+) -> List[Tuple[str, bool, bytes]]:
+    """
+    Prefix an aggregate3 call list with block number and timestamp reads
+
+    Returns:
+        Call list for split_batch_results
+    """
+    return [
+        (multicall.address, False, multicall.encodeABI(fn_name="getBlockNumber")),
+        (
+            multicall.address,
+            False,
+            multicall.encodeABI(fn_name="getCurrentBlockTimestamp"),
+        ),
+    ] + list(calls)
+
+
+def split_batch_results(
+    codec, results: List[Tuple[bool, bytes]]
+) -> Tuple[int, int, List[Tuple[bool, bytes]]]:
+    """
+    Decode aggregate3 results built by build_batch_calls
+
+    Returns:
+        (block_number, block_timestamp, results of the caller's calls)
+    """
+    (block_number,) = codec.decode(["uint256"], results[0][1])
+    (block_timestamp,) = codec.decode(["uint256"], results[1][1])
+    return block_number, block_timestamp, list(results[2:])
+
+
+def decode_snapshot(
+    codec, results: List[Tuple[bool, bytes]], gas_price_wei: int
+) -> CycleSnapshot:
+    """
+    Decode aggregate3 results built by build_snapshot_calls
+
+    Args:
+        codec: ABI codec (w3.codec)
+        results: aggregate3 (success, returnData) list
+        gas_price_wei: Gas price sampled alongside the multicall
+
+    Returns:
+        Decoded CycleSnapshot
+    """
+
+    def decode(index: int, types: list) -> tuple:
+        success, data = results[index]
+        if not success or not data:
+            return tuple(0 for _ in types)
+        return codec.decode(types, data)
 
-class ContractManager:
+    (block_number,) = decode(0, ["uint256"])
+    (block_timestamp,) = decode(1, ["uint256"])
+    (balance_wei,) = decode(2, ["uint256"])
+    claimable0_wei, claimable1_wei = decode(3, ["uint256", "uint256"])
+    (total_debt_wei,) = decode(4, ["uint256"])
+    (total_btc_wei,) = decode(5, ["uint256"])
+
+    return CycleSnapshot(
+        block_number=block_number,
+        block_timestamp=block_timestamp,
+        gas_price_gwei=float(Web3.from_wei(gas_price_wei, "gwei")),
+        claimable0=float(Web3.from_wei(claimable0_wei, "ether")),
+        claimable1=float(Web3.from_wei(claimable1_wei, "ether")),
+        keeper_balance_btc=float(Web3.from_wei(balance_wei, "ether")),
+        total_debt=float(Web3.from_wei(total_debt_wei, "ether")),
+        total_btc_deposited=float(Web3.from_wei(total_btc_wei, "ether")),
+    )
+
+
+def create_web3(
+    rpc_urls: List[str],
+    hedge: bool = False,
+    hedge_min_delay: float = 0.25,
+    timeout: float = 10.0,
+    transport: Optional[HttpTransport] = None,
+    pool: Optional[EndpointPool] = None,
+) -> Web3:
+    """
+    Create a Web3 instance for the keeper
+
+    Requests go through an RPCPoolProvider, even for a single URL, so
+    every endpoint gets a circuit breaker and budgeted retries (settings
+    come from pool, default built from rpc_urls). With several URLs reads
+    go to the fastest healthy endpoint, fail over (and optionally hedge)
+    on errors, and transactions are broadcast to all. Requests post
+    through the transport's pooled keep-alive session.
+    """
+    transport = transport or HttpTransport()
+    provider = RPCPoolProvider(
+        rpc_urls,
+        hedge=hedge,
+        hedge_min_delay=hedge_min_delay,
+        timeout=timeout,
+        pool=pool,
+        transport=transport,
+    )
+    w3 = Web3(provider)
+    # Cache static responses (eth_chainId) so request validation does not
+    # add an extra round trip to every eth_call
+    w3.middleware_onion.add(simple_cache_middleware)
+    return w3
+
+
+class ContractManager(HarvestTxMixin):
     """Manages Web3 connection and smart contract interactions"""
 
     def __init__(
@@ -26,6 +349,13 @@ class ContractManager:
         harvester_address: str,
         debt_manager_address: str,
         strategy_btc_address: str,
+        multicall_address: Optional[str] = DEFAULT_MULTICALL_ADDRESS,
+        gas_oracle: Optional[GasOracle] = None,
+        priority_tier: str = "standard",
+        w3: Optional[Web3] = None,
+        vault: str = DEFAULT_VAULT,
+        abi_search_path: Sequence[str] = (),
+        lifecycle: Optional[TxLifecycle] = None,
     ):
         """
         Initialize contract manager
@@ -37,27 +367,67 @@ class ContractManager:
             harvester_address: Harvester contract address
             debt_manager_address: DebtManager contract address
             strategy_btc_address: StrategyBTC contract address
+            multicall_address: Multicall3 address for batched reads
+                (None disables batching)
+            gas_oracle: Fee history oracle for smoothed prices and type-2
+                transactions (None uses legacy eth_gasPrice)
+            priority_tier: Priority fee tier for type-2 transactions
+            w3: Web3 instance (created from rpc_url if omitted)
+            vault: Vault label for phase timing metrics
+            abi_search_path: Directories searched for ABI files before the
+                bundled ABIs
+            lifecycle: Tracker that speeds up, cancels and rebroadcasts
+                stuck harvests (defaults built if omitted)
         """
         self.rpc_url = rpc_url
         self.chain_id = chain_id
         self.private_key = private_key
+        self.gas_oracle = gas_oracle
+        self.priority_tier = priority_tier
+        self.vault = vault
+
+        # Attached by the keeper once the vault's price market is resolved
+        self.price_oracle: Optional[PriceOracle] = None
+        self.price_market: Optional[PriceMarket] = None
+
+        # Cleared when the node turns out not to implement debug_traceCall
+        self.trace_simulation = True
 
         # Initialize Web3
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to RPC: {rpc_url}")
+        self.w3 = w3 if w3 is not None else create_web3([rpc_url])
 
         # Setup account
         self.account = Account.from_key(private_key)
         self.address = self.account.address
+        self.nonce_manager = NonceManager(self.address)
+        self.lifecycle = lifecycle if lifecycle is not None else TxLifecycle()
+        self.pending_nonces: Dict[str, int] = {}
+        # Wall-clock broadcast time per pending tx, for inclusion latency
+        self.submitted_at: Dict[str, float] = {}
+        # Receipt of the last harvest waited for (gas paid, block)
+        self.last_receipt: Optional[Dict] = None
+        # How the last wait ended: CONFIRMED, CANCEL, LOST, or WAIT if the
+        # harvest was still pending at the timeout
+        self.last_tx_outcome: Optional[str] = None
 
         logger.info(f"Keeper wallet: {self.address}")
-        logger.info(f"Connected to chain ID: {self.w3.eth.chain_id}")
+        # Resolved once; every harvest is signed for this chain ID. Doubles as
+        # the connectivity check, saving a round trip at startup
+        try:
+            node_chain_id = self.w3.eth.chain_id
+        except Exception as e:
+            raise ConnectionError(f"Failed to connect to RPC: {rpc_url}") from e
+        if node_chain_id != chain_id:
+            raise ConnectionError(
+                f"RPC chain ID {node_chain_id} does not match configured {chain_id}"
+            )
+        logger.info(f"Connected to chain ID: {node_chain_id}")
 
         # Load contract ABIs
-        self.harvester_abi = self._load_abi("Harvester")
-        self.debt_manager_abi = self._load_abi("DebtManager")
-        self.strategy_btc_abi = self._load_abi("StrategyBTC")
+        search_path = tuple(abi_search_path)
+        self.harvester_abi = load_abi("Harvester", search_path)
+        self.debt_manager_abi = load_abi("DebtManager", search_path)
+        self.strategy_btc_abi = load_abi("StrategyBTC", search_path)
 
         # Initialize contracts
         self.harvester = self.w3.eth.contract(
@@ -73,33 +443,29 @@ class ContractManager:
             abi=self.strategy_btc_abi,
         )
 
-        logger.info("Contract instances initialized")
-
-    def _load_abi(self, contract_name: str) -> list:
-        """
-        Load ABI from frontend abi directory
-
-        Args:
-            contract_name: Name of contract (e.g., 'Harvester')
+        # Multicall3 is optional: snapshots fall back to sequential reads
+        self.multicall = None
+        if multicall_address:
+            self.multicall = self.w3.eth.contract(
+                address=Web3.to_checksum_address(multicall_address),
+                abi=MULTICALL3_ABI,
+            )
 
-        Returns:
-            Contract ABI as list
-        """
-        # Look for ABI in frontend/stratum-fi/abi/
-        abi_path = (
-            Path(__file__).parent.parent
-            / "frontend"
-            / "stratum-fi"
-            / "abi"
-            / f"{contract_name}.json"
+        # Prebuilt harvest transaction: only nonce and fees are filled at send
+        self.harvest_template = TxTemplate(
+            to=self.harvester.address,
+            data=self.harvester.encodeABI(fn_name="harvest"),
+            chain_id=self.chain_id,
+            fallback_gas=HARVEST_GAS_FALLBACK,
+            validity_seconds=GAS_ESTIMATE_TTL_SECONDS,
         )
 
-        if not abi_path.exists():
-            raise FileNotFoundError(f"ABI not found: {abi_path}")
+        logger.info("Contract instances initialized")
 
-        with open(abi_path, "r") as f:
-            abi_data = json.load(f)
-            return abi_data["abi"]
+    def close(self):
+        """Release the RPC pool's worker threads"""
+        if isinstance(self.w3.provider, RPCPoolProvider):
+            self.w3.provider.close()
 
     def is_connected(self) -> bool:
         """Check if Web3 is connected"""
@@ -109,19 +475,19 @@ class ContractManager:
         except Exception:
             return False
 
-    def get_keeper_balance(self) -> float:
+    def get_keeper_balance(self) -> Optional[float]:
         """
         Get keeper wallet BTC balance
 
         Returns:
-            Balance in BTC (as float)
+            Balance in BTC (as float), or None if the read failed
         """
         try:
             balance_wei = self.w3.eth.get_balance(self.address)
             return float(self.w3.from_wei(balance_wei, "ether"))
         except Exception as e:
             logger.error(f"Failed to get keeper balance: {e}")
-            return 0.0
+            return None
 
     def get_gas_price(self) -> float:
         """
@@ -137,6 +503,69 @@ class ContractManager:
             logger.error(f"Failed to get gas price: {e}")
             return 0.0
 
+    def sample_gas_price_wei(self) -> int:
+        """
+        Gas price used for this cycle's harvest decision
+
+        Refreshes the fee history oracle and returns its smoothed price,
+        falling back to an eth_gasPrice spot sample without one.
+
+        Returns:
+            Gas price in wei
+        """
+        if self.gas_oracle is not None and self.gas_oracle.enabled:
+            try:
+                self.gas_oracle.ingest(
+                    self.w3.eth.fee_history(
+                        self.gas_oracle.history_blocks, "latest", REWARD_PERCENTILES
+                    )
+                )
+                smoothed = self.gas_oracle.smoothed_gas_price_wei()
+                if smoothed is not None:
+                    return smoothed
+            except Exception as e:
+                if is_unsupported_error(e):
+                    logger.warning(
+                        f"eth_feeHistory not supported, using legacy gas pricing: {e}"
+                    )
+                    self.gas_oracle.enabled = False
+                else:
+                    logger.warning(f"Failed to refresh fee history: {e}")
+
+        return self.w3.eth.gas_price
+
+    def refresh_harvest_template(self):
+        """Re-estimate harvest() gas for the prebuilt harvest transaction"""
+        template = self.harvest_template
+        try:
+            estimate = self.w3.eth.estimate_gas(
+                {"from": self.address, "to": template.to, "data": template.data}
+            )
+        except Exception as e:
+            # harvest() reverts when there is nothing to claim; keep the
+            # previous estimate (or the fallback) for another window rather
+            # than retrying each cycle
+            logger.debug("Harvest gas estimation failed: %s", e)
+            estimate = None
+        template.update_gas(estimate)
+
+    def estimate_harvest_gas(self) -> int:
+        """
+        Expected gas used by harvest(), valid for GAS_ESTIMATE_TTL_SECONDS
+
+        Returns:
+            Gas estimate (HARVEST_GAS_FALLBACK if estimation fails)
+        """
+        if not self.harvest_template.is_valid():
+            self.refresh_harvest_template()
+        return self.harvest_template.expected_gas
+
+    def _fee_params(self) -> Dict[str, int]:
+        """Type-2 fee fields from the gas oracle, or a legacy gasPrice"""
+        if self.gas_oracle is not None and self.gas_oracle.has_data:
+            return self.gas_oracle.build_fee_params(self.priority_tier)
+        return {"gasPrice": self.w3.eth.gas_price}
+
     def get_claimable_yield(self) -> Tuple[float, float]:
         """
         Query claimable yield from Harvester contract
@@ -148,7 +577,9 @@ class ContractManager:
             result = self.harvester.functions.getClaimableYield().call()
             claimable0 = float(self.w3.from_wei(result[0], "ether"))
             claimable1 = float(self.w3.from_wei(result[1], "ether"))
-            logger.debug(f"Claimable yield: {claimable0} token0, {claimable1} token1")
+            logger.debug(
+                "Claimable yield: %s token0, %s token1", claimable0, claimable1
+            )
             return claimable0, claimable1
         except ContractLogicError as e:
             logger.warning(f"Contract logic error querying yield: {e}")
@@ -157,88 +588,528 @@ class ContractManager:
             logger.error(f"Failed to get claimable yield: {e}")
             return 0.0, 0.0
 
-    def estimate_yield_usd(self, claimable0: float, claimable1: float) -> float:
+    def estimate_yield_usd(
+        self, claimable0: float, claimable1: float
+    ) -> Optional[float]:
         """
         Estimate total yield in USD
-        Simplified: assumes both tokens are USD-pegged stablecoins
+
+        Values pool token0/token1 with the price oracle when one is
+        attached; otherwise assumes both tokens are USD-pegged.
 
         Args:
             claimable0: Amount of token0
             claimable1: Amount of token1
 
         Returns:
-            Total yield in USD
+            Total yield in USD, or None if a token has no fresh price
         """
-        # TODO: Integrate real price oracle (Pyth) for accurate USD conversion
-        # For now, assume 1:1 USD peg for MUSD tokens
-        return claimable0 + claimable1
+        if self.price_oracle is None or self.price_market is None:
+            return claimable0 + claimable1
+        return self.price_oracle.value_usd(
+            {self.price_market.token0: claimable0, self.price_market.token1: claimable1}
+        )
 
-    def execute_harvest(self, dry_run: bool = False) -> Optional[str]:
+    def get_price_market(self) -> PriceMarket:
         """
-        Execute harvest transaction
-
-        Args:
-            dry_run: If True, simulate without sending transaction
+        Resolve the pool, tokens and Pyth feed used to price this vault's yield
 
         Returns:
-            Transaction hash if successful, None otherwise
+            PriceMarket (cached after the first call)
         """
+        if self.price_market is not None:
+            return self.price_market
+
+        pool_address = self.strategy_btc.functions.musdBtcPool().call()
+        pool = self.w3.eth.contract(address=pool_address, abi=TIGRIS_POOL_ABI)
+
+        pyth, feed_id = None, None
         try:
-            # Build transaction
-            nonce = self.w3.eth.get_transaction_count(self.address)
-            gas_price = self.w3.eth.gas_price
+            pyth = self.debt_manager.functions.pythOracle().call()
+            feed_id = self.debt_manager.functions.btcPriceFeedId().call()
+        except Exception as e:
+            logger.warning(f"Pyth BTC feed unavailable: {e}")
 
-            # Estimate gas
+        self.price_market = PriceMarket(
+            pool=pool_address,
+            token0=pool.functions.token0().call(),
+            token1=pool.functions.token1().call(),
+            btc=self.strategy_btc.functions.btc().call(),
+            musd=self.strategy_btc.functions.musd().call(),
+            pyth=pyth,
+            btc_feed_id=feed_id,
+        )
+        return self.price_market
+
+    def execute_batch(
+        self, calls: List[Tuple[str, bool, bytes]]
+    ) -> Tuple[int, int, List[Tuple[bool, bytes]]]:
+        """
+        Execute aggregate3-style calls pinned to one block
+
+        Uses one Multicall3 eth_call when available, otherwise individual
+        eth_calls at the latest block.
+
+        Returns:
+            (block_number, block_timestamp, per-call (success, data))
+        """
+        if self.multicall is not None:
+            results = self.multicall.functions.aggregate3(
+                build_batch_calls(self.multicall, calls)
+            ).call()
+            return split_batch_results(self.w3.codec, results)
+
+        block = self.w3.eth.get_block("latest")
+        results = []
+        for target, _, data in calls:
             try:
-                gas_estimate = self.harvester.functions.harvest().estimate_gas(
-                    {"from": self.address}
-                )
-                gas_limit = int(gas_estimate * 1.2)  # Add 20% buffer
+                result = self.w3.eth.call({"to": target, "data": data}, block["number"])
+                results.append((True, bytes(result)))
+            except Exception:
+                results.append((False, b""))
+        return block["number"], block["timestamp"], results
+
+    def refresh_prices(self, tokens: List[str], block_number: Optional[int] = None):
+        """
+        Fetch expired token prices in one batched request
+
+        Args:
+            tokens: Tokens about to be valued
+            block_number: Current block, if known (skips same-block refetches)
+        """
+        oracle = self.price_oracle
+        if oracle is None:
+            return
+        stale = oracle.tokens_to_refresh(tokens, block_number)
+        if not stale:
+            return
+
+        plan, calls = oracle.build_calls(stale)
+        block_timestamp, results = time.time(), []
+        if calls:
+            try:
+                block_number, block_timestamp, results = self.execute_batch(calls)
             except Exception as e:
-                logger.warning(f"Gas estimation failed, using default: {e}")
-                gas_limit = 500_000  # Fallback
-
-            tx = self.harvester.functions.harvest().build_transaction(
-                {
-                    "from": self.address,
-                    "nonce": nonce,
-                    "gas": gas_limit,
-                    "gasPrice": gas_price,
-                    "chainId": self.chain_id,
-                }
+                logger.warning(f"Price refresh failed: {e}")
+                return
+        oracle.ingest(plan, results, block_number, block_timestamp)
+
+    def _reserve_nonce(self) -> int:
+        """Reserve the next local nonce, syncing from chain when required"""
+        if self.nonce_manager.needs_sync:
+            self.nonce_manager.sync(
+                self.w3.eth.get_transaction_count(self.address, "pending")
             )
+        return self.nonce_manager.reserve()
+
+    def submit_harvest(
+        self, dry_run: bool = False, fee_ceiling_wei: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Sign and broadcast a harvest transaction without waiting for it
+
+        Uses the prebuilt harvest template, so only the nonce and fees are
+        filled in here; gas is re-estimated inline only if the template's
+        estimate has expired. A harvest still pending from an earlier wait
+        is returned instead of broadcasting another one behind it.
+
+        Args:
+            dry_run: If True, build the transaction but do not send it
+            fee_ceiling_wei: Highest effective gas price at which the harvest
+                is still worth landing; past it a stuck harvest is cancelled
+
+        Returns:
+            Transaction hash if broadcast, None otherwise
+        """
+        pending = self.pending_harvest(fee_ceiling_wei)
+        if pending is not None:
+            return pending
+
+        nonce = None
+        try:
+            template = self.harvest_template
+            with phase_timer("gas_estimation", self.vault):
+                if not template.is_valid():
+                    self.refresh_harvest_template()
+                fee_params = self._fee_params()
 
             if dry_run:
                 logger.info(
-                    f"[DRY RUN] Would send harvest transaction with gas: {gas_limit}"
+                    f"[DRY RUN] Would send harvest transaction with gas: "
+                    f"{template.gas_limit}"
                 )
                 return None
 
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            nonce = self._reserve_nonce()
+            with phase_timer("signing", self.vault):
+                signed_tx = self.account.sign_transaction(
+                    template.build(nonce, fee_params)
+                )
+            with phase_timer("broadcast", self.vault):
+                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
             tx_hash_hex = tx_hash.hex()
+            self._track_harvest(
+                tx_hash_hex,
+                nonce,
+                signed_tx.rawTransaction,
+                fee_params,
+                fee_ceiling_wei=fee_ceiling_wei,
+            )
+            return tx_hash_hex
 
-            logger.info(f"Harvest transaction sent: {tx_hash_hex}")
+        except ContractLogicError as e:
+            logger.error(f"Contract logic error during harvest: {e}")
+            if nonce is not None:
+                self.nonce_manager.release(nonce, e)
+            return None
+        except Exception as e:
+            logger.error(f"Failed to submit harvest: {e}")
+            if nonce is not None:
+                self.nonce_manager.release(nonce, e)
+            return None
 
-            # Wait for receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
+    def simulate_harvest(
+        self, claimable0: float, claimable1: float
+    ) -> Optional[HarvestSimulation]:
+        """
+        Simulate harvest() from the keeper wallet at the pending block
 
-            if receipt["status"] == 1:
-                logger.info(
-                    f"Harvest successful! Gas used: {receipt['gasUsed']}"
+        Traces the call with debug_traceCall to read the Harvested log and
+        gas used. Nodes without tracing get an eth_estimateGas revert check
+        (which also measures gas) and a pool quote for the BTC -> MUSD swap.
+        The measured gas raises the harvest template's gas limit if the
+        template's estimate was taken on a cheaper harvest() branch.
+
+        Args:
+            claimable0: Claimable pool token0
+            claimable1: Claimable pool token1
+
+        Returns:
+            HarvestSimulation, or None if the simulation itself failed
+        """
+        template = self.harvest_template
+        tx = {"from": self.address, "to": template.to, "data": template.data}
+
+        if self.trace_simulation:
+            try:
+                frame = self.w3.manager.request_blocking(
+                    "debug_traceCall", [tx, "pending", TRACE_CONFIG]
                 )
-                return tx_hash_hex
-            else:
-                logger.error("Harvest transaction reverted")
-                return None
+                simulation = simulation_from_trace(frame, template.to)
+                template.record_simulated_gas(simulation.gas_used)
+                return simulation
+            except Exception as e:
+                if is_unsupported_error(e):
+                    logger.info(
+                        "debug_traceCall not supported, simulating with "
+                        f"eth_estimateGas: {e}"
+                    )
+                    self.trace_simulation = False
+                else:
+                    logger.debug("Harvest trace failed, using eth_estimateGas: %s", e)
 
+        try:
+            gas_used = self.w3.eth.estimate_gas(tx, "pending")
         except ContractLogicError as e:
-            logger.error(f"Contract logic error during harvest: {e}")
+            return HarvestSimulation(reverted=True, revert_reason=str(e))
+        except Exception as e:
+            logger.warning(f"Harvest simulation failed: {e}")
             return None
+
+        template.record_simulated_gas(gas_used)
+        return replace(self._quote_harvest(claimable0, claimable1), gas_used=gas_used)
+
+    def _quote_harvest(self, claimable0: float, claimable1: float) -> HarvestSimulation:
+        """Predict the harvested MUSD from a pool quote for the BTC swap"""
+        market = self.price_market
+        if market is None:
+            return HarvestSimulation(reverted=False)
+
+        if market.token0 == market.btc:
+            claimable_btc, claimable_musd = claimable0, claimable1
+        else:
+            claimable_btc, claimable_musd = claimable1, claimable0
+
+        swap_out = 0.0
+        if claimable_btc > 0:
+            pool = self.w3.eth.contract(address=market.pool, abi=TIGRIS_POOL_ABI)
+            try:
+                amount_out = pool.functions.getAmountOut(
+                    int(claimable_btc * 1e18), market.btc
+                ).call()
+                swap_out = amount_out / 1e18
+            except Exception as e:
+                logger.debug("Pool swap quote failed: %s", e)
+                return HarvestSimulation(reverted=False)
+
+        return simulation_from_quote(claimable_musd, claimable_btc, swap_out)
+
+    def wait_for_harvest_receipt(
+        self, tx_hash: str, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Follow a submitted harvest block by block until its outcome is final
+
+        Each new block is checked for a receipt of any attempt for the
+        nonce. A harvest left unmined is re-sent with the same nonce and
+        higher fees, or replaced by a cancel once the fees exceed its
+        ceiling; one that drops from the mempool or whose block is reorged
+        out is rebroadcast. On timeout the harvest stays tracked, and the
+        next cycle resumes it (see pending_harvest). last_tx_outcome
+        records how the wait ended.
+
+        Args:
+            tx_hash: Transaction hash returned by submit_harvest
+            timeout: Seconds to wait (defaults to the tracker's timeout)
+
+        Returns:
+            True if the harvest succeeded, False otherwise
+        """
+        tracked = self._start_wait(tx_hash)
+        if tracked is None:
+            return False
+
+        if timeout is None:
+            timeout = self.lifecycle.timeout_seconds
+        deadline = time.monotonic() + timeout
+        last_head = None
+        while True:
+            try:
+                head = self.w3.eth.block_number
+                if head != last_head:
+                    last_head = head
+                    action = self._next_tx_action(tracked, head)
+                    if action.kind in (CONFIRMED, LOST):
+                        return self._finish_harvest(tx_hash, tracked, action)
+                    self._apply_tx_action(tracked, action, head)
+            except Exception as e:
+                logger.warning(f"Error tracking harvest {tx_hash}: {e}")
+
+            if time.monotonic() >= deadline:
+                self._wait_timed_out(tx_hash, tracked, timeout)
+                return False
+            time.sleep(self.lifecycle.poll_interval_seconds)
+
+    def _find_receipt(self, tracked: TrackedTx) -> Optional[Dict]:
+        """Receipt of any attempt for a tracked nonce, newest attempt first"""
+        for tx_hash in tracked.hashes:
+            try:
+                return self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+        return None
+
+    def _next_tx_action(self, tracked: TrackedTx, head: int) -> TxAction:
+        """Read the chain state the lifecycle tracker needs at a new block"""
+        receipt = self._find_receipt(tracked)
+        chain_nonce = None
+        if receipt is None:
+            chain_nonce = self.w3.eth.get_transaction_count(self.address, "latest")
+            if chain_nonce > tracked.nonce:
+                # Mined between the two reads, or taken by another transaction
+                receipt = self._find_receipt(tracked)
+
+        if receipt is not None:
+            try:
+                canonical_hash = self.w3.eth.get_block(receipt["blockNumber"])["hash"]
+            except Exception as e:
+                logger.debug("Failed to fetch receipt block: %s", e)
+                canonical_hash = None
+            return self.lifecycle.next_action(tracked, head, receipt, canonical_hash)
+        if chain_nonce > tracked.nonce:
+            return self.lifecycle.next_action(tracked, head, chain_nonce=chain_nonce)
+
+        pending_nonce = self.w3.eth.get_transaction_count(self.address, "pending")
+        market_fee_params, base_fee_wei = None, None
+        if self.lifecycle.replacement_due(tracked, head):
+            market_fee_params, base_fee_wei = self._market_fees()
+        return self.lifecycle.next_action(
+            tracked,
+            head,
+            chain_nonce=chain_nonce,
+            known=pending_nonce > tracked.nonce,
+            market_fee_params=market_fee_params,
+            base_fee_wei=base_fee_wei,
+        )
+
+    def _market_fees(self) -> Tuple[Dict[str, int], Optional[int]]:
+        """Fee fields for a new transaction now, and the next base fee"""
+        self.sample_gas_price_wei()
+        base_fee_wei = None
+        if self.gas_oracle is not None and self.gas_oracle.has_data:
+            base_fee_wei = self.gas_oracle.next_base_fee_wei
+        return self._fee_params(), base_fee_wei
+
+    def _apply_tx_action(self, tracked: TrackedTx, action: TxAction, head: int):
+        """Re-send, replace or cancel a tracked harvest as the tracker decided"""
+        if action.kind in (REBROADCAST, REORGED):
+            self._rebroadcasting(tracked, action)
+            try:
+                self.w3.eth.send_raw_transaction(tracked.latest.raw_tx)
+            except Exception as e:
+                logger.debug("Rebroadcast rejected: %s", e)
+            return
+        if action.kind not in (REPLACE, CANCEL):
+            return
+
+        signed_tx = self.account.sign_transaction(self._replacement_tx(tracked, action))
+        try:
+            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
         except Exception as e:
-            logger.error(f"Failed to execute harvest: {e}")
+            self._replacement_rejected(tracked, e)
+            return
+        self._replacement_sent(
+            tracked, action, tx_hash.hex(), signed_tx.rawTransaction, head
+        )
+
+    def _finish_harvest(
+        self, tx_hash: str, tracked: TrackedTx, action: TxAction
+    ) -> bool:
+        """Settle a tracked harvest's nonce and report whether it succeeded"""
+        success, submitted_at = self._settle_harvest(tx_hash, tracked, action)
+        if submitted_at is not None:
+            observed = time.time()
+            try:
+                block = self.w3.eth.get_block(action.receipt["blockNumber"])
+                block_timestamp = block["timestamp"]
+            except Exception as e:
+                logger.debug("Failed to fetch inclusion block: %s", e)
+                block_timestamp = None
+            self._record_inclusion(submitted_at, observed, block_timestamp)
+        return success
+
+    def execute_harvest(self, dry_run: bool = False) -> Optional[str]:
+        """
+        Execute harvest transaction and wait for its receipt
+
+        Args:
+            dry_run: If True, simulate without sending transaction
+
+        Returns:
+            Transaction hash if successful, None otherwise
+        """
+        tx_hash = self.submit_harvest(dry_run=dry_run)
+        if tx_hash is None:
             return None
+        return tx_hash if self.wait_for_harvest_receipt(tx_hash) else None
+
+    def get_cycle_snapshot(
+        self, gas_price_wei: Optional[int] = None
+    ) -> Optional[CycleSnapshot]:
+        """
+        Read all per-cycle chain state in one batched request
+
+        Uses a single Multicall3 aggregate3 eth_call so every value comes
+        from the same block, plus one gas price request (eth_feeHistory or
+        eth_gasPrice). Falls back to sequential reads if the multicall fails.
+
+        Args:
+            gas_price_wei: Gas price already sampled this cycle; fetched if
+                omitted
+
+        Returns:
+            CycleSnapshot, or None if the RPC is unreachable
+        """
+        if self.multicall is not None:
+            try:
+                return self._read_snapshot_multicall(gas_price_wei)
+            except Exception as e:
+                logger.warning(
+                    f"Multicall snapshot failed, using sequential reads: {e}"
+                )
+                self._disable_multicall_if_missing()
+
+        return self._read_snapshot_sequential(gas_price_wei)
+
+    def _disable_multicall_if_missing(self):
+        """Stop using Multicall3 if it is not deployed on this chain"""
+        try:
+            if not self.w3.eth.get_code(self.multicall.address):
+                logger.warning(
+                    f"No Multicall3 contract at {self.multicall.address}, "
+                    "batched snapshots disabled"
+                )
+                self.multicall = None
+        except Exception:
+            # RPC failure - keep multicall enabled and retry next cycle
+            pass
+
+    def _read_snapshot_multicall(
+        self, gas_price_wei: Optional[int] = None
+    ) -> CycleSnapshot:
+        """Read the cycle snapshot through Multicall3 aggregate3"""
+        calls = build_snapshot_calls(
+            self.multicall,
+            self.harvester,
+            self.debt_manager,
+            self.strategy_btc,
+            self.address,
+        )
+        results = self.multicall.functions.aggregate3(calls).call()
+        if gas_price_wei is None:
+            gas_price_wei = self.sample_gas_price_wei()
+        return decode_snapshot(self.w3.codec, results, gas_price_wei)
+
+    def _read_snapshot_sequential(
+        self, gas_price_wei: Optional[int] = None
+    ) -> Optional[CycleSnapshot]:
+        """Read the cycle snapshot with individual calls pinned to one block"""
+        try:
+            block = self.w3.eth.get_block("latest")
+        except Exception as e:
+            logger.error(f"Failed to fetch latest block: {e}")
+            return None
+
+        block_number = block["number"]
+        try:
+            claimable0_wei, claimable1_wei = (
+                self.harvester.functions.getClaimableYield().call(
+                    block_identifier=block_number
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get claimable yield: {e}")
+            claimable0_wei, claimable1_wei = 0, 0
+
+        try:
+            total_debt_wei = self.debt_manager.functions.totalDebt().call(
+                block_identifier=block_number
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get total debt: {e}")
+            total_debt_wei = 0
+
+        try:
+            total_btc_wei = self.strategy_btc.functions.totalBTCDeposited().call(
+                block_identifier=block_number
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get total BTC deposited: {e}")
+            total_btc_wei = 0
+
+        try:
+            balance_wei = self.w3.eth.get_balance(self.address, block_number)
+        except Exception as e:
+            logger.error(f"Failed to get keeper balance: {e}")
+            balance_wei = 0
+
+        if gas_price_wei is None:
+            try:
+                gas_price_wei = self.sample_gas_price_wei()
+            except Exception as e:
+                logger.error(f"Failed to get gas price: {e}")
+                gas_price_wei = 0
+
+        return CycleSnapshot(
+            block_number=block_number,
+            block_timestamp=block["timestamp"],
+            gas_price_gwei=float(self.w3.from_wei(gas_price_wei, "gwei")),
+            claimable0=float(self.w3.from_wei(claimable0_wei, "ether")),
+            claimable1=float(self.w3.from_wei(claimable1_wei, "ether")),
+            keeper_balance_btc=float(self.w3.from_wei(balance_wei, "ether")),
+            total_debt=float(self.w3.from_wei(total_debt_wei, "ether")),
+            total_btc_deposited=float(self.w3.from_wei(total_btc_wei, "ether")),
+        )
 
     def get_total_debt(self) -> float:
         """
@@ -268,12 +1139,12 @@ class ContractManager:
             logger.error(f"Failed to get total BTC deposited: {e}")
             return 0.0
 
-    def check_keeper_authorization(self) -> bool:
+    def check_keeper_authorization(self) -> Optional[bool]:
         """
         Verify that the keeper address is authorized in Harvester contract
 
         Returns:
-            True if authorized, False otherwise
+            True if authorized, False if not, None if the check failed
         """
         try:
             authorized_keeper = self.harvester.functions.keeper().call()
@@ -288,7 +1159,22 @@ class ContractManager:
             return is_authorized
         except Exception as e:
             logger.error(f"Failed to check keeper authorization: {e}")
-            return False
+            return None
+
+    def get_watch_addresses(self) -> List[str]:
+        """
+        Contracts whose events can change this vault's claimable yield
+
+        Returns:
+            Harvester and StrategyBTC addresses, plus the MUSD/BTC pool
+            when it can be resolved
+        """
+        addresses = [self.harvester.address, self.strategy_btc.address]
+        try:
+            addresses.append(self.strategy_btc.functions.musdBtcPool().call())
+        except Exception as e:
+            logger.warning(f"Failed to resolve MUSD/BTC pool address: {e}")
+        return addresses
 
     def get_contract_info(self) -> Dict[str, str]:
         """
@@ -0,0 +1,159 @@
+"""
+Yield accrual forecasting for Stratum Fi Keeper Bot
+Estimates how fast claimable yield grows and when it will cross the
+harvest threshold, so the keeper can sleep until then
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+logger = logging.getLogger("keeper.forecast")
+
+
+@dataclass(frozen=True)
+class YieldSample:
+    """Claimable yield observed at one block"""
+
+    block_number: int
+    timestamp: int
+    claimable0: float
+    claimable1: float
+    yield_usd: float
+
+
+class YieldForecaster:
+    """
+    Rolling linear model of claimable yield over block time
+
+    Samples are kept since the last harvest (a drop in either claimable
+    token amount resets the history). The accrual rate is fitted on token
+    amounts, as the least-squares slope of each against block timestamp,
+    and valued at current prices, so token price moves between samples
+    are not mistaken for accrual.
+    """
+
+    def __init__(
+        self,
+        max_samples: int = 32,
+        value_usd: Optional[Callable[[float, float], Optional[float]]] = None,
+    ):
+        """
+        Initialize forecaster
+
+        Args:
+            max_samples: Number of recent samples used for the rate estimate
+            value_usd: Values token0/token1 amounts in USD at current prices
+                (None assumes both tokens are USD-pegged)
+        """
+        self.samples: Deque[YieldSample] = deque(maxlen=max_samples)
+        self.value_usd = value_usd
+
+    def add_sample(
+        self,
+        block_number: int,
+        timestamp: int,
+        claimable0: float,
+        claimable1: float,
+        yield_usd: float,
+    ):
+        """
+        Record claimable yield read at a block
+
+        Args:
+            block_number: Block the yield was read at
+            timestamp: Block timestamp (seconds)
+            claimable0: Claimable token0
+            claimable1: Claimable token1
+            yield_usd: Claimable yield valued in USD
+        """
+        if self.samples:
+            last = self.samples[-1]
+            if block_number <= last.block_number:
+                return
+            if claimable0 < last.claimable0 or claimable1 < last.claimable1:
+                # Yield was claimed (by us or anyone else); old samples no
+                # longer describe the current accrual curve. A lower USD
+                # value alone is only a price move.
+                self.samples.clear()
+
+        self.samples.append(
+            YieldSample(block_number, timestamp, claimable0, claimable1, yield_usd)
+        )
+
+    def reset(self):
+        """Drop history, e.g. after a successful harvest"""
+        self.samples.clear()
+
+    def rate_per_second(self) -> Optional[float]:
+        """
+        Estimated accrual rate in USD per second
+
+        Returns:
+            Token accrual rates valued at current prices, or None with fewer
+            than two distinct timestamps or without fresh prices
+        """
+        if len(self.samples) < 2:
+            return None
+
+        n = len(self.samples)
+        mean_t = sum(s.timestamp for s in self.samples) / n
+        var_t = sum((s.timestamp - mean_t) ** 2 for s in self.samples)
+        if var_t == 0:
+            return None
+
+        mean0 = sum(s.claimable0 for s in self.samples) / n
+        mean1 = sum(s.claimable1 for s in self.samples) / n
+        rate0 = (
+            sum((s.timestamp - mean_t) * (s.claimable0 - mean0) for s in self.samples)
+            / var_t
+        )
+        rate1 = (
+            sum((s.timestamp - mean_t) * (s.claimable1 - mean1) for s in self.samples)
+            / var_t
+        )
+        if self.value_usd is None:
+            return rate0 + rate1
+        return self.value_usd(rate0, rate1)
+
+    def seconds_until(self, threshold_usd: float) -> Optional[float]:
+        """
+        Predict seconds from the latest sample until yield reaches a threshold
+
+        Args:
+            threshold_usd: Target claimable yield in USD
+
+        Returns:
+            0 if already reached, None if the rate is unknown or not positive
+        """
+        if not self.samples:
+            return None
+
+        current = self.samples[-1].yield_usd
+        if current >= threshold_usd:
+            return 0.0
+
+        rate = self.rate_per_second()
+        if rate is None or rate <= 0:
+            return None
+        return (threshold_usd - current) / rate
+
+    def next_check_delay(
+        self, threshold_usd: float, min_interval: float, max_interval: float
+    ) -> float:
+        """
+        Seconds to sleep before the next check
+
+        Args:
+            threshold_usd: Harvest threshold in USD
+            min_interval: Lower bound on the delay
+            max_interval: Upper bound (used when no forecast is available)
+
+        Returns:
+            Predicted threshold crossing time clamped to [min, max]
+        """
+        eta = self.seconds_until(threshold_usd)
+        if eta is None:
+            return max_interval
+        return min(max(eta, min_interval), max_interval)
@@ -0,0 +1,188 @@
+"""
+Gas price oracle for Stratum Fi Keeper Bot
+Keeps a ring buffer of recent base and priority fees from eth_feeHistory
+and derives smoothed prices and EIP-1559 fee parameters from it
+"""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("keeper.gas")
+
+# Priority fee tiers mapped to eth_feeHistory reward percentiles
+PRIORITY_TIERS = {"slow": 10, "standard": 50, "fast": 90}
+REWARD_PERCENTILES = sorted(PRIORITY_TIERS.values())
+
+
+# Substrings of node errors meaning eth_feeHistory is not available
+UNSUPPORTED_MARKERS = ("method not found", "not supported", "does not exist")
+
+
+def is_unsupported_error(error: Exception) -> bool:
+    """Return True if an RPC error means eth_feeHistory is not implemented"""
+    message = str(error).lower()
+    return "-32601" in message or any(m in message for m in UNSUPPORTED_MARKERS)
+
+
+@dataclass(frozen=True)
+class FeeSample:
+    """Fee data for one block"""
+
+    block_number: int
+    base_fee_wei: int
+    gas_used_ratio: float
+    rewards_wei: Tuple[int, ...]  # One per REWARD_PERCENTILES entry
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Linearly interpolated percentile
+
+    Args:
+        values: Sample values (need not be sorted)
+        pct: Percentile in [0, 100]
+
+    Returns:
+        Percentile value
+    """
+    if not values:
+        raise ValueError("percentile of empty sequence")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class GasOracle:
+    """
+    Rolling fee history for one chain
+
+    The oracle performs no network I/O. Callers request
+    eth_feeHistory(history_blocks, "latest", REWARD_PERCENTILES) and pass
+    the result to ingest().
+    """
+
+    def __init__(
+        self, history_blocks: int = 20, base_fee_multiplier: float = 2.0
+    ):
+        """
+        Initialize gas oracle
+
+        Args:
+            history_blocks: Number of recent blocks kept in the ring buffer
+            base_fee_multiplier: maxFeePerGas headroom over the next base fee
+                (2x survives six consecutive full blocks)
+        """
+        self.history_blocks = history_blocks
+        self.base_fee_multiplier = base_fee_multiplier
+        self.samples: Deque[FeeSample] = deque(maxlen=history_blocks)
+        self.next_base_fee_wei: Optional[int] = None
+        # Cleared when the node turns out not to implement eth_feeHistory
+        self.enabled = True
+        self._lock = threading.Lock()
+
+    @property
+    def has_data(self) -> bool:
+        """True once at least one fee history response has been ingested"""
+        return (
+            self.enabled
+            and bool(self.samples)
+            and self.next_base_fee_wei is not None
+        )
+
+    def ingest(self, fee_history: Dict):
+        """
+        Add an eth_feeHistory response to the ring buffer
+
+        Args:
+            fee_history: Result with oldestBlock, baseFeePerGas (one entry
+                per block plus the next block), gasUsedRatio and reward
+        """
+        oldest = fee_history["oldestBlock"]
+        if isinstance(oldest, str):
+            oldest = int(oldest, 16)
+        base_fees = [_to_int(v) for v in fee_history["baseFeePerGas"]]
+        ratios = list(fee_history.get("gasUsedRatio") or [])
+        rewards: List[List] = list(fee_history.get("reward") or [])
+
+        with self._lock:
+            last_block = self.samples[-1].block_number if self.samples else -1
+            for i, ratio in enumerate(ratios):
+                block_number = oldest + i
+                if block_number <= last_block:
+                    continue
+                block_rewards = rewards[i] if i < len(rewards) else []
+                self.samples.append(
+                    FeeSample(
+                        block_number=block_number,
+                        base_fee_wei=base_fees[i],
+                        gas_used_ratio=float(ratio),
+                        rewards_wei=tuple(_to_int(r) for r in block_rewards),
+                    )
+                )
+
+            # Drop samples that fell out of the window after a long gap
+            if self.samples:
+                newest = self.samples[-1].block_number
+                while self.samples[0].block_number <= newest - self.history_blocks:
+                    self.samples.popleft()
+
+            if base_fees:
+                self.next_base_fee_wei = base_fees[-1]
+
+    def base_fee_percentile(self, pct: float) -> int:
+        """Base fee percentile over the window, in wei"""
+        with self._lock:
+            return int(percentile([s.base_fee_wei for s in self.samples], pct))
+
+    def priority_fee(self, tier: str = "standard") -> int:
+        """
+        Priority fee for a tier, in wei
+
+        The tier selects a per-block reward percentile; the median of that
+        column across the window smooths out single-block spikes.
+        """
+        index = REWARD_PERCENTILES.index(PRIORITY_TIERS[tier])
+        with self._lock:
+            column = [
+                s.rewards_wei[index]
+                for s in self.samples
+                if len(s.rewards_wei) > index
+            ]
+        return int(percentile(column, 50)) if column else 0
+
+    def smoothed_gas_price_wei(self) -> Optional[int]:
+        """
+        Median effective gas price (base fee + standard tip) over the window
+
+        Returns:
+            Gas price in wei, or None without fee history
+        """
+        if not self.has_data:
+            return None
+        return self.base_fee_percentile(50) + self.priority_fee("standard")
+
+    def build_fee_params(self, tier: str = "standard") -> Dict[str, int]:
+        """
+        EIP-1559 fee fields for a type-2 transaction
+
+        Args:
+            tier: Priority fee tier (slow, standard, fast)
+
+        Returns:
+            Dict with maxFeePerGas and maxPriorityFeePerGas
+        """
+        if not self.has_data:
+            raise RuntimeError("GasOracle has no fee history")
+        priority = self.priority_fee(tier)
+        max_fee = int(self.next_base_fee_wei * self.base_fee_multiplier) + priority
+        return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": priority}
+
+
+def _to_int(value) -> int:
+    """Parse an RPC quantity that may be hex-encoded"""
+    return int(value, 16) if isinstance(value, str) else int(value)
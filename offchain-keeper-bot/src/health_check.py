@@ -1,16 +1,224 @@
 """
 Health check endpoint for monitoring keeper bot liveness
 Can be used by orchestrators (Docker, K8s) to verify bot health
+
+Probes are answered from a HealthState snapshot that the keeper loop
+refreshes, so they never make RPC calls.
 """
 
+import asyncio
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import time
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 import threading
 import logging
 
+from profiling import Profiler
+
 logger = logging.getLogger("keeper.health")
 
+# How often the keeper loop re-checks Harvester authorization
+AUTHORIZATION_REFRESH_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Keeper health as last observed by the keeper loop"""
+
+    rpc_connected: bool = False
+    keeper_authorized: bool = False
+    keeper_balance_btc: float = 0.0
+    block_number: Optional[int] = None
+    updated_at: Optional[float] = None  # Last successful RPC read (unix time)
+    authorized_at: Optional[float] = None  # Last authorization check (unix time)
+
+
+class HealthState:
+    """
+    Latest HealthSnapshot, written by the keeper loop and read by probes
+
+    Snapshots are immutable and swapped under a lock, so readers on the
+    health server threads never see a half-updated snapshot.
+    """
+
+    def __init__(self, max_age_seconds: float):
+        """
+        Initialize health state
+
+        Args:
+            max_age_seconds: Readiness fails once the last successful RPC
+                read is older than this
+        """
+        self.max_age_seconds = max_age_seconds
+        self.snapshot = HealthSnapshot()
+        self._lock = threading.Lock()
+
+    def _update(self, **changes):
+        with self._lock:
+            self.snapshot = replace(self.snapshot, **changes)
+
+    def record_rpc_read(
+        self, balance_btc: Optional[float], block_number: Optional[int] = None
+    ):
+        """
+        Record a read of the keeper balance
+
+        Args:
+            balance_btc: Balance read (RPC is up), or None if the read
+                failed, which is recorded as an RPC failure
+            block_number: Block the read was made at
+        """
+        if balance_btc is None:
+            self.record_rpc_failure()
+            return
+        changes = dict(
+            rpc_connected=True, keeper_balance_btc=balance_btc, updated_at=time.time()
+        )
+        if block_number is not None:
+            changes["block_number"] = block_number
+        self._update(**changes)
+
+    def record_rpc_failure(self):
+        """Record a failed RPC read"""
+        self._update(rpc_connected=False)
+
+    def record_authorization(self, authorized: Optional[bool]):
+        """
+        Record the result of a Harvester authorization check
+
+        Args:
+            authorized: Check result, or None if the check failed. A failed
+                check is recorded as an RPC failure and keeps the previous
+                result; the check stays due, so the keeper retries it on
+                the next cycle.
+        """
+        if authorized is None:
+            self.record_rpc_failure()
+            return
+        self._update(keeper_authorized=authorized, authorized_at=time.time())
+
+    def authorization_due(self, now: Optional[float] = None) -> bool:
+        """True if authorization should be re-checked"""
+        authorized_at = self.snapshot.authorized_at
+        now = time.time() if now is None else now
+        return (
+            authorized_at is None
+            or now - authorized_at >= AUTHORIZATION_REFRESH_SECONDS
+        )
+
+
+def build_health_status(keeper_bot) -> Dict:
+    """Liveness payload - is the bot process running?"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "uptime_seconds": (
+            (datetime.now() - keeper_bot.start_time).total_seconds()
+            if hasattr(keeper_bot, "start_time")
+            else 0
+        ),
+    }
+
+
+def _snapshot_age(snapshot: HealthSnapshot, now: float) -> Optional[float]:
+    return None if snapshot.updated_at is None else now - snapshot.updated_at
+
+
+def build_readiness_status(
+    health: HealthState, now: Optional[float] = None
+) -> Tuple[int, Dict]:
+    """Readiness payload and HTTP status code - is the bot ready to harvest?"""
+    snapshot = health.snapshot
+    age = _snapshot_age(snapshot, time.time() if now is None else now)
+    is_fresh = age is not None and age <= health.max_age_seconds
+    is_ready = (
+        is_fresh
+        and snapshot.rpc_connected
+        and snapshot.keeper_authorized
+        and snapshot.keeper_balance_btc > 0.0001
+    )
+
+    status = {
+        "ready": is_ready,
+        "rpc_connected": snapshot.rpc_connected,
+        "keeper_authorized": snapshot.keeper_authorized,
+        "keeper_balance_btc": snapshot.keeper_balance_btc,
+        "block_number": snapshot.block_number,
+        "snapshot_age_seconds": age,
+        "stale": not is_fresh,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    return (200 if is_ready else 503), status
+
+
+def build_metrics_status(keeper_bot, health: HealthState) -> Dict:
+    """Basic JSON metrics payload"""
+    snapshot = health.snapshot
+    return {
+        "harvests_executed": keeper_bot.harvest_count,
+        "last_harvest": (
+            keeper_bot.last_harvest_time.isoformat()
+            if keeper_bot.last_harvest_time
+            else None
+        ),
+        "keeper_balance_btc": snapshot.keeper_balance_btc,
+        "rpc_connected": snapshot.rpc_connected,
+        "snapshot_age_seconds": _snapshot_age(snapshot, time.time()),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+def build_debug_response(
+    profiler: Optional[Profiler], path: str
+) -> Tuple[int, str, bytes]:
+    """
+    Answer a /debug request (blocks for the length of a profile)
+
+    GET /debug/profile?seconds=N returns N seconds of sampled stacks in
+    collapsed form. GET /debug/memory starts tracemalloc, then returns the
+    top allocation sites and their growth since the last call;
+    ?stop=1 stops tracing.
+
+    Args:
+        profiler: Profiler, or None when profiling is disabled
+        path: Request path with query string
+
+    Returns:
+        Tuple of (status code, content type, body)
+    """
+    if profiler is None:
+        return 404, "application/json", b""
+
+    url = urlsplit(path)
+    query = parse_qs(url.query)
+    if url.path == "/debug/memory":
+        if "stop" in query:
+            profiler.stop_memory_tracing()
+            report = {"tracing": False}
+        else:
+            report = profiler.memory_report()
+        return 200, "application/json", json.dumps(report).encode()
+
+    if url.path != "/debug/profile":
+        return 404, "application/json", b""
+    try:
+        seconds = float(query.get("seconds", ["10"])[0])
+    except ValueError:
+        seconds = -1.0
+    if not 0 < seconds <= profiler.max_seconds:
+        error = f"seconds must be in (0, {profiler.max_seconds:g}]"
+        return 400, "application/json", json.dumps({"error": error}).encode()
+
+    stacks = profiler.profile(seconds)
+    if stacks is None:
+        error = "A profile is already running"
+        return 409, "application/json", json.dumps({"error": error}).encode()
+    return 200, "text/plain; charset=utf-8", stacks.encode()
+
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """HTTP handler for health check endpoint"""
@@ -25,92 +233,45 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self._handle_readiness()
         elif self.path == "/metrics":
             self._handle_metrics()
+        elif self.path.startswith("/debug/"):
+            self._send(*build_debug_response(self.keeper_bot.profiler, self.path))
         else:
             self.send_response(404)
             self.end_headers()
 
     def _handle_health(self):
         """Liveness check - is the bot process running?"""
-        status = {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "uptime_seconds": (
-                (datetime.now() - self.keeper_bot.start_time).total_seconds()
-                if hasattr(self.keeper_bot, "start_time")
-                else 0
-            ),
-        }
-
-        self.send_response(200)
-        self.send_header("Content-type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps(status).encode())
+        self._send_json(200, build_health_status(self.keeper_bot))
 
     def _handle_readiness(self):
         """Readiness check - is the bot ready to harvest?"""
-        try:
-            is_connected = self.keeper_bot.contracts.is_connected()
-            is_authorized = self.keeper_bot.contracts.check_keeper_authorization()
-            balance = self.keeper_bot.contracts.get_keeper_balance()
-
-            is_ready = is_connected and is_authorized and balance > 0.0001
-
-            status = {
-                "ready": is_ready,
-                "rpc_connected": is_connected,
-                "keeper_authorized": is_authorized,
-                "keeper_balance_btc": balance,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-
-            response_code = 200 if is_ready else 503
-
-            self.send_response(response_code)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(status).encode())
-
-        except Exception as e:
-            logger.error(f"Readiness check failed: {e}")
-            self.send_response(500)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(
-                json.dumps({"ready": False, "error": str(e)}).encode()
-            )
+        self._send_json(*build_readiness_status(self.keeper_bot.health))
 
     def _handle_metrics(self):
         """Return basic metrics in JSON format"""
-        try:
-            metrics_data = {
-                "harvests_executed": self.keeper_bot.harvest_count,
-                "last_harvest": (
-                    self.keeper_bot.last_harvest_time.isoformat()
-                    if self.keeper_bot.last_harvest_time
-                    else None
-                ),
-                "keeper_balance_btc": self.keeper_bot.contracts.get_keeper_balance(),
-                "rpc_connected": self.keeper_bot.contracts.is_connected(),
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(metrics_data).encode())
+        self._send_json(
+            200, build_metrics_status(self.keeper_bot, self.keeper_bot.health)
+        )
 
-        except Exception as e:
-            logger.error(f"Metrics endpoint failed: {e}")
-            self.send_response(500)
-            self.end_headers()
+    def _send_json(self, response_code: int, payload: Dict):
+        """Write a JSON response"""
+        self._send(response_code, "application/json", json.dumps(payload).encode())
+
+    def _send(self, response_code: int, content_type: str, body: bytes):
+        """Write a response"""
+        self.send_response(response_code)
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def log_message(self, format, *args):
         """Override to use our logger instead of printing to stderr"""
-        logger.debug(f"{self.address_string()} - {format % args}")
+        logger.debug("%s - " + format, self.address_string(), *args)
 
 
 class HealthCheckServer:
-    """HTTP server for health checks running in background thread"""
+    """Threaded HTTP server for health checks running in background threads"""
 
     def __init__(self, keeper_bot, port: int = 8080):
         """
@@ -130,17 +291,117 @@ class HealthCheckServer:
 
     def start(self):
         """Start health check server in background thread"""
-        self.server = HTTPServer(("0.0.0.0", self.port), HealthCheckHandler)
+        self.server = ThreadingHTTPServer(("0.0.0.0", self.port), HealthCheckHandler)
+        self.server.daemon_threads = True
         self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
         self.thread.start()
         logger.info(f"Health check server started on port {self.port}")
         logger.info(f"  - Liveness:  http://0.0.0.0:{self.port}/health")
         logger.info(f"  - Readiness: http://0.0.0.0:{self.port}/ready")
         logger.info(f"  - Metrics:   http://0.0.0.0:{self.port}/metrics")
+        if self.keeper_bot.profiler is not None:
+            logger.info(f"  - Profiling: http://0.0.0.0:{self.port}/debug/profile")
 
     def stop(self):
         """Stop health check server"""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
+            logger.info("Health check server stopped")
+
+
+class AsyncHealthCheckServer:
+    """HTTP health check server running as coroutines on the keeper event loop"""
+
+    REASONS = {
+        200: "OK",
+        400: "Bad Request",
+        404: "Not Found",
+        409: "Conflict",
+        500: "Internal Server Error",
+        503: "Service Unavailable",
+    }
+
+    def __init__(self, keeper_bot, port: int = 8080):
+        """
+        Initialize async health check server
+
+        Args:
+            keeper_bot: Reference to AsyncKeeperBot instance
+            port: HTTP server port
+        """
+        self.keeper_bot = keeper_bot
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        """Start serving health checks on the running event loop"""
+        self.server = await asyncio.start_server(
+            self._handle_connection, "0.0.0.0", self.port
+        )
+        logger.info(f"Async health check server started on port {self.port}")
+        logger.info(f"  - Liveness:  http://0.0.0.0:{self.port}/health")
+        logger.info(f"  - Readiness: http://0.0.0.0:{self.port}/ready")
+        logger.info(f"  - Metrics:   http://0.0.0.0:{self.port}/metrics")
+        if self.keeper_bot.profiler is not None:
+            logger.info(f"  - Profiling: http://0.0.0.0:{self.port}/debug/profile")
+
+    async def stop(self):
+        """Stop health check server"""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
             logger.info("Health check server stopped")
 
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Parse a single HTTP request and write the response"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain headers; probes never send a body
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+
+            content_type = "application/json"
+            if method != "GET":
+                response_code, body = 404, b""
+            elif path.startswith("/debug/"):
+                # Profiles block for seconds; keep the event loop running
+                response_code, content_type, body = await asyncio.to_thread(
+                    build_debug_response, self.keeper_bot.profiler, path
+                )
+            else:
+                response_code, payload = self._route(path)
+                body = json.dumps(payload).encode() if payload is not None else b""
+
+            headers = (
+                f"HTTP/1.1 {response_code} {self.REASONS.get(response_code, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n"
+            )
+            writer.write(headers.encode() + body)
+            await writer.drain()
+        except Exception as e:
+            logger.debug("Health check connection error: %s", e)
+        finally:
+            writer.close()
+
+    def _route(self, path: str):
+        """Dispatch a GET path to its handler"""
+        if path in ("/health", "/healthz"):
+            return 200, build_health_status(self.keeper_bot)
+
+        if path == "/ready":
+            return build_readiness_status(self.keeper_bot.health)
+
+        if path == "/metrics":
+            return 200, build_metrics_status(self.keeper_bot, self.keeper_bot.health)
+
+        return 404, None
@@ -0,0 +1,174 @@
+"""
+Shared HTTP transport for Stratum Fi Keeper Bot
+One pooled keep-alive session (requests for sync code, aiohttp for async
+code) used by the Web3 providers and alert webhooks
+"""
+
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import AsyncHTTPProvider, HTTPProvider
+
+from metrics import metrics
+
+
+def endpoint_label(url: str) -> str:
+    """Metrics label for an endpoint (host only, so API keys never leak)"""
+    parsed = urlparse(url)
+    return parsed.hostname or url
+
+
+class HttpTransport:
+    """
+    Pooled HTTP sessions with keep-alive
+
+    The requests session is thread-safe for concurrent posts and keeps up
+    to pool_size connections per host open. The aiohttp session is created
+    lazily on first use so it binds to the running event loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 32,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        keepalive_seconds: float = 30.0,
+    ):
+        """
+        Initialize transport
+
+        Args:
+            pool_size: Connections kept open per host (and total, async)
+            connect_timeout: TCP/TLS connect timeout (seconds)
+            read_timeout: Default response timeout (seconds)
+            keepalive_seconds: Idle time before a pooled async connection
+                is closed (sync connections stay open until the server
+                closes them)
+        """
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_seconds = keepalive_seconds
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._async_session: Optional[aiohttp.ClientSession] = None
+
+    def timeout(self, read_timeout: Optional[float] = None):
+        """requests (connect, read) timeout"""
+        return (self.connect_timeout, read_timeout or self.read_timeout)
+
+    def async_timeout(
+        self, read_timeout: Optional[float] = None
+    ) -> aiohttp.ClientTimeout:
+        """aiohttp timeout"""
+        return aiohttp.ClientTimeout(
+            total=read_timeout or self.read_timeout, connect=self.connect_timeout
+        )
+
+    def post_json(
+        self, url: str, payload: Any, timeout: Optional[float] = None
+    ) -> requests.Response:
+        """POST a JSON payload on the pooled session, raising on HTTP errors"""
+        response = self.session.post(url, json=payload, timeout=self.timeout(timeout))
+        response.raise_for_status()
+        return response
+
+    async def async_session(self) -> aiohttp.ClientSession:
+        """Pooled aiohttp session (created in the running event loop)"""
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self._async_session = aiohttp.ClientSession(connector=connector)
+        return self._async_session
+
+    def close(self):
+        """Close the pooled sync connections"""
+        self.session.close()
+
+    async def aclose(self):
+        """Close both sessions"""
+        self.close()
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+
+
+class SessionHTTPProvider(HTTPProvider):
+    """
+    Web3 HTTP provider posting through a shared HttpTransport session
+
+    Every request's latency is recorded per method and endpoint, whether
+    it succeeded or not.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        transport: HttpTransport,
+        timeout: Optional[float] = None,
+        label: Optional[str] = None,
+    ):
+        super().__init__(endpoint_uri)
+        self.transport = transport
+        self.timeout = timeout
+        self.label = label or endpoint_label(str(endpoint_uri))
+
+    def make_request(self, method, params) -> Dict:
+        started = time.perf_counter()
+        try:
+            response = self.transport.session.post(
+                self.endpoint_uri,
+                data=self.encode_rpc_request(method, params),
+                headers=self.get_request_headers(),
+                timeout=self.transport.timeout(self.timeout),
+            )
+            response.raise_for_status()
+            return self.decode_rpc_response(response.content)
+        finally:
+            metrics.record_rpc_request(
+                method, self.label, time.perf_counter() - started
+            )
+
+
+class AsyncSessionHTTPProvider(AsyncHTTPProvider):
+    """AsyncWeb3 HTTP provider posting through a shared HttpTransport session"""
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        transport: HttpTransport,
+        timeout: Optional[float] = None,
+        label: Optional[str] = None,
+    ):
+        super().__init__(endpoint_uri)
+        self.transport = transport
+        self.timeout = timeout
+        self.label = label or endpoint_label(str(endpoint_uri))
+
+    async def make_request(self, method, params) -> Dict:
+        session = await self.transport.async_session()
+        started = time.perf_counter()
+        try:
+            async with session.post(
+                self.endpoint_uri,
+                data=self.encode_rpc_request(method, params),
+                headers=self.get_request_headers(),
+                timeout=self.transport.async_timeout(self.timeout),
+            ) as response:
+                response.raise_for_status()
+                raw = await response.read()
+        finally:
+            metrics.record_rpc_request(
+                method, self.label, time.perf_counter() - started
+            )
+        return self.decode_rpc_response(raw)
@@ -6,22 +6,38 @@ Periodically checks claimable yield and executes harvest when thresholds are met
 import time
 import signal
 import sys
+import threading
 from datetime import datetime
-from typing import Optional
-
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
-import requests
+from typing import List, Optional
 
 from config import get_config
-from logger import setup_logger, get_contextual_logger
-from contracts import ContractManager
-from metrics import metrics
-from health_check import HealthCheckServer
+from logger import LoggerAdapter, setup_logger, get_contextual_logger
+from contracts import ContractManager, CycleSnapshot, create_web3
+from http_transport import HttpTransport
+from rpc_pool import EndpointPool
+from resilience import Backoff, CONNECTION, RECOVERABLE_ERRORS, classify_error
+from metrics import metrics, phase_timer, DEFAULT_VAULT
+from profiling import Profiler, cycle_breakdown
+from health_check import HealthCheckServer, HealthState
+from policy import (
+    HarvestDecision,
+    evaluate_harvest,
+    evaluate_simulation,
+    harvest_fee_ceiling_wei,
+)
+from profitability import HarvestEconomics, evaluate_economics
+from alert_dispatcher import (
+    AlertDispatcher,
+    build_alert_sinks,
+    error_alert,
+    success_alert,
+)
+from triggers import BlockTrigger
+from forecast import YieldForecaster
+from gas_oracle import GasOracle
+from pricing import PriceOracle, build_price_oracle
+from state_store import StateStore
+from tx_lifecycle import WAIT, TxLifecycle
 
 
 class KeeperBot:
@@ -36,18 +52,70 @@ class KeeperBot:
             name="keeper",
             level=self.config.log_level,
             log_file=self.config.log_file,
+            log_format=self.config.log_format,
+            max_bytes=self.config.log_max_bytes,
+            backup_count=self.config.log_backup_count,
         )
         self.running = False
         self.harvest_count = 0
         self.last_harvest_time: Optional[datetime] = None
+        self.last_snapshot: Optional[CycleSnapshot] = None
+        self.forecaster = YieldForecaster(
+            value_usd=lambda c0, c1: self.contracts.estimate_yield_usd(c0, c1)
+        )
+        self.last_economics: Optional[HarvestEconomics] = None
         self.start_time = datetime.now()
 
+        # A cycle that failed on RPC errors is re-run after a short jittered
+        # backoff instead of the full check interval
+        self.last_cycle_error: Optional[str] = None
+        self.error_backoff = Backoff(
+            self.config.error_backoff_base_seconds,
+            self.config.error_backoff_max_seconds,
+        )
+
+        # One pooled keep-alive session for RPC requests and Slack alerts
+        self.http = HttpTransport(
+            pool_size=self.config.http_pool_size,
+            connect_timeout=self.config.http_connect_timeout_seconds,
+            read_timeout=self.config.rpc_timeout_seconds,
+            keepalive_seconds=self.config.http_keepalive_seconds,
+        )
+
+        # Alerts are delivered by a background thread, never on the harvest path
+        self.alerts = AlertDispatcher(
+            build_alert_sinks(
+                self.http,
+                self.config.explorer_url,
+                slack_webhook_url=(
+                    self.config.slack_webhook_url
+                    if self.config.enable_slack_alerts
+                    else None
+                ),
+                webhook_url=self.config.alert_webhook_url,
+                file_path=self.config.alert_file,
+            ),
+            max_queue=self.config.alert_queue_size,
+            dedup_window_seconds=self.config.alert_dedup_window_seconds,
+            rate_limit_per_minute=self.config.alert_rate_limit_per_minute,
+        )
+        self.alerts.start()
+
+        # Local history survives restarts: restore counters and forecast samples
+        self.state_store: Optional[StateStore] = None
+        if self.config.state_db_path:
+            self.state_store = StateStore(self.config.state_db_path)
+            self.state_store.start()
+            self._restore_state()
+
         # Initialize metrics server
         if self.config.enable_prometheus:
             metrics.start_server(self.config.prometheus_port)
 
-        # Initialize health check server
-        self.health_server = HealthCheckServer(self, port=8080)
+        # Initialize health check server (serves the snapshot in self.health)
+        self.health = HealthState(self.config.health_max_age_seconds)
+        self.profiler = Profiler() if self.config.enable_profiling else None
+        self.health_server = HealthCheckServer(self, port=self.config.health_port)
         self.health_server.start()
 
         # Initialize contract manager
@@ -59,6 +127,38 @@ class KeeperBot:
                 harvester_address=self.config.harvester_address,
                 debt_manager_address=self.config.debt_manager_address,
                 strategy_btc_address=self.config.strategy_btc_address,
+                multicall_address=self.config.multicall_address or None,
+                gas_oracle=(
+                    GasOracle(self.config.gas_history_blocks)
+                    if self.config.enable_gas_oracle
+                    else None
+                ),
+                priority_tier=self.config.gas_priority_tier,
+                abi_search_path=self.config.abi_search_path_list,
+                lifecycle=TxLifecycle(
+                    replace_after_blocks=self.config.tx_replace_after_blocks,
+                    fee_bump=1 + self.config.tx_fee_bump_percent / 100,
+                    max_replacements=self.config.tx_max_replacements,
+                    confirmations=self.config.tx_confirmations,
+                    timeout_seconds=self.config.tx_timeout_seconds,
+                    poll_interval_seconds=self.config.tx_poll_interval_seconds,
+                ),
+                w3=create_web3(
+                    self.config.rpc_url_list,
+                    hedge=self.config.enable_rpc_hedging,
+                    hedge_min_delay=self.config.rpc_hedge_delay_seconds,
+                    timeout=self.config.rpc_timeout_seconds,
+                    transport=self.http,
+                    pool=EndpointPool(
+                        self.config.rpc_url_list,
+                        failure_threshold=self.config.rpc_failure_threshold,
+                        cooldown_seconds=self.config.rpc_cooldown_seconds,
+                        max_cooldown_seconds=self.config.rpc_max_cooldown_seconds,
+                        read_attempts=self.config.rpc_read_attempts,
+                        broadcast_attempts=self.config.rpc_broadcast_attempts,
+                        retry_budget_ratio=self.config.rpc_retry_budget_ratio,
+                    ),
+                ),
             )
             metrics.update_rpc_status(True)
         except Exception as e:
@@ -67,6 +167,35 @@ class KeeperBot:
             metrics.record_error("initialization_failed")
             raise
 
+        # Price oracle replaces the 1:1 USD peg when valuing yield
+        self.price_oracle: Optional[PriceOracle] = None
+        self.price_tokens: List[str] = []
+        try:
+            market = self.contracts.get_price_market()
+            self.price_oracle = build_price_oracle(
+                [market],
+                self.config.price_source_list,
+                musd_price_usd=self.config.musd_price_usd,
+                btc_price_usd=self.config.btc_price_usd,
+                ttl_seconds=self.config.price_ttl_seconds,
+                max_age_seconds=self.config.max_price_age_seconds,
+            )
+            self.contracts.price_oracle = self.price_oracle
+            self.price_tokens = list(
+                dict.fromkeys([market.token0, market.token1, market.btc])
+            )
+        except Exception as e:
+            self.logger.warning(f"Price oracle unavailable, assuming 1:1 USD: {e}")
+
+        # Block-driven trigger replaces the fixed sleep between cycles
+        self.trigger: Optional[BlockTrigger] = None
+        if self.config.trigger_mode == "block":
+            self.trigger = BlockTrigger(
+                self.contracts.w3,
+                self.contracts.get_watch_addresses(),
+                poll_interval=self.config.block_poll_interval_seconds,
+            )
+
         self.logger.info("Keeper bot initialized successfully")
         self._log_startup_info()
 
@@ -82,7 +211,18 @@ class KeeperBot:
             f"Min Yield Threshold: ${self.config.min_yield_threshold_usd} USD"
         )
         self.logger.info(f"Max Gas Price: {self.config.max_gas_price_gwei} gwei")
+        self.logger.info(
+            f"Gas Oracle: {self.config.enable_gas_oracle} "
+            f"({self.config.gas_priority_tier} tier)"
+        )
         self.logger.info(f"Dry Run Mode: {self.config.dry_run}")
+        self.logger.info(f"Trigger Mode: {self.config.trigger_mode}")
+        self.logger.info(f"Yield Forecast: {self.config.enable_yield_forecast}")
+        self.logger.info(f"Profitability Check: {self.config.enable_profitability}")
+        self.logger.info(f"Price Sources: {self.config.price_sources}")
+        self.logger.info(
+            f"Harvest Simulation: {self.config.enable_harvest_simulation}"
+        )
         self.logger.info(f"Prometheus Enabled: {self.config.enable_prometheus}")
 
         # Contract info
@@ -91,12 +231,25 @@ class KeeperBot:
         self.logger.info(f"DebtManager: {contract_info['debt_manager']}")
         self.logger.info(f"StrategyBTC: {contract_info['strategy_btc']}")
         self.logger.info(f"Keeper Wallet: {contract_info['keeper_wallet']}")
+        self.logger.info("=" * 60)
+
+    def _startup_checks(self):
+        """
+        Warm the harvest template and check authorization and balance
+
+        Runs in a background thread alongside the first cycle; readiness
+        stays false until the authorization check has been recorded.
+        """
+        # Warm the prebuilt harvest transaction
+        self.contracts.refresh_harvest_template()
 
         # Check authorization
+        # A failed read is recorded as an RPC failure and retried by the loop
         is_authorized = self.contracts.check_keeper_authorization()
+        self.health.record_authorization(is_authorized)
         if is_authorized:
             self.logger.info("✅ Keeper wallet is authorized")
-        else:
+        elif is_authorized is not None:
             self.logger.warning("⚠️  Keeper wallet is NOT authorized in Harvester contract!")
             self.logger.warning(
                 "Please run: harvester.setKeeper(keeperAddress) as contract owner"
@@ -104,6 +257,9 @@ class KeeperBot:
 
         # Check balance
         balance = self.contracts.get_keeper_balance()
+        self.health.record_rpc_read(balance)
+        if balance is None:
+            return
         self.logger.info(f"Keeper Balance: {balance:.6f} BTC")
         metrics.update_keeper_balance(balance)
 
@@ -112,183 +268,322 @@ class KeeperBot:
                 "⚠️  Low keeper balance! Ensure wallet has sufficient BTC for gas"
             )
 
-        self.logger.info("=" * 60)
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(requests.exceptions.RequestException),
-    )
     def check_and_harvest(self) -> bool:
         """
         Check claimable yield and execute harvest if thresholds are met
 
+        RPC reads are retried by the endpoint pool; a cycle that still fails
+        records its error kind in last_cycle_error.
+
         Returns:
             True if harvest was executed, False otherwise
         """
         cycle_logger = get_contextual_logger(
             self.logger, cycle=self.harvest_count + 1
         )
+        self.last_cycle_error = None
 
         try:
-            # Check RPC connection
-            if not self.contracts.is_connected():
+            try:
+                with phase_timer("gas_fetch"):
+                    gas_price_wei = self.contracts.sample_gas_price_wei()
+            except Exception as e:
+                cycle_logger.warning(f"Failed to sample gas price: {e}")
+                gas_price_wei = None
+
+            # Read all cycle state from one block in a single batched call
+            with phase_timer("snapshot"):
+                snapshot = self.contracts.get_cycle_snapshot(gas_price_wei)
+            if snapshot is None:
                 cycle_logger.error("RPC connection lost")
+                self.last_cycle_error = CONNECTION
                 metrics.update_rpc_status(False)
                 metrics.record_error("rpc_disconnected")
+                self.health.record_rpc_failure()
                 return False
 
+            self.last_snapshot = snapshot
             metrics.update_rpc_status(True)
+            metrics.update_keeper_balance(snapshot.keeper_balance_btc)
+            self.health.record_rpc_read(
+                snapshot.keeper_balance_btc, snapshot.block_number
+            )
 
-            # Check gas price
-            gas_price = self.contracts.get_gas_price()
+            gas_price = snapshot.gas_price_gwei
             metrics.update_gas_price(gas_price)
 
-            if gas_price > self.config.max_gas_price_gwei:
-                cycle_logger.warning(
-                    f"Gas price too high: {gas_price:.2f} gwei "
-                    f"(max: {self.config.max_gas_price_gwei} gwei). Skipping harvest."
-                )
-                metrics.record_harvest_attempt("skipped_high_gas")
-                return False
-
             # Get claimable yield
-            claimable0, claimable1 = self.contracts.get_claimable_yield()
+            claimable0, claimable1 = snapshot.claimable0, snapshot.claimable1
+            with phase_timer("price_refresh"):
+                self.contracts.refresh_prices(self.price_tokens, snapshot.block_number)
             total_yield_usd = self.contracts.estimate_yield_usd(
                 claimable0, claimable1
             )
+            if total_yield_usd is None:
+                cycle_logger.warning("No fresh token prices. Skipping harvest.")
+                metrics.record_harvest_attempt("skipped_stale_price")
+                return False
             metrics.update_claimable_yield(total_yield_usd)
+            if self.state_store is not None:
+                self.state_store.record_cycle(DEFAULT_VAULT, snapshot, total_yield_usd)
+            self.forecaster.add_sample(
+                snapshot.block_number,
+                snapshot.block_timestamp,
+                claimable0,
+                claimable1,
+                total_yield_usd,
+            )
 
             cycle_logger.info(
                 f"Claimable yield: {claimable0:.6f} token0, {claimable1:.6f} token1 "
-                f"(≈${total_yield_usd:.2f} USD)"
+                f"(≈${total_yield_usd:.2f} USD) at block {snapshot.block_number}",
+                extra={"block": snapshot.block_number},
             )
 
-            # Check if yield meets threshold
-            if total_yield_usd < self.config.min_yield_threshold_usd:
-                cycle_logger.info(
-                    f"Yield below threshold (${total_yield_usd:.2f} < "
-                    f"${self.config.min_yield_threshold_usd}). Skipping harvest."
+            with phase_timer("decision"):
+                # Value expected gas cost against yield
+                economics = None
+                if self.config.enable_profitability:
+                    economics = evaluate_economics(
+                        yield_usd=total_yield_usd,
+                        gas_units=self.contracts.estimate_harvest_gas(),
+                        gas_price_gwei=gas_price,
+                        btc_price_usd=self._btc_price_usd(),
+                        accrual_rate_usd_per_second=self.forecaster.rate_per_second(),
+                        opportunity_apr=self.config.yield_opportunity_apr,
+                    )
+                    self.last_economics = economics
+                    metrics.update_harvest_economics(
+                        economics.gas_cost_usd, economics.net_profit_usd
+                    )
+
+                # Check gas price, yield and profitability thresholds
+                decision = evaluate_harvest(
+                    gas_price_gwei=gas_price,
+                    yield_usd=total_yield_usd,
+                    max_gas_price_gwei=self.config.max_gas_price_gwei,
+                    min_yield_threshold_usd=self.config.min_yield_threshold_usd,
+                    economics=economics,
+                    min_profit_usd=self.config.min_profit_usd,
+                )
+                fee_ceiling_wei = harvest_fee_ceiling_wei(
+                    self.config.max_gas_price_gwei,
+                    economics,
+                    self.config.min_profit_usd,
+                )
+
+            # A harvest left pending by an earlier cycle is followed up
+            # whatever the decision, so a gas spike that holds back new
+            # harvests cannot strand it unreplaced
+            pending_tx = self.contracts.pending_harvest(fee_ceiling_wei)
+            if pending_tx is not None:
+                return self._follow_harvest(
+                    pending_tx, total_yield_usd, time.time(), cycle_logger
                 )
-                metrics.record_harvest_attempt("skipped_low_yield")
+
+            if not decision.should_harvest:
+                cycle_logger.info(f"{decision.reason}. Skipping harvest.")
+                metrics.record_harvest_attempt(decision.status)
                 return False
 
+            # Pre-flight: skip reverts and poor swap output before paying gas
+            if self.config.enable_harvest_simulation:
+                with phase_timer("simulation"):
+                    simulated = self._check_simulation(
+                        claimable0, claimable1, total_yield_usd, economics
+                    )
+                if not simulated.should_harvest:
+                    cycle_logger.info(f"{simulated.reason}. Skipping harvest.")
+                    metrics.record_harvest_attempt(simulated.status)
+                    return False
+                cycle_logger.info(simulated.reason)
+
             # Execute harvest
-            cycle_logger.info(
-                f"💰 Yield threshold met! Executing harvest "
-                f"(${total_yield_usd:.2f} USD, gas: {gas_price:.2f} gwei)"
-            )
+            cycle_logger.info(f"💰 {decision.reason}! Executing harvest")
 
             start_time = time.time()
-            tx_hash = self.contracts.execute_harvest(dry_run=self.config.dry_run)
-            duration = time.time() - start_time
+            tx_hash = self.contracts.submit_harvest(
+                dry_run=self.config.dry_run, fee_ceiling_wei=fee_ceiling_wei
+            )
+            if tx_hash and self.state_store is not None:
+                self.state_store.record_submission(
+                    DEFAULT_VAULT,
+                    tx_hash,
+                    self.contracts.pending_nonces.get(tx_hash),
+                    total_yield_usd,
+                )
+            return self._follow_harvest(
+                tx_hash, total_yield_usd, start_time, cycle_logger
+            )
 
-            if tx_hash:
-                self.harvest_count += 1
-                self.last_harvest_time = datetime.now()
+        except Exception as e:
+            self.last_cycle_error = classify_error(e)
+            cycle_logger.error(
+                f"Error during harvest cycle ({self.last_cycle_error}): {e}",
+                exc_info=True,
+            )
+            metrics.record_harvest_attempt("error")
+            metrics.record_error("harvest_exception")
+            self._send_error_alert(f"Harvest exception: {str(e)}")
+            return False
 
-                metrics.record_harvest_attempt("success")
-                metrics.record_yield_collected(total_yield_usd)
-                metrics.record_harvest_duration(duration)
-                metrics.update_last_harvest_timestamp(time.time())
+    def _follow_harvest(
+        self,
+        tx_hash: Optional[str],
+        total_yield_usd: float,
+        start_time: float,
+        cycle_logger: LoggerAdapter,
+    ) -> bool:
+        """
+        Wait for a broadcast harvest and record its outcome
 
-                cycle_logger.info(
-                    f"✅ Harvest successful! TX: {tx_hash[:10]}... "
-                    f"(took {duration:.2f}s)"
-                )
-                cycle_logger.info(
-                    f"View transaction: {self.config.explorer_url}/tx/{tx_hash}"
-                )
+        Args:
+            tx_hash: Hash returned by submit_harvest or pending_harvest
+                (None if the harvest could not be sent)
+            total_yield_usd: Claimable yield the harvest collects
+            start_time: When the harvest was started, for its duration
+            cycle_logger: Logger carrying the cycle context
 
-                # Send alert if configured
-                self._send_success_alert(total_yield_usd, tx_hash)
+        Returns:
+            True if the harvest succeeded, False otherwise
+        """
+        self.contracts.last_tx_outcome = None
+        if tx_hash:
+            tx_hash = self._wait_for_receipt(tx_hash, total_yield_usd)
+        duration = time.time() - start_time
 
-                # Update protocol stats
-                self._log_protocol_stats()
+        if tx_hash:
+            self.harvest_count += 1
+            self.last_harvest_time = datetime.now()
+            self.forecaster.reset()
 
-                return True
-            else:
-                cycle_logger.error("Harvest transaction failed")
-                metrics.record_harvest_attempt("failed")
-                metrics.record_error("harvest_tx_failed")
-                self._send_error_alert("Harvest transaction failed")
-                return False
+            metrics.record_harvest_attempt("success")
+            metrics.record_yield_collected(total_yield_usd)
+            metrics.record_harvest_duration(duration)
+            metrics.update_last_harvest_timestamp(time.time())
 
-        except Exception as e:
-            cycle_logger.error(f"Error during harvest cycle: {e}", exc_info=True)
-            metrics.record_harvest_attempt("error")
-            metrics.record_error("harvest_exception")
-            self._send_error_alert(f"Harvest exception: {str(e)}")
+            cycle_logger.info(
+                f"✅ Harvest successful! TX: {tx_hash[:10]}... "
+                f"(took {duration:.2f}s)",
+                extra={"tx": tx_hash},
+            )
+            cycle_logger.info(
+                f"View transaction: {self.config.explorer_url}/tx/{tx_hash}"
+            )
+
+            # Send alert if configured
+            self._send_success_alert(total_yield_usd, tx_hash)
+
+            # Update protocol stats
+            self._log_protocol_stats()
+
+            return True
+        elif self.contracts.last_tx_outcome == WAIT:
+            # Still tracked: the next cycle resumes it
+            cycle_logger.warning("Harvest still pending, resuming next cycle")
+            metrics.record_harvest_attempt("pending")
+            return False
+        else:
+            cycle_logger.error("Harvest transaction failed")
+            metrics.record_harvest_attempt("failed")
+            metrics.record_error("harvest_tx_failed")
+            self._send_error_alert("Harvest transaction failed")
             return False
 
+    def _wait_for_receipt(self, tx_hash: str, yield_usd: float) -> Optional[str]:
+        """Wait for a submitted harvest, recording its receipt in the state store"""
+        self.contracts.last_receipt = None
+        success = self.contracts.wait_for_harvest_receipt(tx_hash)
+        receipt = self.contracts.last_receipt
+        if self.state_store is not None and receipt is not None:
+            self.state_store.record_receipt(
+                DEFAULT_VAULT, tx_hash, success, yield_usd, receipt
+            )
+        if not success:
+            return None
+        # A sped-up harvest is mined under its replacement's hash
+        return receipt["transactionHash"].hex()
+
+    def _restore_state(self):
+        """Restore harvest counters and forecast samples from the state store"""
+        count, last_harvest = self.state_store.harvest_stats(DEFAULT_VAULT)
+        self.harvest_count = count
+        if last_harvest is not None:
+            self.last_harvest_time = datetime.fromtimestamp(last_harvest)
+            metrics.update_last_harvest_timestamp(last_harvest)
+
+        # Samples since the last harvest describe the current accrual curve
+        for row in self.state_store.cycles(
+            DEFAULT_VAULT, since=last_harvest, limit=self.forecaster.samples.maxlen
+        ):
+            self.forecaster.add_sample(
+                row["block_number"],
+                row["block_timestamp"],
+                row["claimable0"],
+                row["claimable1"],
+                row["yield_usd"],
+            )
+        self.logger.info(
+            f"Restored {count} harvests and {len(self.forecaster.samples)} "
+            f"yield samples from {self.config.state_db_path}"
+        )
+
+    def _check_simulation(
+        self,
+        claimable0: float,
+        claimable1: float,
+        yield_usd: float,
+        economics: Optional[HarvestEconomics],
+    ) -> HarvestDecision:
+        """Simulate harvest() and re-check the decision against its outcome"""
+        simulation = self.contracts.simulate_harvest(claimable0, claimable1)
+        if simulation is None:
+            return HarvestDecision(
+                should_harvest=True,
+                status="execute",
+                reason="Harvest simulation unavailable",
+            )
+        return evaluate_simulation(
+            simulation,
+            yield_usd,
+            musd_price_usd=self.config.musd_price_usd,
+            max_slippage=self.config.max_harvest_slippage,
+            economics=economics,
+            min_profit_usd=self.config.min_profit_usd,
+        )
+
+    def _btc_price_usd(self) -> float:
+        """BTC/USD from the price oracle, or the static fallback"""
+        if self.price_oracle is not None:
+            price = self.price_oracle.get(self.contracts.price_market.btc)
+            if price is not None:
+                return price.usd
+        return self.config.btc_price_usd
+
     def _log_protocol_stats(self):
         """Log current protocol statistics after successful harvest"""
         try:
-            total_debt = self.contracts.get_total_debt()
-            total_btc = self.contracts.get_total_btc_deposited()
+            snapshot = self.contracts.get_cycle_snapshot()
+            if snapshot is None:
+                self.logger.warning("Failed to fetch protocol stats: RPC unavailable")
+                return
+
+            self.last_snapshot = snapshot
             self.logger.info(
-                f"📊 Protocol Stats - Total BTC: {total_btc:.4f}, "
-                f"Total Debt: {total_debt:.2f} bMUSD"
+                f"📊 Protocol Stats - Total BTC: {snapshot.total_btc_deposited:.4f}, "
+                f"Total Debt: {snapshot.total_debt:.2f} bMUSD "
+                f"(block {snapshot.block_number})"
             )
         except Exception as e:
             self.logger.warning(f"Failed to fetch protocol stats: {e}")
 
     def _send_success_alert(self, yield_usd: float, tx_hash: str):
-        """Send Slack alert on successful harvest"""
-        if not self.config.enable_slack_alerts or not self.config.slack_webhook_url:
-            return
-
-        try:
-            message = {
-                "text": f"🌾 Harvest Successful!",
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": (
-                                f"*Stratum Fi Keeper Bot - Harvest Complete*\n\n"
-                                f"• Yield Collected: `${yield_usd:.2f} USD`\n"
-                                f"• Transaction: <{self.config.explorer_url}/tx/{tx_hash}|{tx_hash[:10]}...>\n"
-                                f"• Timestamp: {datetime.now().isoformat()}"
-                            ),
-                        },
-                    }
-                ],
-            }
-            requests.post(
-                self.config.slack_webhook_url, json=message, timeout=5
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to send Slack alert: {e}")
+        """Queue alert on successful harvest (delivered in the background)"""
+        self.alerts.submit(success_alert(yield_usd, tx_hash))
 
     def _send_error_alert(self, error_msg: str):
-        """Send Slack alert on error"""
-        if not self.config.enable_slack_alerts or not self.config.slack_webhook_url:
-            return
-
-        try:
-            message = {
-                "text": f"⚠️ Keeper Bot Error: {error_msg}",
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": (
-                                f"*Stratum Fi Keeper Bot - Error*\n\n"
-                                f"• Error: `{error_msg}`\n"
-                                f"• Timestamp: {datetime.now().isoformat()}"
-                            ),
-                        },
-                    }
-                ],
-            }
-            requests.post(
-                self.config.slack_webhook_url, json=message, timeout=5
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to send error alert: {e}")
+        """Queue alert on error (delivered in the background)"""
+        self.alerts.submit(error_alert(error_msg))
 
     def run(self):
         """
@@ -301,6 +596,10 @@ class KeeperBot:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+        threading.Thread(
+            target=self._startup_checks, name="startup-checks", daemon=True
+        ).start()
+
         while self.running:
             try:
                 self.logger.info(
@@ -309,13 +608,26 @@ class KeeperBot:
                 )
 
                 # Execute harvest check
-                self.check_and_harvest()
-
-                # Update keeper balance
-                balance = self.contracts.get_keeper_balance()
-                metrics.update_keeper_balance(balance)
+                self.last_snapshot = None
+                with cycle_breakdown(self.logger, self.harvest_count + 1):
+                    self.check_and_harvest()
+
+                # Keeper balance comes from the cycle snapshot when available
+                if self.last_snapshot is not None:
+                    balance = self.last_snapshot.keeper_balance_btc
+                else:
+                    balance = self.contracts.get_keeper_balance()
+                    self.health.record_rpc_read(balance)
+                if balance is not None:
+                    metrics.update_keeper_balance(balance)
+
+                # Authorization rarely changes; re-check it for readiness
+                if self.health.authorization_due():
+                    self.health.record_authorization(
+                        self.contracts.check_keeper_authorization()
+                    )
 
-                if balance < 0.0001:
+                if balance is not None and balance < 0.0001:
                     self.logger.critical(
                         f"⚠️  CRITICAL: Keeper balance very low ({balance:.6f} BTC). "
                         "Please fund the wallet!"
@@ -324,12 +636,11 @@ class KeeperBot:
                         f"Critical: Keeper balance low ({balance:.6f} BTC)"
                     )
 
-                # Sleep until next cycle
-                self.logger.info(
-                    f"⏳ Sleeping for {self.config.harvest_interval_seconds}s "
-                    f"until next check..."
-                )
-                time.sleep(self.config.harvest_interval_seconds)
+                # Keep the harvest gas estimate warm off the send path
+                if self.contracts.harvest_template.needs_refresh():
+                    self.contracts.refresh_harvest_template()
+
+                self._wait_for_next_cycle()
 
             except KeyboardInterrupt:
                 self.logger.info("Keyboard interrupt received. Shutting down...")
@@ -339,11 +650,65 @@ class KeeperBot:
                     f"Unexpected error in main loop: {e}", exc_info=True
                 )
                 metrics.record_error("main_loop_exception")
-                # Sleep briefly before retrying
-                time.sleep(30)
+                delay = self.error_backoff.next_delay()
+                self.logger.info(f"🔁 Retrying in {delay:.1f}s")
+                time.sleep(delay)
 
         self._shutdown()
 
+    def _harvest_target_usd(self) -> float:
+        """Yield at which the next harvest is expected to execute"""
+        if self.last_economics is None:
+            return self.config.min_yield_threshold_usd
+        return self.last_economics.target_yield_usd(
+            self.config.min_yield_threshold_usd, self.config.min_profit_usd
+        )
+
+    def _next_check_interval(self) -> float:
+        """Seconds until the next check, forecast from yield accrual if enabled"""
+        interval = self.config.harvest_interval_seconds
+        if self.last_cycle_error in RECOVERABLE_ERRORS:
+            delay = min(interval, self.error_backoff.next_delay())
+            self.logger.info(
+                f"🔁 Cycle failed ({self.last_cycle_error}), retrying in {delay:.1f}s"
+            )
+            return delay
+        self.error_backoff.reset()
+
+        if not self.config.enable_yield_forecast:
+            return interval
+
+        delay = self.forecaster.next_check_delay(
+            self._harvest_target_usd(),
+            min_interval=self.config.min_check_interval_seconds,
+            max_interval=interval,
+        )
+        rate = self.forecaster.rate_per_second()
+        if rate is not None:
+            self.logger.info(
+                f"📈 Yield accruing at ${rate * 3600:.2f}/h, "
+                f"next check in {delay:.0f}s"
+            )
+        return delay
+
+    def _wait_for_next_cycle(self):
+        """Sleep until the next check, or until relevant on-chain activity"""
+        interval = self._next_check_interval()
+        if self.trigger is None:
+            self.logger.info(f"⏳ Sleeping for {interval:.0f}s until next check...")
+            time.sleep(interval)
+            return
+
+        self.logger.info(
+            f"⏳ Waiting for relevant on-chain activity (max {interval:.0f}s)..."
+        )
+        changed = self.trigger.wait(interval, should_stop=lambda: not self.running)
+        if changed:
+            self.logger.info(
+                f"⚡ Trigger events at block {self.trigger.last_block} "
+                f"from {', '.join(sorted(changed))}"
+            )
+
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         self.logger.info(f"Received signal {signum}. Shutting down gracefully...")
@@ -364,6 +729,17 @@ class KeeperBot:
         # Stop health check server
         if hasattr(self, 'health_server'):
             self.health_server.stop()
+
+        # Stop the RPC pool's worker threads
+        self.contracts.close()
+
+        # Flush queued history rows
+        if self.state_store is not None:
+            self.state_store.close()
+
+        # Deliver queued alerts before closing their connections
+        self.alerts.close()
+        self.http.close()
         
         self.logger.info("Keeper bot stopped. Goodbye! 👋")
         sys.exit(0)
@@ -385,8 +761,15 @@ def main():
     )
 
     try:
-        bot = KeeperBot()
-        bot.run()
+        # Multi-vault mode always runs on the asyncio engine
+        config = get_config()
+        if config.async_mode or config.vaults_file:
+            from async_keeper import run_async
+
+            run_async()
+        else:
+            bot = KeeperBot()
+            bot.run()
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         sys.exit(1)
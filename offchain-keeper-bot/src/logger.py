@@ -1,20 +1,108 @@
 """
 Logging configuration for Stratum Fi Keeper Bot
 Provides structured, colorized console output and file logging
+
+Records are handed to a background QueueListener, so console and file
+writes (and JSON/colour formatting) never block the keeper loop.
 """
 
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import colorlog
 
+# Context attached through get_contextual_logger or extra=, emitted as
+# fields in JSON lines and as "| key=value" suffixes in text logs
+CONTEXT_FIELDS = ("cycle", "vault", "block", "tx")
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Listener of the logger configured last (stopped on reconfigure and exit)
+_listener: Optional[QueueListener] = None
+
+
+def _context(record: logging.LogRecord) -> Dict:
+    """Context fields set on a record"""
+    return {
+        key: getattr(record, key)
+        for key in CONTEXT_FIELDS
+        if getattr(record, key, None) is not None
+    }
+
+
+class _ContextMixin:
+    """Appends context fields to the formatted text message"""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        context = _context(record)
+        if not context:
+            return message
+        return message + "".join(f" | {k}={v}" for k, v in context.items())
+
+
+class ContextFormatter(_ContextMixin, logging.Formatter):
+    """Plain text formatter with context suffixes"""
+
+
+class ColoredContextFormatter(_ContextMixin, colorlog.ColoredFormatter):
+    """Colorized console formatter with context suffixes"""
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, context fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_context(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _KeeperQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread
+
+    Only the message is rendered here (args may not be safe to read later);
+    exceptions are rendered to text since tracebacks cannot be queued.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 
 def setup_logger(
     name: str = "keeper",
     level: str = "INFO",
     log_file: Optional[str] = None,
+    log_format: str = "text",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
 ) -> logging.Logger:
     """
     Configure and return a logger instance with both console and file handlers
@@ -23,62 +111,87 @@ def setup_logger(
         name: Logger name
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional path to log file
+        log_format: "text" (colorized console) or "json" (JSON lines)
+        max_bytes: Log file size that triggers rotation (0 never rotates)
+        backup_count: Rotated log files kept
 
     Returns:
         Configured logger instance
     """
+    global _listener
+
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
     logger.handlers.clear()  # Remove any existing handlers
+    shutdown_logging()
+
+    if log_format == "json":
+        console_formatter = file_formatter = JsonFormatter()
+    else:
+        # Console handler with colors
+        console_formatter = ColoredContextFormatter(
+            "%(log_color)s" + TEXT_FORMAT,
+            datefmt=DATE_FORMAT,
+            log_colors={
+                "DEBUG": "cyan",
+                "INFO": "green",
+                "WARNING": "yellow",
+                "ERROR": "red",
+                "CRITICAL": "red,bg_white",
+            },
+            secondary_log_colors={},
+            style="%",
+        )
+        file_formatter = ContextFormatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
 
-    # Console handler with colors
-    console_handler = colorlog.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-
-    console_formatter = colorlog.ColoredFormatter(
-        "%(log_color)s%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        log_colors={
-            "DEBUG": "cyan",
-            "INFO": "green",
-            "WARNING": "yellow",
-            "ERROR": "red",
-            "CRITICAL": "red,bg_white",
-        },
-        secondary_log_colors={},
-        style="%",
-    )
+    console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler (if log_file provided)
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        file_handler = logging.FileHandler(log_file, mode="a")
-        file_handler.setLevel(logging.DEBUG)
-
-        file_formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+        file_handler = RotatingFileHandler(
+            log_file, mode="a", maxBytes=max_bytes, backupCount=backup_count
         )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_KeeperQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     return logger
 
 
+def shutdown_logging():
+    """Write out queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 class LoggerAdapter(logging.LoggerAdapter):
     """
     Custom logger adapter that adds contextual information to log messages
+
+    Context is attached to the record (not the message), so it is only
+    formatted if the record is emitted.
     """
 
     def process(self, msg, kwargs):
-        """Add context from self.extra to log message"""
+        """Merge context from self.extra into the record's extra fields"""
         if self.extra:
-            context_str = " | ".join(f"{k}={v}" for k, v in self.extra.items())
-            return f"{msg} | {context_str}", kwargs
+            kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}
         return msg, kwargs
 
 
@@ -96,4 +209,3 @@ def get_contextual_logger(
         LoggerAdapter with context
     """
     return LoggerAdapter(base_logger, context)
-
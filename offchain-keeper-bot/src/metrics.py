@@ -3,35 +3,90 @@ Prometheus metrics for Stratum Fi Keeper Bot
 Tracks harvest operations, gas usage, yield collected, and system health
 """
 
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 import logging
 
+from profiling import record_cycle_phase
+
 logger = logging.getLogger("keeper.metrics")
 
+# Vault label used by the single-vault engine
+DEFAULT_VAULT = "default"
+
+# Vault label for per-cycle reads shared by every vault (async engine)
+ALL_VAULTS = "all"
+
+# Sub-millisecond to multi-minute buckets: local phases (decision, signing)
+# take microseconds, waiting for inclusion takes blocks
+LATENCY_BUCKETS = [
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+]
+
 
 # Harvest Metrics
 harvest_attempts_total = Counter(
     "keeper_harvest_attempts_total",
     "Total number of harvest attempts",
-    ["status"],  # status: success, failed, skipped
+    ["status", "vault"],  # status: success, failed, pending, skipped, error
 )
 
 harvest_yield_collected_usd = Counter(
     "keeper_harvest_yield_collected_usd_total",
     "Total yield collected in USD equivalent",
+    ["vault"],
 )
 
 harvest_gas_used_total = Counter(
     "keeper_harvest_gas_used_total",
     "Total gas consumed by harvest transactions",
+    ["vault"],
 )
 
 harvest_duration_seconds = Histogram(
     "keeper_harvest_duration_seconds",
     "Time taken to execute harvest operation",
+    ["vault"],
     buckets=[1, 5, 10, 30, 60, 120, 300],
 )
 
+harvest_phase_duration_seconds = Histogram(
+    "keeper_harvest_phase_duration_seconds",
+    "Time spent in each phase of a harvest cycle",
+    # phase: gas_fetch, snapshot, price_refresh, decision, simulation,
+    # gas_estimation, signing, broadcast, inclusion, confirmation
+    ["phase", "vault"],
+    buckets=LATENCY_BUCKETS,
+)
+
+harvest_tx_events_total = Counter(
+    "keeper_harvest_tx_events_total",
+    "In-flight harvest transactions sped up, cancelled or rebroadcast",
+    # event: replaced, cancelled, rebroadcast, reorged, lost
+    ["event", "vault"],
+)
+
 # System Health Metrics
 keeper_balance_btc = Gauge(
     "keeper_wallet_balance_btc",
@@ -46,11 +101,57 @@ rpc_connection_status = Gauge(
 last_successful_harvest_timestamp = Gauge(
     "keeper_last_successful_harvest_timestamp",
     "Unix timestamp of last successful harvest",
+    ["vault"],
 )
 
 claimable_yield_usd = Gauge(
     "keeper_claimable_yield_usd",
     "Current claimable yield in USD",
+    ["vault"],
+)
+
+harvest_gas_cost_usd = Gauge(
+    "keeper_harvest_gas_cost_usd",
+    "Expected gas cost of harvesting now in USD",
+    ["vault"],
+)
+
+harvest_net_profit_usd = Gauge(
+    "keeper_harvest_net_profit_usd",
+    "Expected net profit of harvesting now in USD (yield minus gas)",
+    ["vault"],
+)
+
+# RPC Endpoint Metrics
+rpc_request_duration_seconds = Histogram(
+    "keeper_rpc_request_duration_seconds",
+    "Latency of JSON-RPC requests per method and endpoint",
+    ["method", "endpoint"],
+    buckets=LATENCY_BUCKETS[:-4],  # Requests time out well before 30s
+)
+
+rpc_endpoint_errors_total = Counter(
+    "keeper_rpc_endpoint_errors_total",
+    "Failed JSON-RPC requests per endpoint (transport errors and rate limits)",
+    ["endpoint", "kind"],  # kind: timeout, rate_limit, connection, server, ...
+)
+
+rpc_endpoint_healthy = Gauge(
+    "keeper_rpc_endpoint_healthy",
+    "RPC endpoint circuit state (1=closed, 0=open after consecutive failures)",
+    ["endpoint", "operation"],  # operation: read, broadcast
+)
+
+rpc_retries_total = Counter(
+    "keeper_rpc_retries_total",
+    "JSON-RPC requests retried after a transient error",
+    ["operation", "kind"],
+)
+
+rpc_hedged_requests_total = Counter(
+    "keeper_rpc_hedged_requests_total",
+    "Reads also sent to a second endpoint because the first was slow or failed",
+    ["endpoint"],
 )
 
 gas_price_gwei = Gauge(
@@ -58,6 +159,19 @@ gas_price_gwei = Gauge(
     "Current gas price in gwei",
 )
 
+# Alerting
+alerts_delivered_total = Counter(
+    "keeper_alerts_delivered_total",
+    "Alert deliveries per sink",
+    ["sink", "status"],  # status: sent, failed
+)
+
+alerts_discarded_total = Counter(
+    "keeper_alerts_discarded_total",
+    "Alerts not delivered individually",
+    ["reason"],  # reason: suppressed (folded into a summary), dropped (queue full)
+)
+
 # Error Tracking
 errors_total = Counter(
     "keeper_errors_total",
@@ -73,8 +187,10 @@ class MetricsCollector:
         self.port = port
         self.server_started = False
 
-    def start_server(self):
+    def start_server(self, port: Optional[int] = None):
         """Start Prometheus HTTP server"""
+        if port is not None:
+            self.port = port
         if not self.server_started:
             try:
                 start_http_server(self.port)
@@ -84,24 +200,36 @@ class MetricsCollector:
                 logger.warning(f"Failed to start metrics server: {e}")
 
     @staticmethod
-    def record_harvest_attempt(status: str):
+    def record_harvest_attempt(status: str, vault: str = DEFAULT_VAULT):
         """Record a harvest attempt with status"""
-        harvest_attempts_total.labels(status=status).inc()
+        harvest_attempts_total.labels(status=status, vault=vault).inc()
 
     @staticmethod
-    def record_yield_collected(amount_usd: float):
+    def record_yield_collected(amount_usd: float, vault: str = DEFAULT_VAULT):
         """Record yield collected in USD"""
-        harvest_yield_collected_usd.inc(amount_usd)
+        harvest_yield_collected_usd.labels(vault=vault).inc(amount_usd)
 
     @staticmethod
-    def record_gas_used(gas_amount: int):
+    def record_gas_used(gas_amount: int, vault: str = DEFAULT_VAULT):
         """Record gas consumed"""
-        harvest_gas_used_total.inc(gas_amount)
+        harvest_gas_used_total.labels(vault=vault).inc(gas_amount)
 
     @staticmethod
-    def record_harvest_duration(duration_seconds: float):
+    def record_harvest_duration(duration_seconds: float, vault: str = DEFAULT_VAULT):
         """Record harvest operation duration"""
-        harvest_duration_seconds.observe(duration_seconds)
+        harvest_duration_seconds.labels(vault=vault).observe(duration_seconds)
+
+    @staticmethod
+    def record_phase(phase: str, duration_seconds: float, vault: str = DEFAULT_VAULT):
+        """Record the duration of one harvest cycle phase"""
+        harvest_phase_duration_seconds.labels(phase=phase, vault=vault).observe(
+            duration_seconds
+        )
+
+    @staticmethod
+    def record_tx_event(event: str, vault: str = DEFAULT_VAULT):
+        """Record a replacement, cancel or rebroadcast of a pending harvest"""
+        harvest_tx_events_total.labels(event=event, vault=vault).inc()
 
     @staticmethod
     def update_keeper_balance(balance_btc: float):
@@ -114,14 +242,22 @@ class MetricsCollector:
         rpc_connection_status.set(1 if is_connected else 0)
 
     @staticmethod
-    def update_last_harvest_timestamp(timestamp: float):
+    def update_last_harvest_timestamp(timestamp: float, vault: str = DEFAULT_VAULT):
         """Update last successful harvest timestamp"""
-        last_successful_harvest_timestamp.set(timestamp)
+        last_successful_harvest_timestamp.labels(vault=vault).set(timestamp)
 
     @staticmethod
-    def update_claimable_yield(amount_usd: float):
+    def update_claimable_yield(amount_usd: float, vault: str = DEFAULT_VAULT):
         """Update current claimable yield"""
-        claimable_yield_usd.set(amount_usd)
+        claimable_yield_usd.labels(vault=vault).set(amount_usd)
+
+    @staticmethod
+    def update_harvest_economics(
+        gas_cost_usd: float, net_profit_usd: float, vault: str = DEFAULT_VAULT
+    ):
+        """Update expected gas cost and net profit of harvesting now"""
+        harvest_gas_cost_usd.labels(vault=vault).set(gas_cost_usd)
+        harvest_net_profit_usd.labels(vault=vault).set(net_profit_usd)
 
     @staticmethod
     def update_gas_price(price_gwei: float):
@@ -133,7 +269,68 @@ class MetricsCollector:
         """Record an error occurrence"""
         errors_total.labels(error_type=error_type).inc()
 
+    @staticmethod
+    def record_rpc_request(method: str, endpoint: str, duration_seconds: float):
+        """Record a JSON-RPC request's latency"""
+        rpc_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(
+            duration_seconds
+        )
+
+    @staticmethod
+    def record_rpc_error(endpoint: str, kind: str):
+        """Record a failed request on an RPC endpoint"""
+        rpc_endpoint_errors_total.labels(endpoint=endpoint, kind=kind).inc()
+
+    @staticmethod
+    def update_rpc_endpoint_health(endpoint: str, operation: str, healthy: bool):
+        """Update whether an RPC endpoint is in rotation"""
+        rpc_endpoint_healthy.labels(endpoint=endpoint, operation=operation).set(
+            1 if healthy else 0
+        )
+
+    @staticmethod
+    def record_rpc_retry(operation: str, kind: str):
+        """Record a JSON-RPC request retried after a transient error"""
+        rpc_retries_total.labels(operation=operation, kind=kind).inc()
+
+    @staticmethod
+    def record_rpc_hedge(endpoint: str):
+        """Record a read hedged to a second RPC endpoint"""
+        rpc_hedged_requests_total.labels(endpoint=endpoint).inc()
+
+    @staticmethod
+    def record_alert_delivery(sink: str, status: str):
+        """Record an alert delivery attempt outcome"""
+        alerts_delivered_total.labels(sink=sink, status=status).inc()
+
+    @staticmethod
+    def record_alert_discarded(reason: str):
+        """Record an alert that was folded or dropped"""
+        alerts_discarded_total.labels(reason=reason).inc()
+
 
 # Global metrics instance
 metrics = MetricsCollector()
 
+
+@contextmanager
+def phase_timer(phase: str, vault: str = DEFAULT_VAULT) -> Iterator[None]:
+    """
+    Time a block of a harvest cycle into harvest_phase_duration_seconds
+
+    The duration is recorded even if the block raises, so slow failures
+    show up in the phase that failed. Wall and CPU time also go to the
+    cycle breakdown when one is being logged.
+
+    Args:
+        phase: Phase name
+        vault: Vault label
+    """
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        metrics.record_phase(phase, duration, vault)
+        record_cycle_phase(phase, duration, time.process_time() - cpu_started)
@@ -0,0 +1,143 @@
+"""
+Local nonce tracking for the keeper wallet
+Hands out sequential nonces without an RPC round trip per transaction and
+resyncs from the chain when a gap or nonce rejection is detected
+"""
+
+import logging
+import threading
+from typing import Optional, Set
+
+logger = logging.getLogger("keeper.nonce")
+
+# Substrings of node error messages that mean our local nonce is wrong
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "already known",
+    "known transaction",
+    "replacement transaction underpriced",
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Return True if an RPC error was caused by a bad nonce"""
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+class NonceManager:
+    """
+    Thread-safe local nonce allocator for one keeper wallet
+
+    The manager performs no network I/O. Callers check needs_sync and feed
+    it the chain's pending transaction count via sync() before reserving.
+    """
+
+    def __init__(self, address: str):
+        """
+        Initialize nonce manager
+
+        Args:
+            address: Keeper wallet address (for logging)
+        """
+        self.address = address
+        self._next_nonce: Optional[int] = None
+        self._in_flight: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def needs_sync(self) -> bool:
+        """True until synced from chain, and after a gap or rejection"""
+        return self._next_nonce is None
+
+    @property
+    def in_flight(self) -> Set[int]:
+        """Nonces broadcast but not yet confirmed"""
+        with self._lock:
+            return set(self._in_flight)
+
+    def sync(self, chain_pending_nonce: int):
+        """
+        Reset local state from the chain's pending transaction count
+
+        Args:
+            chain_pending_nonce: eth_getTransactionCount(address, "pending")
+        """
+        with self._lock:
+            current = self._next_nonce
+            if current is not None and current != chain_pending_nonce:
+                logger.warning(
+                    f"Nonce resync for {self.address}: local {current}, "
+                    f"chain {chain_pending_nonce}"
+                )
+            self._next_nonce = chain_pending_nonce
+            self._in_flight = {n for n in self._in_flight if n < chain_pending_nonce}
+
+    def peek(self) -> int:
+        """Return the next nonce without reserving it"""
+        with self._lock:
+            if self._next_nonce is None:
+                raise RuntimeError("NonceManager not synced")
+            return self._next_nonce
+
+    def reserve(self) -> int:
+        """
+        Reserve the next nonce for a transaction about to be broadcast
+
+        Returns:
+            Reserved nonce
+        """
+        with self._lock:
+            if self._next_nonce is None:
+                raise RuntimeError("NonceManager not synced")
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            self._in_flight.add(nonce)
+            return nonce
+
+    def confirm(self, nonce: int):
+        """Mark a nonce as mined"""
+        with self._lock:
+            self._in_flight.discard(nonce)
+
+    def release(self, nonce: int, error: Optional[Exception] = None):
+        """
+        Return a reserved nonce whose transaction was never accepted
+
+        If it was the most recent reservation it is simply reused; otherwise
+        a gap now exists below later transactions and a resync is forced.
+        Nonce rejections from the node always force a resync.
+
+        Args:
+            nonce: Nonce that failed to broadcast
+            error: Broadcast error, if any
+        """
+        with self._lock:
+            self._in_flight.discard(nonce)
+
+            if error is not None and is_nonce_error(error):
+                logger.warning(f"Nonce {nonce} rejected ({error}), resyncing")
+                self._next_nonce = None
+            elif self._next_nonce is not None and nonce == self._next_nonce - 1:
+                self._next_nonce = nonce
+            else:
+                logger.warning(f"Nonce gap at {nonce}, resyncing")
+                self._next_nonce = None
+
+    def reconcile(self, chain_pending_nonce: int):
+        """
+        Detect gaps against the chain's pending nonce
+
+        A pending count below our next nonce means broadcast transactions
+        were dropped from the mempool; above it means another sender used
+        this wallet. Either way local state is reset to the chain's view.
+
+        Args:
+            chain_pending_nonce: eth_getTransactionCount(address, "pending")
+        """
+        with self._lock:
+            if self._next_nonce is None or self._next_nonce == chain_pending_nonce:
+                return
+        self.sync(chain_pending_nonce)
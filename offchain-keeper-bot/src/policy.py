@@ -0,0 +1,207 @@
+"""
+Harvest decision policy for Stratum Fi Keeper Bot
+Shared by the sync and async keeper engines so both skip/execute identically
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from profitability import HarvestEconomics
+from simulation import HarvestSimulation
+
+
+@dataclass(frozen=True)
+class HarvestDecision:
+    """Outcome of evaluating harvest conditions for one cycle"""
+
+    should_harvest: bool
+    # metrics status label: execute, skipped_high_gas, skipped_low_yield,
+    # skipped_unprofitable, skipped_below_optimal, skipped_simulated_revert,
+    # skipped_low_output
+    status: str
+    reason: str
+
+
+def evaluate_harvest(
+    gas_price_gwei: float,
+    yield_usd: float,
+    max_gas_price_gwei: float,
+    min_yield_threshold_usd: float,
+    economics: Optional[HarvestEconomics] = None,
+    min_profit_usd: float = 0.0,
+) -> HarvestDecision:
+    """
+    Decide whether to harvest given current gas price and claimable yield
+
+    Args:
+        gas_price_gwei: Current gas price in gwei
+        yield_usd: Claimable yield in USD
+        max_gas_price_gwei: Skip harvest above this gas price
+        min_yield_threshold_usd: Skip harvest below this yield
+        economics: Expected gas cost and optimal harvest point; when given,
+            harvests must also clear min_profit_usd net of gas and reach
+            the optimal yield
+        min_profit_usd: Required net profit after gas
+
+    Returns:
+        HarvestDecision describing the action to take
+    """
+    if gas_price_gwei > max_gas_price_gwei:
+        return HarvestDecision(
+            should_harvest=False,
+            status="skipped_high_gas",
+            reason=(
+                f"Gas price too high: {gas_price_gwei:.2f} gwei "
+                f"(max: {max_gas_price_gwei} gwei)"
+            ),
+        )
+
+    if yield_usd < min_yield_threshold_usd:
+        return HarvestDecision(
+            should_harvest=False,
+            status="skipped_low_yield",
+            reason=(
+                f"Yield below threshold (${yield_usd:.2f} < "
+                f"${min_yield_threshold_usd})"
+            ),
+        )
+
+    if economics is None:
+        return HarvestDecision(
+            should_harvest=True,
+            status="execute",
+            reason=(
+                f"Yield threshold met (${yield_usd:.2f} USD, "
+                f"gas: {gas_price_gwei:.2f} gwei)"
+            ),
+        )
+
+    if economics.net_profit_usd < min_profit_usd:
+        return HarvestDecision(
+            should_harvest=False,
+            status="skipped_unprofitable",
+            reason=(
+                f"Net profit too low (${economics.net_profit_usd:.2f} after "
+                f"${economics.gas_cost_usd:.4f} gas < ${min_profit_usd})"
+            ),
+        )
+
+    optimal = economics.optimal_yield_usd
+    if optimal is not None and yield_usd < optimal:
+        return HarvestDecision(
+            should_harvest=False,
+            status="skipped_below_optimal",
+            reason=(
+                f"Yield below optimal harvest point (${yield_usd:.2f} < "
+                f"${optimal:.2f})"
+            ),
+        )
+
+    return HarvestDecision(
+        should_harvest=True,
+        status="execute",
+        reason=(
+            f"Harvest profitable (${yield_usd:.2f} USD yield, "
+            f"${economics.gas_cost_usd:.4f} gas, "
+            f"${economics.net_profit_usd:.2f} net)"
+        ),
+    )
+
+
+def harvest_fee_ceiling_wei(
+    max_gas_price_gwei: float,
+    economics: Optional[HarvestEconomics] = None,
+    min_profit_usd: float = 0.0,
+) -> int:
+    """
+    Highest effective gas price a pending harvest may be sped up to
+
+    Past this price the harvest breaks the gas cap or stops paying for
+    itself, so a stuck harvest is cancelled rather than replaced.
+
+    Args:
+        max_gas_price_gwei: Configured gas price cap
+        economics: Expected economics (None applies the cap alone)
+        min_profit_usd: Required net profit after gas
+
+    Returns:
+        Gas price in wei
+    """
+    ceiling_gwei = max_gas_price_gwei
+    if economics is not None:
+        break_even = economics.break_even_gas_price_gwei(min_profit_usd)
+        if break_even is not None:
+            ceiling_gwei = min(ceiling_gwei, break_even)
+    return int(ceiling_gwei * 1e9)
+
+
+def evaluate_simulation(
+    simulation: HarvestSimulation,
+    yield_usd: float,
+    musd_price_usd: float = 1.0,
+    max_slippage: float = 0.02,
+    economics: Optional[HarvestEconomics] = None,
+    min_profit_usd: float = 0.0,
+) -> HarvestDecision:
+    """
+    Re-check a harvest against its simulated outcome before sending it
+
+    Args:
+        simulation: Pre-flight simulation of harvest()
+        yield_usd: Claimable yield in USD the harvest was approved on
+        musd_price_usd: USD price of the MUSD harvest() delivers
+        max_slippage: Largest tolerated shortfall of the simulated output
+            against yield_usd (harvest() swaps with amountOutMin = 0)
+        economics: Expected gas cost; re-checked against the simulated
+            output and gas use when given
+        min_profit_usd: Required net profit after gas
+
+    Returns:
+        HarvestDecision describing the action to take
+    """
+    if simulation.reverted:
+        return HarvestDecision(
+            should_harvest=False,
+            status="skipped_simulated_revert",
+            reason=f"Simulated harvest reverts ({simulation.revert_reason})",
+        )
+
+    if not simulation.has_outcome:
+        return HarvestDecision(
+            should_harvest=True,
+            status="execute",
+            reason="Simulated harvest succeeds",
+        )
+
+    output_usd = simulation.musd_amount * musd_price_usd
+    min_output_usd = yield_usd * (1 - max_slippage)
+    if output_usd < min_output_usd:
+        return HarvestDecision(
+            should_harvest=False,
+            status="skipped_low_output",
+            reason=(
+                f"Simulated output too low (${output_usd:.2f} < "
+                f"${min_output_usd:.2f}, {max_slippage:.1%} below "
+                f"${yield_usd:.2f} yield)"
+            ),
+        )
+
+    if economics is not None:
+        gas_cost = economics.gas_cost_usd
+        if simulation.gas_used and economics.gas_units:
+            gas_cost *= simulation.gas_used / economics.gas_units
+        if output_usd - gas_cost < min_profit_usd:
+            return HarvestDecision(
+                should_harvest=False,
+                status="skipped_low_output",
+                reason=(
+                    f"Simulated net profit too low (${output_usd - gas_cost:.2f} "
+                    f"after ${gas_cost:.4f} gas < ${min_profit_usd})"
+                ),
+            )
+
+    return HarvestDecision(
+        should_harvest=True,
+        status="execute",
+        reason=f"Simulated harvest delivers ${output_usd:.2f} ({simulation.source})",
+    )
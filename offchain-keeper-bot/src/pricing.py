@@ -0,0 +1,435 @@
+"""
+Token pricing for Stratum Fi Keeper Bot
+Pluggable USD price sources (Pyth feeds, pool reserves, static table)
+behind a TTL cache, fetched for many tokens in one batched request
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+
+logger = logging.getLogger("keeper.pricing")
+
+# Multicall3 aggregate3 call: (target, allowFailure, callData)
+Call = Tuple[str, bool, bytes]
+CallResult = Tuple[bool, bytes]
+
+KNOWN_SOURCES = ("pyth", "pool", "static")
+
+
+def encode_call(
+    signature: str, types: Sequence[str] = (), args: Sequence = ()
+) -> bytes:
+    """ABI-encode calldata for a function signature"""
+    selector = function_signature_to_4byte_selector(signature)
+    return selector + (encode(list(types), list(args)) if types else b"")
+
+
+@dataclass(frozen=True)
+class Price:
+    """USD price of one token"""
+
+    usd: float
+    timestamp: Optional[float]  # Unix time the price is valid at (None: static)
+    source: str
+    block_number: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PriceMarket:
+    """Addresses needed to price one vault's yield tokens"""
+
+    pool: str
+    token0: str
+    token1: str
+    btc: str
+    musd: str
+    pyth: Optional[str] = None
+    btc_feed_id: Optional[bytes] = None
+
+
+class PriceSource:
+    """
+    Base class for a USD price source
+
+    Sources perform no network I/O: they describe the eth_calls they need
+    and decode the results, so all sources and tokens share one
+    Multicall3 request.
+    """
+
+    name = "base"
+
+    def supports(self, token: str) -> bool:
+        """Return True if this source can price the token"""
+        raise NotImplementedError
+
+    def build_calls(self, token: str) -> List[Call]:
+        """eth_calls needed to price the token"""
+        return []
+
+    def decode(
+        self, token: str, results: List[CallResult], block_timestamp: float
+    ) -> Optional[Price]:
+        """Decode call results into a price (None if unavailable)"""
+        raise NotImplementedError
+
+
+class StaticPriceSource(PriceSource):
+    """Fixed prices (stablecoin pegs, config fallbacks and tests)"""
+
+    name = "static"
+
+    def __init__(self, prices: Dict[str, float]):
+        self.prices = {to_checksum_address(t): p for t, p in prices.items()}
+
+    def supports(self, token: str) -> bool:
+        return token in self.prices
+
+    def decode(
+        self, token: str, results: List[CallResult], block_timestamp: float
+    ) -> Optional[Price]:
+        return Price(self.prices[token], None, self.name)
+
+
+class PoolReservePriceSource(PriceSource):
+    """Prices one token of a two-token pool from reserves and the other's price"""
+
+    name = "pool"
+
+    def __init__(
+        self,
+        pool: str,
+        token0: str,
+        token1: str,
+        base_token: str,
+        quote_price_usd: float = 1.0,
+    ):
+        """
+        Initialize pool reserve source
+
+        Args:
+            pool: Pool address (getReserves)
+            token0: Pool token0
+            token1: Pool token1
+            base_token: Token to price (the other is the quote token)
+            quote_price_usd: USD price of the quote token
+        """
+        self.pool = to_checksum_address(pool)
+        self.base_token = to_checksum_address(base_token)
+        self.base_is_token0 = self.base_token == to_checksum_address(token0)
+        if not self.base_is_token0 and self.base_token != to_checksum_address(token1):
+            raise ValueError(f"{base_token} is not a token of pool {pool}")
+        self.quote_price_usd = quote_price_usd
+
+    def supports(self, token: str) -> bool:
+        return token == self.base_token
+
+    def build_calls(self, token: str) -> List[Call]:
+        return [(self.pool, True, encode_call("getReserves()"))]
+
+    def decode(
+        self, token: str, results: List[CallResult], block_timestamp: float
+    ) -> Optional[Price]:
+        success, data = results[0]
+        if not success:
+            return None
+        reserve0, reserve1, _ = decode(["uint112", "uint112", "uint32"], data)
+        if self.base_is_token0:
+            base, quote = reserve0, reserve1
+        else:
+            base, quote = reserve1, reserve0
+        if base == 0:
+            return None
+        # Both Mezo pool tokens use 18 decimals
+        return Price(quote / base * self.quote_price_usd, block_timestamp, self.name)
+
+
+class PythPriceSource(PriceSource):
+    """Pyth pull-oracle feeds read with getPriceUnsafe"""
+
+    name = "pyth"
+
+    def __init__(
+        self,
+        pyth: str,
+        feed_ids: Dict[str, bytes],
+        max_confidence_ratio: float = 0.02,
+    ):
+        """
+        Initialize Pyth source
+
+        Args:
+            pyth: Pyth contract address
+            feed_ids: Price feed ID per token
+            max_confidence_ratio: Reject prices whose confidence interval
+                exceeds this fraction of the price
+        """
+        self.pyth = to_checksum_address(pyth)
+        self.feed_ids = {to_checksum_address(t): f for t, f in feed_ids.items()}
+        self.max_confidence_ratio = max_confidence_ratio
+
+    def supports(self, token: str) -> bool:
+        return token in self.feed_ids
+
+    def build_calls(self, token: str) -> List[Call]:
+        data = encode_call(
+            "getPriceUnsafe(bytes32)", ["bytes32"], [self.feed_ids[token]]
+        )
+        return [(self.pyth, True, data)]
+
+    def decode(
+        self, token: str, results: List[CallResult], block_timestamp: float
+    ) -> Optional[Price]:
+        success, data = results[0]
+        if not success:
+            return None
+        ((price, conf, expo, publish_time),) = decode(
+            ["(int64,uint64,int32,uint256)"], data
+        )
+        if price <= 0:
+            return None
+        if conf > price * self.max_confidence_ratio:
+            logger.warning(
+                f"Pyth price for {token} rejected: confidence {conf} too wide "
+                f"for price {price}"
+            )
+            return None
+        return Price(price * 10**expo, float(publish_time), self.name)
+
+
+class PriceOracle:
+    """
+    TTL-cached USD prices from prioritized sources
+
+    Each token is priced by the first source (in priority order) that
+    returns a fresh price. Prices older than max_age_seconds are never
+    served, and a token is fetched at most once per block and once per
+    TTL, however many vaults ask for it.
+    """
+
+    def __init__(
+        self,
+        sources: List[PriceSource],
+        ttl_seconds: float = 30.0,
+        max_age_seconds: float = 3600.0,
+    ):
+        """
+        Initialize price oracle
+
+        Args:
+            sources: Price sources in priority order
+            ttl_seconds: How long a fetched price is reused before refetching
+            max_age_seconds: Prices older than this are treated as missing
+        """
+        self.sources = sources
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self._cache: Dict[str, Price] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def tokens_to_refresh(
+        self, tokens: Iterable[str], block_number: Optional[int] = None
+    ) -> List[str]:
+        """
+        Tokens whose cached price has expired
+
+        Args:
+            tokens: Tokens that are about to be priced
+            block_number: Current block, if known; a token already fetched
+                at this block is never refetched
+
+        Returns:
+            Tokens to include in the next batched fetch
+        """
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            for token in dict.fromkeys(tokens):
+                cached = self._cache.get(token)
+                if cached is None:
+                    stale.append(token)
+                    continue
+                expired = now - self._fetched_at[token] >= self.ttl_seconds
+                same_block = (
+                    block_number is not None
+                    and cached.block_number is not None
+                    and block_number <= cached.block_number
+                )
+                if expired and not same_block:
+                    stale.append(token)
+        return stale
+
+    def build_calls(
+        self, tokens: Iterable[str]
+    ) -> Tuple[List[Tuple[str, PriceSource, int, int]], List[Call]]:
+        """
+        Build one batch of calls pricing every token from every source
+
+        Fallback sources are queried in the same batch so a failing primary
+        source costs no extra round trip.
+
+        Returns:
+            (plan, calls) where plan entries are (token, source, offset,
+            count) slices into the call results
+        """
+        plan = []
+        calls: List[Call] = []
+        for token in tokens:
+            for source in self.sources:
+                if not source.supports(token):
+                    continue
+                source_calls = source.build_calls(token)
+                plan.append((token, source, len(calls), len(source_calls)))
+                calls.extend(source_calls)
+        return plan, calls
+
+    def ingest(
+        self,
+        plan: List[Tuple[str, PriceSource, int, int]],
+        results: List[CallResult],
+        block_number: Optional[int],
+        block_timestamp: float,
+    ):
+        """
+        Decode a batch and cache the best price per token
+
+        Args:
+            plan: Plan returned by build_calls
+            results: aggregate3 results for the batch's calls
+            block_number: Block the batch was read at
+            block_timestamp: Timestamp of that block
+        """
+        chosen: Dict[str, Price] = {}
+        for token, source, offset, count in plan:
+            if token in chosen:
+                continue
+            try:
+                price = source.decode(
+                    token, results[offset : offset + count], block_timestamp
+                )
+            except Exception as e:
+                logger.warning(f"{source.name} price decode failed for {token}: {e}")
+                continue
+            if price is not None and not self._is_stale(price, block_timestamp):
+                chosen[token] = Price(
+                    price.usd, price.timestamp, price.source, block_number
+                )
+
+        now = time.monotonic()
+        with self._lock:
+            for token, price in chosen.items():
+                self._cache[token] = price
+                self._fetched_at[token] = now
+
+        missing = {token for token, *_ in plan} - chosen.keys()
+        if missing:
+            logger.warning(f"No fresh price from any source for {sorted(missing)}")
+
+    def _is_stale(self, price: Price, now: float) -> bool:
+        """True if a price is older than max_age_seconds"""
+        if price.timestamp is None:
+            return False
+        return now - price.timestamp > self.max_age_seconds
+
+    def get(self, token: str) -> Optional[Price]:
+        """
+        Cached price for a token
+
+        Returns:
+            Price, or None if never fetched or older than max_age_seconds
+        """
+        with self._lock:
+            price = self._cache.get(token)
+        if price is None or self._is_stale(price, time.time()):
+            return None
+        return price
+
+    def value_usd(self, amounts: Dict[str, float]) -> Optional[float]:
+        """
+        USD value of token amounts
+
+        Args:
+            amounts: Token address -> amount (in whole tokens)
+
+        Returns:
+            Total USD value, or None if any non-zero amount lacks a price
+        """
+        total = 0.0
+        for token, amount in amounts.items():
+            if amount == 0:
+                continue
+            price = self.get(token)
+            if price is None:
+                return None
+            total += amount * price.usd
+        return total
+
+
+def build_price_oracle(
+    markets: List[PriceMarket],
+    source_names: Sequence[str],
+    musd_price_usd: float = 1.0,
+    btc_price_usd: Optional[float] = None,
+    ttl_seconds: float = 30.0,
+    max_age_seconds: float = 3600.0,
+) -> PriceOracle:
+    """
+    Create a PriceOracle for the given vault markets
+
+    Args:
+        markets: Price markets of all vaults
+        source_names: Sources in priority order (pyth, pool, static)
+        musd_price_usd: MUSD peg, used as the pool quote price and static price
+        btc_price_usd: Static BTC/USD fallback (used if "static" is listed)
+        ttl_seconds: Price cache TTL
+        max_age_seconds: Stale price cutoff
+
+    Returns:
+        Configured PriceOracle
+    """
+    sources: List[PriceSource] = []
+    for name in source_names:
+        if name == "pyth":
+            feeds_by_oracle: Dict[str, Dict[str, bytes]] = {}
+            for market in markets:
+                if market.pyth and market.btc_feed_id:
+                    feeds_by_oracle.setdefault(market.pyth, {})[
+                        market.btc
+                    ] = market.btc_feed_id
+            sources.extend(
+                PythPriceSource(pyth, feeds) for pyth, feeds in feeds_by_oracle.items()
+            )
+        elif name == "pool":
+            # Vaults sharing a pool share its source
+            pools = {(market.pool, market.btc): market for market in markets}
+            sources.extend(
+                PoolReservePriceSource(
+                    market.pool,
+                    market.token0,
+                    market.token1,
+                    base_token=market.btc,
+                    quote_price_usd=musd_price_usd,
+                )
+                for market in pools.values()
+            )
+        elif name == "static":
+            static = {market.musd: musd_price_usd for market in markets}
+            if btc_price_usd is not None:
+                static.update({market.btc: btc_price_usd for market in markets})
+            sources.append(StaticPriceSource(static))
+        else:
+            raise ValueError(f"Unknown price source: {name}")
+
+    # MUSD is only priced by its peg
+    if "static" not in source_names:
+        sources.append(
+            StaticPriceSource({market.musd: musd_price_usd for market in markets})
+        )
+
+    return PriceOracle(sources, ttl_seconds, max_age_seconds)
@@ -0,0 +1,238 @@
+"""
+Profiling hooks for Stratum Fi Keeper Bot
+Sampling profiler and tracemalloc snapshots served on demand by the health
+server, plus a per-cycle wall/CPU time breakdown logged at DEBUG
+"""
+
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger("keeper.profiling")
+
+# Longest profile one request may ask for, and the default sampling rate
+MAX_PROFILE_SECONDS = 60.0
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+# Stack depth kept per allocation while tracemalloc is tracing
+TRACEMALLOC_FRAMES = 10
+
+
+def _collapse(frame: Optional[FrameType], thread_name: str) -> str:
+    """One stack in collapsed (flame graph) form, root first"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        filename = Path(code.co_filename).name
+        names.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+def sample_stacks(
+    seconds: float, interval: float = SAMPLE_INTERVAL_SECONDS
+) -> Counter:
+    """
+    Sample the stack of every other thread in the process
+
+    Wall-clock sampling: threads blocked on I/O are sampled too, so RPC
+    waits show up next to CPU-bound code.
+
+    Args:
+        seconds: How long to sample
+        interval: Delay between samples
+
+    Returns:
+        Counter of collapsed stacks to sample counts
+    """
+    own = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != own:
+                stacks[_collapse(frame, names.get(ident, str(ident)))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Collapsed stacks, most sampled first (input for flamegraph.pl/speedscope)"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class Profiler:
+    """
+    On-demand profiling of the running keeper
+
+    One sampling profile runs at a time. tracemalloc is started by the
+    first memory report and runs until stopped, since tracing slows every
+    allocation.
+    """
+
+    def __init__(
+        self,
+        max_seconds: float = MAX_PROFILE_SECONDS,
+        interval: float = SAMPLE_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize profiler
+
+        Args:
+            max_seconds: Longest profile a request may ask for
+            interval: Delay between stack samples
+        """
+        self.max_seconds = max_seconds
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def profile(self, seconds: float) -> Optional[str]:
+        """
+        Sample all threads for a number of seconds (blocks the caller)
+
+        Returns:
+            Collapsed stacks, or None if another profile is running
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            logger.info(f"Sampling profile for {seconds:.1f}s")
+            return format_collapsed(sample_stacks(seconds, self.interval))
+        finally:
+            self._lock.release()
+
+    def memory_report(self, limit: int = 25) -> Dict:
+        """
+        Top allocation sites, and growth since the previous report
+
+        Starts tracemalloc on first use; allocations made before that are
+        not attributed.
+
+        Args:
+            limit: Allocation sites to list
+
+        Returns:
+            JSON-serialisable report
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._previous = None
+            logger.info("tracemalloc started")
+            return {"tracing": True, "started": True}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        report = {
+            "tracing": True,
+            "started": False,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "location": str(stat.traceback),
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:limit]
+            ],
+        }
+        if self._previous is not None:
+            report["growth"] = [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(self._previous, "lineno")[:limit]
+            ]
+        self._previous = snapshot
+        return report
+
+    def stop_memory_tracing(self):
+        """Stop tracemalloc and drop the stored snapshot"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+        self._previous = None
+
+
+class CycleBreakdown:
+    """Wall and CPU time of one keeper cycle, split by harvest phase"""
+
+    def __init__(self):
+        self.phases: Dict[str, List[float]] = {}  # phase -> [wall, cpu]
+
+    def add(self, phase: str, wall_seconds: float, cpu_seconds: float):
+        totals = self.phases.setdefault(phase, [0.0, 0.0])
+        totals[0] += wall_seconds
+        totals[1] += cpu_seconds
+
+    def summary(self, wall_seconds: float, cpu_seconds: float) -> str:
+        """One log line: cycle totals, then wall/CPU ms per phase"""
+        parts = [
+            f"{phase} {wall * 1000:.1f}/{cpu * 1000:.1f}ms"
+            for phase, (wall, cpu) in self.phases.items()
+        ]
+        line = f"{wall_seconds * 1000:.1f}ms wall, {cpu_seconds * 1000:.1f}ms CPU"
+        return f"{line} | {', '.join(parts)}" if parts else line
+
+
+# Breakdown of the cycle running in this context (tasks spawned by the
+# cycle inherit it)
+_current_breakdown: ContextVar[Optional[CycleBreakdown]] = ContextVar(
+    "cycle_breakdown", default=None
+)
+
+
+def record_cycle_phase(phase: str, wall_seconds: float, cpu_seconds: float):
+    """Add a phase to the current cycle's breakdown, if one is being kept"""
+    breakdown = _current_breakdown.get()
+    if breakdown is not None:
+        breakdown.add(phase, wall_seconds, cpu_seconds)
+
+
+@contextmanager
+def cycle_breakdown(
+    cycle_logger: logging.Logger, cycle: int
+) -> Iterator[Optional[CycleBreakdown]]:
+    """
+    Log a cycle's wall/CPU time per phase at DEBUG
+
+    Free when DEBUG logging is off. CPU time is the process's, so on the
+    async engine phases of concurrently checked vaults overlap.
+
+    Args:
+        cycle_logger: Logger the breakdown is written to
+        cycle: Cycle number
+    """
+    if not cycle_logger.isEnabledFor(logging.DEBUG):
+        yield None
+        return
+
+    breakdown = CycleBreakdown()
+    token = _current_breakdown.set(breakdown)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield breakdown
+    finally:
+        _current_breakdown.reset(token)
+        cycle_logger.debug(
+            f"Cycle #{cycle} time: "
+            + breakdown.summary(
+                time.perf_counter() - wall, time.process_time() - cpu
+            )
+        )
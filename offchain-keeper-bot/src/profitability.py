@@ -0,0 +1,140 @@
+"""
+Harvest profitability for Stratum Fi Keeper Bot
+Values the expected gas cost of a harvest in USD, the net profit of
+harvesting now, and the yield level at which harvesting is optimal
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class HarvestEconomics:
+    """Expected economics of harvesting at the current block"""
+
+    yield_usd: float
+    gas_units: int
+    gas_price_gwei: float
+    gas_cost_usd: float
+    net_profit_usd: float
+    accrual_rate_usd_per_second: Optional[float]
+    optimal_yield_usd: Optional[float]
+
+    def target_yield_usd(
+        self, min_yield_threshold_usd: float, min_profit_usd: float = 0.0
+    ) -> float:
+        """
+        Smallest claimable yield at which a harvest would be executed
+
+        Args:
+            min_yield_threshold_usd: Configured yield floor
+            min_profit_usd: Required net profit after gas
+
+        Returns:
+            Yield target in USD
+        """
+        return max(
+            min_yield_threshold_usd,
+            self.gas_cost_usd + min_profit_usd,
+            self.optimal_yield_usd or 0.0,
+        )
+
+    def break_even_gas_price_gwei(self, min_profit_usd: float = 0.0) -> Optional[float]:
+        """
+        Highest gas price at which harvesting still nets min_profit_usd
+
+        Args:
+            min_profit_usd: Required net profit after gas
+
+        Returns:
+            Gas price in gwei, or None if the gas cost was not priced
+        """
+        if self.gas_cost_usd <= 0 or self.gas_price_gwei <= 0:
+            return None
+        cost_per_gwei = self.gas_cost_usd / self.gas_price_gwei
+        return max(0.0, self.yield_usd - min_profit_usd) / cost_per_gwei
+
+
+def gas_cost_usd(
+    gas_units: int, gas_price_gwei: float, btc_price_usd: float
+) -> float:
+    """
+    USD cost of a transaction paying gas in BTC
+
+    Args:
+        gas_units: Gas limit or estimate
+        gas_price_gwei: Effective gas price in gwei
+        btc_price_usd: BTC/USD price
+
+    Returns:
+        Gas cost in USD
+    """
+    return gas_units * gas_price_gwei * 1e-9 * btc_price_usd
+
+
+def optimal_harvest_yield(
+    gas_cost: float, accrual_rate_usd_per_second: float, opportunity_apr: float
+) -> Optional[float]:
+    """
+    Claimable yield at which to harvest to maximize net yield over time
+
+    Harvesting every T seconds costs gas_cost per harvest, while yield left
+    unharvested forgoes opportunity_apr (harvested yield repays debt).
+    With linear accrual r the cost per second is C/T + r*rho*T/2, which is
+    minimized at T* = sqrt(2C / (r*rho)), i.e. Y* = sqrt(2*C*r / rho).
+
+    Args:
+        gas_cost: Harvest gas cost in USD (C)
+        accrual_rate_usd_per_second: Yield accrual rate (r)
+        opportunity_apr: Annual return forgone on unharvested yield
+
+    Returns:
+        Optimal yield in USD, or None if the inputs do not define one
+    """
+    if accrual_rate_usd_per_second <= 0 or opportunity_apr <= 0 or gas_cost <= 0:
+        return None
+    rho = opportunity_apr / SECONDS_PER_YEAR
+    return math.sqrt(2 * gas_cost * accrual_rate_usd_per_second / rho)
+
+
+def evaluate_economics(
+    yield_usd: float,
+    gas_units: int,
+    gas_price_gwei: float,
+    btc_price_usd: float,
+    accrual_rate_usd_per_second: Optional[float] = None,
+    opportunity_apr: float = 0.0,
+) -> HarvestEconomics:
+    """
+    Compute the expected economics of harvesting now
+
+    Args:
+        yield_usd: Claimable yield in USD
+        gas_units: Expected harvest gas usage
+        gas_price_gwei: Expected gas price in gwei
+        btc_price_usd: BTC/USD price (gas is paid in BTC)
+        accrual_rate_usd_per_second: Forecast yield accrual rate, if known
+        opportunity_apr: Annual return forgone on unharvested yield
+
+    Returns:
+        HarvestEconomics for the current cycle
+    """
+    cost = gas_cost_usd(gas_units, gas_price_gwei, btc_price_usd)
+    optimal = None
+    if accrual_rate_usd_per_second is not None:
+        optimal = optimal_harvest_yield(
+            cost, accrual_rate_usd_per_second, opportunity_apr
+        )
+
+    return HarvestEconomics(
+        yield_usd=yield_usd,
+        gas_units=gas_units,
+        gas_price_gwei=gas_price_gwei,
+        gas_cost_usd=cost,
+        net_profit_usd=yield_usd - cost,
+        accrual_rate_usd_per_second=accrual_rate_usd_per_second,
+        optimal_yield_usd=optimal,
+    )
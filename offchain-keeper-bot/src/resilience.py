@@ -0,0 +1,423 @@
+"""
+RPC resilience for Stratum Fi Keeper Bot
+Error classification, circuit breakers with half-open probing, jittered
+backoff, retry budgets and retry policies for reads and broadcasts
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Optional
+
+import aiohttp
+import requests
+from web3.exceptions import ContractLogicError
+
+from metrics import MetricsCollector
+from nonce_manager import is_nonce_error
+
+logger = logging.getLogger("keeper.resilience")
+
+# Error kinds
+TIMEOUT = "timeout"
+RATE_LIMIT = "rate_limit"
+CONNECTION = "connection"
+SERVER = "server"
+CIRCUIT_OPEN = "circuit_open"
+REVERT = "revert"
+NONCE = "nonce"
+OTHER = "other"
+
+# Kinds caused by the endpoint or the network, not by the request: worth
+# retrying, and counted against the endpoint's circuit breaker
+TRANSIENT_ERRORS: FrozenSet[str] = frozenset(
+    {TIMEOUT, RATE_LIMIT, CONNECTION, SERVER}
+)
+
+# Kinds after which a failed keeper cycle is re-run after a short backoff
+# rather than the full check interval
+RECOVERABLE_ERRORS: FrozenSet[str] = TRANSIENT_ERRORS | {CIRCUIT_OPEN}
+
+# JSON-RPC errors that say more about the endpoint than about the request
+ENDPOINT_ERROR_CODES = {-32005, 429}
+ENDPOINT_ERROR_MARKERS = ("rate limit", "too many requests", "capacity exceeded")
+
+# Broadcast responses meaning the node already has this exact transaction
+KNOWN_TX_MARKERS = ("already known", "known transaction")
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class EndpointError(Exception):
+    """An endpoint answered with an error caused by the endpoint itself"""
+
+
+class CircuitOpenError(Exception):
+    """Request not sent: the endpoint's circuit breaker is open"""
+
+
+def is_endpoint_error(response: Dict) -> bool:
+    """Return True if a JSON-RPC response is a rate limit or overload error"""
+    error = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message", "")).lower()
+    return error.get("code") in ENDPOINT_ERROR_CODES or any(
+        marker in message for marker in ENDPOINT_ERROR_MARKERS
+    )
+
+
+def is_known_transaction(response: Dict) -> bool:
+    """Return True if a broadcast was rejected because the node already has it"""
+    error = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message", "")).lower()
+    return any(marker in message for marker in KNOWN_TX_MARKERS)
+
+
+def _status_kind(status: Optional[int]) -> Optional[str]:
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None and status >= 500:
+        return SERVER
+    return None
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify an RPC or contract error
+
+    Args:
+        error: Exception raised by a provider, web3 or a contract call
+
+    Returns:
+        One of TIMEOUT, RATE_LIMIT, CONNECTION, SERVER, CIRCUIT_OPEN,
+        REVERT, NONCE or OTHER
+    """
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN
+    if isinstance(error, EndpointError):
+        return RATE_LIMIT
+    if isinstance(error, ContractLogicError):
+        return REVERT
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, requests.Timeout)):
+        return TIMEOUT
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        kind = _status_kind(error.response.status_code)
+        if kind:
+            return kind
+    if isinstance(error, aiohttp.ClientResponseError):
+        kind = _status_kind(error.status)
+        if kind:
+            return kind
+    if isinstance(
+        error,
+        (ConnectionError, requests.ConnectionError, aiohttp.ClientConnectionError),
+    ):
+        return CONNECTION
+
+    if is_nonce_error(error):
+        return NONCE
+    message = str(error).lower()
+    if "execution reverted" in message:
+        return REVERT
+    if any(marker in message for marker in ENDPOINT_ERROR_MARKERS):
+        return RATE_LIMIT
+    if "timed out" in message or "timeout" in message:
+        return TIMEOUT
+    return OTHER
+
+
+def backoff_delay(
+    attempt: int, base_seconds: float, max_seconds: float, rng=random
+) -> float:
+    """
+    Exponential backoff with equal jitter
+
+    The delay doubles per attempt up to max_seconds; half of it is random,
+    so clients that failed together do not retry together, and none
+    retries immediately.
+
+    Args:
+        attempt: Failures so far, minus one (0 for the first retry)
+        base_seconds: Delay before the first retry
+        max_seconds: Longest delay
+        rng: Random source (for tests)
+    """
+    delay = min(max_seconds, base_seconds * 2 ** min(attempt, 32))
+    return delay / 2 + rng.uniform(0, delay / 2)
+
+
+class Backoff:
+    """Jittered exponential delay for consecutive failures of one loop"""
+
+    def __init__(self, base_seconds: float, max_seconds: float):
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.failures = 0
+
+    def next_delay(self) -> float:
+        """Count a failure and return the delay before trying again"""
+        self.failures += 1
+        return backoff_delay(self.failures - 1, self.base_seconds, self.max_seconds)
+
+    def reset(self):
+        self.failures = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint and operation
+
+    Closed: requests flow. After failure_threshold consecutive failures it
+    opens and rejects requests for the reset timeout. Then it
+    is half-open: one probe request is let through; success closes it,
+    failure reopens it for twice as long (up to max_reset_seconds).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_seconds: float = 2.0,
+        max_reset_seconds: float = 30.0,
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: First open period before a probe
+            max_reset_seconds: Longest open period
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.consecutive_failures = 0
+        self.opened = 0  # Times opened without closing in between
+        self.open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def state(self, now: Optional[float] = None) -> str:
+        now = time.monotonic() if now is None else now
+        if self.opened == 0:
+            return CLOSED
+        return OPEN if now < self.open_until else HALF_OPEN
+
+    def available(self, now: Optional[float] = None) -> bool:
+        """True if a request would be let through (does not reserve a probe)"""
+        state = self.state(now)
+        return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def acquire(self, now: Optional[float] = None) -> bool:
+        """Reserve permission to send a request; False if it must not be sent"""
+        with self._lock:
+            state = self.state(now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> bool:
+        """
+        Record a successful request
+
+        Returns:
+            True if this closed an open circuit
+        """
+        with self._lock:
+            closed = self.opened > 0
+            self.consecutive_failures = 0
+            self.opened = 0
+            self._probing = False
+            return closed
+
+    def record_failure(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Record a transient failure
+
+        Returns:
+            Seconds the circuit is now open for, or None if it stayed closed
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.consecutive_failures += 1
+            probe_failed = self._probing
+            self._probing = False
+            if not probe_failed and (
+                self.opened > 0 or self.consecutive_failures < self.failure_threshold
+            ):
+                return None
+            period = min(
+                self.max_reset_seconds,
+                self.reset_seconds * 2 ** min(self.opened, 32),
+            )
+            # Jitter so endpoints that failed together are not probed together
+            period *= random.uniform(0.8, 1.2)
+            self.opened += 1
+            self.open_until = now + period
+            return period
+
+    def release(self):
+        """Give back a probe reservation whose request was never sent"""
+        with self._lock:
+            self._probing = False
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent requests
+
+    Retries are allowed while they stay under min_retries plus ratio times
+    the requests of the last window_seconds, so an outage costs at most
+    that much extra load instead of multiplying every request.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_retries: int = 5, window_seconds: float = 10.0
+    ):
+        """
+        Initialize retry budget
+
+        Args:
+            ratio: Retries allowed per request
+            min_retries: Retries always allowed per window (low traffic)
+            window_seconds: Accounting window
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        for events in (self._requests, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_request(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._prune(now)
+            self._requests.append(now)
+
+    def try_spend(self, now: Optional[float] = None) -> bool:
+        """Take one retry from the budget; False if it is exhausted"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._prune(now)
+            allowed = self.min_retries + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy:
+    """
+    Retries of one class of operation (reads or broadcasts)
+
+    Only transient errors are retried (by default), after a jittered
+    exponential backoff that starts higher for rate limits, and only
+    while the policy's retry budget allows.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 0.1,
+        max_delay_seconds: float = 2.0,
+        retry_on: FrozenSet[str] = TRANSIENT_ERRORS,
+        budget: Optional[RetryBudget] = None,
+        rate_limit_factor: float = 4.0,
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            name: Policy name for logs and metrics
+            max_attempts: Attempts including the first
+            base_delay_seconds: Delay before the first retry
+            max_delay_seconds: Longest delay
+            retry_on: Error kinds that are retried
+            budget: Shared retry budget (default: a new one)
+            rate_limit_factor: Delay multiplier after a rate limit
+        """
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.retry_on = retry_on
+        self.budget = budget or RetryBudget()
+        self.rate_limit_factor = rate_limit_factor
+
+    def retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        Delay before retrying a failed attempt
+
+        Args:
+            error: Error of the failed attempt
+            attempt: Attempts made so far
+
+        Returns:
+            Seconds to wait, or None if the error must be raised
+        """
+        kind = classify_error(error)
+        if kind not in self.retry_on or attempt >= self.max_attempts:
+            return None
+        if not self.budget.try_spend():
+            logger.debug("Retry budget of %s exhausted: %s", self.name, error)
+            return None
+        base = self.base_delay_seconds
+        if kind == RATE_LIMIT:
+            base *= self.rate_limit_factor
+        MetricsCollector.record_rpc_retry(self.name, kind)
+        delay = backoff_delay(attempt - 1, base, self.max_delay_seconds)
+        logger.debug(
+            "%s attempt %d failed (%s), retrying in %.2fs",
+            self.name,
+            attempt,
+            kind,
+            delay,
+        )
+        return delay
+
+    def call(self, fn: Callable, *args):
+        """Call fn(*args), retrying transient failures"""
+        self.budget.record_request()
+        attempt = 1
+        while True:
+            try:
+                return fn(*args)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn: Callable, *args):
+        """Await fn(*args), retrying transient failures"""
+        self.budget.record_request()
+        attempt = 1
+        while True:
+            try:
+                return await fn(*args)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,545 @@
+"""
+Multi-endpoint RPC pool for Stratum Fi Keeper Bot
+Routes reads to the fastest healthy endpoint with failover and optional
+hedging, and broadcasts raw transactions to every endpoint, behind
+per-endpoint circuit breakers and budgeted retries
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Dict, List, Optional
+
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3.providers import JSONBaseProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+from http_transport import (
+    AsyncSessionHTTPProvider,
+    HttpTransport,
+    SessionHTTPProvider,
+    endpoint_label,
+)
+from metrics import MetricsCollector
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    EndpointError,
+    RetryBudget,
+    RetryPolicy,
+    classify_error,
+    is_endpoint_error,
+    is_known_transaction,
+)
+
+logger = logging.getLogger("keeper.rpc_pool")
+
+# Sent to every endpoint; the first accepted response wins
+BROADCAST_METHODS = {"eth_sendRawTransaction"}
+
+# Filters live on the node that created them
+FILTER_CREATE_METHODS = {
+    "eth_newFilter",
+    "eth_newBlockFilter",
+    "eth_newPendingTransactionFilter",
+}
+FILTER_METHODS = {"eth_getFilterChanges", "eth_getFilterLogs", "eth_uninstallFilter"}
+
+# Change state on the node, so a timed-out attempt is not blindly repeated
+UNRETRIED_METHODS = FILTER_CREATE_METHODS | FILTER_METHODS
+
+# Operations with their own circuit breaker and retry policy per endpoint
+READ = "read"
+BROADCAST = "broadcast"
+
+
+def operation_for(method: str) -> str:
+    """Operation class of a JSON-RPC method"""
+    return BROADCAST if method in BROADCAST_METHODS else READ
+
+
+def known_transaction_response(response: Dict, raw_transaction: Any) -> Dict:
+    """Successful send response for a transaction the node already had"""
+    tx_hash = keccak(HexBytes(raw_transaction))
+    return {"jsonrpc": "2.0", "id": response.get("id"), "result": "0x" + tx_hash.hex()}
+
+
+def _rejected_broadcast(rejected: Dict[int, Dict], params: Any) -> Dict:
+    """
+    Result of a broadcast no endpoint accepted
+
+    A node that already has the transaction (an earlier attempt reached
+    it) counts as accepted; otherwise the best-ranked rejection is returned.
+    """
+    for rank in sorted(rejected):
+        if is_known_transaction(rejected[rank]):
+            return known_transaction_response(rejected[rank], params[0])
+    return rejected[min(rejected)]
+
+
+class EndpointStats:
+    """Rolling latency and error rate of one RPC endpoint"""
+
+    def __init__(
+        self,
+        url: str,
+        label: str,
+        window: int = 100,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+    ):
+        self.url = url
+        self.label = label
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)  # True = success
+        self.latency_ewma: Optional[float] = None
+        self.breakers = breakers or {
+            READ: CircuitBreaker(),
+            BROADCAST: CircuitBreaker(),
+        }
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def is_healthy(self, now: float, operation: str = READ) -> bool:
+        return self.breakers[operation].available(now)
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def score(self) -> float:
+        """Expected cost of a request; unmeasured endpoints are tried first"""
+        if self.latency_ewma is None:
+            return 0.0 if not self.outcomes else float("inf")
+        return self.latency_ewma * (1.0 + 4.0 * self.error_rate)
+
+
+class EndpointPool:
+    """
+    Endpoint ranking, circuit breakers and retry policies shared by both
+    pool providers
+
+    Endpoints are ranked by EWMA latency inflated by their recent error
+    rate. Each endpoint has a circuit breaker per operation (reads and
+    broadcasts): after failure_threshold consecutive failures it opens
+    for cooldown_seconds (doubling up to max_cooldown_seconds while
+    half-open probes keep failing), and requests skip it until then.
+    Failed requests are retried with jittered backoff within a retry
+    budget, so an outage adds bounded load to the endpoints left.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        window: int = 100,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 2.0,
+        max_cooldown_seconds: float = 30.0,
+        read_attempts: int = 3,
+        broadcast_attempts: int = 3,
+        retry_budget_ratio: float = 0.2,
+    ):
+        """
+        Initialize endpoint pool
+
+        Args:
+            urls: RPC endpoint URLs
+            window: Requests kept per endpoint for error rate and p95
+            alpha: EWMA latency smoothing factor
+            failure_threshold: Consecutive failures that open a circuit
+            cooldown_seconds: First open period before a probe request
+            max_cooldown_seconds: Longest open period
+            read_attempts: Attempts per read, including the first
+            broadcast_attempts: Attempts per transaction broadcast
+            retry_budget_ratio: Retries allowed per request (each policy)
+        """
+        if not urls:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints: List[EndpointStats] = []
+        for url in urls:
+            label = endpoint_label(url)
+            if any(e.label == label for e in self.endpoints):
+                label = f"{label}-{len(self.endpoints)}"
+            breakers = {
+                operation: CircuitBreaker(
+                    failure_threshold, cooldown_seconds, max_cooldown_seconds
+                )
+                for operation in (READ, BROADCAST)
+            }
+            self.endpoints.append(EndpointStats(url, label, window, breakers))
+        self.alpha = alpha
+        self.filter_owners: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+        # Idempotent reads retry quickly; a broadcast resends the same
+        # signed bytes, and a node that already has them counts as success
+        self.read_policy = RetryPolicy(
+            READ,
+            max_attempts=read_attempts,
+            base_delay_seconds=0.1,
+            budget=RetryBudget(retry_budget_ratio),
+        )
+        self.broadcast_policy = RetryPolicy(
+            BROADCAST,
+            max_attempts=broadcast_attempts,
+            base_delay_seconds=0.25,
+            budget=RetryBudget(retry_budget_ratio),
+        )
+
+    def ranked(
+        self, now: Optional[float] = None, operation: str = READ
+    ) -> List[EndpointStats]:
+        """Available endpoints fastest first, then open ones soonest first"""
+        now = time.monotonic() if now is None else now
+        healthy = [e for e in self.endpoints if e.is_healthy(now, operation)]
+        cooling = [e for e in self.endpoints if not e.is_healthy(now, operation)]
+        healthy.sort(key=lambda e: e.score())
+        cooling.sort(key=lambda e: e.breakers[operation].open_until)
+        return healthy + cooling
+
+    def candidates(self, method: str, params: Any) -> List[EndpointStats]:
+        """Endpoints to try for a request, in order"""
+        if method in FILTER_METHODS and params:
+            owner = self.filter_owners.get(params[0])
+            if owner is not None:
+                return [owner]
+        return self.ranked()
+
+    def hedge_delay(self, endpoint: EndpointStats, min_delay: float) -> float:
+        """Wait before hedging: the endpoint's p95 latency, at least min_delay"""
+        p95 = endpoint.latency_quantile(0.95)
+        return max(min_delay, p95 or 0.0)
+
+    def acquire(self, endpoint: EndpointStats, operation: str):
+        """Check an endpoint's circuit before sending, reserving a probe"""
+        if not endpoint.breakers[operation].acquire():
+            raise CircuitOpenError(f"{endpoint.label} circuit open for {operation}")
+
+    def record_success(
+        self, endpoint: EndpointStats, latency: float, method: str, response: Dict
+    ):
+        operation = operation_for(method)
+        with self._lock:
+            endpoint.latencies.append(latency)
+            endpoint.outcomes.append(True)
+            if endpoint.latency_ewma is None:
+                endpoint.latency_ewma = latency
+            else:
+                endpoint.latency_ewma += self.alpha * (latency - endpoint.latency_ewma)
+        if endpoint.breakers[operation].record_success():
+            logger.info(f"RPC endpoint {endpoint.label} recovered ({operation})")
+        if method in FILTER_CREATE_METHODS and "result" in response:
+            self.filter_owners[response["result"]] = endpoint
+        MetricsCollector.update_rpc_endpoint_health(endpoint.label, operation, True)
+
+    def record_failure(
+        self, endpoint: EndpointStats, error: Exception, operation: str = READ
+    ):
+        kind = classify_error(error)
+        with self._lock:
+            endpoint.outcomes.append(False)
+        MetricsCollector.record_rpc_error(endpoint.label, kind)
+        breaker = endpoint.breakers[operation]
+        cooldown = breaker.record_failure()
+        if cooldown is not None:
+            MetricsCollector.update_rpc_endpoint_health(
+                endpoint.label, operation, False
+            )
+            logger.warning(
+                f"RPC endpoint {endpoint.label} failed {breaker.consecutive_failures}"
+                f" times in a row ({kind}), {operation} circuit open for "
+                f"{cooldown:.1f}s: {error}"
+            )
+        else:
+            logger.debug("RPC endpoint %s failed (%s): %s", endpoint.label, kind, error)
+
+
+class RPCPoolProvider(JSONBaseProvider):
+    """Web3 provider routing requests across several HTTP endpoints"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        hedge: bool = False,
+        hedge_min_delay: float = 0.25,
+        timeout: float = 10.0,
+        pool: Optional[EndpointPool] = None,
+        transport: Optional[HttpTransport] = None,
+    ):
+        """
+        Initialize pool provider
+
+        Args:
+            urls: RPC endpoint URLs (the first is preferred until measured)
+            hedge: Send a slow read to a second endpoint as well
+            hedge_min_delay: Shortest wait before hedging (seconds)
+            timeout: Per-request HTTP timeout (seconds)
+            pool: Endpoint bookkeeping (default built from urls)
+            transport: Shared pooled HTTP session (default: a new one)
+        """
+        super().__init__()
+        self.pool = pool or EndpointPool(urls)
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.transport = transport or HttpTransport()
+        self.providers = {
+            e.url: SessionHTTPProvider(e.url, self.transport, timeout, e.label)
+            for e in self.pool.endpoints
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * len(self.providers), thread_name_prefix="rpc-pool"
+        )
+
+    def __str__(self) -> str:
+        return f"RPC pool of {len(self.providers)} endpoints"
+
+    def close(self):
+        """Stop the hedging and broadcast worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, endpoint: EndpointStats, method: str, params: Any) -> Dict:
+        operation = operation_for(method)
+        self.pool.acquire(endpoint, operation)
+        started = time.perf_counter()
+        try:
+            response = self.providers[endpoint.url].make_request(method, params)
+            if is_endpoint_error(response):
+                raise EndpointError(response["error"])
+        except Exception as e:
+            self.pool.record_failure(endpoint, e, operation)
+            raise
+        self.pool.record_success(
+            endpoint, time.perf_counter() - started, method, response
+        )
+        return response
+
+    def make_request(self, method, params) -> Dict:
+        if method in BROADCAST_METHODS:
+            return self.pool.broadcast_policy.call(self._broadcast, method, params)
+        if method in UNRETRIED_METHODS:
+            return self._read(method, params)
+        return self.pool.read_policy.call(self._read, method, params)
+
+    def _read(self, method, params) -> Dict:
+        candidates = self.pool.candidates(method, params)
+        if self.hedge and len(candidates) > 1 and method not in FILTER_CREATE_METHODS:
+            return self._hedged(method, params, candidates)
+        return self._failover(method, params, candidates)
+
+    def _failover(self, method, params, candidates: List[EndpointStats]) -> Dict:
+        error: Optional[Exception] = None
+        for endpoint in candidates:
+            try:
+                return self._call(endpoint, method, params)
+            except CircuitOpenError as e:
+                error = error or e
+            except Exception as e:
+                error = e
+        raise error
+
+    def _hedged(self, method, params, candidates: List[EndpointStats]) -> Dict:
+        primary, secondary = candidates[0], candidates[1]
+        pending = {self._executor.submit(self._call, primary, method, params)}
+        done, pending = wait(
+            pending, timeout=self.pool.hedge_delay(primary, self.hedge_min_delay)
+        )
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+
+        # Primary is slow or failed: race the second endpoint against it
+        MetricsCollector.record_rpc_hedge(secondary.label)
+        pending.add(self._executor.submit(self._call, secondary, method, params))
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        if len(candidates) > 2:
+            return self._failover(method, params, candidates[2:])
+        raise error
+
+    def _broadcast(self, method, params) -> Dict:
+        ranked = self.pool.ranked(operation=BROADCAST)
+        futures = {
+            self._executor.submit(self._call, endpoint, method, params): rank
+            for rank, endpoint in enumerate(ranked)
+        }
+        rejected: Dict[int, Dict] = {}
+        error: Optional[Exception] = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if "error" not in response:
+                # Remaining sends finish in the background
+                return response
+            rejected[futures[future]] = response
+        if rejected:
+            return _rejected_broadcast(rejected, params)
+        raise error
+
+
+class AsyncRPCPoolProvider(AsyncJSONBaseProvider):
+    """AsyncWeb3 provider routing requests across several HTTP endpoints"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        hedge: bool = False,
+        hedge_min_delay: float = 0.25,
+        timeout: float = 10.0,
+        pool: Optional[EndpointPool] = None,
+        transport: Optional[HttpTransport] = None,
+    ):
+        """
+        Initialize async pool provider
+
+        Args:
+            urls: RPC endpoint URLs (the first is preferred until measured)
+            hedge: Send a slow read to a second endpoint as well
+            hedge_min_delay: Shortest wait before hedging (seconds)
+            timeout: Per-request HTTP timeout (seconds)
+            pool: Endpoint bookkeeping (default built from urls)
+            transport: Shared pooled HTTP session (default: a new one)
+        """
+        super().__init__()
+        self.pool = pool or EndpointPool(urls)
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.transport = transport or HttpTransport()
+        self.providers = {
+            e.url: AsyncSessionHTTPProvider(e.url, self.transport, timeout, e.label)
+            for e in self.pool.endpoints
+        }
+        # Strong references to requests still running after a result was
+        # returned (hedge losers, broadcast stragglers)
+        self._background: set = set()
+
+    def __str__(self) -> str:
+        return f"Async RPC pool of {len(self.providers)} endpoints"
+
+    async def _call(self, endpoint: EndpointStats, method: str, params: Any) -> Dict:
+        operation = operation_for(method)
+        self.pool.acquire(endpoint, operation)
+        started = time.perf_counter()
+        try:
+            response = await self.providers[endpoint.url].make_request(method, params)
+            if is_endpoint_error(response):
+                raise EndpointError(response["error"])
+        except asyncio.CancelledError:
+            endpoint.breakers[operation].release()
+            raise
+        except Exception as e:
+            self.pool.record_failure(endpoint, e, operation)
+            raise
+        self.pool.record_success(
+            endpoint, time.perf_counter() - started, method, response
+        )
+        return response
+
+    def _detach(self, tasks):
+        for task in tasks:
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            # Consume the exception so it is not reported as never retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def make_request(self, method, params) -> Dict:
+        if method in BROADCAST_METHODS:
+            return await self.pool.broadcast_policy.acall(
+                self._broadcast, method, params
+            )
+        if method in UNRETRIED_METHODS:
+            return await self._read(method, params)
+        return await self.pool.read_policy.acall(self._read, method, params)
+
+    async def _read(self, method, params) -> Dict:
+        candidates = self.pool.candidates(method, params)
+        if self.hedge and len(candidates) > 1 and method not in FILTER_CREATE_METHODS:
+            return await self._hedged(method, params, candidates)
+        return await self._failover(method, params, candidates)
+
+    async def _failover(self, method, params, candidates: List[EndpointStats]) -> Dict:
+        error: Optional[Exception] = None
+        for endpoint in candidates:
+            try:
+                return await self._call(endpoint, method, params)
+            except CircuitOpenError as e:
+                error = error or e
+            except Exception as e:
+                error = e
+        raise error
+
+    async def _hedged(self, method, params, candidates: List[EndpointStats]) -> Dict:
+        primary, secondary = candidates[0], candidates[1]
+        pending = {asyncio.ensure_future(self._call(primary, method, params))}
+        done, pending = await asyncio.wait(
+            pending, timeout=self.pool.hedge_delay(primary, self.hedge_min_delay)
+        )
+        for task in done:
+            if task.exception() is None:
+                return task.result()
+
+        # Primary is slow or failed: race the second endpoint against it
+        MetricsCollector.record_rpc_hedge(secondary.label)
+        pending.add(asyncio.ensure_future(self._call(secondary, method, params)))
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    # The loser still completes and updates its latency stats
+                    self._detach(pending)
+                    return task.result()
+                error = task.exception()
+        if len(candidates) > 2:
+            return await self._failover(method, params, candidates[2:])
+        raise error
+
+    async def _broadcast(self, method, params) -> Dict:
+        ranked = self.pool.ranked(operation=BROADCAST)
+        tasks = {
+            asyncio.ensure_future(self._call(endpoint, method, params)): rank
+            for rank, endpoint in enumerate(ranked)
+        }
+        pending = set(tasks)
+        rejected: Dict[int, Dict] = {}
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    continue
+                response = task.result()
+                if "error" not in response:
+                    self._detach(pending)
+                    return response
+                rejected[tasks[task]] = response
+        if rejected:
+            return _rejected_broadcast(rejected, params)
+        raise error
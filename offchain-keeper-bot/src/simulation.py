@@ -0,0 +1,110 @@
+"""
+Harvest pre-flight simulation for Stratum Fi Keeper Bot
+Decodes the predicted outcome of harvest() from a debug_traceCall call
+frame, or from claimable yield and a pool swap quote
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from eth_abi import decode
+from web3 import Web3
+
+# Harvested(musdAmount, btcAmount, totalValue) emitted by Harvester.harvest()
+HARVESTED_TOPIC = Web3.keccak(text="Harvested(uint256,uint256,uint256)").hex()
+
+# debug_traceCall options returning the call tree with emitted logs
+TRACE_CONFIG = {"tracer": "callTracer", "tracerConfig": {"withLog": True}}
+
+
+@dataclass(frozen=True)
+class HarvestSimulation:
+    """Predicted outcome of sending harvest() now"""
+
+    reverted: bool
+    revert_reason: Optional[str] = None
+    musd_amount: Optional[float] = None  # MUSD sent to the DebtManager
+    btc_amount: Optional[float] = None  # BTC swapped to MUSD
+    gas_used: Optional[int] = None
+    source: str = "call"  # trace, quote or call (revert check only)
+
+    @property
+    def has_outcome(self) -> bool:
+        """True if the simulation predicts the harvested amount"""
+        return not self.reverted and self.musd_amount is not None
+
+
+def collect_trace_logs(frame: Dict) -> List[Dict]:
+    """Logs emitted anywhere in a callTracer frame, in execution order"""
+    logs = list(frame.get("logs") or [])
+    for call in frame.get("calls") or []:
+        logs.extend(collect_trace_logs(call))
+    return logs
+
+
+def _to_int(value) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def simulation_from_trace(frame: Dict, harvester: str) -> HarvestSimulation:
+    """
+    Decode a debug_traceCall callTracer frame for harvest()
+
+    Args:
+        frame: Top-level call frame (traced with TRACE_CONFIG)
+        harvester: Harvester address whose Harvested log is decoded
+
+    Returns:
+        HarvestSimulation (musd_amount is None if no Harvested log was found)
+    """
+    gas_used = _to_int(frame["gasUsed"]) if frame.get("gasUsed") else None
+    if frame.get("error"):
+        return HarvestSimulation(
+            reverted=True,
+            revert_reason=frame.get("revertReason") or frame["error"],
+            gas_used=gas_used,
+            source="trace",
+        )
+
+    harvester = harvester.lower()
+    for log in collect_trace_logs(frame):
+        topics = log.get("topics") or []
+        if (
+            log.get("address", "").lower() == harvester
+            and topics
+            and topics[0].lower() == HARVESTED_TOPIC
+        ):
+            musd, btc, _ = decode(
+                ["uint256", "uint256", "uint256"], bytes.fromhex(log["data"][2:])
+            )
+            return HarvestSimulation(
+                reverted=False,
+                musd_amount=musd / 1e18,
+                btc_amount=btc / 1e18,
+                gas_used=gas_used,
+                source="trace",
+            )
+
+    return HarvestSimulation(reverted=False, gas_used=gas_used, source="trace")
+
+
+def simulation_from_quote(
+    claimable_musd: float, claimable_btc: float, btc_swap_out_musd: float
+) -> HarvestSimulation:
+    """
+    Predict the harvest outcome from claimable yield and a swap quote
+
+    Args:
+        claimable_musd: Claimable MUSD
+        claimable_btc: Claimable BTC (swapped to MUSD by harvest())
+        btc_swap_out_musd: Pool quote for swapping claimable_btc to MUSD
+
+    Returns:
+        HarvestSimulation with the predicted MUSD amount
+    """
+    return HarvestSimulation(
+        reverted=False,
+        musd_amount=claimable_musd + btc_swap_out_musd,
+        btc_amount=claimable_btc,
+        source="quote",
+    )
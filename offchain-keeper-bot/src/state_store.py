@@ -0,0 +1,421 @@
+"""
+Persistent state store for Stratum Fi Keeper Bot
+Append-only SQLite (WAL) history of cycle snapshots, submitted harvest
+transactions, their receipts and backfilled protocol events, written
+from a background thread
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from contracts import CycleSnapshot
+
+logger = logging.getLogger("keeper.state")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    vault TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_timestamp INTEGER NOT NULL,
+    gas_price_gwei REAL NOT NULL,
+    claimable0 REAL NOT NULL,
+    claimable1 REAL NOT NULL,
+    yield_usd REAL NOT NULL,
+    keeper_balance_btc REAL NOT NULL,
+    total_debt REAL NOT NULL,
+    total_btc_deposited REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_vault_time ON cycles (vault, recorded_at);
+
+CREATE TABLE IF NOT EXISTS txs (
+    tx_hash TEXT PRIMARY KEY,
+    vault TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    nonce INTEGER,
+    yield_usd REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_txs_vault_time ON txs (vault, submitted_at);
+
+CREATE TABLE IF NOT EXISTS receipts (
+    tx_hash TEXT PRIMARY KEY,
+    vault TEXT NOT NULL,
+    confirmed_at REAL NOT NULL,
+    success INTEGER NOT NULL,
+    block_number INTEGER,
+    gas_used INTEGER,
+    effective_gas_price_wei INTEGER,
+    gas_paid_btc REAL,
+    yield_usd REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_receipts_vault_time ON receipts (vault, confirmed_at);
+
+CREATE TABLE IF NOT EXISTS events (
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL,
+    event TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_timestamp INTEGER,
+    amount0 REAL,
+    amount1 REAL,
+    amount2 REAL,
+    PRIMARY KEY (tx_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS idx_events_vault_block ON events (vault, block_number);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+_INSERTS = {
+    "cycle": (
+        "INSERT INTO cycles (vault, recorded_at, block_number, block_timestamp, "
+        "gas_price_gwei, claimable0, claimable1, yield_usd, keeper_balance_btc, "
+        "total_debt, total_btc_deposited) VALUES (:vault, :recorded_at, "
+        ":block_number, :block_timestamp, :gas_price_gwei, :claimable0, "
+        ":claimable1, :yield_usd, :keeper_balance_btc, :total_debt, "
+        ":total_btc_deposited)"
+    ),
+    "tx": (
+        "INSERT OR IGNORE INTO txs (tx_hash, vault, submitted_at, nonce, yield_usd) "
+        "VALUES (:tx_hash, :vault, :submitted_at, :nonce, :yield_usd)"
+    ),
+    "receipt": (
+        "INSERT OR IGNORE INTO receipts (tx_hash, vault, confirmed_at, success, "
+        "block_number, gas_used, effective_gas_price_wei, gas_paid_btc, yield_usd) "
+        "VALUES (:tx_hash, :vault, :confirmed_at, :success, :block_number, "
+        ":gas_used, :effective_gas_price_wei, :gas_paid_btc, :yield_usd)"
+    ),
+    "events": (
+        "INSERT OR IGNORE INTO events (tx_hash, log_index, vault, event, "
+        "block_number, block_timestamp, amount0, amount1, amount2) VALUES "
+        "(:tx_hash, :log_index, :vault, :event, :block_number, :block_timestamp, "
+        ":amount0, :amount1, :amount2)"
+    ),
+    # Checkpoints are the one mutable row: progress markers, not history
+    "checkpoint": (
+        "INSERT OR REPLACE INTO checkpoints (name, block_number, updated_at) "
+        "VALUES (:name, :block_number, :updated_at)"
+    ),
+}
+
+# Sentinel asking the writer thread to exit
+_STOP = object()
+
+
+class StateStore:
+    """
+    Local keeper history in SQLite
+
+    record_* calls only enqueue rows, so they never block the harvest
+    loop; a single writer thread commits them in batches. Queries open
+    their own connection, which WAL mode lets run alongside the writer.
+    """
+
+    def __init__(self, path: str, max_queue: int = 10_000, batch_size: int = 500):
+        """
+        Initialize state store
+
+        Args:
+            path: SQLite database file
+            max_queue: Pending rows kept before new rows are dropped
+            batch_size: Maximum rows committed per transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _query(self, sql: str, params: list) -> List[sqlite3.Row]:
+        """Run a read query on a short-lived connection"""
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write_loop, name="state-store", daemon=True
+            )
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0):
+        """Flush queued rows and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row is committed (True on success)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def _enqueue(self, kind: str, row, block: bool = False):
+        """Queue a row for the writer (block=True waits instead of dropping)"""
+        try:
+            self._queue.put((kind, row), block=block)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"State store queue full, dropped {kind} row")
+
+    def _write_loop(self):
+        """Commit queued rows in batches until stopped"""
+        conn = self._connect()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    rows.append(item)
+            try:
+                with conn:
+                    for kind, row in rows:
+                        if isinstance(row, list):
+                            conn.executemany(_INSERTS[kind], row)
+                        else:
+                            conn.execute(_INSERTS[kind], row)
+            except sqlite3.Error as e:
+                logger.error(f"State store write failed ({len(rows)} rows lost): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def record_cycle(self, vault: str, snapshot: CycleSnapshot, yield_usd: float):
+        """Record the chain state read for one vault's cycle"""
+        self._enqueue(
+            "cycle",
+            {
+                "vault": vault,
+                "recorded_at": time.time(),
+                "yield_usd": yield_usd,
+                **asdict(snapshot),
+            },
+        )
+
+    def record_submission(
+        self, vault: str, tx_hash: str, nonce: Optional[int], yield_usd: float
+    ):
+        """Record a broadcast harvest transaction"""
+        self._enqueue(
+            "tx",
+            {
+                "tx_hash": tx_hash,
+                "vault": vault,
+                "submitted_at": time.time(),
+                "nonce": nonce,
+                "yield_usd": yield_usd,
+            },
+        )
+
+    def record_receipt(
+        self,
+        vault: str,
+        tx_hash: str,
+        success: bool,
+        yield_usd: float,
+        receipt: Optional[Dict] = None,
+    ):
+        """
+        Record the outcome of a harvest transaction
+
+        Args:
+            vault: Vault name
+            tx_hash: Transaction hash
+            success: Whether the harvest succeeded
+            yield_usd: Yield the harvest collected (if successful)
+            receipt: Transaction receipt, for block, gas used and gas price
+        """
+        receipt = receipt or {}
+        gas_used = receipt.get("gasUsed")
+        gas_price = receipt.get("effectiveGasPrice")
+        gas_paid = gas_used * gas_price / 1e18 if gas_used and gas_price else None
+        self._enqueue(
+            "receipt",
+            {
+                "tx_hash": tx_hash,
+                "vault": vault,
+                "confirmed_at": time.time(),
+                "success": int(success),
+                "block_number": receipt.get("blockNumber"),
+                "gas_used": gas_used,
+                "effective_gas_price_wei": gas_price,
+                "gas_paid_btc": gas_paid,
+                "yield_usd": yield_usd if success else 0.0,
+            },
+        )
+
+    def record_events(self, events: List[Dict]):
+        """
+        Record decoded protocol events (duplicates are ignored)
+
+        Args:
+            events: Rows with tx_hash, log_index, vault, event, block_number,
+                block_timestamp and up to three amounts
+        """
+        if events:
+            self._enqueue("events", events, block=True)
+
+    def record_checkpoint(self, name: str, block_number: int):
+        """
+        Record progress of a long-running job
+
+        Queued behind every row recorded before it, so a checkpoint is
+        never committed ahead of the data it covers.
+        """
+        self._enqueue(
+            "checkpoint",
+            {"name": name, "block_number": block_number, "updated_at": time.time()},
+            block=True,
+        )
+
+    def checkpoint(self, name: str) -> Optional[int]:
+        """Last committed checkpoint block for a job, or None"""
+        rows = self._query(
+            "SELECT block_number FROM checkpoints WHERE name = ?", [name]
+        )
+        return rows[0][0] if rows else None
+
+    def events(
+        self,
+        vault: Optional[str] = None,
+        event: Optional[str] = None,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Backfilled protocol events in block order
+
+        Args:
+            vault: Vault name (None for all vaults)
+            event: Event name, e.g. Harvested (None for all events)
+            from_block: First block (inclusive)
+            to_block: Last block (inclusive)
+        """
+        query = "SELECT * FROM events WHERE block_number >= ?"
+        params: list = [from_block]
+        if vault is not None:
+            query += " AND vault = ?"
+            params.append(vault)
+        if event is not None:
+            query += " AND event = ?"
+            params.append(event)
+        if to_block is not None:
+            query += " AND block_number <= ?"
+            params.append(to_block)
+        query += " ORDER BY block_number, log_index"
+        return [dict(r) for r in self._query(query, params)]
+
+    def harvest_stats(self, vault: str) -> Tuple[int, Optional[float]]:
+        """
+        Successful harvests recorded for a vault
+
+        Returns:
+            (harvest count, unix time of the last successful harvest or None)
+        """
+        (row,) = self._query(
+            "SELECT COUNT(*), MAX(confirmed_at) FROM receipts "
+            "WHERE vault = ? AND success = 1",
+            [vault],
+        )
+        return row[0], row[1]
+
+    def cycles(
+        self,
+        vault: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Cycle snapshots for a vault in a time range, oldest first
+
+        Args:
+            vault: Vault name
+            since: Earliest recorded_at (unix time, inclusive)
+            until: Latest recorded_at (unix time, inclusive)
+            limit: Return only the most recent rows
+        """
+        query = "SELECT * FROM cycles WHERE vault = ? AND recorded_at >= ?"
+        params: list = [vault, since or 0.0]
+        if until is not None:
+            query += " AND recorded_at <= ?"
+            params.append(until)
+        query += " ORDER BY recorded_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(r) for r in reversed(self._query(query, params))]
+
+    def harvests(
+        self,
+        vault: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        Submitted harvests with their receipts (if any), oldest first
+
+        Args:
+            vault: Vault name (None for all vaults)
+            since: Earliest submitted_at (unix time, inclusive)
+            until: Latest submitted_at (unix time, inclusive)
+        """
+        query = (
+            "SELECT t.tx_hash, t.vault, t.submitted_at, t.nonce, t.yield_usd, "
+            "r.confirmed_at, r.success, r.block_number, r.gas_used, "
+            "r.effective_gas_price_wei, r.gas_paid_btc "
+            "FROM txs t LEFT JOIN receipts r ON r.tx_hash = t.tx_hash "
+            "WHERE t.submitted_at >= ?"
+        )
+        params: list = [since or 0.0]
+        if vault is not None:
+            query += " AND t.vault = ?"
+            params.append(vault)
+        if until is not None:
+            query += " AND t.submitted_at <= ?"
+            params.append(until)
+        query += " ORDER BY t.submitted_at"
+        return [dict(r) for r in self._query(query, params)]
@@ -0,0 +1,279 @@
+"""
+Block-driven harvest triggers for Stratum Fi Keeper Bot
+Follows new block heads and wakes the keeper only when logs that can change
+claimable yield appear, instead of polling on a fixed interval
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from web3 import Web3
+
+logger = logging.getLogger("keeper.triggers")
+
+# Events that change (or reveal a change in) claimable yield
+TRIGGER_EVENT_SIGNATURES = [
+    "Harvested(uint256,uint256,uint256)",  # Harvester
+    "Invested(address,uint256,uint256,uint256)",  # StrategyBTC
+    "YieldClaimed(uint256,uint256)",  # StrategyBTC
+    "Swap(address,address,uint256,uint256,uint256,uint256)",  # Tigris (Aerodrome)
+    "Swap(address,uint256,uint256,uint256,uint256,address)",  # UniswapV2-style
+]
+
+TRIGGER_TOPICS = [Web3.keccak(text=sig).hex() for sig in TRIGGER_EVENT_SIGNATURES]
+
+
+def build_log_filter(
+    addresses: Iterable[str], from_block: int, to_block: int
+) -> Dict:
+    """
+    Build eth_getLogs params for trigger events emitted by watched contracts
+
+    Args:
+        addresses: Contract addresses to watch
+        from_block: First block (inclusive)
+        to_block: Last block (inclusive)
+
+    Returns:
+        Filter params dict
+    """
+    return {
+        "fromBlock": from_block,
+        "toBlock": to_block,
+        "address": sorted(set(addresses)),
+        "topics": [TRIGGER_TOPICS],
+    }
+
+
+def emitting_addresses(logs: List[Dict]) -> Set[str]:
+    """Checksummed addresses that emitted the given logs"""
+    return {Web3.to_checksum_address(log["address"]) for log in logs}
+
+
+class BlockTrigger:
+    """
+    Waits for new heads and reports which watched contracts emitted
+    trigger events
+
+    Heads come from an eth_newBlockFilter; if the node does not support
+    filters (or one expires) the trigger falls back to eth_blockNumber polling.
+    """
+
+    def __init__(
+        self, w3: Web3, addresses: Iterable[str], poll_interval: float = 2.0
+    ):
+        """
+        Initialize block trigger
+
+        Args:
+            w3: Web3 instance
+            addresses: Contract addresses to watch for trigger events
+            poll_interval: Seconds between head checks
+        """
+        self.w3 = w3
+        self.addresses = {Web3.to_checksum_address(a) for a in addresses}
+        self.poll_interval = poll_interval
+        self.last_block: Optional[int] = None
+        self._block_filter = None
+        self._use_filter = True
+
+    def _new_head(self) -> Optional[int]:
+        """Return the latest block number if a new head arrived, else None"""
+        if self._use_filter:
+            try:
+                if self._block_filter is None:
+                    self._block_filter = self.w3.eth.filter("latest")
+                if not self._block_filter.get_new_entries():
+                    return None
+            except Exception as e:
+                logger.info(f"Block filter unavailable, polling heads instead: {e}")
+                self._block_filter = None
+                self._use_filter = False
+
+        head = self.w3.eth.block_number
+        return head if self.last_block is None or head > self.last_block else None
+
+    def wait(
+        self, timeout: float, should_stop: Callable[[], bool] = lambda: False
+    ) -> Set[str]:
+        """
+        Block until a watched contract emits a trigger event or timeout
+
+        Args:
+            timeout: Maximum seconds to wait
+            should_stop: Callback checked between polls to abort early
+
+        Returns:
+            Addresses that emitted trigger events (empty on timeout)
+        """
+        deadline = time.monotonic() + timeout
+        if self.last_block is None:
+            self.last_block = self.w3.eth.block_number
+
+        while time.monotonic() < deadline and not should_stop():
+            try:
+                head = self._new_head()
+                if head is not None and head > self.last_block:
+                    logs = self.w3.eth.get_logs(
+                        build_log_filter(self.addresses, self.last_block + 1, head)
+                    )
+                    self.last_block = head
+                    if logs:
+                        changed = emitting_addresses(logs)
+                        logger.debug("Trigger logs at block %s from %s", head, changed)
+                        return changed
+            except Exception as e:
+                logger.warning(f"Block trigger poll failed: {e}")
+
+            time.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+        return set()
+
+
+class AsyncBlockTrigger:
+    """
+    Async counterpart of BlockTrigger
+
+    With a websocket URL, heads arrive through an eth_subscribe("newHeads")
+    subscription; otherwise eth_newBlockFilter, falling back to polling.
+    """
+
+    def __init__(
+        self,
+        w3,
+        addresses: Iterable[str],
+        poll_interval: float = 2.0,
+        ws_url: Optional[str] = None,
+    ):
+        """
+        Initialize async block trigger
+
+        Args:
+            w3: AsyncWeb3 instance (HTTP) used for filters and getLogs
+            addresses: Contract addresses to watch for trigger events
+            poll_interval: Seconds between head checks when polling
+            ws_url: Optional websocket endpoint for newHeads subscriptions
+        """
+        self.w3 = w3
+        self.addresses = {Web3.to_checksum_address(a) for a in addresses}
+        self.poll_interval = poll_interval
+        self.ws_url = ws_url
+        self.last_block: Optional[int] = None
+        self._filter_id: Optional[str] = None
+        self._use_filter = True
+        self._heads: Optional[asyncio.Queue] = None
+        self._ws_task: Optional[asyncio.Task] = None
+
+    async def _subscribe_heads(self):
+        """Feed newHeads block numbers from a websocket subscription"""
+        from web3 import AsyncWeb3, WebsocketProviderV2
+
+        while True:
+            try:
+                async with AsyncWeb3.persistent_websocket(
+                    WebsocketProviderV2(self.ws_url)
+                ) as ws_w3:
+                    await ws_w3.eth.subscribe("newHeads")
+                    logger.info(f"Subscribed to newHeads at {self.ws_url}")
+                    async for message in ws_w3.ws.process_subscriptions():
+                        number = message["result"]["number"]
+                        if isinstance(number, str):
+                            number = int(number, 16)
+                        self._heads.put_nowait(number)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"newHeads subscription dropped, reconnecting: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _new_head(self) -> Optional[int]:
+        """Return the latest block number if a new head arrived, else None"""
+        if self._heads is not None:
+            try:
+                head = await asyncio.wait_for(self._heads.get(), self.poll_interval)
+            except asyncio.TimeoutError:
+                return None
+            # Coalesce heads that queued up while we were busy
+            while not self._heads.empty():
+                head = max(head, self._heads.get_nowait())
+            return head
+
+        if self._use_filter:
+            try:
+                if self._filter_id is None:
+                    block_filter = await self.w3.eth.filter("latest")
+                    self._filter_id = block_filter.filter_id
+                if not await self.w3.eth.get_filter_changes(self._filter_id):
+                    return None
+            except Exception as e:
+                logger.info(f"Block filter unavailable, polling heads instead: {e}")
+                self._filter_id = None
+                self._use_filter = False
+
+        head = await self.w3.eth.block_number
+        return head if self.last_block is None or head > self.last_block else None
+
+    async def wait(self, timeout: float, stop_event: Optional[asyncio.Event] = None):
+        """
+        Wait until a watched contract emits a trigger event or timeout
+
+        Args:
+            timeout: Maximum seconds to wait
+            stop_event: Event that aborts the wait when set
+
+        Returns:
+            Set of addresses that emitted trigger events (empty on timeout)
+        """
+        if self.ws_url and self._ws_task is None:
+            self._heads = asyncio.Queue()
+            self._ws_task = asyncio.get_running_loop().create_task(
+                self._subscribe_heads()
+            )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if self.last_block is None:
+            self.last_block = await self.w3.eth.block_number
+
+        while loop.time() < deadline and not (stop_event and stop_event.is_set()):
+            try:
+                head = await self._new_head()
+                if head is not None and head > self.last_block:
+                    logs = await self.w3.eth.get_logs(
+                        build_log_filter(self.addresses, self.last_block + 1, head)
+                    )
+                    self.last_block = head
+                    if logs:
+                        changed = emitting_addresses(logs)
+                        logger.debug("Trigger logs at block %s from %s", head, changed)
+                        return changed
+            except Exception as e:
+                logger.warning(f"Block trigger poll failed: {e}")
+
+            if self._heads is None:
+                remaining = max(0.0, deadline - loop.time())
+                await self._sleep(min(self.poll_interval, remaining), stop_event)
+
+        return set()
+
+    async def _sleep(self, seconds: float, stop_event: Optional[asyncio.Event]):
+        """Sleep, waking early if the stop event is set"""
+        if stop_event is None:
+            await asyncio.sleep(seconds)
+            return
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def close(self):
+        """Cancel the websocket subscription task, if any"""
+        if self._ws_task is not None:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._ws_task = None
@@ -0,0 +1,554 @@
+"""
+Lifecycle tracking for in-flight harvest transactions
+Follows each broadcast nonce block by block and decides when to speed it
+up with higher fees, replace it with a cancel, or rebroadcast it after it
+drops out of the mempool or is reorged out. HarvestTxMixin holds the
+bookkeeping around it shared by the sync and async contract managers
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from metrics import metrics
+from nonce_manager import is_nonce_error
+
+logger = logging.getLogger("keeper.tx")
+
+# Nodes reject a same-nonce replacement unless every fee field rises by at
+# least 10% (geth's default txpool price bump)
+MIN_FEE_BUMP = 1.1
+
+# Gas for a zero-value transfer to self, used to cancel a pending nonce
+CANCEL_GAS = 21000
+
+# Actions returned by TxLifecycle.next_action
+WAIT = "wait"
+CONFIRMED = "confirmed"
+REPLACE = "replace"
+CANCEL = "cancel"
+REBROADCAST = "rebroadcast"
+REORGED = "reorged"
+LOST = "lost"
+
+
+def max_fee_per_gas(fee_params: Dict[str, int]) -> int:
+    """Highest price per gas a transaction may pay (maxFeePerGas or gasPrice)"""
+    return fee_params.get("maxFeePerGas", fee_params.get("gasPrice", 0))
+
+
+def effective_gas_price(
+    fee_params: Dict[str, int], base_fee_wei: Optional[int] = None
+) -> int:
+    """
+    Price per gas a transaction would pay if included now
+
+    Args:
+        fee_params: gasPrice, or maxFeePerGas and maxPriorityFeePerGas
+        base_fee_wei: Next block's base fee (None assumes the full maxFeePerGas)
+
+    Returns:
+        Price per gas in wei
+    """
+    if "maxPriorityFeePerGas" in fee_params and base_fee_wei is not None:
+        return min(
+            fee_params["maxFeePerGas"],
+            base_fee_wei + fee_params["maxPriorityFeePerGas"],
+        )
+    return max_fee_per_gas(fee_params)
+
+
+def bump_fees(
+    fee_params: Dict[str, int],
+    factor: float,
+    market_fee_params: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    """
+    Fee fields for a same-nonce replacement
+
+    Every field of the previous attempt is raised by at least factor (and
+    never by less than the node's minimum bump), or to the current market
+    fee if that is higher.
+
+    Args:
+        fee_params: Fee fields of the attempt being replaced
+        factor: Fee multiplier per replacement
+        market_fee_params: Fee fields a new transaction would use now
+
+    Returns:
+        Fee fields of the same transaction type
+    """
+    factor = max(factor, MIN_FEE_BUMP)
+    market = market_fee_params or {}
+    bumped = {
+        key: max(math.ceil(value * factor), market.get(key, 0))
+        for key, value in fee_params.items()
+    }
+    if "maxPriorityFeePerGas" in bumped:
+        bumped["maxFeePerGas"] = max(
+            bumped["maxFeePerGas"], bumped["maxPriorityFeePerGas"]
+        )
+    return bumped
+
+
+def cancel_transaction(
+    address: str, nonce: int, chain_id: int, fee_params: Dict[str, int]
+) -> Dict:
+    """
+    Zero-value transfer to self that takes over a pending nonce
+
+    Args:
+        address: Keeper wallet address
+        nonce: Nonce of the transaction being cancelled
+        chain_id: Chain ID the transaction is signed for
+        fee_params: Bumped fee fields (see bump_fees)
+
+    Returns:
+        Unsigned transaction dict
+    """
+    return {
+        "to": address,
+        "value": 0,
+        "gas": CANCEL_GAS,
+        "nonce": nonce,
+        "chainId": chain_id,
+        **fee_params,
+    }
+
+
+@dataclass
+class Attempt:
+    """One signed transaction broadcast for a tracked nonce"""
+
+    tx_hash: str
+    raw_tx: bytes
+    fee_params: Dict[str, int]
+    block: Optional[int]  # First chain head seen after broadcast
+    cancel: bool = False
+
+
+@dataclass
+class TrackedTx:
+    """A harvest nonce and every transaction sent for it"""
+
+    nonce: int
+    attempts: List[Attempt]
+    fee_ceiling_wei: Optional[int] = None
+    replacements: int = 0
+    reorgs: int = 0
+
+    @property
+    def latest(self) -> Attempt:
+        """Most recently broadcast attempt"""
+        return self.attempts[-1]
+
+    @property
+    def hashes(self) -> List[str]:
+        """Hashes of every attempt, newest first"""
+        return [attempt.tx_hash for attempt in reversed(self.attempts)]
+
+    @property
+    def cancelling(self) -> bool:
+        """True once the harvest has been replaced by a cancel"""
+        return self.latest.cancel
+
+    def attempt(self, tx_hash: str) -> Optional[Attempt]:
+        """Return the attempt with the given hash"""
+        for attempt in self.attempts:
+            if attempt.tx_hash == tx_hash:
+                return attempt
+        return None
+
+
+@dataclass
+class TxAction:
+    """What the caller should do next for a tracked transaction"""
+
+    kind: str
+    reason: str = ""
+    fee_params: Dict[str, int] = field(default_factory=dict)
+    receipt: Optional[Dict] = None
+
+
+class TxLifecycle:
+    """
+    Tracks in-flight harvest transactions for one keeper wallet
+
+    The tracker performs no network I/O. Contract managers broadcast a
+    harvest, register it with track(), then on every new block feed
+    next_action() the receipt (if any attempt has one), the canonical hash
+    of the receipt's block and the wallet's latest and pending nonces, and
+    carry out the returned action.
+    """
+
+    def __init__(
+        self,
+        replace_after_blocks: int = 3,
+        fee_bump: float = 1.125,
+        max_replacements: int = 5,
+        confirmations: int = 1,
+        timeout_seconds: float = 300.0,
+        poll_interval_seconds: float = 1.0,
+    ):
+        """
+        Initialize transaction lifecycle tracker
+
+        Args:
+            replace_after_blocks: Blocks without inclusion before the latest
+                attempt is replaced (0 disables replacement and cancels)
+            fee_bump: Fee multiplier per replacement (at least 1.1)
+            max_replacements: Replacements allowed per nonce
+            confirmations: Blocks (including the receipt's) before a receipt
+                is treated as final
+            timeout_seconds: How long callers wait before giving up for now
+            poll_interval_seconds: How often callers check for a new block
+        """
+        self.replace_after_blocks = replace_after_blocks
+        self.fee_bump = max(fee_bump, MIN_FEE_BUMP)
+        self.max_replacements = max_replacements
+        self.confirmations = max(confirmations, 1)
+        self.timeout_seconds = timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._tracked: Dict[int, TrackedTx] = {}
+        self._lock = threading.Lock()
+
+    def track(
+        self,
+        nonce: int,
+        tx_hash: str,
+        raw_tx: bytes,
+        fee_params: Dict[str, int],
+        block: Optional[int] = None,
+        fee_ceiling_wei: Optional[int] = None,
+    ) -> TrackedTx:
+        """
+        Start tracking a broadcast harvest
+
+        Args:
+            nonce: Nonce the harvest was sent with
+            tx_hash: Transaction hash
+            raw_tx: Signed transaction, kept for rebroadcasts
+            fee_params: Fee fields it was sent with
+            block: Chain head when broadcast (None takes the next head seen)
+            fee_ceiling_wei: Highest effective gas price at which the harvest
+                is still worth landing (None never cancels)
+
+        Returns:
+            The tracked transaction
+        """
+        tracked = TrackedTx(
+            nonce=nonce,
+            attempts=[Attempt(tx_hash, raw_tx, dict(fee_params), block)],
+            fee_ceiling_wei=fee_ceiling_wei,
+        )
+        with self._lock:
+            self._tracked[nonce] = tracked
+        return tracked
+
+    def get(self, nonce: int) -> Optional[TrackedTx]:
+        """Return the tracked transaction for a nonce"""
+        with self._lock:
+            return self._tracked.get(nonce)
+
+    def finish(self, nonce: int):
+        """Stop tracking a nonce once its outcome is final"""
+        with self._lock:
+            self._tracked.pop(nonce, None)
+
+    @property
+    def pending(self) -> List[TrackedTx]:
+        """Tracked transactions, lowest nonce first"""
+        with self._lock:
+            return [self._tracked[n] for n in sorted(self._tracked)]
+
+    def add_attempt(
+        self,
+        tracked: TrackedTx,
+        tx_hash: str,
+        raw_tx: bytes,
+        fee_params: Dict[str, int],
+        block: int,
+        cancel: bool = False,
+    ):
+        """Record a replacement broadcast for a tracked nonce"""
+        tracked.attempts.append(
+            Attempt(tx_hash, raw_tx, dict(fee_params), block, cancel=cancel)
+        )
+        tracked.replacements += 1
+
+    def replacement_due(self, tracked: TrackedTx, head_block: int) -> bool:
+        """True if the latest attempt has waited long enough to be replaced"""
+        return (
+            self.replace_after_blocks > 0
+            and tracked.replacements < self.max_replacements
+            and self._blocks_waited(tracked, head_block) >= self.replace_after_blocks
+        )
+
+    @staticmethod
+    def _blocks_waited(tracked: TrackedTx, head_block: int) -> int:
+        """Blocks since the latest attempt, stamping its first head seen"""
+        latest = tracked.latest
+        if latest.block is None:
+            latest.block = head_block
+        return head_block - latest.block
+
+    def next_action(
+        self,
+        tracked: TrackedTx,
+        head_block: int,
+        receipt: Optional[Dict] = None,
+        canonical_hash: Optional[bytes] = None,
+        chain_nonce: Optional[int] = None,
+        known: bool = True,
+        market_fee_params: Optional[Dict[str, int]] = None,
+        base_fee_wei: Optional[int] = None,
+    ) -> TxAction:
+        """
+        Decide what to do with a tracked transaction at a new block
+
+        Args:
+            tracked: Transaction returned by track()
+            head_block: Latest block number
+            receipt: Receipt of any attempt, if one was mined
+            canonical_hash: Hash of the canonical block at the receipt's
+                height (None skips the reorg check)
+            chain_nonce: Wallet's latest (mined) transaction count, read
+                before the receipts
+            known: Whether the node's pending pool still holds the nonce
+                (its pending transaction count is above it)
+            market_fee_params: Fee fields a new transaction would use now,
+                required when replacement_due()
+            base_fee_wei: Next block's base fee, to price type-2 attempts
+
+        Returns:
+            TxAction to carry out
+        """
+        if receipt is not None:
+            depth = head_block - receipt["blockNumber"] + 1
+            if canonical_hash is not None and canonical_hash != receipt["blockHash"]:
+                tracked.reorgs += 1
+                return TxAction(
+                    REORGED,
+                    reason=f"block {receipt['blockNumber']} was reorged out",
+                )
+            if depth < self.confirmations:
+                return TxAction(
+                    WAIT, reason=f"{depth}/{self.confirmations} confirmations"
+                )
+            return TxAction(CONFIRMED, receipt=receipt)
+
+        if chain_nonce is not None and chain_nonce > tracked.nonce:
+            return TxAction(LOST, reason=f"nonce {tracked.nonce} used by another tx")
+
+        if not known:
+            return TxAction(REBROADCAST, reason="dropped from the mempool")
+
+        if not self.replacement_due(tracked, head_block):
+            return TxAction(WAIT)
+
+        fee_params = bump_fees(
+            tracked.latest.fee_params, self.fee_bump, market_fee_params
+        )
+        if tracked.cancelling:
+            return TxAction(
+                CANCEL, reason="cancel still pending", fee_params=fee_params
+            )
+
+        price = effective_gas_price(fee_params, base_fee_wei)
+        ceiling = tracked.fee_ceiling_wei
+        if ceiling is not None and price > ceiling:
+            return TxAction(
+                CANCEL,
+                reason=(
+                    f"harvest unprofitable at {price / 1e9:.4f} gwei "
+                    f"(ceiling {ceiling / 1e9:.4f} gwei)"
+                ),
+                fee_params=fee_params,
+            )
+        waited = self._blocks_waited(tracked, head_block)
+        return TxAction(
+            REPLACE, reason=f"not mined after {waited} blocks", fee_params=fee_params
+        )
+
+
+class HarvestTxMixin:
+    """
+    Harvest transaction bookkeeping shared by the sync and async managers
+
+    Covers everything around the tracker that needs no network I/O:
+    registering broadcasts, building replacements and cancels, settling
+    finished nonces and the related logs and metrics. The managers keep
+    only the RPC calls (sync or async) and call these helpers around them.
+
+    Expects the manager to define address, chain_id, vault, lifecycle,
+    nonce_manager, harvest_template, pending_nonces, submitted_at,
+    last_receipt and last_tx_outcome.
+    """
+
+    def _track_harvest(
+        self,
+        tx_hash: str,
+        nonce: int,
+        raw_tx: bytes,
+        fee_params: Dict[str, int],
+        fee_ceiling_wei: Optional[int] = None,
+    ):
+        """Start tracking a broadcast harvest"""
+        self.pending_nonces[tx_hash] = nonce
+        self.submitted_at[tx_hash] = time.time()
+        self.lifecycle.track(
+            nonce, tx_hash, raw_tx, fee_params, fee_ceiling_wei=fee_ceiling_wei
+        )
+        logger.info(
+            f"Harvest transaction sent: {tx_hash} (nonce {nonce})",
+            extra={"vault": self.vault, "tx": tx_hash},
+        )
+
+    def pending_harvest(self, fee_ceiling_wei: Optional[int] = None) -> Optional[str]:
+        """
+        Hash of a harvest from this manager still being tracked
+
+        Keepers check this every cycle, before deciding on a new harvest,
+        and wait on the returned hash so a stuck harvest keeps being sped
+        up, cancelled or rebroadcast while gas or yield holds back new ones.
+
+        Args:
+            fee_ceiling_wei: Fee ceiling from the current economics, replacing
+                the one the harvest was sent with (None keeps it)
+
+        Returns:
+            Transaction hash, or None if nothing is pending
+        """
+        for tx_hash, nonce in self.pending_nonces.items():
+            tracked = self.lifecycle.get(nonce)
+            if tracked is None:
+                continue
+            if fee_ceiling_wei is not None:
+                tracked.fee_ceiling_wei = fee_ceiling_wei
+            logger.info(
+                f"Harvest {tx_hash} (nonce {nonce}) is still pending, "
+                "resuming tracking",
+                extra={"vault": self.vault, "tx": tx_hash},
+            )
+            return tx_hash
+        return None
+
+    def _start_wait(self, tx_hash: str) -> Optional[TrackedTx]:
+        """Tracked transaction for a hash about to be waited for"""
+        self.last_tx_outcome = None
+        nonce = self.pending_nonces.get(tx_hash)
+        tracked = self.lifecycle.get(nonce) if nonce is not None else None
+        if tracked is None:
+            logger.error(f"Harvest {tx_hash} is not being tracked")
+        return tracked
+
+    def _wait_timed_out(self, tx_hash: str, tracked: TrackedTx, timeout: float):
+        """Record a wait that ended with the harvest still pending"""
+        logger.warning(
+            f"Harvest {tx_hash} (nonce {tracked.nonce}) still pending after "
+            f"{timeout:.0f}s"
+        )
+        self.last_tx_outcome = WAIT
+
+    def _rebroadcasting(self, tracked: TrackedTx, action: TxAction):
+        """Log and count a rebroadcast of the latest attempt"""
+        logger.warning(f"Rebroadcasting harvest nonce {tracked.nonce}: {action.reason}")
+        metrics.record_tx_event(action.kind, self.vault)
+
+    def _replacement_tx(self, tracked: TrackedTx, action: TxAction) -> Dict:
+        """Unsigned speed-up (REPLACE) or cancel (CANCEL) for a tracked nonce"""
+        if action.kind == CANCEL:
+            return cancel_transaction(
+                self.address, tracked.nonce, self.chain_id, action.fee_params
+            )
+        return self.harvest_template.build(tracked.nonce, action.fee_params)
+
+    def _replacement_rejected(self, tracked: TrackedTx, error: Exception):
+        """Log a replacement the node refused"""
+        # An underpriced or already-mined nonce is settled at the next block
+        level = logging.INFO if is_nonce_error(error) else logging.WARNING
+        logger.log(level, f"Replacement for nonce {tracked.nonce} rejected: {error}")
+
+    def _replacement_sent(
+        self,
+        tracked: TrackedTx,
+        action: TxAction,
+        tx_hash: str,
+        raw_tx: bytes,
+        head: int,
+    ):
+        """Record a broadcast speed-up or cancel"""
+        cancel = action.kind == CANCEL
+        self.lifecycle.add_attempt(
+            tracked, tx_hash, raw_tx, action.fee_params, head, cancel=cancel
+        )
+        metrics.record_tx_event("cancelled" if cancel else "replaced", self.vault)
+        logger.warning(
+            f"{'Cancelling' if cancel else 'Speeding up'} harvest nonce "
+            f"{tracked.nonce} with {tx_hash}: {action.reason}",
+            extra={"vault": self.vault, "tx": tx_hash},
+        )
+
+    def _settle_harvest(
+        self, tx_hash: str, tracked: TrackedTx, action: TxAction
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Settle a tracked harvest's nonce once its outcome is final
+
+        Args:
+            tx_hash: Hash the harvest was submitted under
+            tracked: Tracked transaction
+            action: CONFIRMED or LOST action from the tracker
+
+        Returns:
+            Whether the harvest succeeded, and its wall-clock broadcast time
+            if a receipt's inclusion latency should be recorded
+        """
+        self.lifecycle.finish(tracked.nonce)
+        self.nonce_manager.confirm(tracked.nonce)
+        self.pending_nonces.pop(tx_hash, None)
+        submitted_at = self.submitted_at.pop(tx_hash, None)
+        self.last_tx_outcome = action.kind
+
+        if action.kind == LOST:
+            logger.error(f"Harvest {tx_hash} lost: {action.reason}")
+            metrics.record_tx_event(LOST, self.vault)
+            return False, None
+
+        receipt = action.receipt
+        self.last_receipt = receipt
+        attempt = tracked.attempt(receipt["transactionHash"].hex())
+        if attempt is not None and attempt.cancel:
+            self.last_tx_outcome = CANCEL
+            logger.warning(f"Harvest {tx_hash} cancelled (nonce {tracked.nonce})")
+            return False, submitted_at
+        if receipt["status"] == 1:
+            logger.info(f"Harvest successful! Gas used: {receipt['gasUsed']}")
+            return True, submitted_at
+
+        logger.error("Harvest transaction reverted")
+        return False, submitted_at
+
+    def _record_inclusion(
+        self,
+        submitted_at: float,
+        observed: float,
+        block_timestamp: Optional[int] = None,
+    ):
+        """
+        Record time to confirmation and to inclusion (block timestamp)
+
+        Args:
+            submitted_at: Wall-clock broadcast time
+            observed: Wall-clock time the receipt was seen final
+            block_timestamp: Timestamp of the inclusion block, if fetched
+        """
+        metrics.record_phase("confirmation", observed - submitted_at, self.vault)
+        if block_timestamp is None:
+            return
+        # Block timestamps have one second resolution
+        included = max(0.0, min(observed, block_timestamp) - submitted_at)
+        metrics.record_phase("inclusion", included, self.vault)
@@ -0,0 +1,132 @@
+"""
+Prebuilt transactions for Stratum Fi Keeper Bot
+Keeps calldata, chain ID and a gas estimate ready so that sending a
+harvest only fills in the nonce and fees before signing
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class TxTemplate:
+    """
+    Warm, unsigned transaction for a fixed contract call
+
+    The template performs no network I/O. Callers estimate gas off the
+    send path (refreshing before the validity window runs out) and pass
+    the result to update_gas(); build() then only adds nonce and fees.
+    Gas measured by a pre-flight simulation is passed to
+    record_simulated_gas() and raises the gas limit when the call has
+    become more expensive since the last estimate.
+    """
+
+    def __init__(
+        self,
+        to: str,
+        data: str,
+        chain_id: int,
+        fallback_gas: int,
+        validity_seconds: float = 600.0,
+        refresh_fraction: float = 0.5,
+        gas_buffer: float = 1.2,
+    ):
+        """
+        Initialize transaction template
+
+        Args:
+            to: Target contract address (checksummed)
+            data: ABI-encoded calldata (hex)
+            chain_id: Chain ID the transaction is signed for
+            fallback_gas: Gas limit used while no estimate is available
+            validity_seconds: How long a gas estimate may be used
+            refresh_fraction: Fraction of the validity window after which
+                a background refresh is due
+            gas_buffer: Gas limit headroom over the estimate
+        """
+        self.to = to
+        self.data = data
+        self.chain_id = chain_id
+        self.fallback_gas = fallback_gas
+        self.validity_seconds = validity_seconds
+        self.refresh_after_seconds = validity_seconds * refresh_fraction
+        self.gas_buffer = gas_buffer
+        self.gas_estimate: Optional[int] = None
+        self.estimated_at: Optional[float] = None
+        self.simulated_gas: Optional[int] = None
+
+    def update_gas(self, estimate: Optional[int], now: Optional[float] = None):
+        """
+        Record a gas estimate
+
+        Args:
+            estimate: eth_estimateGas result, or None if estimation failed
+                (the previous estimate, if any, is kept for another window)
+            now: time.monotonic() of the estimate
+        """
+        if estimate is not None:
+            self.gas_estimate = estimate
+        self.estimated_at = time.monotonic() if now is None else now
+
+    def record_simulated_gas(self, gas_used: Optional[int]):
+        """
+        Record gas measured by simulating the call at the pending block
+
+        Args:
+            gas_used: Simulated gas, or None if the simulation did not
+                measure it (the previous measurement is kept)
+        """
+        if gas_used is not None:
+            self.simulated_gas = gas_used
+
+    def _age(self, now: Optional[float]) -> float:
+        if self.estimated_at is None:
+            return float("inf")
+        return (time.monotonic() if now is None else now) - self.estimated_at
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        """True while the gas estimate is inside its validity window"""
+        return self._age(now) < self.validity_seconds
+
+    def needs_refresh(self, now: Optional[float] = None) -> bool:
+        """True once a background gas refresh is due"""
+        return self._age(now) >= self.refresh_after_seconds
+
+    @property
+    def _measured_gas(self) -> Optional[int]:
+        """Larger of the gas estimate and the latest simulated gas"""
+        measured = [g for g in (self.gas_estimate, self.simulated_gas) if g]
+        return max(measured) if measured else None
+
+    @property
+    def expected_gas(self) -> int:
+        """Expected gas used (the raw measurement, for cost projections)"""
+        return self._measured_gas or self.fallback_gas
+
+    @property
+    def gas_limit(self) -> int:
+        """Gas limit to send with (estimate or simulated gas, plus buffer)"""
+        measured = self._measured_gas
+        if measured is None:
+            return self.fallback_gas
+        return int(measured * self.gas_buffer)
+
+    def build(self, nonce: int, fee_params: Dict[str, int]) -> Dict:
+        """
+        Unsigned transaction ready for signing
+
+        Args:
+            nonce: Sender nonce
+            fee_params: gasPrice, or maxFeePerGas and maxPriorityFeePerGas
+
+        Returns:
+            Transaction dict
+        """
+        return {
+            "to": self.to,
+            "data": self.data,
+            "value": 0,
+            "gas": self.gas_limit,
+            "nonce": nonce,
+            "chainId": self.chain_id,
+            **fee_params,
+        }
@@ -0,0 +1,66 @@
+"""
+Vault definitions for multi-vault keeper mode
+Loads the list of Harvester deployments a single keeper process manages
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class VaultDefinition(BaseModel):
+    """One Harvester/DebtManager/StrategyBTC deployment"""
+
+    name: str = Field(..., description="Unique vault name (used as metrics label)")
+    harvester_address: str = Field(..., description="Harvester contract address")
+    debt_manager_address: str = Field(..., description="DebtManager contract address")
+    strategy_btc_address: str = Field(..., description="StrategyBTC contract address")
+
+    # Optional per-vault overrides of the global thresholds
+    min_yield_threshold_usd: Optional[float] = Field(default=None, ge=0)
+    max_gas_price_gwei: Optional[float] = Field(default=None, ge=0)
+
+    @field_validator(
+        "harvester_address", "debt_manager_address", "strategy_btc_address"
+    )
+    @classmethod
+    def validate_address(cls, v: str) -> str:
+        """Ensure addresses look like 0x-prefixed 20-byte hex"""
+        if not v.startswith("0x") or len(v) != 42:
+            raise ValueError("Contract address must be 0x + 40 hex characters")
+        return v
+
+
+def load_vaults(path: str) -> List[VaultDefinition]:
+    """
+    Load vault definitions from a JSON file
+
+    The file may be a list of vault objects or {"vaults": [...]}.
+
+    Args:
+        path: Path to vaults JSON file
+
+    Returns:
+        List of validated vault definitions
+    """
+    vaults_path = Path(path)
+    if not vaults_path.exists():
+        raise FileNotFoundError(f"Vaults file not found: {vaults_path}")
+
+    with open(vaults_path, "r") as f:
+        data = json.load(f)
+
+    entries = data["vaults"] if isinstance(data, dict) else data
+    vaults = [VaultDefinition(**entry) for entry in entries]
+
+    if not vaults:
+        raise ValueError(f"No vaults defined in {vaults_path}")
+
+    names = [vault.name for vault in vaults]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate vault names: {', '.join(duplicates)}")
+
+    return vaults
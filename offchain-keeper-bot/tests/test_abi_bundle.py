@@ -0,0 +1,36 @@
+"""
+Unit tests for the bundled contract ABIs
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src and scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from build_abi_bundle import BUNDLE_PATH, DEFAULT_ABI_DIR, build_bundle
+from contracts import load_abi
+
+
+@pytest.mark.skipif(not DEFAULT_ABI_DIR.exists(), reason="frontend ABIs not present")
+def test_bundle_matches_frontend_artifacts():
+    """Test src/abi_bundle.py is regenerated after ABI changes"""
+    assert BUNDLE_PATH.read_text() == build_bundle(DEFAULT_ABI_DIR)
+
+
+def test_search_path_overrides_bundle(tmp_path):
+    """Test mounted ABI files win over the bundle, which is the fallback"""
+    bundled = load_abi("Harvester")
+    assert {e["name"] for e in bundled} >= {"harvest", "getClaimableYield"}
+
+    override = [{"type": "function", "name": "harvest", "inputs": [], "outputs": []}]
+    (tmp_path / "Harvester.json").write_text(json.dumps({"abi": override}))
+    assert load_abi("Harvester", (str(tmp_path),)) == override
+    assert load_abi("DebtManager", (str(tmp_path),)) == load_abi("DebtManager")
+
+    with pytest.raises(FileNotFoundError):
+        load_abi("VaultController", (str(tmp_path),))
@@ -0,0 +1,195 @@
+"""
+Unit tests for the background alert dispatcher
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from alert_dispatcher import (
+    AlertDispatcher,
+    AlertSink,
+    FileSink,
+    error_alert,
+    success_alert,
+)
+
+
+def _counter(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class RecordingSink(AlertSink):
+    """Records alerts, optionally holding each send until released"""
+
+    name = "recording"
+
+    def __init__(self, release=None):
+        self.release = release
+        self.sent = []
+
+    def send(self, alert):
+        if self.release is not None:
+            self.release.wait(2)
+        self.sent.append(alert)
+
+
+class DownSink(AlertSink):
+    """Fails every send"""
+
+    name = "down"
+
+    def __init__(self):
+        self.attempts = 0
+
+    def send(self, alert):
+        self.attempts += 1
+        raise ConnectionError("webhook unavailable")
+
+
+class FlakySink(AlertSink):
+    """Fails the first send, then records alerts"""
+
+    name = "flaky"
+
+    def __init__(self):
+        self.failures = 1
+        self.sent = []
+
+    def send(self, alert):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("webhook unavailable")
+        self.sent.append(alert)
+
+
+def test_repeats_fold_into_one_summary_and_failures_retry(tmp_path):
+    """Test a flapping error is delivered once plus one summary"""
+    sink = FlakySink()
+    file_sink = FileSink(str(tmp_path / "alerts" / "alerts.jsonl"))
+    dispatcher = AlertDispatcher(
+        [sink, file_sink], dedup_window_seconds=0.3, retry_backoff_seconds=0.01
+    )
+    dispatcher.start()
+
+    started = time.monotonic()
+    for _ in range(5):
+        assert dispatcher.submit(error_alert("RPC timeout", vault="vault-a"))
+    dispatcher.submit(success_alert(12.5, "0xaa"))
+    dispatcher.submit(success_alert(13.0, "0xbb"))
+    assert time.monotonic() - started < 0.05  # Never waits on the sinks
+    time.sleep(0.5)
+    dispatcher.close()
+
+    assert [(a.kind, a.repeats) for a in sink.sent] == [
+        ("error", 0),
+        ("harvest_success", 0),
+        ("harvest_success", 0),
+        ("error", 4),
+    ]
+    lines = (tmp_path / "alerts" / "alerts.jsonl").read_text().splitlines()
+    assert [json.loads(line)["tx_hash"] for line in lines[1:3]] == ["0xaa", "0xbb"]
+    assert not AlertDispatcher([]).submit(error_alert("disabled"))
+
+
+def test_dedup_window_is_per_key_and_reopens_after_it_closes():
+    """Test repeats fold only within the window and only for the same key"""
+    sink = RecordingSink()
+    dispatcher = AlertDispatcher([sink], dedup_window_seconds=0.2)
+    dispatcher.start()
+    suppressed = _counter("keeper_alerts_discarded_total", reason="suppressed")
+
+    dispatcher.submit(error_alert("RPC timeout", vault="vault-a"))
+    dispatcher.submit(error_alert("RPC timeout", vault="vault-a"))
+    dispatcher.submit(error_alert("RPC timeout", vault="vault-b"))
+    dispatcher.submit(error_alert("Nonce too low", vault="vault-a"))
+    time.sleep(0.1)
+    assert [(a.vault, a.message) for a in sink.sent] == [
+        ("vault-a", "RPC timeout"),
+        ("vault-b", "RPC timeout"),
+        ("vault-a", "Nonce too low"),
+    ]
+
+    # The window closes with one summary; a window that folded nothing
+    # closes silently, so the next occurrence is delivered at once
+    time.sleep(0.25)
+    assert sink.sent[-1].repeats == 1
+    dispatcher.submit(error_alert("Nonce too low", vault="vault-a"))
+    time.sleep(0.05)
+    dispatcher.close()
+
+    assert [a.repeats for a in sink.sent] == [0, 0, 0, 1, 0]
+    after = _counter("keeper_alerts_discarded_total", reason="suppressed")
+    assert after - suppressed == 1
+
+
+def test_full_queue_drops_and_rate_limit_paces_without_dropping():
+    """Test a full queue drops new alerts; the rate limit only delays them"""
+    release = threading.Event()
+    sink = RecordingSink(release)
+    dispatcher = AlertDispatcher([sink], max_queue=2)
+    dispatcher.start()
+    dropped = _counter("keeper_alerts_discarded_total", reason="dropped")
+
+    # The worker holds the first alert in send(), two more fill the queue
+    assert dispatcher.submit(error_alert("first"))
+    time.sleep(0.05)
+    assert dispatcher.submit(error_alert("second"))
+    assert dispatcher.submit(error_alert("third"))
+    assert not dispatcher.submit(error_alert("fourth"))
+    assert _counter("keeper_alerts_discarded_total", reason="dropped") == dropped + 1
+    release.set()
+    dispatcher.close()
+    assert [a.message for a in sink.sent] == ["first", "second", "third"]
+
+    # A burst of 300/minute, then 5 per second
+    sink = RecordingSink()
+    dispatcher = AlertDispatcher([sink], rate_limit_per_minute=300)
+    dispatcher.start()
+    started = time.monotonic()
+    for i in range(302):
+        assert dispatcher.submit(error_alert(f"error {i}"))
+    time.sleep(0.1)
+    assert 300 <= len(sink.sent) < 302
+    dispatcher.close()
+    assert len(sink.sent) == 302
+    assert time.monotonic() - started >= 0.35
+
+
+def test_close_retries_failing_sinks_and_empties_the_queue():
+    """Test close() delivers everything queued, past a sink that keeps failing"""
+    down, sink = DownSink(), RecordingSink()
+    dispatcher = AlertDispatcher(
+        [down, sink],
+        dedup_window_seconds=60,
+        max_retries=2,
+        retry_backoff_seconds=0.001,
+    )
+    dispatcher.start()
+    failed = _counter("keeper_alerts_delivered_total", sink="down", status="failed")
+
+    for _ in range(3):
+        dispatcher.submit(error_alert("RPC timeout"))
+    dispatcher.submit(error_alert("Nonce too low"))
+    dispatcher.submit(success_alert(12.5, "0xaa"))
+    dispatcher.close()
+
+    # Open windows are flushed as summaries at shutdown
+    assert [(a.message, a.repeats) for a in sink.sent] == [
+        ("RPC timeout", 0),
+        ("Nonce too low", 0),
+        ("Harvested $12.50 USD", 0),
+        ("RPC timeout", 2),
+    ]
+    assert down.attempts == 2 * len(sink.sent)
+    after = _counter("keeper_alerts_delivered_total", sink="down", status="failed")
+    assert after - failed == len(sink.sent)
+    assert dispatcher._queue.empty()
+    assert not dispatcher.submit(error_alert("after close"))
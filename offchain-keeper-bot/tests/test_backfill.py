@@ -0,0 +1,170 @@
+"""
+Unit tests for the historical event backfill
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from eth_abi import encode
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from backfill import (
+    CHECKPOINT_NAME,
+    AdaptiveWindow,
+    Backfiller,
+    is_range_limit_error,
+    resume_block,
+)
+from simulation import HARVESTED_TOPIC
+from state_store import StateStore
+
+HARVESTER = "0x5A296604269470c24290e383C2D34F41B2B375c0"
+
+
+def _harvested_log(block):
+    data = encode(["uint256", "uint256", "uint256"], [5 * 10**18, 10**14, 11])
+    return {
+        "address": HARVESTER,
+        "topics": [HARVESTED_TOPIC],
+        "data": "0x" + data.hex(),
+        "transactionHash": f"0x{block:064x}",
+        "logIndex": 0,
+        "blockNumber": block,
+    }
+
+
+class FakeEth:
+    """get_logs rejecting ranges over 100 blocks, one Harvested log per 250"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_logs(self, params):
+        start, end = params["fromBlock"], params["toBlock"]
+        self.calls.append((start, end))
+        if end - start + 1 > 100:
+            raise ValueError({"code": -32005, "message": "block range too large"})
+        return [_harvested_log(b) for b in range(start, end + 1) if b % 250 == 0]
+
+    async def get_block(self, number):
+        return {"number": number, "timestamp": 1_700_000_000 + number}
+
+
+class DenseEth(FakeEth):
+    """get_logs with a log every block, capped at 50 results per response"""
+
+    async def get_logs(self, params):
+        start, end = params["fromBlock"], params["toBlock"]
+        self.calls.append((start, end))
+        if end - start + 1 > 50:
+            raise ValueError("query returned more than 50 results")
+        return [_harvested_log(block) for block in range(start, end + 1)]
+
+
+class FlakyEth(FakeEth):
+    """FakeEth whose node goes away for every block past fail_after"""
+
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+
+    async def get_logs(self, params):
+        if params["toBlock"] > self.fail_after:
+            self.calls.append((params["fromBlock"], params["toBlock"]))
+            raise ConnectionError("connection reset by peer")
+        return await super().get_logs(params)
+
+
+class FakeWeb3:
+    def __init__(self, eth=None):
+        self.eth = eth or FakeEth()
+
+
+def test_backfill_splits_windows_and_checkpoints(tmp_path):
+    """Test oversized windows are split and every event is stored once"""
+    store = StateStore(str(tmp_path / "keeper.db"))
+    store.start()
+    w3 = FakeWeb3()
+    backfiller = Backfiller(
+        w3,
+        {HARVESTER: "vault-a"},
+        store,
+        window=AdaptiveWindow(initial=1000),
+        concurrency=4,
+    )
+    summary = asyncio.run(backfiller.run(1, 2000))
+    store.close()
+
+    assert summary["events"] == 8
+    assert summary["splits"] > 0
+    assert all(end - start + 1 <= 1000 for start, end in w3.eth.calls)
+
+    reopened = StateStore(str(tmp_path / "keeper.db"))
+    assert reopened.checkpoint(CHECKPOINT_NAME) == 2000
+    events = reopened.events(vault="vault-a", event="Harvested")
+    assert [e["block_number"] for e in events] == list(range(250, 2001, 250))
+    assert events[0]["amount0"] == 5.0
+    assert events[0]["block_timestamp"] == 1_700_000_250
+
+
+def test_too_many_results_shrinks_the_window(tmp_path):
+    """Test a result-count limit halves the window until responses fit"""
+    assert is_range_limit_error(ValueError("query returned more than 50 results"))
+    store = StateStore(str(tmp_path / "keeper.db"))
+    store.start()
+    w3 = FakeWeb3(DenseEth())
+    window = AdaptiveWindow(initial=400)
+    backfiller = Backfiller(w3, {HARVESTER: "vault-a"}, store, window, concurrency=1)
+    summary = asyncio.run(backfiller.run(1, 400))
+    store.close()
+
+    # 400 -> 200 -> 100 -> 50 blocks before the first request succeeds
+    assert w3.eth.calls[:4] == [(1, 400), (1, 200), (1, 100), (1, 50)]
+    assert summary["splits"] >= 3
+    assert window.size < 400
+    assert summary["events"] == 400
+    assert len(store.events(vault="vault-a")) == 400
+    assert store.checkpoint(CHECKPOINT_NAME) == 400
+
+
+def test_interrupted_backfill_resumes_from_checkpoint(tmp_path):
+    """Test a second run starts after the stored checkpoint, not from scratch"""
+    store = StateStore(str(tmp_path / "keeper.db"))
+    store.start()
+    flaky = FakeWeb3(FlakyEth(fail_after=1200))
+    backfiller = Backfiller(
+        flaky,
+        {HARVESTER: "vault-a"},
+        store,
+        window=AdaptiveWindow(initial=100),
+        concurrency=1,
+        max_retries=1,
+    )
+    try:
+        asyncio.run(backfiller.run(1, 2000))
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("backfill should stop when the node goes away")
+    assert store.flush()
+    checkpoint = store.checkpoint(CHECKPOINT_NAME)
+    assert checkpoint is not None and checkpoint <= 1200
+
+    start = resume_block(store, 1)
+    assert start == checkpoint + 1
+    assert resume_block(store, 1500) == 1500  # Requested start past the checkpoint
+
+    w3 = FakeWeb3()
+    backfiller = Backfiller(
+        w3, {HARVESTER: "vault-a"}, store, window=AdaptiveWindow(initial=100)
+    )
+    asyncio.run(backfiller.run(start, 2000))
+    store.close()
+
+    assert min(s for s, _ in w3.eth.calls) == start
+    assert store.checkpoint(CHECKPOINT_NAME) == 2000
+    events = store.events(vault="vault-a")
+    assert [e["block_number"] for e in events] == list(range(250, 2001, 250))
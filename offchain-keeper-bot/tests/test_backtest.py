@@ -0,0 +1,93 @@
+"""
+Unit tests for harvest policy backtesting
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+np = pytest.importorskip("numpy")
+
+from backtest import (
+    HarvestPolicy,
+    MarketSeries,
+    harvest_mask,
+    optimal_yield,
+    run_backtest,
+)
+from policy import evaluate_harvest
+from profitability import evaluate_economics
+
+
+def test_vectorized_decision_matches_evaluate_harvest():
+    """Test the vectorized mask agrees with the keeper's scalar decision"""
+    rng = np.random.default_rng(7)
+    for _ in range(500):
+        gas = float(rng.uniform(0, 2))
+        yield_usd = float(rng.uniform(0, 200))
+        rate = float(rng.choice([0.0, rng.uniform(0, 0.01)]))
+        apr = float(rng.choice([0.0, 0.05]))
+        profitability = bool(rng.integers(2))
+        max_gas, min_yield = float(rng.uniform(0, 2)), float(rng.uniform(0, 100))
+        min_profit = float(rng.uniform(0, 50))
+
+        economics = evaluate_economics(yield_usd, 300_000, gas, 60000.0, rate, apr)
+        expected = evaluate_harvest(
+            gas,
+            yield_usd,
+            max_gas,
+            min_yield,
+            economics if profitability else None,
+            min_profit,
+        ).should_harvest
+        cost = economics.gas_cost_usd
+        assert bool(
+            harvest_mask(
+                gas,
+                yield_usd,
+                max_gas,
+                min_yield,
+                cost,
+                profitability,
+                min_profit,
+                optimal_yield(cost, rate, apr),
+            )
+        ) == expected
+
+
+def test_backtest_harvests_on_threshold_and_skips_high_gas():
+    """Test harvest count, gas spent and repayment for a linear series"""
+    # $0.10 per minute for a day; at 1 gwei a harvest costs $6 of gas
+    t = np.arange(1440) * 60.0
+    series = MarketSeries(t, np.full(1440, 0.1), np.full(1440, 1.0), 60000.0)
+    policies = [
+        HarvestPolicy(min_yield_threshold_usd=10.0, enable_profitability=False),
+        HarvestPolicy(min_yield_threshold_usd=10.0, max_gas_price_gwei=0.5),
+        HarvestPolicy(
+            harvest_interval_seconds=7200,
+            min_yield_threshold_usd=1.0,
+            enable_profitability=False,
+        ),
+    ]
+    hourly, capped, two_hourly = run_backtest(
+        series, policies, gas_units=100_000, initial_debt_usd=50.0
+    )
+
+    # Checks at 0h..23h; yield reaches $10 every second hour from 2h to 22h
+    assert hourly.harvests == 11
+    assert math.isclose(hourly.yield_harvested_usd, (22 * 60 + 1) * 0.1)
+    assert math.isclose(hourly.gas_spent_usd, 11 * 6.0)
+    assert math.isclose(hourly.days_to_repay, 10 / 24)
+    assert 0.5 < hourly.mean_lag_hours < 1.5
+
+    assert capped.harvests == 0 and capped.days_to_repay is None
+    assert math.isnan(capped.mean_lag_hours)
+
+    # Same cadence, checked every two hours in a separate vectorized group
+    assert two_hourly.harvests == 11
+    assert math.isclose(two_hourly.yield_harvested_usd, hourly.yield_harvested_usd)
@@ -0,0 +1,51 @@
+"""
+Unit tests for the benchmark harness and its mock chain
+"""
+
+import sys
+from pathlib import Path
+
+# Add src and benchmarks to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from mock_chain import Faults
+from run_benchmarks import Scenario, compare, run_scenario
+
+
+def test_sync_keeper_harvests_against_mock_chain():
+    """Test the sync keeper reads, simulates and harvests over the mock RPC"""
+    result = run_scenario(
+        Scenario("smoke", "Short single vault run", cycles=4, faults=Faults())
+    )
+
+    # Yield crosses the $10 threshold on the third block
+    assert result.cycles == 4
+    assert result.harvests == 1
+    assert result.failed_cycles == 0
+    assert result.rpc_calls["eth_sendRawTransaction"] == 1
+    assert 0 < result.rpc_calls_per_cycle < 10
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    """Test slower cycles and extra RPC calls are reported as regressions"""
+    baseline = {
+        "cycles_per_second": 20.0,
+        "p50_ms": 20.0,
+        "p99_ms": 100.0,
+        "rpc_calls_per_cycle": 4.0,
+    }
+    noisy = {
+        "cycles_per_second": 17.0,
+        "p50_ms": 24.0,
+        "p99_ms": 140.0,  # p99 gets twice the tolerance
+        "rpc_calls_per_cycle": 4.0,
+    }
+    assert compare(noisy, baseline, tolerance=0.25) == []
+
+    slower = dict(noisy, cycles_per_second=10.0, rpc_calls_per_cycle=6.0)
+    regressions = compare(slower, baseline, tolerance=0.25)
+    assert [r.split()[0] for r in regressions] == [
+        "cycles_per_second",
+        "rpc_calls_per_cycle",
+    ]
@@ -0,0 +1,67 @@
+"""
+Unit tests for yield accrual forecasting
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from forecast import YieldForecaster
+
+
+def _feed(forecaster, points):
+    for block, (timestamp, yield_usd) in enumerate(points, start=1):
+        forecaster.add_sample(block, timestamp, yield_usd, 0.0, yield_usd)
+
+
+def test_forecast_predicts_threshold_crossing():
+    """Test linear accrual of $1/min predicts the remaining time"""
+    forecaster = YieldForecaster()
+    _feed(forecaster, [(0, 1.0), (60, 2.0), (120, 3.0)])
+
+    assert abs(forecaster.rate_per_second() - 1 / 60) < 1e-9
+    assert abs(forecaster.seconds_until(10.0) - 420) < 1e-6
+    assert forecaster.next_check_delay(10.0, 60, 3600) == forecaster.seconds_until(
+        10.0
+    )
+
+
+def test_forecast_delay_is_bounded():
+    """Test delay is clamped and falls back to the max without a rate"""
+    forecaster = YieldForecaster()
+    assert forecaster.next_check_delay(10.0, 60, 3600) == 3600
+
+    _feed(forecaster, [(0, 1.0), (60, 1.001)])
+    assert forecaster.next_check_delay(10.0, 60, 3600) == 3600
+
+    forecaster.add_sample(3, 120, 20.0, 0.0, 20.0)
+    assert forecaster.next_check_delay(10.0, 60, 3600) == 60
+
+
+def test_forecast_resets_when_yield_is_claimed():
+    """Test a drop in claimable yield starts a fresh accrual history"""
+    forecaster = YieldForecaster()
+    _feed(forecaster, [(0, 5.0), (60, 6.0), (120, 0.5)])
+
+    assert len(forecaster.samples) == 1
+    assert forecaster.rate_per_second() is None
+
+
+def test_forecast_ignores_price_moves_without_a_claim():
+    """Test a BTC price dip keeps the history and the token accrual rate"""
+    btc_price = [60000.0]
+    forecaster = YieldForecaster(value_usd=lambda musd, btc: musd + btc * btc_price[0])
+
+    # 1 MUSD and 1e-5 BTC per minute: $1.60/min at $60k
+    for block, timestamp in enumerate([0, 60, 120], start=1):
+        musd, btc = block * 1.0, block * 1e-5
+        forecaster.add_sample(block, timestamp, musd, btc, musd + btc * 60000.0)
+
+    # Price drops 10% while the claimable amounts keep growing
+    btc_price[0] = 54000.0
+    forecaster.add_sample(4, 180, 4.0, 4e-5, 4.0 + 4e-5 * 54000.0)
+
+    assert len(forecaster.samples) == 4
+    assert abs(forecaster.rate_per_second() - 1.54 / 60) < 1e-9
@@ -0,0 +1,55 @@
+"""
+Unit tests for the fee history gas oracle
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gas_oracle import GasOracle, is_unsupported_error, percentile
+
+GWEI = 10**9
+
+
+def _fee_history(oldest, base_fees_gwei, tip_gwei=(1, 2, 5)):
+    """eth_feeHistory result with constant reward percentiles"""
+    return {
+        "oldestBlock": oldest,
+        "baseFeePerGas": [b * GWEI for b in base_fees_gwei],
+        "gasUsedRatio": [0.5] * (len(base_fees_gwei) - 1),
+        "reward": [[t * GWEI for t in tip_gwei]] * (len(base_fees_gwei) - 1),
+    }
+
+
+def test_oracle_smooths_base_fee_spikes():
+    """Test one spiking block does not move the smoothed price"""
+    oracle = GasOracle(history_blocks=5)
+    oracle.ingest(_fee_history(100, [10, 10, 300, 10, 10, 12]))
+
+    assert oracle.smoothed_gas_price_wei() == 12 * GWEI  # median 10 + tip 2
+    assert oracle.next_base_fee_wei == 12 * GWEI
+
+
+def test_oracle_builds_type2_fees_per_tier():
+    """Test fee params use next base fee headroom and the tier's tip"""
+    oracle = GasOracle(history_blocks=5)
+    oracle.ingest(_fee_history("0x64", [10, 10, 10]))
+
+    assert oracle.build_fee_params("fast") == {
+        "maxFeePerGas": 25 * GWEI,
+        "maxPriorityFeePerGas": 5 * GWEI,
+    }
+    assert oracle.build_fee_params("slow")["maxPriorityFeePerGas"] == 1 * GWEI
+
+
+def test_oracle_ring_buffer_keeps_recent_blocks():
+    """Test overlapping responses are deduplicated and old blocks evicted"""
+    oracle = GasOracle(history_blocks=4)
+    oracle.ingest(_fee_history(100, [1, 2, 3, 4]))
+    oracle.ingest(_fee_history(102, [3, 5, 6, 7]))
+
+    assert [s.block_number for s in oracle.samples] == [101, 102, 103, 104]
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert is_unsupported_error(ValueError({"code": -32601, "message": "x"}))
@@ -0,0 +1,99 @@
+"""
+Unit tests for snapshot-served health checks
+"""
+
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from health_check import HealthCheckServer, HealthState, build_readiness_status
+
+
+class StubKeeper:
+    """Keeper without contracts: probes must not touch the RPC"""
+
+    def __init__(self):
+        self.start_time = datetime.now()
+        self.harvest_count = 2
+        self.last_harvest_time = None
+        self.health = HealthState(max_age_seconds=60)
+        self.profiler = None
+
+
+def test_readiness_follows_snapshot_freshness():
+    """Test readiness needs a fresh, connected, authorized, funded snapshot"""
+    health = HealthState(max_age_seconds=60)
+    code, status = build_readiness_status(health)
+    assert code == 503 and status["stale"]
+
+    health.record_authorization(True)
+    health.record_rpc_read(0.05, block_number=123)
+    code, status = build_readiness_status(health)
+    assert code == 200 and status["block_number"] == 123
+
+    assert build_readiness_status(health, now=time.time() + 61)[0] == 503
+    health.record_rpc_failure()
+    assert build_readiness_status(health)[0] == 503
+
+
+def test_failed_reads_mark_rpc_down_and_keep_authorization_due():
+    """Test failed balance and authorization reads are not recorded as values"""
+    health = HealthState(max_age_seconds=60)
+
+    # A failed startup check leaves authorization due for the next cycle
+    health.record_authorization(None)
+    assert health.authorization_due()
+    assert not health.snapshot.rpc_connected
+
+    health.record_authorization(True)
+    health.record_rpc_read(0.05, block_number=123)
+    read_at = health.snapshot.updated_at
+    assert build_readiness_status(health)[0] == 200
+
+    # A failed balance read is an RPC failure, not a zero balance
+    health.record_rpc_read(None)
+    snapshot = health.snapshot
+    assert not snapshot.rpc_connected
+    assert snapshot.keeper_balance_btc == 0.05 and snapshot.updated_at == read_at
+    assert build_readiness_status(health)[0] == 503
+
+    # A failed refresh keeps the last result and is retried next cycle
+    health.record_rpc_read(0.05, block_number=124)
+    later = time.time() + 601
+    assert health.authorization_due(now=later)
+    health.record_authorization(None)
+    assert health.snapshot.keeper_authorized
+    assert health.authorization_due(now=later)
+
+
+def test_threaded_server_answers_from_snapshot():
+    """Test probes are served without RPC calls"""
+    keeper = StubKeeper()
+    keeper.health.record_authorization(True)
+    keeper.health.record_rpc_read(0.05, block_number=7)
+    server = HealthCheckServer(keeper, port=0)
+    server.start()
+    try:
+        base = f"http://127.0.0.1:{server.server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/ready", timeout=2) as response:
+            assert json.loads(response.read())["ready"] is True
+        with urllib.request.urlopen(f"{base}/metrics", timeout=2) as response:
+            payload = json.loads(response.read())
+        assert payload["harvests_executed"] == 2
+        assert payload["keeper_balance_btc"] == 0.05
+
+        keeper.health.record_rpc_failure()
+        try:
+            urllib.request.urlopen(f"{base}/ready", timeout=2)
+            assert False, "expected 503"
+        except urllib.error.HTTPError as e:
+            assert e.code == 503
+    finally:
+        server.stop()
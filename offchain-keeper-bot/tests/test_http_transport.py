@@ -0,0 +1,66 @@
+"""
+Unit tests for the shared HTTP transport
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from prometheus_client import REGISTRY
+
+from contracts import create_web3
+from http_transport import HttpTransport
+
+
+def _rpc_server(client_ports):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            client_ports.add(self.client_address[1])
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            body = json.dumps(
+                {"jsonrpc": "2.0", "id": request.get("id"), "result": "0x2a"}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_rpc_and_alerts_share_one_keepalive_connection():
+    """Test RPC requests and webhook posts reuse one pooled connection"""
+    client_ports = set()
+    server = _rpc_server(client_ports)
+    url = f"http://127.0.0.1:{server.server_port}"
+    transport = HttpTransport(pool_size=4)
+    timed = {"method": "eth_blockNumber", "endpoint": "127.0.0.1"}
+    before = (
+        REGISTRY.get_sample_value("keeper_rpc_request_duration_seconds_count", timed)
+        or 0
+    )
+    try:
+        w3 = create_web3([url], transport=transport)
+        assert [w3.eth.block_number for _ in range(10)] == [42] * 10
+        transport.post_json(url, {"text": "Harvest Successful"})
+        assert len(client_ports) == 1
+        after = REGISTRY.get_sample_value(
+            "keeper_rpc_request_duration_seconds_count", timed
+        )
+        assert after - before == 10
+    finally:
+        transport.close()
+        server.shutdown()
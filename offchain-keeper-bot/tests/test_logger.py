@@ -0,0 +1,40 @@
+"""
+Unit tests for queued JSON logging
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from logger import get_contextual_logger, setup_logger, shutdown_logging
+
+
+def test_json_lines_carry_context_fields(tmp_path):
+    """Test context becomes JSON keys and filtered DEBUG calls never format"""
+
+    class Explosive:
+        def __str__(self):
+            raise AssertionError("formatted a filtered record")
+
+    log_file = tmp_path / "logs" / "keeper.log"
+    logger = setup_logger(
+        "test_json_logger", level="INFO", log_file=str(log_file), log_format="json"
+    )
+    cycle_logger = get_contextual_logger(logger, cycle=3, vault="musd-btc")
+    cycle_logger.debug("Claimable yield: %s", Explosive())
+    cycle_logger.info("Harvest sent", extra={"tx": "0xabc", "block": 1200})
+    try:
+        raise TimeoutError("RPC timeout")
+    except TimeoutError:
+        cycle_logger.error("Error during harvest cycle", exc_info=True)
+    shutdown_logging()  # Drain the queue
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["message"] == "Harvest sent"
+    assert (lines[0]["cycle"], lines[0]["vault"]) == (3, "musd-btc")
+    assert (lines[0]["tx"], lines[0]["block"]) == ("0xabc", 1200)
+    assert "TimeoutError: RPC timeout" in lines[1]["exc_info"]
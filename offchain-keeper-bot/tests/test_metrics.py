@@ -0,0 +1,36 @@
+"""
+Unit tests for harvest phase timing
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from prometheus_client import REGISTRY
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from metrics import phase_timer
+
+
+def test_phase_timer_records_sub_millisecond_and_failed_phases():
+    """Test phases land in sub-ms buckets and failures are still timed"""
+    with phase_timer("signing", "test-vault"):
+        pass
+    fast = REGISTRY.get_sample_value(
+        "keeper_harvest_phase_duration_seconds_bucket",
+        {"phase": "signing", "vault": "test-vault", "le": "0.001"},
+    )
+    assert fast == 1
+
+    with pytest.raises(TimeoutError):
+        with phase_timer("broadcast", "test-vault"):
+            time.sleep(0.01)
+            raise TimeoutError("RPC timeout")
+    failed = REGISTRY.get_sample_value(
+        "keeper_harvest_phase_duration_seconds_sum",
+        {"phase": "broadcast", "vault": "test-vault"},
+    )
+    assert failed >= 0.01
@@ -0,0 +1,67 @@
+"""
+Unit tests for local nonce management
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nonce_manager import NonceManager, is_nonce_error
+
+ADDRESS = "0x" + "1" * 40
+
+
+def test_nonce_manager_reserves_sequentially():
+    """Test that reserved nonces are sequential after a sync"""
+    manager = NonceManager(ADDRESS)
+    assert manager.needs_sync
+    with pytest.raises(RuntimeError):
+        manager.reserve()
+
+    manager.sync(7)
+    assert [manager.reserve() for _ in range(3)] == [7, 8, 9]
+    assert manager.in_flight == {7, 8, 9}
+
+    manager.confirm(7)
+    assert manager.in_flight == {8, 9}
+
+
+def test_nonce_manager_release_reuses_latest():
+    """Test that releasing the latest reservation reuses its nonce"""
+    manager = NonceManager(ADDRESS)
+    manager.sync(3)
+    nonce = manager.reserve()
+    manager.release(nonce, RuntimeError("insufficient funds"))
+
+    assert not manager.needs_sync
+    assert manager.reserve() == 3
+
+
+def test_nonce_manager_resyncs_on_gap_or_rejection():
+    """Test that gaps and nonce rejections force a resync"""
+    manager = NonceManager(ADDRESS)
+    manager.sync(0)
+    first = manager.reserve()
+    manager.reserve()
+    manager.release(first)
+    assert manager.needs_sync
+
+    manager.sync(1)
+    nonce = manager.reserve()
+    manager.release(nonce, ValueError("{'message': 'nonce too low'}"))
+    assert manager.needs_sync
+
+
+def test_nonce_manager_reconcile_detects_drift():
+    """Test that reconcile adopts the chain's pending nonce on mismatch"""
+    manager = NonceManager(ADDRESS)
+    manager.sync(5)
+    manager.reserve()
+    manager.reconcile(5)  # broadcast tx dropped from mempool
+
+    assert manager.peek() == 5
+    assert is_nonce_error(ValueError("replacement transaction underpriced"))
+    assert not is_nonce_error(ValueError("execution reverted"))
@@ -0,0 +1,87 @@
+"""
+Unit tests for harvest decision policy
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from policy import evaluate_harvest
+from profitability import evaluate_economics
+
+
+def test_policy_skips_high_gas():
+    """Test that gas above the cap skips harvest even with high yield"""
+    decision = evaluate_harvest(
+        gas_price_gwei=60.0,
+        yield_usd=1000.0,
+        max_gas_price_gwei=50.0,
+        min_yield_threshold_usd=10.0,
+    )
+    assert decision.should_harvest is False
+    assert decision.status == "skipped_high_gas"
+
+
+def test_policy_skips_low_yield():
+    """Test that yield below threshold skips harvest"""
+    decision = evaluate_harvest(
+        gas_price_gwei=1.0,
+        yield_usd=9.99,
+        max_gas_price_gwei=50.0,
+        min_yield_threshold_usd=10.0,
+    )
+    assert decision.should_harvest is False
+    assert decision.status == "skipped_low_yield"
+
+
+def test_policy_executes_when_thresholds_met():
+    """Test that harvest executes at exactly the yield threshold"""
+    decision = evaluate_harvest(
+        gas_price_gwei=50.0,
+        yield_usd=10.0,
+        max_gas_price_gwei=50.0,
+        min_yield_threshold_usd=10.0,
+    )
+    assert decision.should_harvest is True
+    assert decision.status == "execute"
+
+
+def test_policy_skips_unprofitable_harvest():
+    """Test that yield not covering gas cost plus min profit skips harvest"""
+    economics = evaluate_economics(
+        yield_usd=10.0, gas_units=500_000, gas_price_gwei=20.0, btc_price_usd=1500.0
+    )
+    decision = evaluate_harvest(
+        gas_price_gwei=20.0,
+        yield_usd=10.0,
+        max_gas_price_gwei=50.0,
+        min_yield_threshold_usd=5.0,
+        economics=economics,
+    )
+    assert abs(economics.gas_cost_usd - 15.0) < 1e-9
+    assert decision.should_harvest is False
+    assert decision.status == "skipped_unprofitable"
+
+
+def test_policy_waits_for_optimal_harvest_point():
+    """Test that a profitable harvest below the optimal yield is deferred"""
+    economics = evaluate_economics(
+        yield_usd=12.0,
+        gas_units=100_000,
+        gas_price_gwei=0.1,
+        btc_price_usd=60_000.0,
+        accrual_rate_usd_per_second=1e-5,
+        opportunity_apr=0.05,
+    )
+    decision = evaluate_harvest(
+        gas_price_gwei=0.1,
+        yield_usd=12.0,
+        max_gas_price_gwei=50.0,
+        min_yield_threshold_usd=10.0,
+        economics=economics,
+    )
+    assert economics.net_profit_usd > 0
+    assert decision.status == "skipped_below_optimal"
+    assert economics.target_yield_usd(10.0) == economics.optimal_yield_usd
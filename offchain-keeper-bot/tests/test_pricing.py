@@ -0,0 +1,110 @@
+"""
+Unit tests for the token price oracle
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from eth_abi import encode
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from pricing import PriceMarket, build_price_oracle
+
+MARKET = PriceMarket(
+    pool="0x" + "11" * 20,
+    token0="0x" + "22" * 20,  # MUSD
+    token1="0x" + "33" * 20,  # BTC
+    btc="0x" + "33" * 20,
+    musd="0x" + "22" * 20,
+    pyth="0x" + "44" * 20,
+    btc_feed_id=b"\x01" * 32,
+)
+
+
+def _pyth_result(price, conf, expo, publish_time):
+    data = encode(
+        ["(int64,uint64,int32,uint256)"], [(price, conf, expo, publish_time)]
+    )
+    return True, data
+
+
+def _reserves_result(musd_reserve, btc_reserve):
+    data = encode(["uint112", "uint112", "uint32"], [musd_reserve, btc_reserve, 0])
+    return True, data
+
+
+def _results_for(calls, pyth, reserves):
+    """Answer each batched call according to its target"""
+    return [pyth if target == MARKET.pyth else reserves for target, _, _ in calls]
+
+
+def test_pyth_preferred_with_pool_fallback_in_same_batch():
+    """Test one batch prices BTC from Pyth, or the pool when Pyth fails"""
+    oracle = build_price_oracle([MARKET], ["pyth", "pool", "static"])
+    now = int(time.time())
+
+    plan, calls = oracle.build_calls([MARKET.btc, MARKET.musd])
+    assert {target for target, _, _ in calls} == {MARKET.pyth, MARKET.pool}
+    oracle.ingest(
+        plan,
+        _results_for(
+            calls,
+            _pyth_result(6_000_000, 100, -2, now),
+            _reserves_result(59_000 * 10**18, 10**18),
+        ),
+        block_number=10,
+        block_timestamp=now,
+    )
+    assert oracle.get(MARKET.btc).source == "pyth"
+    assert oracle.get(MARKET.btc).usd == 60_000
+    assert oracle.value_usd({MARKET.musd: 5.0, MARKET.btc: 0.001}) == 65.0
+
+    # A Pyth price older than max_age is ignored in favour of pool reserves
+    oracle = build_price_oracle([MARKET], ["pyth", "pool"], max_age_seconds=3600)
+    plan, calls = oracle.build_calls([MARKET.btc])
+    oracle.ingest(
+        plan,
+        _results_for(
+            calls,
+            _pyth_result(6_000_000, 100, -2, now - 7200),
+            _reserves_result(59_000 * 10**18, 10**18),
+        ),
+        block_number=10,
+        block_timestamp=now,
+    )
+    assert oracle.get(MARKET.btc).source == "pool"
+    assert oracle.get(MARKET.btc).usd == 59_000
+
+
+def test_stale_price_is_never_served():
+    """Test value_usd returns None once a cached price exceeds max age"""
+    oracle = build_price_oracle([MARKET], ["pyth"], max_age_seconds=60)
+    now = int(time.time())
+    plan, calls = oracle.build_calls([MARKET.btc])
+    oracle.ingest(
+        plan, [_pyth_result(6_000_000, 100, -2, now - 59)], 10, block_timestamp=now
+    )
+    assert oracle.value_usd({MARKET.btc: 1.0}) == 60_000
+
+    time.sleep(1.1)
+    assert oracle.get(MARKET.btc) is None
+    assert oracle.value_usd({MARKET.btc: 1.0}) is None
+    # Zero amounts need no price
+    assert oracle.value_usd({MARKET.btc: 0.0}) == 0.0
+
+
+def test_refresh_once_per_ttl_and_block():
+    """Test cached prices are not refetched within the TTL or the same block"""
+    oracle = build_price_oracle([MARKET], ["pool"], ttl_seconds=0)
+    assert oracle.tokens_to_refresh([MARKET.btc, MARKET.btc]) == [MARKET.btc]
+
+    plan, calls = oracle.build_calls([MARKET.btc])
+    oracle.ingest(plan, [_reserves_result(60_000, 1)], 10, time.time())
+    assert oracle.tokens_to_refresh([MARKET.btc], block_number=10) == []
+    assert oracle.tokens_to_refresh([MARKET.btc], block_number=11) == [MARKET.btc]
+
+    oracle.ttl_seconds = 60
+    assert oracle.tokens_to_refresh([MARKET.btc], block_number=11) == []
@@ -0,0 +1,68 @@
+"""
+Unit tests for profiling hooks
+"""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from health_check import build_debug_response
+from metrics import phase_timer
+from profiling import Profiler, cycle_breakdown
+
+
+def busy_keeper_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_endpoint_samples_other_threads():
+    """Test a profile names the busy function and rejects bad durations"""
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_keeper_loop, args=(stop,), name="keeper")
+    worker.start()
+    try:
+        profiler = Profiler(max_seconds=5, interval=0.001)
+        code, content_type, body = build_debug_response(
+            profiler, "/debug/profile?seconds=0.2"
+        )
+    finally:
+        stop.set()
+        worker.join()
+
+    assert code == 200 and content_type.startswith("text/plain")
+    # Other threads (e.g. leftover worker pools) may sort ahead of ours
+    keeper_lines = [
+        line
+        for line in body.decode().splitlines()
+        if line.startswith("keeper;") and "busy_keeper_loop" in line
+    ]
+    assert keeper_lines
+    stack, count = keeper_lines[0].rsplit(" ", 1)
+    assert int(count) > 10
+    assert build_debug_response(profiler, "/debug/profile?seconds=60")[0] == 400
+    assert build_debug_response(None, "/debug/profile")[0] == 404
+
+
+def test_cycle_breakdown_collects_phases_at_debug(caplog):
+    """Test phases timed during a cycle are logged as one DEBUG line"""
+    cycle_logger = logging.getLogger("keeper.test_profiling")
+    with caplog.at_level(logging.DEBUG, logger=cycle_logger.name):
+        with cycle_breakdown(cycle_logger, 7) as breakdown:
+            with phase_timer("snapshot", "test-vault"):
+                time.sleep(0.01)
+            with phase_timer("decision", "test-vault"):
+                pass
+
+    assert list(breakdown.phases) == ["snapshot", "decision"]
+    assert breakdown.phases["snapshot"][0] >= 0.01
+    assert "Cycle #7 time:" in caplog.text and "snapshot" in caplog.text
+
+    cycle_logger.setLevel(logging.INFO)
+    with cycle_breakdown(cycle_logger, 8) as breakdown:
+        assert breakdown is None  # Nothing collected without DEBUG
@@ -0,0 +1,32 @@
+"""
+Unit tests for harvest profitability
+"""
+
+import math
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from profitability import SECONDS_PER_YEAR, gas_cost_usd, optimal_harvest_yield
+
+
+def test_gas_cost_is_valued_in_btc():
+    """Test gas cost = gas units x price (gwei) x BTC/USD"""
+    assert math.isclose(gas_cost_usd(300_000, 2.0, 50_000.0), 30.0)
+
+
+def test_optimal_yield_minimizes_cost_per_second():
+    """Test Y* balances gas per harvest against forgone return"""
+    cost, rate, apr = 1.0, 0.001, 0.10
+    optimal = optimal_harvest_yield(cost, rate, apr)
+    rho = apr / SECONDS_PER_YEAR
+
+    def cost_per_second(y):
+        period = y / rate
+        return cost / period + rate * rho * period / 2
+
+    assert cost_per_second(optimal) < cost_per_second(optimal * 0.9)
+    assert cost_per_second(optimal) < cost_per_second(optimal * 1.1)
+    assert optimal_harvest_yield(cost, rate, 0.0) is None
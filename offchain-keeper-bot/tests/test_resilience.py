@@ -0,0 +1,104 @@
+"""
+Unit tests for RPC error classification, circuit breakers and retries
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from eth_utils import keccak
+from web3.exceptions import ContractLogicError
+
+from resilience import (
+    CONNECTION,
+    HALF_OPEN,
+    NONCE,
+    OPEN,
+    RATE_LIMIT,
+    REVERT,
+    TIMEOUT,
+    CircuitBreaker,
+    CircuitOpenError,
+    EndpointError,
+    classify_error,
+)
+from rpc_pool import EndpointPool, RPCPoolProvider
+
+URL = "https://rpc.example"
+
+
+class ScriptedEndpoint:
+    """Raises or answers with the next scripted outcome"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def make_request(self, method, params):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {"jsonrpc": "2.0", "id": 1, **outcome}
+
+
+def test_breaker_probes_when_half_open_and_errors_are_classified():
+    """Test the breaker opens, lets one probe through, and backs off on failure"""
+    assert classify_error(requests.ReadTimeout()) == TIMEOUT
+    assert classify_error(requests.ConnectionError()) == CONNECTION
+    assert classify_error(EndpointError({"code": -32005})) == RATE_LIMIT
+    assert classify_error(ContractLogicError("execution reverted")) == REVERT
+    assert classify_error(ValueError("nonce too low")) == NONCE
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=1.0)
+    assert breaker.record_failure(now=0.0) is None
+    first = breaker.record_failure(now=0.0)
+    assert 0.8 <= first <= 1.2
+    assert breaker.state(now=0.5) == OPEN and not breaker.acquire(now=0.5)
+
+    assert breaker.state(now=first) == HALF_OPEN
+    assert breaker.acquire(now=first) and not breaker.acquire(now=first)
+    assert 1.6 <= breaker.record_failure(now=first) <= 2.4  # Probe failed
+
+    assert breaker.acquire(now=10.0)
+    assert breaker.record_success() and breaker.acquire(now=10.0)
+
+
+def test_pool_retries_reads_and_treats_known_broadcast_as_sent():
+    """Test transient read errors are retried and open circuits fail fast"""
+    endpoint = ScriptedEndpoint(
+        [requests.ReadTimeout(), requests.ConnectionError(), {"result": "0x10"}]
+    )
+    provider = RPCPoolProvider([URL], pool=EndpointPool([URL], cooldown_seconds=60))
+    provider.providers = {URL: endpoint}
+    try:
+        assert provider.make_request("eth_blockNumber", [])["result"] == "0x10"
+        assert endpoint.calls == 3
+
+        # Reverts are answers, not endpoint failures: returned without retry
+        endpoint.outcomes = [{"error": {"code": 3, "message": "execution reverted"}}]
+        assert "error" in provider.make_request("eth_call", [{}, "latest"])
+        assert endpoint.calls == 4
+
+        # Three failures in a row open the read circuit; reads then fail fast
+        endpoint.outcomes = [requests.ConnectionError()] * 3
+        with pytest.raises(requests.ConnectionError):
+            provider.make_request("eth_blockNumber", [])
+        with pytest.raises(CircuitOpenError):
+            provider.make_request("eth_blockNumber", [])
+        assert endpoint.calls == 7
+
+        # Broadcasts have their own circuit; a resend the node already has wins
+        endpoint.outcomes = [
+            requests.ConnectionError(),
+            {"error": {"code": -32000, "message": "already known"}},
+        ]
+        response = provider.make_request("eth_sendRawTransaction", ["0x02"])
+        assert response["result"] == "0x" + keccak(b"\x02").hex()
+    finally:
+        provider.close()
@@ -0,0 +1,102 @@
+"""
+Unit tests for the multi-endpoint RPC pool
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rpc_pool import AsyncRPCPoolProvider, RPCPoolProvider
+
+URLS = ["https://a.example/key1", "https://b.example", "https://c.example"]
+
+
+class FakeEndpoint:
+    def __init__(self, result=None, error=None, rpc_error=None, delay=0.0):
+        self.result = result
+        self.error = error
+        self.rpc_error = rpc_error
+        self.delay = delay
+        self.calls = []
+
+    def _respond(self):
+        if self.error:
+            raise self.error
+        if self.rpc_error:
+            return {"jsonrpc": "2.0", "id": 1, "error": self.rpc_error}
+        return {"jsonrpc": "2.0", "id": 1, "result": self.result}
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        time.sleep(self.delay)
+        return self._respond()
+
+
+class AsyncFakeEndpoint(FakeEndpoint):
+    async def make_request(self, method, params):
+        self.calls.append(method)
+        await asyncio.sleep(self.delay)
+        return self._respond()
+
+
+def _pool(provider_cls, fakes):
+    provider = provider_cls(URLS, hedge_min_delay=0.05)
+    provider.providers = dict(zip(URLS, fakes))
+    return provider
+
+
+def test_failover_cooldown_and_broadcast():
+    """Test reads fail over, dead endpoints cool down, sends reach every node"""
+    dead = FakeEndpoint(error=ConnectionError("connection refused"))
+    limited = FakeEndpoint(rpc_error={"code": -32005, "message": "rate limited"})
+    healthy = FakeEndpoint(result="0x10")
+    provider = _pool(RPCPoolProvider, [dead, limited, healthy])
+    try:
+        for _ in range(3):
+            assert provider.make_request("eth_blockNumber", [])["result"] == "0x10"
+        # Failing endpoints rank behind c after one error each
+        assert [e.label for e in provider.pool.ranked()][0] == "c.example"
+        assert len(dead.calls) == 1 and len(limited.calls) == 1
+        assert len(healthy.calls) == 3
+
+        # Consecutive failures take an endpoint out of rotation
+        for _ in range(3):
+            provider.pool.record_failure(provider.pool.endpoints[0], TimeoutError())
+        assert not provider.pool.endpoints[0].is_healthy(time.monotonic())
+
+        # Another node already has the tx; the accepted response wins
+        dead.error = None
+        dead.rpc_error = {"code": -32000, "message": "already known"}
+        limited.rpc_error = None
+        limited.result = "0xhash"
+        healthy.result = "0xhash"
+        response = provider.make_request("eth_sendRawTransaction", ["0x02"])
+        assert response["result"] == "0xhash"
+        time.sleep(0.05)
+        assert "eth_sendRawTransaction" in dead.calls
+    finally:
+        provider.close()
+
+
+def test_async_hedge_returns_faster_endpoint():
+    """Test a slow read is hedged to the second endpoint"""
+    slow = AsyncFakeEndpoint(result="0x1", delay=1.0)
+    fast = AsyncFakeEndpoint(result="0x2", delay=0.01)
+    provider = _pool(AsyncRPCPoolProvider, [slow, fast, AsyncFakeEndpoint()])
+    provider.hedge = True
+    provider.pool.endpoints[1].latency_ewma = 0.01
+    provider.pool.endpoints[2].latency_ewma = 5.0
+
+    async def run():
+        started = time.monotonic()
+        response = await provider.make_request("eth_call", [{}, "latest"])
+        return response, time.monotonic() - started
+
+    response, elapsed = asyncio.run(run())
+    assert response["result"] == "0x2"
+    assert elapsed < 0.5
+    assert slow.calls and fast.calls
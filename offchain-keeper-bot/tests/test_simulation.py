@@ -0,0 +1,80 @@
+"""
+Unit tests for harvest pre-flight simulation
+"""
+
+import sys
+from pathlib import Path
+
+from eth_abi import encode
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from policy import evaluate_simulation
+from profitability import evaluate_economics
+from simulation import HARVESTED_TOPIC, HarvestSimulation, simulation_from_trace
+
+HARVESTER = "0x5A296604269470c24290e383C2D34F41B2B375c0"
+
+
+def _harvested_log(musd, btc):
+    data = encode(["uint256", "uint256", "uint256"], [musd, btc, musd])
+    return {
+        "address": HARVESTER.lower(),
+        "topics": [HARVESTED_TOPIC],
+        "data": "0x" + data.hex(),
+    }
+
+
+def test_trace_decodes_nested_harvested_log_and_reverts():
+    """Test the nested Harvested log is decoded and reverts are reported"""
+    frame = {
+        "gasUsed": "0x3d090",
+        "logs": [],
+        "calls": [
+            {"logs": [{"address": "0x" + "11" * 20, "topics": [], "data": "0x"}]},
+            {"calls": [], "logs": [_harvested_log(12 * 10**18, 10**15)]},
+        ],
+    }
+    simulation = simulation_from_trace(frame, HARVESTER)
+    assert simulation.has_outcome
+    assert simulation.musd_amount == 12.0
+    assert simulation.btc_amount == 0.001
+    assert simulation.gas_used == 250_000
+
+    reverted = simulation_from_trace(
+        {
+            "gasUsed": "0x5208",
+            "error": "execution reverted",
+            "revertReason": "Only keeper or owner",
+        },
+        HARVESTER,
+    )
+    assert reverted.reverted and reverted.revert_reason == "Only keeper or owner"
+
+
+def test_evaluate_simulation():
+    """Test reverts and low swap output are skipped"""
+    decision = evaluate_simulation(
+        HarvestSimulation(reverted=True, revert_reason="Strategy not set"), 20.0
+    )
+    assert decision.status == "skipped_simulated_revert"
+
+    # Swap lost 10% of the yield (amountOutMin = 0)
+    low = HarvestSimulation(reverted=False, musd_amount=18.0, source="trace")
+    decision = evaluate_simulation(low, 20.0, max_slippage=0.02)
+    assert decision.status == "skipped_low_output"
+    assert evaluate_simulation(low, 20.0, max_slippage=0.2).should_harvest
+
+    # Simulated gas use (2x the estimate) makes the harvest unprofitable
+    economics = evaluate_economics(20.0, 100_000, 50.0, 60_000.0)  # $0.30 gas
+    costly = HarvestSimulation(
+        reverted=False, musd_amount=19.8, gas_used=200_000, source="trace"
+    )
+    decision = evaluate_simulation(
+        costly, 20.0, max_slippage=0.05, economics=economics, min_profit_usd=19.3
+    )
+    assert decision.status == "skipped_low_output"
+
+    # No predicted outcome (revert check only) does not block the harvest
+    assert evaluate_simulation(HarvestSimulation(reverted=False), 20.0).should_harvest
@@ -0,0 +1,132 @@
+"""
+Unit tests for the persistent state store
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from contracts import CycleSnapshot
+from state_store import StateStore
+
+
+def _snapshot(block, claimable):
+    return CycleSnapshot(
+        block_number=block,
+        block_timestamp=1_700_000_000 + block,
+        gas_price_gwei=0.1,
+        claimable0=claimable,
+        claimable1=0.0,
+        keeper_balance_btc=0.5,
+        total_debt=1000.0,
+        total_btc_deposited=2.0,
+    )
+
+
+def test_history_survives_reopen(tmp_path):
+    """Test rows written in the background are queryable after reopening"""
+    path = str(tmp_path / "state" / "keeper.db")
+    store = StateStore(path)
+    store.start()
+    for block in range(1, 4):
+        store.record_cycle("vault-a", _snapshot(block, block * 5.0), block * 5.0)
+    store.record_cycle("vault-b", _snapshot(1, 1.0), 1.0)
+    store.record_submission("vault-a", "0xaa", 7, 15.0)
+    store.record_receipt(
+        "vault-a",
+        "0xaa",
+        True,
+        15.0,
+        {"blockNumber": 4, "gasUsed": 200_000, "effectiveGasPrice": 10**9},
+    )
+    store.record_submission("vault-a", "0xbb", 8, 3.0)
+    store.close()
+
+    reopened = StateStore(path)
+    count, last_harvest = reopened.harvest_stats("vault-a")
+    assert count == 1 and last_harvest is not None
+    assert reopened.harvest_stats("vault-b") == (0, None)
+
+    cycles = reopened.cycles("vault-a", limit=2)
+    assert [c["block_number"] for c in cycles] == [2, 3]
+    assert cycles[-1]["yield_usd"] == 15.0
+
+    harvests = reopened.harvests("vault-a")
+    assert [h["tx_hash"] for h in harvests] == ["0xaa", "0xbb"]
+    assert harvests[0]["gas_paid_btc"] == 0.0002
+    assert harvests[1]["success"] is None  # Still awaiting its receipt
+
+
+def test_full_queue_drops_rows_without_blocking(tmp_path):
+    """Test cycle rows past max_queue are counted and dropped, not queued"""
+    store = StateStore(str(tmp_path / "keeper.db"), max_queue=2)
+    for block in range(1, 6):
+        store.record_cycle("vault-a", _snapshot(block, 1.0), 1.0)
+    assert store.dropped == 3
+
+    store.start()
+    store.close()
+    cycles = store.cycles("vault-a")
+    assert [c["block_number"] for c in cycles] == [1, 2]
+
+
+def test_checkpoint_never_visible_before_its_events(tmp_path):
+    """Test a checkpoint is committed only after the events queued before it"""
+    store = StateStore(str(tmp_path / "keeper.db"), batch_size=1)
+    for block in range(1, 51):
+        store.record_events(
+            [
+                {
+                    "tx_hash": f"0x{block:04x}",
+                    "log_index": 0,
+                    "vault": "vault-a",
+                    "event": "Harvested",
+                    "block_number": block,
+                    "block_timestamp": None,
+                    "amount0": 1.0,
+                    "amount1": None,
+                    "amount2": None,
+                }
+            ]
+        )
+        store.record_checkpoint("backfill", block)
+
+    # One row per commit, so every intermediate checkpoint is observable
+    store.start()
+    seen = []
+    while store._queue.unfinished_tasks:
+        block = store.checkpoint("backfill")
+        if block is not None:
+            assert len(store.events(to_block=block)) >= block
+            seen.append(block)
+    store.close()
+
+    assert seen == sorted(seen)
+    assert store.checkpoint("backfill") == 50
+    assert len(store.events("vault-a", "Harvested")) == 50
+
+
+def test_harvests_include_submissions_without_receipts(tmp_path):
+    """Test the harvest history keeps transactions that never got a receipt"""
+    store = StateStore(str(tmp_path / "keeper.db"))
+    store.start()
+    store.record_submission("vault-a", "0xaa", 1, 5.0)
+    store.record_submission("vault-b", "0xbb", 1, 7.0)
+    store.record_receipt("vault-b", "0xbb", False, 7.0, {"blockNumber": 3})
+    store.record_submission("vault-a", "0xcc", 2, 9.0)
+    store.close()
+
+    pending = store.harvests("vault-a")
+    assert [h["tx_hash"] for h in pending] == ["0xaa", "0xcc"]
+    for harvest in pending:
+        assert harvest["confirmed_at"] is None
+        assert harvest["success"] is None and harvest["gas_paid_btc"] is None
+        assert harvest["nonce"] is not None and harvest["yield_usd"] > 0
+
+    (reverted,) = store.harvests("vault-b")
+    assert reverted["success"] == 0 and reverted["block_number"] == 3
+    assert reverted["gas_paid_btc"] is None  # Receipt carried no gas fields
+    assert len(store.harvests()) == 3
+    assert store.harvest_stats("vault-b") == (0, None)
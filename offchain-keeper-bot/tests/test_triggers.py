@@ -0,0 +1,36 @@
+"""
+Unit tests for block-driven harvest triggers
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from web3 import Web3
+
+from triggers import TRIGGER_TOPICS, build_log_filter, emitting_addresses
+
+HARVESTER = "0x5A296604269470c24290e383C2D34F41B2B375c0"
+STRATEGY = "0x3fffA39983C77933aB74E708B4475995E9540E4F"
+
+
+def test_log_filter_matches_any_trigger_topic():
+    """Test that the filter ORs all trigger topics over deduplicated addresses"""
+    params = build_log_filter([HARVESTER, STRATEGY, HARVESTER], 10, 12)
+
+    assert params["fromBlock"] == 10
+    assert params["toBlock"] == 12
+    assert params["address"] == sorted([HARVESTER, STRATEGY])
+    assert params["topics"] == [TRIGGER_TOPICS]
+    assert Web3.keccak(text="Harvested(uint256,uint256,uint256)").hex() in (
+        TRIGGER_TOPICS
+    )
+
+
+def test_emitting_addresses_are_checksummed():
+    """Test that log emitters are normalized for vault lookups"""
+    logs = [{"address": HARVESTER.lower()}, {"address": HARVESTER}]
+
+    assert emitting_addresses(logs) == {HARVESTER}
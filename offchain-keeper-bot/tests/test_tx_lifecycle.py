@@ -0,0 +1,207 @@
+"""
+Unit tests for in-flight harvest transaction tracking
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src and benchmarks to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from async_contracts import AsyncContractManager, create_async_web3
+from http_transport import HttpTransport
+from mock_chain import (
+    CHAIN_ID,
+    KEEPER_PRIVATE_KEY,
+    MULTICALL_ADDRESS,
+    MockChain,
+    MockRPCServer,
+)
+from run_benchmarks import HIGH_BASE_FEE_WEI, Scenario, keeper_environment
+from tx_lifecycle import (
+    CANCEL,
+    CONFIRMED,
+    LOST,
+    REBROADCAST,
+    REORGED,
+    REPLACE,
+    WAIT,
+    TxLifecycle,
+    bump_fees,
+)
+
+GWEI = 10**9
+FEES = {"maxFeePerGas": 20 * GWEI, "maxPriorityFeePerGas": 1 * GWEI}
+
+
+def test_stuck_harvest_is_sped_up_then_cancelled_past_its_ceiling():
+    """Test replacements bump every fee field and turn into a cancel"""
+    # Bumps by the configured factor, never below the node's 10% minimum,
+    # and up to the market fee when that is higher
+    assert bump_fees(FEES, 1.05) == {
+        "maxFeePerGas": 22 * GWEI,
+        "maxPriorityFeePerGas": 1.1 * GWEI,
+    }
+    assert bump_fees({"gasPrice": 10}, 1.2, {"gasPrice": 30}) == {"gasPrice": 30}
+
+    lifecycle = TxLifecycle(replace_after_blocks=2, fee_bump=1.5)
+    tracked = lifecycle.track(7, "0xa", b"a", FEES, fee_ceiling_wei=4 * GWEI)
+
+    # The first head seen after broadcast starts the block count
+    assert lifecycle.next_action(tracked, 100, chain_nonce=7).kind == WAIT
+    assert lifecycle.next_action(tracked, 101, chain_nonce=7).kind == WAIT
+
+    # Effective price 2 + 1.5 gwei is under the 4 gwei ceiling
+    action = lifecycle.next_action(tracked, 102, chain_nonce=7, base_fee_wei=2 * GWEI)
+    assert action.kind == REPLACE
+    assert action.fee_params == {
+        "maxFeePerGas": 30 * GWEI,
+        "maxPriorityFeePerGas": 1.5 * GWEI,
+    }
+    lifecycle.add_attempt(tracked, "0xb", b"b", action.fee_params, 102)
+
+    # Another bump would pay 2 + 2.25 gwei: the harvest no longer pays off
+    assert lifecycle.next_action(tracked, 103, base_fee_wei=2 * GWEI).kind == WAIT
+    action = lifecycle.next_action(tracked, 104, chain_nonce=7, base_fee_wei=2 * GWEI)
+    assert action.kind == CANCEL
+    lifecycle.add_attempt(tracked, "0xc", b"c", action.fee_params, 104, cancel=True)
+
+    # A stuck cancel keeps being bumped as a cancel
+    assert tracked.cancelling and tracked.hashes == ["0xc", "0xb", "0xa"]
+    assert lifecycle.next_action(tracked, 106, chain_nonce=7).kind == CANCEL
+
+
+def test_receipts_reorgs_and_dropped_transactions():
+    """Test confirmation depth, reorged receipts, drops and lost nonces"""
+    lifecycle = TxLifecycle(replace_after_blocks=0, confirmations=2)
+    tracked = lifecycle.track(3, "0xa", b"a", FEES, block=50)
+    receipt = {"blockNumber": 51, "blockHash": b"\x01", "status": 1}
+
+    assert lifecycle.next_action(tracked, 51, receipt, b"\x01").kind == WAIT
+    assert lifecycle.next_action(tracked, 52, receipt, b"\x02").kind == REORGED
+    assert tracked.reorgs == 1
+    action = lifecycle.next_action(tracked, 52, receipt, b"\x01")
+    assert action.kind == CONFIRMED and action.receipt is receipt
+
+    # Unmined: dropped from the pool, or the nonce was used by another tx
+    kind = lifecycle.next_action(tracked, 60, chain_nonce=3, known=False).kind
+    assert kind == REBROADCAST
+    assert lifecycle.next_action(tracked, 60, chain_nonce=4).kind == LOST
+
+    # Replacement disabled: an unmined harvest just waits
+    assert lifecycle.next_action(tracked, 90, chain_nonce=3).kind == WAIT
+    lifecycle.finish(3)
+    assert lifecycle.get(3) is None and lifecycle.pending == []
+
+
+def test_async_manager_speeds_up_a_stuck_harvest_until_mined():
+    """Test the async manager times out, resumes, replaces and confirms"""
+    chain = MockChain()
+    chain.tick()
+    chain.hold_transactions = True
+    vault = chain.vaults[0]
+
+    async def run(url: str):
+        transport = HttpTransport()
+        lifecycle = TxLifecycle(
+            replace_after_blocks=2, fee_bump=1.5, poll_interval_seconds=0.01
+        )
+        contracts = AsyncContractManager(
+            rpc_url=url,
+            chain_id=CHAIN_ID,
+            private_key=KEEPER_PRIVATE_KEY,
+            harvester_address=vault.harvester,
+            debt_manager_address=vault.debt_manager,
+            strategy_btc_address=vault.strategy,
+            multicall_address=MULTICALL_ADDRESS,
+            w3=create_async_web3([url], transport=transport),
+            lifecycle=lifecycle,
+        )
+        try:
+            tx_hash = await contracts.submit_harvest()
+            tracked = lifecycle.get(contracts.pending_nonces[tx_hash])
+
+            # Unmined at the timeout: reported as pending and kept tracked.
+            # The next cycle picks it up with that cycle's fee ceiling
+            assert not await contracts.wait_for_harvest_receipt(tx_hash, 0.05)
+            assert contracts.last_tx_outcome == WAIT
+            assert contracts.pending_harvest(fee_ceiling_wei=1000 * GWEI) == tx_hash
+            assert tracked.fee_ceiling_wei == 1000 * GWEI
+            assert await contracts.submit_harvest() == tx_hash
+
+            # Two blocks later it is re-sent with the same nonce and more fees
+            chain.tick(2)
+            assert not await contracts.wait_for_harvest_receipt(tx_hash, 0.05)
+            assert tracked.replacements == 1 and len(tracked.hashes) == 2
+            speed_up = tracked.latest.fee_params["gasPrice"]
+            assert speed_up >= 1.5 * tracked.attempts[0].fee_params["gasPrice"]
+
+            # The replacement is mined and confirmed under its own hash
+            chain.include_pending()
+            assert await contracts.wait_for_harvest_receipt(tx_hash, 5)
+            assert contracts.last_tx_outcome == CONFIRMED
+            receipt_hash = contracts.last_receipt["transactionHash"].hex()
+            assert receipt_hash == tracked.hashes[0]
+            assert lifecycle.pending == [] and contracts.pending_nonces == {}
+        finally:
+            await transport.aclose()
+
+    with MockRPCServer(chain) as server:
+        asyncio.run(run(server.url))
+    assert vault.harvests == 1
+
+
+def test_keeper_cancels_a_stuck_harvest_while_gas_holds_back_new_ones():
+    """Test a pending harvest is followed up on cycles that skip for gas"""
+    from keeper import KeeperBot
+
+    chain = MockChain()
+    chain.tick(3)  # Yield above the $10 threshold
+    chain.hold_transactions = True
+    scenario = Scenario(
+        "stuck_harvest",
+        "Harvest held in the pool through a gas spike",
+        env={
+            "GAS_HISTORY_BLOCKS": "1",
+            "TX_REPLACE_AFTER_BLOCKS": "1",
+            "TX_TIMEOUT_SECONDS": "0.05",
+            "TX_POLL_INTERVAL_SECONDS": "0.01",
+        },
+    )
+    with MockRPCServer(chain) as server:
+        with keeper_environment(chain, server.url, scenario):
+            bot = KeeperBot()
+            try:
+                # Sent, and still pending when the cycle stops waiting
+                assert not bot.check_and_harvest()
+                assert bot.last_cycle_error is None
+                tracked = bot.contracts.lifecycle.pending[0]
+
+                # Gas spikes past the cap: no new harvest, but the stuck one
+                # can no longer pay off and is cancelled
+                chain.set_base_fee(HIGH_BASE_FEE_WEI)
+                chain.tick()
+                assert not bot.check_and_harvest()
+                assert tracked.cancelling
+
+                # The cancel is mined and the nonce settled
+                chain.include_pending()
+                chain.hold_transactions = False
+                chain.tick()
+                assert not bot.check_and_harvest()
+                assert bot.contracts.last_tx_outcome == CANCEL
+                assert bot.contracts.lifecycle.pending == []
+                assert chain.harvests == 0
+
+                # Gas is back under the cap: the next harvest goes through
+                chain.set_base_fee(10_000_000)
+                chain.tick()
+                assert bot.check_and_harvest()
+                assert chain.harvests == 1
+            finally:
+                bot.health_server.stop()
+                bot.contracts.close()
+                bot.alerts.close()
+                bot.http.close()
@@ -0,0 +1,77 @@
+"""
+Unit tests for prebuilt transaction templates
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tx_template import TxTemplate
+
+HARVESTER = "0x" + "11" * 20
+
+
+def _template():
+    return TxTemplate(
+        HARVESTER,
+        "0x4641257d",
+        chain_id=31611,
+        fallback_gas=500_000,
+        validity_seconds=600,
+    )
+
+
+def test_build_fills_only_nonce_and_fees():
+    """Test built transactions reuse calldata, chain ID and buffered gas"""
+    template = _template()
+    assert template.gas_limit == 500_000
+
+    template.update_gas(200_000, now=0)
+    tx = template.build(7, {"maxFeePerGas": 3, "maxPriorityFeePerGas": 1})
+    assert tx == {
+        "to": HARVESTER,
+        "data": "0x4641257d",
+        "value": 0,
+        "gas": 240_000,
+        "nonce": 7,
+        "chainId": 31611,
+        "maxFeePerGas": 3,
+        "maxPriorityFeePerGas": 1,
+    }
+    assert template.expected_gas == 200_000
+
+
+def test_estimate_validity_window():
+    """Test refresh timing and that failed estimates keep the last one"""
+    template = _template()
+    assert not template.is_valid(now=0) and template.needs_refresh(now=0)
+
+    template.update_gas(200_000, now=100)
+    assert template.is_valid(now=399) and not template.needs_refresh(now=399)
+    assert template.is_valid(now=400) and template.needs_refresh(now=400)
+    assert not template.is_valid(now=700)
+
+    # A failed estimate (harvest() reverting) keeps the last good one
+    template.update_gas(None, now=700)
+    assert template.is_valid(now=701)
+    assert template.gas_estimate == 200_000
+
+
+def test_simulated_gas_raises_limit_of_stale_estimate():
+    """Test an estimate taken with no BTC to swap is raised by simulation"""
+    template = _template()
+    # Estimated while claimable BTC was zero: harvest() skips the swap
+    template.update_gas(200_000, now=0)
+    assert template.gas_limit == 240_000
+
+    # BTC has accrued since; the simulated harvest includes the swap
+    template.record_simulated_gas(350_000)
+    assert template.is_valid(now=1)
+    assert template.build(1, {"gasPrice": 1})["gas"] == 420_000
+    assert template.expected_gas == 350_000
+
+    # A simulation that measured nothing keeps the last measurement
+    template.record_simulated_gas(None)
+    assert template.gas_limit == 420_000
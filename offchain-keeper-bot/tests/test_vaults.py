@@ -0,0 +1,61 @@
+"""
+Unit tests for multi-vault definitions
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from vaults import load_vaults
+
+VAULT = {
+    "name": "vault-a",
+    "harvester_address": "0x" + "1" * 40,
+    "debt_manager_address": "0x" + "2" * 40,
+    "strategy_btc_address": "0x" + "3" * 40,
+}
+
+
+def test_load_vaults_accepts_list_and_object(tmp_path):
+    """Test that both a bare list and {"vaults": [...]} are accepted"""
+    list_file = tmp_path / "list.json"
+    list_file.write_text(json.dumps([VAULT]))
+    object_file = tmp_path / "object.json"
+    object_file.write_text(
+        json.dumps({"vaults": [dict(VAULT, max_gas_price_gwei=5)]})
+    )
+
+    assert load_vaults(str(list_file))[0].name == "vault-a"
+    vault = load_vaults(str(object_file))[0]
+    assert vault.max_gas_price_gwei == 5
+    assert vault.min_yield_threshold_usd is None
+
+
+def test_load_vaults_rejects_duplicates(tmp_path):
+    """Test that duplicate vault names are rejected"""
+    vaults_file = tmp_path / "vaults.json"
+    vaults_file.write_text(json.dumps([VAULT, VAULT]))
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_vaults(str(vaults_file))
+
+
+def test_load_vaults_validates_addresses(tmp_path):
+    """Test that malformed contract addresses are rejected"""
+    vaults_file = tmp_path / "vaults.json"
+    vaults_file.write_text(json.dumps([dict(VAULT, harvester_address="0x123")]))
+
+    with pytest.raises(ValidationError):
+        load_vaults(str(vaults_file))
+
+
+def test_example_vaults_file_is_valid():
+    """Test that the shipped example vaults file loads"""
+    example = Path(__file__).parent.parent / "vaults.example.json"
+    assert len(load_vaults(str(example))) == 2